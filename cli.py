@@ -947,6 +947,55 @@ def task_info(task_id):
         sys.exit(1)
 
 
+@cli.group('latest-state')
+def latest_state():
+    """Latest-state serving tables (compacted ReplacingMergeTree reads)."""
+    pass
+
+
+@latest_state.command('compact')
+@click.option('--table', multiple=True, help='Source table to compact (default: all declared)')
+def latest_state_compact(table):
+    """Build missing serving tables and merge unmerged partitions."""
+    try:
+        from stock_datasource.utils.latest_state import get_latest_state_manager
+
+        report = get_latest_state_manager().compact(list(table) or None)
+        for name, result in report.items():
+            if result.get('error'):
+                click.echo(f"  ✗ {name}: {result['error']}")
+            elif not result['ready']:
+                click.echo(f"  - {name}: source table missing")
+            else:
+                click.echo(
+                    f"  ✓ {name}: optimized {len(result['optimized'])} partitions, "
+                    f"{result['pending']} pending"
+                )
+    except Exception as e:
+        click.echo(f"✗ Compaction failed: {e}", err=True)
+        sys.exit(1)
+
+
+@latest_state.command('benchmark')
+@click.option('--repeat', default=5, help='Runs per query (median is reported)')
+def latest_state_benchmark(repeat):
+    """Time the hottest latest-state queries: legacy vs routed."""
+    try:
+        from stock_datasource.utils.latest_state import get_latest_state_manager
+
+        for row in get_latest_state_manager().benchmark(repeat=repeat):
+            if row.get('skipped'):
+                click.echo(f"  {row['query']}: skipped ({row['skipped']})")
+                continue
+            click.echo(
+                f"  {row['query']}: legacy {row['legacy_ms']} ms ({row['legacy_rows']} rows) "
+                f"-> {row['source']} {row['routed_ms']} ms ({row['routed_rows']} rows)"
+            )
+    except Exception as e:
+        click.echo(f"✗ Benchmark failed: {e}", err=True)
+        sys.exit(1)
+
+
 # ============================================================
 # Register CLI subcommand modules (setup, doctor, server, config)
 # ============================================================
@@ -990,7 +990,7 @@ export const datamanageApi = {
   },
 
   // Export query results
-  exportExplorerSql(sql: string, format: 'csv' | 'xlsx', filename?: string): Promise<Blob> {
+  exportExplorerSql(sql: string, format: 'csv' | 'xlsx' | 'parquet', filename?: string): Promise<Blob> {
     return request.post('/api/datamanage/explorer/sql/export', { sql, format, filename }, {
       responseType: 'blob'
     })
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+交易日历微基准 - 对比 DataFrame 掩码实现与数组 + 二分实现的单次调用延迟
+
+用法: python scripts/benchmark_trade_calendar.py [--calls 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from stock_datasource.core.trade_calendar import trade_calendar_service  # noqa: E402
+
+
+def legacy_between(df: pd.DataFrame, start: str, end: str) -> list[str]:
+    """Previous get_trading_days_between: boolean mask + strftime loop."""
+    mask = (
+        (df["is_open"] == 1)
+        & (df["cal_date"] >= pd.Timestamp(start))
+        & (df["cal_date"] <= pd.Timestamp(end))
+    )
+    return [d.strftime("%Y-%m-%d") for d in df[mask]["cal_date"].sort_values()]
+
+
+def legacy_offset(df: pd.DataFrame, day: str, offset: int) -> str | None:
+    """Previous get_trading_day_offset for offset != 0."""
+    ts = pd.Timestamp(day)
+    if offset > 0:
+        future = df[(df["is_open"] == 1) & (df["cal_date"] > ts)].sort_values("cal_date")
+        if len(future) >= offset:
+            return future.iloc[offset - 1]["cal_date"].strftime("%Y-%m-%d")
+        return None
+    past = df[(df["is_open"] == 1) & (df["cal_date"] < ts)]
+    if len(past) >= -offset:
+        return past.iloc[-offset - 1]["cal_date"].strftime("%Y-%m-%d")
+    return None
+
+
+def _time_us(fn, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trade calendar micro-benchmark")
+    parser.add_argument("--calls", type=int, default=2000, help="calls per operation")
+    args = parser.parse_args()
+
+    svc = trade_calendar_service
+    df = svc._get_df()
+    random.seed(0)
+    days = [
+        f"{random.randint(2005, 2025)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+        for _ in range(args.calls)
+    ]
+    ranges = [(d, f"{int(d[:4]) + 1}{d[4:]}") for d in days]
+
+    rows = [
+        (
+            "between (1y)",
+            _time_us(lambda s, e: legacy_between(df, s, e), ranges),
+            _time_us(svc.get_trading_days_between, ranges),
+        ),
+        (
+            "offset +5",
+            _time_us(lambda d: legacy_offset(df, d, 5), [(d,) for d in days]),
+            _time_us(lambda d: svc.get_trading_day_offset(d, 5), [(d,) for d in days]),
+        ),
+        (
+            "offset -5",
+            _time_us(lambda d: legacy_offset(df, d, -5), [(d,) for d in days]),
+            _time_us(lambda d: svc.get_trading_day_offset(d, -5), [(d,) for d in days]),
+        ),
+    ]
+    batch_start = time.perf_counter()
+    svc.get_trading_day_offsets(days, 5)
+    batch_us = (time.perf_counter() - batch_start) / len(days) * 1e6
+
+    print(f"{'operation':<16}{'legacy µs/call':>16}{'compiled µs/call':>18}{'speedup':>10}")
+    for name, legacy, compiled in rows:
+        print(f"{name:<16}{legacy:>16.1f}{compiled:>18.2f}{legacy / compiled:>9.0f}x")
+    print(f"{'offsets batch':<16}{'':>16}{batch_us:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -108,6 +108,8 @@ def get_langchain_model():
         try:
             from langchain_openai import ChatOpenAI
 
+            from stock_datasource.llm.metrics import LLMMetricsCallback
+
             api_key = os.getenv("OPENAI_API_KEY")
             base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
             model_name = os.getenv("OPENAI_MODEL", "gpt-4")
@@ -123,6 +125,7 @@ def get_langchain_model():
                 api_key=api_key,
                 base_url=base_url,
                 temperature=0.7,
+                callbacks=[LLMMetricsCallback(model_name)],
             )
             logger.info(f"LangChain model initialized: {model_name} @ {base_url}")
         except Exception as e:
@@ -123,6 +123,8 @@ class ConfigDrivenHarnessAgent(LangGraphAgent):
                 try:
                     from langchain_openai import ChatOpenAI
 
+                    from stock_datasource.llm.metrics import LLMMetricsCallback
+
                     api_key = os.getenv("OPENAI_API_KEY")
                     base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
                     self._model = ChatOpenAI(
@@ -131,6 +133,7 @@ class ConfigDrivenHarnessAgent(LangGraphAgent):
                         base_url=base_url,
                         temperature=model_cfg.temperature,
                         max_tokens=model_cfg.max_tokens if model_cfg.max_tokens > 0 else None,
+                        callbacks=[LLMMetricsCallback(model_cfg.model)],
                     )
                     logger.info(
                         "ConfigDrivenHarnessAgent '%s' using custom model: %s (temp=%s)",
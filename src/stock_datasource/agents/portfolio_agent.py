@@ -261,6 +261,45 @@ def get_positions() -> str:
         return "\n".join(lines)
 
 
+def get_latest_prices(codes: str) -> str:
+    """批量获取多只股票/ETF/港股的最新价格（实时分钟行情优先，否则为最近日线收盘价）。
+
+    Args:
+        codes: 逗号分隔的代码列表，如 "600519.SH,510300.SH,00700.HK"
+
+    Returns:
+        每个代码的最新价、时间、昨收价和涨跌幅
+    """
+    from stock_datasource.services.price_resolver import get_price_resolver
+
+    ts_codes = [c.strip().upper() for c in codes.split(",") if c.strip()]
+    if not ts_codes:
+        return "请提供至少一个股票代码。"
+    try:
+        prices = get_price_resolver().resolve(ts_codes)
+    except Exception as e:
+        logger.error(f"Failed to resolve latest prices: {e}", exc_info=True)
+        return f"获取最新价格失败: {e}"
+
+    lines = ["| 代码 | 最新价 | 时间 | 昨收 | 涨跌幅 |", "|------|--------|------|------|--------|"]
+    for code in ts_codes:
+        info = prices.get(code)
+        if not info:
+            lines.append(f"| {code} | - | 无行情数据 | - | - |")
+            continue
+        prev_close = info.get("prev_close")
+        pct = (
+            f"{(info['close'] - prev_close) / prev_close * 100:+.2f}%"
+            if prev_close
+            else "-"
+        )
+        lines.append(
+            f"| {code} | {info['close']:.3f} | {info.get('trade_time', '')} | "
+            f"{prev_close if prev_close is not None else '-'} | {pct} |"
+        )
+    return "\n".join(lines)
+
+
 def calculate_portfolio_pnl() -> str:
     """计算当前用户持仓组合的总体盈亏。
 
@@ -449,6 +488,7 @@ class PortfolioAgent(LangGraphAgent):
             update_position,
             get_positions,
             calculate_portfolio_pnl,
+            get_latest_prices,
             get_stock_info,
         ]
 
@@ -461,6 +501,7 @@ class PortfolioAgent(LangGraphAgent):
 - update_position: 更新持仓（加仓/减仓）
 - get_positions: 获取持仓列表
 - calculate_portfolio_pnl: 计算持仓盈亏
+- get_latest_prices: 批量获取多个代码的最新价格
 - get_stock_info: 获取股票最新行情
 
 ## 持仓操作
@@ -4,6 +4,7 @@ Arena Persistence Layer
 Handles persistence of thinking messages and arena data to ClickHouse.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -27,6 +28,12 @@ logger = logging.getLogger(__name__)
 class ThinkingMessageWriter:
     """Writes thinking messages to ClickHouse for persistence.
 
+    ``write`` does not hit ClickHouse directly: messages are put on a bounded
+    queue and a background task flushes them with ``write_batch`` once
+    ``batch_size`` messages are pending or ``flush_interval`` seconds have
+    passed. When the queue is full, ``write`` waits (back-pressure) instead of
+    dropping messages.
+
     Schema (to be created):
     CREATE TABLE IF NOT EXISTS arena_thinking_messages (
         id String,
@@ -43,9 +50,20 @@ class ThinkingMessageWriter:
     TTL timestamp + INTERVAL 30 DAY;
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+    ):
         self._client = None
         self._table = "arena_thinking_messages"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._queue: asyncio.Queue | None = None
+        self._flusher: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     async def _get_client(self):
         """Lazy load ClickHouse client."""
@@ -59,45 +77,80 @@ class ThinkingMessageWriter:
                 self._client = False
         return self._client if self._client else None
 
+    def _ensure_flusher(self) -> asyncio.Queue:
+        """Create the queue and flusher task for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._flusher is None or self._flusher.done():
+            if self._loop is not loop or self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._loop = loop
+            self._flusher = loop.create_task(self._flush_loop())
+        return self._queue
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be flushed."""
+        return self._queue.qsize() if self._queue is not None else 0
+
     async def write(self, message: ThinkingMessage) -> bool:
-        """Write a single message to ClickHouse."""
+        """Queue a single message for batched persistence.
+
+        Returns False when ClickHouse is unavailable. Waits while the queue
+        is full so producers are slowed down instead of losing messages.
+        """
         client = await self._get_client()
         if not client:
             return False
 
-        try:
-            query = f"""
-            INSERT INTO {self._table} 
-            (id, arena_id, agent_id, agent_role, round_id, message_type, content, metadata, timestamp)
-            VALUES
-            """
-            data = [
-                (
-                    message.id,
-                    message.arena_id,
-                    message.agent_id,
-                    message.agent_role,
-                    message.round_id,
-                    message.message_type.value
-                    if hasattr(message.message_type, "value")
-                    else str(message.message_type),
-                    message.content,
-                    json.dumps(message.metadata, ensure_ascii=False),
-                    message.timestamp,
-                )
-            ]
-            client.execute(query, data)
-            return True
-        except Exception as e:
-            logger.warning(f"Failed to write thinking message: {e}")
-            return False
+        queue = self._ensure_flusher()
+        await queue.put(message)
+        return True
+
+    async def _flush_loop(self) -> None:
+        """Drain the queue in batches until cancelled."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._write_batch_in_thread(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
 
-    async def write_batch(self, messages: list[ThinkingMessage]) -> bool:
-        """Write multiple messages in batch."""
+    async def _write_batch_in_thread(self, messages: list[ThinkingMessage]) -> bool:
+        """Run the blocking batch insert off the event loop."""
         client = await self._get_client()
         if not client or not messages:
             return False
+        return await asyncio.to_thread(self._insert_rows, client, messages)
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been written."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush pending messages and stop the background flusher."""
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
 
+    def _insert_rows(self, client, messages: list[ThinkingMessage]) -> bool:
+        """Insert messages with a single INSERT statement."""
         try:
             query = f"""
             INSERT INTO {self._table} 
@@ -126,6 +179,13 @@ class ThinkingMessageWriter:
             logger.warning(f"Failed to write thinking messages batch: {e}")
             return False
 
+    async def write_batch(self, messages: list[ThinkingMessage]) -> bool:
+        """Write multiple messages in batch."""
+        client = await self._get_client()
+        if not client or not messages:
+            return False
+        return self._insert_rows(client, messages)
+
     async def get_history(
         self,
         arena_id: str,
@@ -345,6 +405,15 @@ class StrategyRepository:
 
 _arena_repository: ArenaRepository | None = None
 _strategy_repository: StrategyRepository | None = None
+_thinking_message_writer: ThinkingMessageWriter | None = None
+
+
+def get_thinking_message_writer() -> ThinkingMessageWriter:
+    """Get the process-wide batching thinking message writer."""
+    global _thinking_message_writer
+    if _thinking_message_writer is None:
+        _thinking_message_writer = ThinkingMessageWriter()
+    return _thinking_message_writer
 
 
 def get_arena_repository() -> ArenaRepository:
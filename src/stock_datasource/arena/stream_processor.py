@@ -6,8 +6,10 @@ Provides message publishing, subscription, and history retrieval.
 """
 
 import asyncio
+import bisect
 import json
 import logging
+from collections import deque
 from collections.abc import AsyncGenerator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -24,15 +26,134 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
+class ArenaMessageBuffer:
+    """Fixed-capacity ring buffer of one arena's messages with secondary indexes.
+
+    Every message gets a monotonically increasing sequence number and lives in
+    slot ``seq % capacity``. Sequence numbers are indexed by round_id, agent_id
+    and message type, and a non-decreasing timestamp watermark per slot lets
+    ``since`` queries bisect instead of scanning the whole arena.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._slots: list[ThinkingMessage | None] = [None] * capacity
+        self._watermarks: list[datetime | None] = [None] * capacity
+        self._start = 0  # Oldest live sequence number
+        self._end = 0  # Next sequence number to assign
+        self._by_round: dict[str, deque[int]] = {}
+        self._by_agent: dict[str, deque[int]] = {}
+        self._by_type: dict[Any, deque[int]] = {}
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _index_keys(self, message: ThinkingMessage):
+        return (
+            (self._by_round, message.round_id),
+            (self._by_agent, message.agent_id),
+            (self._by_type, message.message_type),
+        )
+
+    def _evict_oldest(self) -> None:
+        slot = self._start % self.capacity
+        oldest = self._slots[slot]
+        for index, key in self._index_keys(oldest):
+            seqs = index.get(key)
+            if seqs:
+                seqs.popleft()
+                if not seqs:
+                    del index[key]
+        self._slots[slot] = None
+        self._watermarks[slot] = None
+        self._start += 1
+
+    def append(self, message: ThinkingMessage) -> None:
+        """Append a message, evicting the oldest one when full."""
+        if len(self) >= self.capacity:
+            self._evict_oldest()
+
+        seq = self._end
+        watermark = message.timestamp
+        if len(self):
+            previous = self._watermarks[(seq - 1) % self.capacity]
+            if previous is not None and previous > watermark:
+                watermark = previous
+
+        slot = seq % self.capacity
+        self._slots[slot] = message
+        self._watermarks[slot] = watermark
+        for index, key in self._index_keys(message):
+            index.setdefault(key, deque()).append(seq)
+        self._end += 1
+
+    def _first_seq_after(self, since: datetime) -> int:
+        """First sequence number whose timestamp watermark is after ``since``."""
+        return bisect.bisect_right(
+            range(self._start, self._end),
+            since,
+            key=lambda seq: self._watermarks[seq % self.capacity],
+        ) + self._start
+
+    def query(
+        self,
+        round_id: str = None,
+        agent_id: str = None,
+        message_type: MessageType = None,
+        since: datetime = None,
+        limit: int = 100,
+    ) -> list[ThinkingMessage]:
+        """Return the newest ``limit`` matching messages in chronological order."""
+        if limit <= 0 or not len(self):
+            return []
+
+        lower = self._first_seq_after(since) if since else self._start
+
+        candidates: list[deque[int]] = []
+        if round_id:
+            candidates.append(self._by_round.get(round_id, deque()))
+        if agent_id:
+            candidates.append(self._by_agent.get(agent_id, deque()))
+        if message_type:
+            candidates.append(self._by_type.get(message_type, deque()))
+
+        if candidates:
+            seqs = reversed(min(candidates, key=len))
+        else:
+            seqs = reversed(range(lower, self._end))
+
+        result: list[ThinkingMessage] = []
+        for seq in seqs:
+            if seq < lower:
+                break
+            message = self._slots[seq % self.capacity]
+            if round_id and message.round_id != round_id:
+                continue
+            if agent_id and message.agent_id != agent_id:
+                continue
+            if message_type and message.message_type != message_type:
+                continue
+            if since and not message.timestamp > since:
+                continue
+            result.append(message)
+            if len(result) >= limit:
+                break
+
+        result.reverse()
+        return result
+
+
 @dataclass
 class MessageStore:
     """In-memory message store for thinking streams.
 
+    Each arena keeps its recent messages in an ``ArenaMessageBuffer`` so
+    filtered and ``since`` lookups (SSE reconnects) do not rescan history.
     In production, this should be replaced with Redis Streams.
     """
 
-    # Messages by arena: {arena_id: [ThinkingMessage]}
-    messages: dict[str, list[ThinkingMessage]] = field(default_factory=dict)
+    # Message buffers by arena: {arena_id: ArenaMessageBuffer}
+    buffers: dict[str, ArenaMessageBuffer] = field(default_factory=dict)
 
     # Subscribers by arena: {arena_id: [callback]}
     subscribers: dict[str, list[Callable]] = field(default_factory=dict)
@@ -45,18 +166,11 @@ class MessageStore:
 
     def add_message(self, message: ThinkingMessage) -> None:
         """Add a message to the store."""
-        arena_id = message.arena_id
-
-        if arena_id not in self.messages:
-            self.messages[arena_id] = []
-
-        self.messages[arena_id].append(message)
-
-        # Trim if exceeds max
-        if len(self.messages[arena_id]) > self.max_messages_per_arena:
-            self.messages[arena_id] = self.messages[arena_id][
-                -self.max_messages_per_arena :
-            ]
+        buffer = self.buffers.get(message.arena_id)
+        if buffer is None:
+            buffer = ArenaMessageBuffer(self.max_messages_per_arena)
+            self.buffers[message.arena_id] = buffer
+        buffer.append(message)
 
     def get_messages(
         self,
@@ -68,25 +182,20 @@ class MessageStore:
         limit: int = 100,
     ) -> list[ThinkingMessage]:
         """Get messages with optional filters."""
-        messages = self.messages.get(arena_id, [])
-
-        # Apply filters
-        if round_id:
-            messages = [m for m in messages if m.round_id == round_id]
-        if agent_id:
-            messages = [m for m in messages if m.agent_id == agent_id]
-        if message_type:
-            messages = [m for m in messages if m.message_type == message_type]
-        if since:
-            messages = [m for m in messages if m.timestamp > since]
-
-        # Apply limit
-        return messages[-limit:]
+        buffer = self.buffers.get(arena_id)
+        if buffer is None:
+            return []
+        return buffer.query(
+            round_id=round_id,
+            agent_id=agent_id,
+            message_type=message_type,
+            since=since,
+            limit=limit,
+        )
 
     def clear_arena(self, arena_id: str) -> None:
         """Clear all messages for an arena."""
-        if arena_id in self.messages:
-            del self.messages[arena_id]
+        self.buffers.pop(arena_id, None)
 
     def add_subscriber(self, arena_id: str, callback: Callable) -> str:
         """Add a subscriber for an arena. Returns subscriber ID."""
@@ -233,7 +342,7 @@ class ThinkingStreamProcessor:
                 logger.warning(f"Subscriber callback failed: {e}")
 
     async def _persist_message(self, message: ThinkingMessage) -> None:
-        """Persist message to ClickHouse (async, non-blocking)."""
+        """Queue message for batched ClickHouse persistence (non-blocking)."""
         try:
             writer = await self._get_db_writer()
             if writer:
@@ -246,9 +355,9 @@ class ThinkingStreamProcessor:
         """Lazy load ClickHouse writer."""
         if self._db_writer is None:
             try:
-                from .persistence import ThinkingMessageWriter
+                from .persistence import get_thinking_message_writer
 
-                self._db_writer = ThinkingMessageWriter()
+                self._db_writer = get_thinking_message_writer()
             except ImportError:
                 logger.debug("ClickHouse persistence not available")
                 self._db_writer = False  # Mark as unavailable
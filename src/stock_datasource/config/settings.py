@@ -121,6 +121,18 @@ class Settings(BaseSettings):
     LOGS_DIR: Path = BASE_DIR / "logs"
     SQL_DIR: Path = BASE_DIR / "src" / "stock_datasource" / "sql"
 
+    # Plugin discovery
+    PLUGIN_LAZY_LOADING: bool = Field(
+        default=True,
+        description="Discover plugins from a cached static manifest and import each plugin on first use",
+    )
+
+    # Startup schema bootstrap
+    SCHEMA_BOOTSTRAP_WORKERS: int = Field(
+        default=4,
+        description="Max concurrent schema modules applied at API startup",
+    )
+
     # Logging
     LOG_LEVEL: str = Field(default="INFO")
     LOG_ROTATION_SIZE: str = Field(
@@ -136,6 +148,108 @@ class Settings(BaseSettings):
         default="90 days", description="Log retention period"
     )
 
+    # Telemetry sink (api_usage_log / mcp_tool_usage_log / token_usage_log)
+    TELEMETRY_BATCH_SIZE: int = Field(
+        default=500, description="Rows per table before a telemetry flush"
+    )
+    TELEMETRY_FLUSH_INTERVAL: float = Field(
+        default=5.0, description="Max seconds between telemetry flushes"
+    )
+    TELEMETRY_MAX_QUEUE: int = Field(
+        default=50000, description="Telemetry queue size before rows are dropped"
+    )
+
+    # Process-wide metrics registry (/metrics)
+    METRICS_MULTIPROC_ENABLED: bool = Field(
+        default=True, description="Aggregate metrics across API and worker processes"
+    )
+    METRICS_MULTIPROC_DIR: Path | None = Field(
+        default=None, description="Snapshot directory shared by all processes (default LOGS_DIR/metrics)"
+    )
+    METRICS_FLUSH_INTERVAL: float = Field(
+        default=5.0, description="Seconds between per-process metrics snapshots"
+    )
+
+    # ClickHouse query profiler / slow-query log (opt-in)
+    QUERY_PROFILER_ENABLED: bool = Field(
+        default=False, description="Profile ClickHouseClient queries and log slow ones"
+    )
+    QUERY_PROFILER_SLOW_MS: float = Field(
+        default=1000.0, description="Queries at or above this wall time are logged as slow"
+    )
+    QUERY_PROFILER_RING_SIZE: int = Field(
+        default=500, description="Slow queries kept in memory for the API"
+    )
+    QUERY_PROFILER_LOG_MAX_BYTES: int = Field(
+        default=10 * 1024 * 1024, description="Size at which logs/slow_queries.log rotates"
+    )
+    QUERY_PROFILER_LOG_BACKUPS: int = Field(
+        default=5, description="Rotated slow query log files to keep"
+    )
+
+    # MCP tool execution and result encoding
+    MCP_TOOL_WORKERS: int = Field(
+        default=16, description="Thread pool size for blocking MCP tool service calls"
+    )
+    MCP_MAX_RESULT_ROWS: int = Field(
+        default=2000, description="Max rows returned by a single MCP tool call"
+    )
+
+    # In-process security search index (market search box / code resolution)
+    SECURITY_SEARCH_REFRESH_INTERVAL: float = Field(
+        default=300.0,
+        description="Seconds between checks for new basic-info data in ClickHouse",
+    )
+
+    # Latest-state serving tables (compacted ReplacingMergeTree reads)
+    LATEST_STATE_CHECK_INTERVAL: float = Field(
+        default=0.0,
+        description=(
+            "Seconds a serving table's merged state is trusted before re-checking "
+            "system.parts (0 = every read); inside the window reads skip FINAL "
+            "even while other processes insert"
+        ),
+    )
+    LATEST_STATE_COMPACTION_MINUTES: int = Field(
+        default=15, description="Minutes between background latest-state compaction runs"
+    )
+
+    # Paper trading
+    PAPER_TRADING_VALUATION_TIME: str = Field(
+        default="19:30",
+        description="HH:MM of the bulk end-of-day paper trading valuation (after the daily sync)",
+    )
+
+    # SQL data explorer exports (streamed from ClickHouse)
+    EXPLORER_EXPORT_MAX_ROWS: int = Field(
+        default=5_000_000, description="Upper bound on rows in one data explorer export"
+    )
+    EXPLORER_EXPORT_MAX_BYTES: int = Field(
+        default=2 * 1024**3,
+        description="Upper bound on uncompressed result bytes in one data explorer export",
+    )
+    EXPLORER_EXPORT_TIMEOUT: int = Field(
+        default=600, description="Max execution seconds of a data explorer export query"
+    )
+
+    # Authenticated principal caches (JWT users and MCP/Open API keys)
+    AUTH_USER_CACHE_TTL: float = Field(
+        default=60.0, description="Seconds a looked-up user is served from memory"
+    )
+    AUTH_USER_CACHE_MAX_ENTRIES: int = Field(
+        default=10_000, description="Max users kept in the in-process cache"
+    )
+    AUTH_API_KEY_CACHE_TTL: float = Field(
+        default=60.0, description="Seconds a validated API key is served from memory"
+    )
+    AUTH_API_KEY_CACHE_MAX_ENTRIES: int = Field(
+        default=10_000, description="Max API keys kept in the in-process cache"
+    )
+    AUTH_CACHE_SYNC_INTERVAL: float = Field(
+        default=5.0,
+        description="Seconds between checks for invalidations made by other processes (via Redis)",
+    )
+
     # Database settings
     DATABASE_URL: str | None = Field(default=None)
 
@@ -162,6 +276,14 @@ class Settings(BaseSettings):
     CACHE_TTL_DAILY: int = Field(default=86400)  # Daily K-line data
     CACHE_TTL_BASIC: int = Field(default=3600)  # Stock basic info
     CACHE_TTL_OVERVIEW: int = Field(default=300)  # Market overview
+    PRICE_RESOLVER_CACHE_TTL: float = Field(
+        default=5.0,
+        description="In-process TTL (seconds) of resolved latest prices; 0 disables it",
+    )
+    SCREENER_SNAPSHOT_TTL: float = Field(
+        default=900.0,
+        description="In-process TTL (seconds) of per-date screener market snapshots",
+    )
 
     # --- Realtime Kline (RT_KLINE_*) ---
     RT_KLINE_COLLECT_INTERVAL: float = Field(default=1.5, description="采集周期(秒)")
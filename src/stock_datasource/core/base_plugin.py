@@ -1,7 +1,9 @@
 """Base plugin class for stock data source."""
 
 import json
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -10,6 +12,17 @@ from typing import Any
 import pandas as pd
 
 from stock_datasource.utils.logger import logger
+from stock_datasource.utils.metrics import registry as metrics_registry
+
+_PLUGIN_RUNS_TOTAL = metrics_registry.counter(
+    "plugin_runs_total", "Plugin pipeline runs by outcome", ("plugin", "status")
+)
+_PLUGIN_RUN_SECONDS = metrics_registry.histogram(
+    "plugin_run_duration_seconds", "Plugin pipeline wall time", ("plugin",)
+)
+_PLUGIN_RECORDS_TOTAL = metrics_registry.counter(
+    "plugin_records_loaded_total", "Records loaded by plugin pipelines", ("plugin",)
+)
 
 
 class PluginCategory(str, Enum):
@@ -55,6 +68,25 @@ class PluginRole(str, Enum):
     AUXILIARY = "auxiliary"  # 辅助数据（如指数权重）
 
 
+# Callbacks invoked as ``listener(plugin_name, table_name)`` after a plugin
+# successfully loads data (e.g. to refresh in-process caches of that table).
+_load_listeners: list[Callable[[str, str], None]] = []
+
+
+def add_load_listener(listener: Callable[[str, str], None]) -> None:
+    """Register a callback for successful plugin data loads."""
+    if listener not in _load_listeners:
+        _load_listeners.append(listener)
+
+
+def _notify_data_loaded(plugin_name: str, table_name: str) -> None:
+    for listener in list(_load_listeners):
+        try:
+            listener(plugin_name, table_name)
+        except Exception as e:
+            logger.warning(f"Load listener failed for {table_name}: {e}")
+
+
 class BasePlugin(ABC):
     """Base class for all data plugins."""
 
@@ -355,11 +387,21 @@ class BasePlugin(ABC):
             )
             self.db.execute_query(f"TRUNCATE TABLE {table_name}")
             self.logger.info(f"Table {table_name} truncated successfully")
+            self._invalidate_coverage(table_name)
             return True
         except Exception as e:
             self.logger.error(f"Failed to truncate table {table_name}: {e}")
             return False
 
+    def _invalidate_coverage(self, table_name: str) -> None:
+        """Forget cached date coverage of a table whose rows were removed."""
+        try:
+            from stock_datasource.modules.datamanage.coverage import get_coverage_engine
+
+            get_coverage_engine().invalidate(table_name)
+        except Exception as e:
+            self.logger.warning(f"Failed to invalidate coverage of {table_name}: {e}")
+
     def should_run_today(self, current_date=None) -> bool:
         """Check if plugin should run on the given date.
 
@@ -415,6 +457,21 @@ class BasePlugin(ABC):
         Returns:
             Pipeline execution result with status and step details
         """
+        start = time.perf_counter()
+        result = self._run_pipeline(**kwargs)
+        status = result.get("status", "unknown")
+        if result.get("steps", {}).get("extract", {}).get("status") == "no_data":
+            status = "no_data"
+        _PLUGIN_RUN_SECONDS.observe(time.perf_counter() - start, plugin=self.name)
+        _PLUGIN_RUNS_TOTAL.inc(plugin=self.name, status=status)
+        load = result.get("steps", {}).get("load") or {}
+        records = load.get("total_records", load.get("records", 0))
+        if isinstance(records, (int, float)) and records > 0:
+            _PLUGIN_RECORDS_TOTAL.inc(records, plugin=self.name)
+        return result
+
+    def _run_pipeline(self, **kwargs) -> dict[str, Any]:
+        """Run the extract -> validate -> transform -> load steps for ``run``."""
         result = {
             "plugin": self.name,
             "status": "success",
@@ -477,6 +534,8 @@ class BasePlugin(ABC):
 
             if load_result.get("status") != "success":
                 result["status"] = "failed"
+            elif schema and schema.get("table_name"):
+                _notify_data_loaded(self.name, schema["table_name"])
 
             self.logger.info(
                 f"[{self.name}] Pipeline completed with status: {result['status']}"
@@ -1,12 +1,19 @@
 """Base service class for all data query services."""
 
 import inspect
+import re
 from abc import ABC
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from functools import wraps
 from typing import Any
 
+import pandas as pd
+from clickhouse_driver.context import Context
+from clickhouse_driver.util.escape import escape_params
+
 from stock_datasource.models.database import db_client
 
 
@@ -21,8 +28,23 @@ class QueryParam:
     default: Any = None
 
 
-def query_method(description: str = "", params: list[QueryParam] | None = None):
-    """Decorator to mark query methods and attach metadata."""
+_PUSHDOWN_MODES = (None, "raw", "mapped")
+
+
+def query_method(
+    description: str = "",
+    params: list[QueryParam] | None = None,
+    pushdown: str | None = None,
+):
+    """Decorator to mark query methods and attach metadata.
+
+    ``pushdown`` declares that the method issues a single ``self.db`` query
+    and returns its rows one-to-one, so the Open API may push LIMIT/OFFSET
+    and column projection into the SQL: ``"raw"`` when the rows are returned
+    unchanged, ``"mapped"`` when each row goes through a value conversion.
+    """
+    if pushdown not in _PUSHDOWN_MODES:
+        raise ValueError(f"Invalid pushdown mode: {pushdown!r}")
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -33,6 +55,7 @@ def query_method(description: str = "", params: list[QueryParam] | None = None):
         wrapper._query_metadata = {
             "description": description,
             "params": params or [],
+            "pushdown": pushdown,
             "func": func,
         }
         return wrapper
@@ -40,6 +63,124 @@ def query_method(description: str = "", params: list[QueryParam] | None = None):
     return decorator
 
 
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass
+class QueryShape:
+    """Row window and column projection pushed down into a query method's SQL.
+
+    The method's single SELECT is wrapped as
+    ``SELECT <columns> FROM (<sql>) LIMIT <limit> OFFSET <offset>``; ``offset``
+    only applies together with ``limit``. In ``capture`` mode the shaped SQL,
+    with its parameters inlined, is recorded in ``captured_sql`` instead of
+    being executed, so the caller can stream it from ClickHouse itself.
+    """
+
+    limit: int | None = None
+    offset: int = 0
+    columns: list[str] | None = None
+    capture: bool = False
+    captured_sql: str | None = None
+    applied: bool = False
+
+    def __post_init__(self):
+        for column in self.columns or []:
+            if not _IDENTIFIER_RE.match(column):
+                raise ValueError(f"Invalid column name: {column}")
+
+    def apply(self, sql: str) -> str:
+        inner = sql.strip().rstrip(";")
+        if not re.match(r"(?is)^\s*(SELECT|WITH)\b", inner):
+            return sql
+        columns = ", ".join(f"`{c}`" for c in self.columns) if self.columns else "*"
+        shaped = f"SELECT {columns} FROM (\n{inner}\n)"
+        if self.limit is not None:
+            shaped += f" LIMIT {int(self.limit)}"
+            if self.offset:
+                shaped += f" OFFSET {int(self.offset)}"
+        return shaped
+
+
+_active_shape: ContextVar[QueryShape | None] = ContextVar("query_shape", default=None)
+
+
+@contextmanager
+def query_shape(shape: QueryShape) -> Iterator[QueryShape]:
+    """Apply ``shape`` to the service query issued inside the block."""
+    token = _active_shape.set(shape)
+    try:
+        yield shape
+    finally:
+        _active_shape.reset(token)
+
+
+def _inline_params(query: str, params: dict | None) -> str | None:
+    """Render ``%(name)s`` placeholders the way clickhouse_driver does client-side.
+
+    Returns None when a value cannot be escaped without a server connection
+    (timezone-dependent datetimes); the query is then executed as usual.
+    """
+    if not params:
+        return query
+    try:
+        return query % escape_params(params, Context())
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class _ShapedClient:
+    """db client proxy that shapes the first query of a query method."""
+
+    def __init__(self, db, shape: QueryShape):
+        self._db = db
+        self._shape = shape
+
+    def _run(self, method: str, query: str, params=None):
+        shape = self._shape
+        if shape.applied:
+            return getattr(self._db, method)(query, params)
+        shape.applied = True
+        query = shape.apply(query)
+        if shape.capture:
+            captured = _inline_params(query, params)
+            if captured is not None:
+                shape.captured_sql = captured
+                return [] if method == "execute" else pd.DataFrame()
+        return getattr(self._db, method)(query, params)
+
+    def execute_query(self, query: str, params=None):
+        return self._run("execute_query", query, params)
+
+    def query(self, query: str, params=None):
+        return self._run("query", query, params)
+
+    def execute(self, query: str, params=None):
+        return self._run("execute", query, params)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._db, attr)
+
+
+def supports_pushdown(method: Callable) -> bool:
+    """Whether LIMIT/OFFSET/projection can be pushed into ``method``'s SQL.
+
+    Only methods declared with ``@query_method(pushdown="raw"|"mapped")``.
+    """
+    metadata = getattr(method, "_query_metadata", None)
+    return bool(metadata and metadata.get("pushdown"))
+
+
+def streams_natively(method: Callable) -> bool:
+    """Whether ``method``'s shaped SQL can be streamed straight from ClickHouse.
+
+    Only for ``pushdown="raw"`` methods: streaming skips the method body,
+    including the per-row value conversion of ``"mapped"`` methods.
+    """
+    metadata = getattr(method, "_query_metadata", None)
+    return bool(metadata and metadata.get("pushdown") == "raw")
+
+
 class BaseService(ABC):
     """Base class for all data query services."""
 
@@ -47,6 +188,17 @@ class BaseService(ABC):
         self.plugin_name = plugin_name
         self.db = db_client
 
+    @property
+    def db(self):
+        shape = _active_shape.get()
+        if shape is None:
+            return self._db
+        return _ShapedClient(self._db, shape)
+
+    @db.setter
+    def db(self, value):
+        self._db = value
+
     def get_query_methods(self) -> dict[str, dict[str, Any]]:
         """Extract all query methods with their metadata."""
         methods = {}
@@ -2,12 +2,19 @@
 
 import importlib
 import pkgutil
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from stock_datasource.config.settings import settings
 from stock_datasource.core.base_plugin import BasePlugin, PluginCategory, PluginRole
+from stock_datasource.core.plugin_manifest import (
+    LazyPlugin,
+    PluginManifest,
+    PluginManifestEntry,
+)
 from stock_datasource.utils.logger import logger
 
 
@@ -51,80 +58,111 @@ class DependencyCheckResult:
 
 
 class PluginManager:
-    """Manages plugin discovery, registration, and lifecycle."""
+    """Manages plugin discovery, registration, and lifecycle.
 
-    def __init__(self):
+    With ``PLUGIN_LAZY_LOADING`` (default) discovery only reads the static
+    plugin manifest (see ``core.plugin_manifest``); ``get_plugin`` returns a
+    ``LazyPlugin`` that imports the plugin package the first time it is run.
+    """
+
+    def __init__(self, manifest_path: Path | None = None):
         self.plugins: dict[str, BasePlugin] = {}
+        self._lazy: dict[str, LazyPlugin] = {}
+        self._manifest_entries: dict[str, PluginManifestEntry] = {}
+        self._manifest_path = manifest_path
+        self._load_lock = threading.RLock()
         self.logger = logger.bind(component="PluginManager")
 
     def discover_plugins(self, package_path: str = "stock_datasource.plugins") -> None:
-        """Discover and load plugins from the plugins package."""
+        """Discover plugins from the plugins package."""
         try:
             package = importlib.import_module(package_path)
             package_path_obj = Path(package.__file__).parent
 
             self.logger.info(f"Discovering plugins in {package_path}")
+            module_names = [
+                name
+                for _, name, _ in pkgutil.iter_modules([str(package_path_obj)])
+                if not name.startswith("_")
+            ]
+
+            to_import = module_names
+            if settings.PLUGIN_LAZY_LOADING:
+                manifest = PluginManifest(
+                    self._manifest_path or settings.DATA_DIR / "plugin_manifest.json"
+                )
+                entries, to_import = manifest.load(
+                    package_path, package_path_obj, module_names
+                )
+                for entry in entries:
+                    self._manifest_entries[entry.name] = entry
+                    if entry.name not in self.plugins:
+                        self._lazy[entry.name] = LazyPlugin(entry, self._load_plugin)
+
             discovered = 0
             failed = 0
-
-            for finder, name, ispkg in pkgutil.iter_modules([str(package_path_obj)]):
-                if name.startswith("_"):
-                    continue
-
+            for name in to_import:
                 try:
-                    module = importlib.import_module(f"{package_path}.{name}")
-
-                    # Look for plugin classes that inherit from BasePlugin
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (
-                            isinstance(attr, type)
-                            and issubclass(attr, BasePlugin)
-                            and attr != BasePlugin
-                        ):
-                            plugin_instance = attr()
-                            self.register_plugin(plugin_instance)
-                            discovered += 1
-                            self.logger.debug(
-                                f"Discovered plugin: {plugin_instance.name}"
-                            )
-
+                    discovered += self._import_plugin_module(f"{package_path}.{name}")
                 except Exception as e:
-                    if "No columns to parse from file" in str(e):
-                        try:
-                            time.sleep(0.2)
-                            module = importlib.import_module(f"{package_path}.{name}")
-                            for attr_name in dir(module):
-                                attr = getattr(module, attr_name)
-                                if (
-                                    isinstance(attr, type)
-                                    and issubclass(attr, BasePlugin)
-                                    and attr != BasePlugin
-                                ):
-                                    plugin_instance = attr()
-                                    self.register_plugin(plugin_instance)
-                                    discovered += 1
-                                    self.logger.debug(
-                                        f"Discovered plugin after retry: {plugin_instance.name}"
-                                    )
-                            continue
-                        except Exception as retry_error:
-                            failed += 1
-                            self.logger.error(
-                                f"Failed to load plugin module {name} after retry: {retry_error}"
-                            )
-                            continue
-
                     failed += 1
                     self.logger.error(f"Failed to load plugin module {name}: {e}")
 
             self.logger.info(
-                f"Plugin discovery completed: {discovered} discovered, {len(self.plugins)} registered, {failed} failed"
+                f"Plugin discovery completed: {len(self._lazy)} from manifest, "
+                f"{discovered} imported, {len(self.list_plugins())} registered, {failed} failed"
             )
 
         except Exception as e:
             self.logger.error(f"Failed to discover plugins: {e}")
 
+    def _import_plugin_module(self, module_name: str, class_name: str | None = None) -> int:
+        """Import a plugin package and register its plugin class(es)."""
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            if "No columns to parse from file" not in str(e):
+                raise
+            time.sleep(0.2)
+            module = importlib.import_module(module_name)
+
+        registered = 0
+        for attr_name in dir(module):
+            if class_name is not None and attr_name != class_name:
+                continue
+            attr = getattr(module, attr_name)
+            if (
+                isinstance(attr, type)
+                and issubclass(attr, BasePlugin)
+                and attr != BasePlugin
+            ):
+                plugin_instance = attr()
+                self.register_plugin(plugin_instance)
+                registered += 1
+                self.logger.debug(f"Discovered plugin: {plugin_instance.name}")
+        return registered
+
+    def _load_plugin(self, name: str) -> BasePlugin:
+        """Import a manifest plugin on first use (``LazyPlugin`` loader)."""
+        with self._load_lock:
+            plugin = self.plugins.get(name)
+            if plugin is not None:
+                return plugin
+            entry = self._manifest_entries[name]
+            started = time.perf_counter()
+            if not self._import_plugin_module(entry.module, entry.class_name):
+                # Class not re-exported by the package __init__
+                self._import_plugin_module(f"{entry.module}.plugin", entry.class_name)
+            plugin = self.plugins.get(name)
+            if plugin is None:
+                raise ImportError(
+                    f"Plugin class {entry.class_name} not found in {entry.module}"
+                )
+            self.logger.debug(
+                f"Loaded plugin {name} in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+            return plugin
+
     def register_plugin(self, plugin: BasePlugin) -> None:
         """Register a plugin instance."""
         if plugin.name in self.plugins:
@@ -133,18 +171,22 @@ class PluginManager:
         self.plugins[plugin.name] = plugin
         self.logger.debug(f"Registered plugin: {plugin.name}")
 
-    def get_plugin(self, name: str) -> BasePlugin | None:
-        """Get a plugin by name."""
-        return self.plugins.get(name)
+    def get_plugin(self, name: str) -> BasePlugin | LazyPlugin | None:
+        """Get a plugin by name (a ``LazyPlugin`` until it is first used)."""
+        return self.plugins.get(name) or self._lazy.get(name)
 
     def list_plugins(self) -> list[str]:
         """List all registered plugin names."""
-        return list(self.plugins.keys())
+        return list(dict.fromkeys([*self._lazy, *self.plugins]))
+
+    def _all_plugins(self) -> list[BasePlugin | LazyPlugin]:
+        return [self.get_plugin(name) for name in self.list_plugins()]
 
     def get_plugin_info(self) -> list[dict[str, Any]]:
         """Get information about all registered plugins."""
         info = []
-        for plugin_name, plugin in self.plugins.items():
+        for plugin in self._all_plugins():
+            plugin_name = plugin.name
             try:
                 info.append(
                     {
@@ -182,7 +224,7 @@ class PluginManager:
 
     def get_enabled_plugins(self) -> list[BasePlugin]:
         """Get only enabled plugins."""
-        return [plugin for plugin in self.plugins.values() if plugin.is_enabled()]
+        return [plugin for plugin in self._all_plugins() if plugin.is_enabled()]
 
     def execute_plugin(self, plugin_name: str, **kwargs) -> Any:
         """Execute a plugin with given parameters."""
@@ -221,6 +263,8 @@ class PluginManager:
     def reload_plugins(self) -> None:
         """Reload all plugins (useful for development)."""
         self.plugins.clear()
+        self._lazy.clear()
+        self._manifest_entries.clear()
         self.discover_plugins()
         self.logger.info("Plugins reloaded")
 
@@ -391,7 +435,8 @@ class PluginManager:
             Dictionary mapping plugin names to their dependencies
         """
         graph = {}
-        for plugin_name, plugin in self.plugins.items():
+        for plugin in self._all_plugins():
+            plugin_name = plugin.name
             try:
                 graph[plugin_name] = plugin.get_dependencies()
             except Exception as e:
@@ -411,7 +456,8 @@ class PluginManager:
             List of plugin names that depend on this plugin
         """
         dependents = []
-        for name, plugin in self.plugins.items():
+        for plugin in self._all_plugins():
+            name = plugin.name
             try:
                 if plugin_name in plugin.get_dependencies():
                     dependents.append(name)
@@ -430,7 +476,7 @@ class PluginManager:
         Returns:
             List of plugins matching the category
         """
-        return [p for p in self.plugins.values() if p.get_category() == category]
+        return [p for p in self._all_plugins() if p.get_category() == category]
 
     def get_plugins_by_role(self, role: PluginRole) -> list[BasePlugin]:
         """Get plugins by role.
@@ -441,7 +487,7 @@ class PluginManager:
         Returns:
             List of plugins matching the role
         """
-        return [p for p in self.plugins.values() if p.get_role() == role]
+        return [p for p in self._all_plugins() if p.get_role() == role]
 
     def get_filtered_plugins(
         self, category: PluginCategory | None = None, role: PluginRole | None = None
@@ -455,7 +501,7 @@ class PluginManager:
         Returns:
             List of plugins matching the filters
         """
-        result = list(self.plugins.values())
+        result = self._all_plugins()
 
         if category is not None:
             result = [p for p in result if p.get_category() == category]
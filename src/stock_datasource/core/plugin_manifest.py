@@ -0,0 +1,374 @@
+"""Static plugin manifest for lazy plugin discovery.
+
+Importing a plugin package pulls in its extractor, and several extractors
+create a Tushare ``pro_api()`` client at import time. Discovery therefore
+builds a manifest without importing plugin code:
+
+- ``config.json`` and ``schema.json`` are read as-is.
+- ``plugin.py`` is parsed (not executed) to pick up the plugin class and the
+  literal return values of ``name``, ``version``, ``description``,
+  ``get_category``, ``get_role``, ``get_dependencies`` and
+  ``get_optional_dependencies``. ``self._plugin_config.get("key", default)``
+  style returns are resolved against ``config.json``.
+
+The manifest is cached as JSON together with the mtimes of those files;
+only plugin directories whose files changed are re-parsed. ``LazyPlugin``
+answers metadata calls from the manifest and imports the real plugin the
+first time anything else (``run``, ``extract_data``, services...) is used.
+"""
+
+import ast
+import json
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from stock_datasource.core.base_plugin import BasePlugin, PluginCategory, PluginRole
+from stock_datasource.utils.logger import logger
+
+MANIFEST_VERSION = 1
+
+# Files whose mtimes invalidate a plugin's manifest entry
+WATCHED_FILES = ("__init__.py", "plugin.py", "config.json", "schema.json")
+
+_STATIC_MEMBERS = {
+    "name": "name",
+    "version": "version",
+    "description": "description",
+    "get_category": "category",
+    "get_role": "role",
+    "get_dependencies": "dependencies",
+    "get_optional_dependencies": "optional_dependencies",
+}
+
+_ENUMS = {"PluginCategory": PluginCategory, "PluginRole": PluginRole}
+
+
+class _Unresolved(Exception):
+    """A member's return value cannot be determined without running code."""
+
+
+@dataclass
+class PluginManifestEntry:
+    """Everything discovery needs to know about one plugin package."""
+
+    name: str
+    module: str
+    class_name: str
+    plugin_dir: str
+    config: dict[str, Any] = field(default_factory=dict)
+    schema: dict[str, Any] | None = None
+    # None = not statically known, ask the plugin itself
+    version: str | None = None
+    description: str | None = None
+    category: str | None = None
+    role: str | None = None
+    dependencies: list[str] | None = None
+    optional_dependencies: list[str] | None = None
+    mtimes: dict[str, float] = field(default_factory=dict)
+
+
+def _file_mtimes(plugin_dir: Path) -> dict[str, float]:
+    mtimes = {}
+    for filename in WATCHED_FILES:
+        try:
+            mtimes[filename] = os.stat(plugin_dir / filename).st_mtime
+        except OSError:
+            continue
+    return mtimes
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _eval_static(node: ast.expr, config: dict[str, Any]) -> Any:
+    """Evaluate a ``return`` expression that only depends on literals/config."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_eval_static(elt, config) for elt in node.elts]
+    if (
+        isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Name)
+        and node.value.id in _ENUMS
+    ):
+        return _ENUMS[node.value.id][node.attr].value
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "get"
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+        and not node.keywords
+    ):
+        # self._plugin_config.get("plugin_name", "tushare_weekly")
+        default = _eval_static(node.args[1], config) if len(node.args) > 1 else None
+        return config.get(node.args[0].value, default)
+    raise _Unresolved(ast.dump(node)[:80])
+
+
+# BasePlugin's return values for members a direct subclass does not override
+_BASE_DEFAULTS = {
+    "version": "1.0.0",
+    "description": "",
+    "category": PluginCategory.CN_STOCK.value,
+    "role": PluginRole.PRIMARY.value,
+    "dependencies": [],
+    "optional_dependencies": [],
+}
+
+
+def _static_members(
+    class_node: ast.ClassDef, config: dict[str, Any]
+) -> dict[str, Any]:
+    direct_subclass = [ast.unparse(b) for b in class_node.bases] == ["BasePlugin"]
+    values = dict(_BASE_DEFAULTS) if direct_subclass else {}
+    for node in class_node.body:
+        if not isinstance(node, ast.FunctionDef) or node.name not in _STATIC_MEMBERS:
+            continue
+        key = _STATIC_MEMBERS[node.name]
+        values.pop(key, None)
+        returns = [
+            stmt for stmt in node.body if isinstance(stmt, ast.Return) and stmt.value
+        ]
+        if len(returns) != 1:
+            continue
+        try:
+            values[key] = _eval_static(returns[0].value, config)
+        except (_Unresolved, KeyError):
+            continue
+    return values
+
+
+def _find_plugin_class(tree: ast.Module) -> ast.ClassDef | None:
+    """The class in plugin.py that defines ``name`` and ``extract_data``."""
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or not node.bases:
+            continue
+        methods = {n.name for n in node.body if isinstance(n, ast.FunctionDef)}
+        if {"name", "extract_data"} <= methods:
+            return node
+    return None
+
+
+def scan_plugin_dir(package_path: str, plugin_dir: Path) -> PluginManifestEntry | None:
+    """Build a manifest entry without importing the plugin.
+
+    Returns None when the plugin name cannot be determined statically; such
+    packages are imported eagerly by the plugin manager instead.
+    """
+    plugin_file = plugin_dir / "plugin.py"
+    if not plugin_file.exists():
+        return None
+    config = _read_json(plugin_dir / "config.json") or {}
+    schema = _read_json(plugin_dir / "schema.json")
+
+    tree = ast.parse(plugin_file.read_text(encoding="utf-8"), str(plugin_file))
+    class_node = _find_plugin_class(tree)
+    if class_node is None:
+        return None
+    values = _static_members(class_node, config)
+    name = values.pop("name", None)
+    if not isinstance(name, str) or not name:
+        return None
+
+    return PluginManifestEntry(
+        name=name,
+        module=f"{package_path}.{plugin_dir.name}",
+        class_name=class_node.name,
+        plugin_dir=str(plugin_dir),
+        config=config,
+        schema=schema,
+        mtimes=_file_mtimes(plugin_dir),
+        **values,
+    )
+
+
+class PluginManifest:
+    """mtime-validated, JSON-cached manifest of a plugin package."""
+
+    def __init__(self, cache_path: Path | None = None):
+        self.cache_path = Path(cache_path) if cache_path else None
+
+    def _read_cache(self, package_path: str) -> dict[str, dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable plugin manifest {self.cache_path}: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("package") != package_path:
+            return {}
+        return data.get("plugins", {})
+
+    def _write_cache(self, package_path: str, plugins: dict[str, dict[str, Any]]) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": MANIFEST_VERSION, "package": package_path, "plugins": plugins},
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to write plugin manifest {self.cache_path}: {e}")
+
+    def load(
+        self, package_path: str, package_dir: Path, module_names: list[str]
+    ) -> tuple[list[PluginManifestEntry], list[str]]:
+        """Manifest entries for ``module_names`` plus the names needing an import.
+
+        Cached entries are reused while the mtimes of their watched files are
+        unchanged; anything else is re-parsed and the cache rewritten.
+        """
+        cached = self._read_cache(package_path)
+        plugins: dict[str, dict[str, Any]] = {}
+        entries: list[PluginManifestEntry] = []
+        unresolved: list[str] = []
+        rescanned = 0
+
+        for module_name in module_names:
+            plugin_dir = package_dir / module_name
+            raw = cached.get(module_name)
+            if raw is not None and raw.get("mtimes") == _file_mtimes(plugin_dir):
+                entry = PluginManifestEntry(**raw) if raw.get("name") else None
+            else:
+                rescanned += 1
+                try:
+                    entry = scan_plugin_dir(package_path, plugin_dir)
+                except Exception as e:
+                    logger.warning(f"Failed to scan plugin {module_name}: {e}")
+                    entry = None
+            if entry is None:
+                unresolved.append(module_name)
+                plugins[module_name] = {"mtimes": _file_mtimes(plugin_dir)}
+            else:
+                entries.append(entry)
+                plugins[module_name] = asdict(entry)
+
+        if rescanned or set(cached) != set(plugins):
+            self._write_cache(package_path, plugins)
+        logger.debug(
+            f"Plugin manifest: {len(entries)} entries, {rescanned} rescanned, "
+            f"{len(unresolved)} need import"
+        )
+        return entries, unresolved
+
+
+class LazyPlugin:
+    """Manifest-backed stand-in that imports the real plugin on first use.
+
+    Metadata (name, schema, config, category, dependencies, schedule...) is
+    served from the manifest. Any other attribute loads the plugin through
+    ``loader`` and is forwarded to it.
+    """
+
+    # Config-derived BasePlugin behaviour works unchanged on the manifest config
+    is_enabled = BasePlugin.is_enabled
+    get_timeout = BasePlugin.get_timeout
+    get_retry_attempts = BasePlugin.get_retry_attempts
+    get_schedule = BasePlugin.get_schedule
+    get_sync_mode = BasePlugin.get_sync_mode
+    get_config_schema = BasePlugin.get_config_schema
+    should_run_today = BasePlugin.should_run_today
+
+    def __init__(self, entry: PluginManifestEntry, loader: Callable[[str], BasePlugin]):
+        self._entry = entry
+        self._loader = loader
+        self._plugin: BasePlugin | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> BasePlugin:
+        """Import and instantiate the real plugin (once)."""
+        if self._plugin is None:
+            with self._lock:
+                if self._plugin is None:
+                    self._plugin = self._loader(self._entry.name)
+        return self._plugin
+
+    @property
+    def loaded(self) -> bool:
+        return self._plugin is not None
+
+    def _static(self, attr: str):
+        value = getattr(self._entry, attr)
+        if value is None or self._plugin is not None:
+            return getattr(self.load(), attr)
+        return value
+
+    @property
+    def name(self) -> str:
+        return self._entry.name
+
+    @property
+    def version(self) -> str:
+        return self._static("version")
+
+    @property
+    def description(self) -> str:
+        return self._static("description")
+
+    @property
+    def api_rate_limit(self) -> int:
+        return self.load().api_rate_limit
+
+    def get_rate_limit(self) -> int:
+        # Reading api_rate_limit eagerly would import the plugin just to
+        # throw the value away when config.json already sets rate_limit.
+        config = self.get_config()
+        if "rate_limit" in config:
+            return config["rate_limit"]
+        return self.api_rate_limit
+
+    def get_config(self) -> dict[str, Any]:
+        if self._plugin is not None:
+            return self._plugin.get_config()
+        return self._entry.config
+
+    def get_schema(self) -> dict[str, Any]:
+        if self._entry.schema is None or self._plugin is not None:
+            return self.load().get_schema()
+        return self._entry.schema
+
+    def get_category(self) -> PluginCategory:
+        if self._entry.category is None or self._plugin is not None:
+            return self.load().get_category()
+        return PluginCategory(self._entry.category)
+
+    def get_role(self) -> PluginRole:
+        if self._entry.role is None or self._plugin is not None:
+            return self.load().get_role()
+        return PluginRole(self._entry.role)
+
+    def get_dependencies(self) -> list[str]:
+        if self._entry.dependencies is None or self._plugin is not None:
+            return self.load().get_dependencies()
+        return list(self._entry.dependencies)
+
+    def get_optional_dependencies(self) -> list[str]:
+        if self._entry.optional_dependencies is None or self._plugin is not None:
+            return self.load().get_optional_dependencies()
+        return list(self._entry.optional_dependencies)
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached for attributes LazyPlugin does not define itself
+        if attr.startswith("__") or attr in {"_entry", "_loader", "_plugin", "_lock"}:
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "lazy"
+        return f"<LazyPlugin {self._entry.name} ({state})>"
@@ -3,9 +3,12 @@
 Supports both A-share (SSE) and HK stock exchange calendars.
 """
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
 from datetime import date, datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from stock_datasource.utils.logger import logger
@@ -33,6 +36,29 @@ class InvalidDateError(TradeCalendarError):
     pass
 
 
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class CompiledCalendar:
+    """Trading days of one market as sorted day numbers (days since 1970-01-01).
+
+    Scalar lookups bisect a Python list; batch lookups use ``np.searchsorted``
+    on the same values. ISO strings are precomputed so results need no
+    ``strftime``.
+    """
+
+    def __init__(self, calendar_df: pd.DataFrame):
+        open_days = calendar_df.loc[calendar_df["is_open"] == 1, "cal_date"]
+        days = np.unique(open_days.values.astype("datetime64[D]"))
+        self.array: np.ndarray = days.astype(np.int64)
+        self.days: list[int] = self.array.tolist()
+        self.strings: list[str] = np.datetime_as_string(days, unit="D").tolist()
+        self.day_set: set[str] = set(self.strings)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
 class TradeCalendarService:
     """Global trade calendar service (Singleton pattern).
 
@@ -58,6 +84,7 @@ class TradeCalendarService:
     # HK calendar
     _hk_calendar_df: pd.DataFrame | None = None
     _hk_trading_days_set: set | None = None
+    _compiled: dict[str, CompiledCalendar] | None = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -121,11 +148,7 @@ class TradeCalendarService:
                 "cal_date", ascending=False
             )
 
-            # Build set of trading days for O(1) lookup
-            trading_days = self._calendar_df[self._calendar_df["is_open"] == 1][
-                "cal_date"
-            ]
-            self._trading_days_set = set(trading_days.dt.strftime("%Y-%m-%d").tolist())
+            self._compile(MARKET_CN)
 
             self.logger.info(
                 f"Loaded A-share trade calendar: {len(self._calendar_df)} total days, "
@@ -159,6 +182,7 @@ class TradeCalendarService:
                     )
                     self._hk_calendar_df = None
                     self._hk_trading_days_set = None
+                    self._get_compiled_map().pop(MARKET_HK, None)
             except Exception as e:
                 self.logger.error(
                     f"Failed to fetch HK trade calendar from TuShare API: {e}. "
@@ -166,10 +190,12 @@ class TradeCalendarService:
                 )
                 self._hk_calendar_df = None
                 self._hk_trading_days_set = None
+                self._get_compiled_map().pop(MARKET_HK, None)
         except Exception as e:
             self.logger.error(f"Failed to load HK trade calendar: {e}")
             self._hk_calendar_df = None
             self._hk_trading_days_set = None
+            self._get_compiled_map().pop(MARKET_HK, None)
 
     def _load_hk_calendar_from_csv(self, hk_path: Path):
         """Load HK calendar data from a CSV file path."""
@@ -184,10 +210,7 @@ class TradeCalendarService:
             "cal_date", ascending=False
         )
 
-        trading_days = self._hk_calendar_df[self._hk_calendar_df["is_open"] == 1][
-            "cal_date"
-        ]
-        self._hk_trading_days_set = set(trading_days.dt.strftime("%Y-%m-%d").tolist())
+        self._compile(MARKET_HK)
 
         self.logger.info(
             f"Loaded HK trade calendar: {len(self._hk_calendar_df)} total days, "
@@ -200,6 +223,45 @@ class TradeCalendarService:
             return self._hk_calendar_df
         return self._calendar_df
 
+    def _get_compiled_map(self) -> dict[str, CompiledCalendar]:
+        if self._compiled is None:
+            self._compiled = {}
+        return self._compiled
+
+    def _compile(self, market: str) -> CompiledCalendar:
+        """Compile the loaded calendar of ``market`` into sorted arrays."""
+        compiled = CompiledCalendar(self._get_df(market))
+        self._get_compiled_map()[market] = compiled
+        if market == MARKET_HK:
+            self._hk_trading_days_set = compiled.day_set
+        else:
+            self._trading_days_set = compiled.day_set
+        return compiled
+
+    def _get_compiled(self, market: str = MARKET_CN) -> CompiledCalendar | None:
+        return self._get_compiled_map().get(market)
+
+    def _to_day(self, date_input: str | date | datetime) -> int:
+        """Day number (days since 1970-01-01) of a date input."""
+        if isinstance(date_input, datetime):
+            d = date_input.date()
+        elif isinstance(date_input, date):
+            d = date_input
+        elif isinstance(date_input, str) and len(date_input) == 10:
+            try:
+                d = date.fromisoformat(date_input)  # fast path for YYYY-MM-DD
+            except ValueError:
+                raise InvalidDateError(
+                    f"Invalid date format: {date_input}. Expected YYYY-MM-DD or YYYYMMDD"
+                )
+        else:
+            d = date.fromisoformat(self._normalize_date(date_input))
+        return d.toordinal() - _EPOCH_ORDINAL
+
+    def _to_days(self, dates: Iterable[str | date | datetime]) -> np.ndarray:
+        """Day numbers of an iterable of date inputs."""
+        return np.fromiter((self._to_day(d) for d in dates), dtype=np.int64)
+
     def _get_trading_set(self, market: str = MARKET_CN) -> set | None:
         """Get the trading days set for the given market."""
         if market == MARKET_HK:
@@ -251,23 +313,15 @@ class TradeCalendarService:
         Returns:
             List of trading dates in YYYY-MM-DD format, sorted descending (most recent first)
         """
-        df = self._get_df(market)
-        if df is None:
+        cal = self._get_compiled(market)
+        if cal is None:
             self.logger.warning("Calendar not loaded")
             return []
 
         try:
-            if end_date is None:
-                end_ts = pd.Timestamp.now().normalize()
-            else:
-                end_str = self._normalize_date(end_date)
-                end_ts = pd.Timestamp(end_str)
-
-            # Filter trading days up to end_date
-            mask = (df["is_open"] == 1) & (df["cal_date"] <= end_ts)
-            trading_days = df[mask].head(n)["cal_date"]
-
-            return [d.strftime("%Y-%m-%d") for d in trading_days]
+            end = self._to_day(date.today() if end_date is None else end_date)
+            hi = bisect_right(cal.days, end)
+            return cal.strings[max(hi - n, 0) : hi][::-1]
 
         except Exception as e:
             self.logger.error(f"Failed to get trading days: {e}")
@@ -307,27 +361,7 @@ class TradeCalendarService:
         Returns:
             Previous trading day in YYYY-MM-DD format, or None if not found
         """
-        df = self._get_df(market)
-        if df is None:
-            return None
-
-        try:
-            date_str = self._normalize_date(date_input)
-            date_ts = pd.Timestamp(date_str)
-
-            # Find trading days before this date
-            mask = (df["is_open"] == 1) & (df["cal_date"] < date_ts)
-            prev_days = df[mask]
-
-            if prev_days.empty:
-                return None
-
-            # Get the most recent one (already sorted descending)
-            return prev_days.iloc[0]["cal_date"].strftime("%Y-%m-%d")
-
-        except Exception as e:
-            self.logger.error(f"Failed to get previous trading day: {e}")
-            return None
+        return self.get_trading_day_offset(date_input, -1, market=market)
 
     def get_next_trading_day(
         self, date_input: str | date | datetime, market: str = MARKET_CN
@@ -341,27 +375,7 @@ class TradeCalendarService:
         Returns:
             Next trading day in YYYY-MM-DD format, or None if not found
         """
-        df = self._get_df(market)
-        if df is None:
-            return None
-
-        try:
-            date_str = self._normalize_date(date_input)
-            date_ts = pd.Timestamp(date_str)
-
-            # Find trading days after this date
-            mask = (df["is_open"] == 1) & (df["cal_date"] > date_ts)
-            next_days = df[mask]
-
-            if next_days.empty:
-                return None
-
-            # Get the earliest one (data is sorted descending, so get last)
-            return next_days.iloc[-1]["cal_date"].strftime("%Y-%m-%d")
-
-        except Exception as e:
-            self.logger.error(f"Failed to get next trading day: {e}")
-            return None
+        return self.get_trading_day_offset(date_input, 1, market=market)
 
     def get_trading_days_between(
         self,
@@ -379,30 +393,47 @@ class TradeCalendarService:
         Returns:
             List of trading dates in YYYY-MM-DD format, sorted ascending
         """
-        df = self._get_df(market)
-        if df is None:
+        cal = self._get_compiled(market)
+        if cal is None:
             return []
 
         try:
-            start_str = self._normalize_date(start_date)
-            end_str = self._normalize_date(end_date)
+            lo = bisect_left(cal.days, self._to_day(start_date))
+            hi = bisect_right(cal.days, self._to_day(end_date))
+            return cal.strings[lo:hi]
 
-            start_ts = pd.Timestamp(start_str)
-            end_ts = pd.Timestamp(end_str)
+        except Exception as e:
+            self.logger.error(f"Failed to get trading days between dates: {e}")
+            return []
 
-            # Filter trading days within range
-            mask = (
-                (df["is_open"] == 1)
-                & (df["cal_date"] >= start_ts)
-                & (df["cal_date"] <= end_ts)
-            )
-            trading_days = df[mask]["cal_date"].sort_values()
+    def count_trading_days_between(
+        self,
+        start_date: str | date | datetime,
+        end_date: str | date | datetime,
+        market: str = MARKET_CN,
+    ) -> int:
+        """Count trading days between two dates (inclusive).
+
+        Args:
+            start_date: Start date
+            end_date: End date
+            market: Market type - 'cn' for A-share (default), 'hk' for HK stock
 
-            return [d.strftime("%Y-%m-%d") for d in trading_days]
+        Returns:
+            Number of trading days (0 if the calendar is not loaded)
+        """
+        cal = self._get_compiled(market)
+        if cal is None:
+            return 0
+
+        try:
+            lo = bisect_left(cal.days, self._to_day(start_date))
+            hi = bisect_right(cal.days, self._to_day(end_date))
+            return max(hi - lo, 0)
 
         except Exception as e:
-            self.logger.error(f"Failed to get trading days between dates: {e}")
-            return []
+            self.logger.error(f"Failed to count trading days between dates: {e}")
+            return 0
 
     def get_trading_day_offset(
         self, date_input: str | date | datetime, offset: int, market: str = MARKET_CN
@@ -417,45 +448,79 @@ class TradeCalendarService:
         Returns:
             Trading day in YYYY-MM-DD format, or None if not found
         """
-        df = self._get_df(market)
-        if df is None:
+        cal = self._get_compiled(market)
+        if cal is None:
             return None
 
         try:
-            date_str = self._normalize_date(date_input)
-            date_ts = pd.Timestamp(date_str)
-
-            if offset == 0:
-                # Return the same day if it's a trading day, otherwise the previous
-                if self.is_trading_day(date_str, market=market):
-                    return date_str
-                return self.get_prev_trading_day(date_str, market=market)
-
-            elif offset > 0:
-                # Get future trading days
-                mask = (df["is_open"] == 1) & (df["cal_date"] > date_ts)
-                future_days = df[mask].sort_values("cal_date")
-
-                if len(future_days) >= offset:
-                    return future_days.iloc[offset - 1]["cal_date"].strftime("%Y-%m-%d")
-                return None
-
-            else:  # offset < 0
-                # Get past trading days
-                mask = (df["is_open"] == 1) & (df["cal_date"] < date_ts)
-                past_days = df[mask]  # Already sorted descending
-
-                abs_offset = abs(offset)
-                if len(past_days) >= abs_offset:
-                    return past_days.iloc[abs_offset - 1]["cal_date"].strftime(
-                        "%Y-%m-%d"
-                    )
-                return None
+            day = self._to_day(date_input)
+            if offset >= 0:
+                # offset 0: the same day if it's a trading day, otherwise the previous
+                idx = bisect_right(cal.days, day) + offset - 1
+            else:
+                idx = bisect_left(cal.days, day) + offset
+            if 0 <= idx < len(cal.days):
+                return cal.strings[idx]
+            return None
 
         except Exception as e:
             self.logger.error(f"Failed to get trading day with offset: {e}")
             return None
 
+    # ------------------------------------------------------------------
+    # Batch (vectorized) variants
+    # ------------------------------------------------------------------
+
+    def is_trading_days(
+        self, dates: Iterable[str | date | datetime], market: str = MARKET_CN
+    ) -> np.ndarray:
+        """Vectorized ``is_trading_day``.
+
+        Returns:
+            Boolean array aligned with ``dates`` (all False if not loaded)
+        """
+        days = self._to_days(dates)
+        cal = self._get_compiled(market)
+        if cal is None or not len(cal):
+            return np.zeros(len(days), dtype=bool)
+        idx = np.searchsorted(cal.array, days)
+        return cal.array[np.minimum(idx, len(cal) - 1)] == days
+
+    def get_trading_day_offsets(
+        self,
+        dates: Iterable[str | date | datetime],
+        offset: int,
+        market: str = MARKET_CN,
+    ) -> list[str | None]:
+        """Vectorized ``get_trading_day_offset`` (same offset for every date)."""
+        days = self._to_days(dates)
+        cal = self._get_compiled(market)
+        if cal is None:
+            return [None] * len(days)
+        if offset >= 0:
+            idx = np.searchsorted(cal.array, days, side="right") + offset - 1
+        else:
+            idx = np.searchsorted(cal.array, days, side="left") + offset
+        valid = (idx >= 0) & (idx < len(cal))
+        strings = cal.strings
+        return [strings[i] if ok else None for i, ok in zip(idx.tolist(), valid.tolist())]
+
+    def count_trading_days_between_batch(
+        self,
+        start_dates: Iterable[str | date | datetime],
+        end_dates: Iterable[str | date | datetime],
+        market: str = MARKET_CN,
+    ) -> np.ndarray:
+        """Vectorized ``count_trading_days_between`` over aligned date pairs."""
+        starts = self._to_days(start_dates)
+        ends = self._to_days(end_dates)
+        cal = self._get_compiled(market)
+        if cal is None:
+            return np.zeros(len(starts), dtype=np.int64)
+        lo = np.searchsorted(cal.array, starts, side="left")
+        hi = np.searchsorted(cal.array, ends, side="right")
+        return np.maximum(hi - lo, 0)
+
     def refresh_calendar(self, market: str = MARKET_CN) -> bool:
         """Refresh trade calendar from TuShare API.
 
@@ -531,8 +596,7 @@ class TradeCalendarService:
 
         # Reload into memory
         self._calendar_df = df
-        trading_days = df[df["is_open"] == 1]["cal_date"]
-        self._trading_days_set = set(trading_days.dt.strftime("%Y-%m-%d").tolist())
+        self._compile(MARKET_CN)
 
         self.logger.info(
             f"Refreshed A-share trade calendar: {len(df)} total days, "
@@ -580,8 +644,7 @@ class TradeCalendarService:
 
         # Reload into memory
         self._hk_calendar_df = df
-        trading_days = df[df["is_open"] == 1]["cal_date"]
-        self._hk_trading_days_set = set(trading_days.dt.strftime("%Y-%m-%d").tolist())
+        self._compile(MARKET_HK)
 
         self.logger.info(
             f"Refreshed HK trade calendar: {len(df)} total days, "
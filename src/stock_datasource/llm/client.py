@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import os
+import time
 from collections.abc import AsyncGenerator
 from typing import Any
 
@@ -12,6 +13,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from .base import BaseLLMClient
+from .metrics import record_llm_call, usage_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -205,6 +207,7 @@ class OpenAIClient(BaseLLMClient):
             trace, "chat_completion", self.model, messages
         )
 
+        start = time.perf_counter()
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
@@ -213,6 +216,13 @@ class OpenAIClient(BaseLLMClient):
                 max_tokens=max_tokens,
             )
             result = response.choices[0].message.content
+            record_llm_call(
+                "generate",
+                self.model,
+                "ok",
+                time.perf_counter() - start,
+                *usage_tokens(response.usage),
+            )
 
             # Update Langfuse generation
             if generation:
@@ -236,6 +246,8 @@ class OpenAIClient(BaseLLMClient):
 
             return result
         except Exception as e:
+            elapsed = time.perf_counter() - start
+            record_llm_call("generate", self.model, "error", elapsed)
             logger.error(f"OpenAI API error: {e}")
             if generation:
                 try:
@@ -274,6 +286,7 @@ class OpenAIClient(BaseLLMClient):
         )
 
         full_response = ""
+        start = time.perf_counter()
         try:
             stream = await self.client.chat.completions.create(
                 model=self.model,
@@ -287,6 +300,7 @@ class OpenAIClient(BaseLLMClient):
                     content = chunk.choices[0].delta.content
                     full_response += content
                     yield content
+            record_llm_call("stream", self.model, "ok", time.perf_counter() - start)
 
             # Update Langfuse generation
             if generation:
@@ -296,6 +310,7 @@ class OpenAIClient(BaseLLMClient):
                     logger.debug(f"Failed to end Langfuse generation: {e}")
 
         except Exception as e:
+            record_llm_call("stream", self.model, "error", time.perf_counter() - start)
             logger.error(f"OpenAI streaming error: {e}")
             if generation:
                 try:
@@ -327,6 +342,7 @@ class OpenAIClient(BaseLLMClient):
             trace, "chat_completion", self.model, messages
         )
 
+        start = time.perf_counter()
         try:
             kwargs = {
                 "model": self.model,
@@ -354,6 +370,13 @@ class OpenAIClient(BaseLLMClient):
                 response = await self.client.chat.completions.create(**kwargs)
 
             message = response.choices[0].message
+            record_llm_call(
+                "chat",
+                self.model,
+                "ok",
+                time.perf_counter() - start,
+                *usage_tokens(response.usage),
+            )
 
             result = {"role": "assistant", "content": message.content}
             if hasattr(message, "tool_calls") and message.tool_calls:
@@ -391,6 +414,7 @@ class OpenAIClient(BaseLLMClient):
 
             return result
         except Exception as e:
+            record_llm_call("chat", self.model, "error", time.perf_counter() - start)
             logger.error(f"OpenAI chat error: {e}")
             if generation:
                 try:
@@ -0,0 +1,95 @@
+"""LLM call metrics: request counts, latency and token usage.
+
+``OpenAIClient`` records its calls directly; LangChain models used by the
+agents get :class:`LLMMetricsCallback` as a constructor callback so every
+invocation is counted without touching each agent.
+"""
+
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from stock_datasource.utils.metrics import registry as metrics_registry
+
+_LLM_REQUESTS = metrics_registry.counter(
+    "llm_requests_total", "LLM calls by caller, model and status",
+    ("source", "model", "status"),
+)
+_LLM_SECONDS = metrics_registry.histogram(
+    "llm_request_seconds", "LLM call latency", ("source", "model")
+)
+_LLM_TOKENS = metrics_registry.counter(
+    "llm_tokens_total", "LLM tokens by caller, model and kind (prompt/completion)",
+    ("source", "model", "kind"),
+)
+
+
+def record_llm_call(
+    source: str,
+    model: str,
+    status: str,
+    seconds: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> None:
+    """Record one finished LLM call."""
+    _LLM_REQUESTS.inc(source=source, model=model, status=status)
+    _LLM_SECONDS.observe(seconds, source=source, model=model)
+    if prompt_tokens:
+        _LLM_TOKENS.inc(prompt_tokens, source=source, model=model, kind="prompt")
+    if completion_tokens:
+        _LLM_TOKENS.inc(
+            completion_tokens, source=source, model=model, kind="completion"
+        )
+
+
+def usage_tokens(usage: Any) -> tuple[int, int]:
+    """(prompt, completion) tokens from an OpenAI ``usage`` object or dict."""
+    if not usage:
+        return 0, 0
+    if isinstance(usage, dict):
+        prompt = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+        completion = usage.get("completion_tokens", usage.get("output_tokens", 0))
+    else:
+        prompt = getattr(usage, "prompt_tokens", 0)
+        completion = getattr(usage, "completion_tokens", 0)
+    return int(prompt or 0), int(completion or 0)
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LangChain callback that records each model call in the metrics registry."""
+
+    def __init__(self, model: str, source: str = "agent"):
+        self.model = model
+        self.source = source
+        self._started: dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        usage = (response.llm_output or {}).get("token_usage")
+        if not usage:
+            # Streaming responses carry usage on the message instead
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) or usage
+        self._finish(run_id, "ok", *usage_tokens(usage))
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id, "error")
+
+    def _finish(
+        self, run_id: UUID, status: str, prompt: int = 0, completion: int = 0
+    ) -> None:
+        start = self._started.pop(run_id, None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        record_llm_call(self.source, self.model, status, elapsed, prompt, completion)
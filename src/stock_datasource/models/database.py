@@ -1,10 +1,12 @@
 """Database connection and operations for ClickHouse."""
 
+import functools
 import logging
 import threading
+import time
 import io
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterator, NamedTuple
 from datetime import datetime, date
 import pandas as pd
 from clickhouse_driver import Client
@@ -15,6 +17,68 @@ from stock_datasource.config.settings import settings
 logger = logging.getLogger(__name__)
 
 
+class _Instruments(NamedTuple):
+    queries_total: Any
+    query_seconds: Any
+    profiler: Any
+    current_query: Callable[[], Any]
+
+
+@functools.lru_cache(maxsize=None)
+def _instruments() -> _Instruments:
+    """Metrics and profiler hooks for the query methods.
+
+    Imported on first use: the ``stock_datasource.utils`` package imports
+    this module from its ``__init__``, so a module-level import would be
+    circular.
+    """
+    from stock_datasource.utils.metrics import registry
+    from stock_datasource.utils.query_profiler import current_query, query_profiler
+
+    return _Instruments(
+        queries_total=registry.counter(
+            "clickhouse_queries_total", "ClickHouse queries by client method and outcome",
+            ("method", "status"),
+        ),
+        query_seconds=registry.histogram(
+            "clickhouse_query_duration_seconds", "ClickHouse query latency including retries",
+            ("method",),
+        ),
+        profiler=query_profiler,
+        current_query=current_query,
+    )
+
+
+def _current_query():
+    return _instruments().current_query()
+
+
+def _instrumented(method_name: str):
+    """Record count, outcome and latency of a ClickHouseClient query method.
+
+    When the query profiler is enabled the call is also profiled; the
+    transports pick up its ``query_id`` via ``current_query()``.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, query, *args, **kwargs):
+            instruments = _instruments()
+            start = time.perf_counter()
+            status = "error"
+            try:
+                with instruments.profiler.profile(self.name, method_name, query):
+                    result = func(self, query, *args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                instruments.query_seconds.observe(
+                    time.perf_counter() - start, method=method_name
+                )
+                instruments.queries_total.inc(method=method_name, status=status)
+        return wrapper
+    return decorator
+
+
 def _to_clickhouse_literal(value: Any) -> str:
     """Serialize a Python value into a safe ClickHouse SQL literal."""
     if value is None:
@@ -91,6 +155,9 @@ class ClickHouseHttpClient:
                 raise ValueError(f"Unbound ClickHouse parameters in HTTP query: {unreplaced}")
         
         req_params = {"database": self.database}
+        record = _current_query()
+        if record is not None:
+            req_params["query_id"] = record.new_attempt()
         
         if data:
             req_params["query"] = query
@@ -106,6 +173,8 @@ class ClickHouseHttpClient:
                 f"url={resp.url}, body={resp.text[:300]}"
             )
         resp.raise_for_status()
+        if record is not None:
+            record.update_from_http(resp.headers.get("X-ClickHouse-Summary"))
         return resp.text.strip()
     
     def execute(self, query: str, params: Optional[Dict] = None) -> List[tuple]:
@@ -325,6 +394,33 @@ class ClickHouseHttpClient:
         result = self._request(query, params={"database": self.database, "table_name": table_name})
         return int(result.strip()) > 0 if result else False
     
+    def stream(self, query: str, settings: Optional[Dict[str, Any]] = None,
+               timeout: float = 300, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+        """Stream the raw response of a query that carries its own FORMAT clause.
+
+        A dedicated session is used so a long export neither holds ``_lock``
+        nor buffers the response; ClickHouse ``settings`` go as URL params.
+        """
+        import requests as _requests
+        req_params = {"database": self.database, **(settings or {})}
+        with _requests.Session() as session:
+            session.trust_env = False
+            if self._auth:
+                session.auth = self._auth
+            with session.post(self._base_url, params=req_params, data=query.encode('utf-8'),
+                              headers={'Content-Type': 'text/plain; charset=utf-8'},
+                              stream=True, timeout=(10, timeout)) as resp:
+                if resp.status_code != 200:
+                    body = resp.text[:300]
+                    logger.error(
+                        f"ClickHouse HTTP stream error [{self.name}]: status={resp.status_code}, "
+                        f"body={body}"
+                    )
+                    raise _requests.HTTPError(f"{resp.status_code}: {body}", response=resp)
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        yield chunk
+
     def close(self):
         """Close connection (no-op for HTTP)."""
         logger.info(f"ClickHouse HTTP connection closed [{self.name}]")
@@ -486,6 +582,27 @@ class ClickHouseClient:
             logger.warning(f"Failed to auto-create table {table_name} [{self.name}]: {e}")
         return False
 
+    def _tcp_execute(self, query: str, params: Optional[Dict] = None) -> Any:
+        """Run ``query`` over TCP, tagged and measured when it is being profiled."""
+        record = _current_query()
+        if record is None:
+            return self.client.execute(query, params)
+        result = self.client.execute(query, params, query_id=record.new_attempt())
+        record.update_from_tcp(getattr(self.client, "last_query", None))
+        return result
+
+    def _tcp_query_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+        """``query_dataframe`` counterpart of ``_tcp_execute``."""
+        record = _current_query()
+        if record is None:
+            return self.client.query_dataframe(query, params)
+        result = self.client.query_dataframe(
+            query, params, query_id=record.new_attempt()
+        )
+        record.update_from_tcp(getattr(self.client, "last_query", None))
+        return result
+
+    @_instrumented("execute")
     @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=0.5, min=1, max=3))
     def execute(self, query: str, params: Optional[Dict] = None) -> Any:
         """Execute a query with retry logic and auto-reconnect on transport errors.
@@ -501,7 +618,7 @@ class ClickHouseClient:
                 return self._http_client.execute(query, params)
             
             try:
-                return self.client.execute(query, params)
+                return self._tcp_execute(query, params)
             except Exception as e:
                 # Auto-create table on UNKNOWN_TABLE and retry once (TCP path)
                 error_msg = str(e)
@@ -513,7 +630,7 @@ class ClickHouseClient:
                         table_name = match.group(1)
                         if self._try_auto_create_table(table_name):
                             try:
-                                return self.client.execute(query, params)
+                                return self._tcp_execute(query, params)
                             except Exception:
                                 pass  # Retry failed, fall through to original error
                 
@@ -523,10 +640,11 @@ class ClickHouseClient:
                     # After reconnect, check if we switched to HTTP
                     if self._use_http and self._http_client:
                         return self._http_client.execute(query, params)
-                    return self.client.execute(query, params)
+                    return self._tcp_execute(query, params)
                 logger.error(f"Query execution failed [{self.name}]: {e}")
                 raise
     
+    @_instrumented("execute_query")
     @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=0.5, min=1, max=3))
     def execute_query(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
         """Execute query and return results as DataFrame with auto-reconnect on transport errors."""
@@ -538,7 +656,7 @@ class ClickHouseClient:
                 return self._http_client.execute_query(query, params)
             
             try:
-                result = self.client.query_dataframe(query, params)
+                result = self._tcp_query_dataframe(query, params)
                 return result
             except Exception as e:
                 if "No columns to parse from file" in str(e):
@@ -552,7 +670,7 @@ class ClickHouseClient:
                     # After reconnect, check if we switched to HTTP
                     if self._use_http and self._http_client:
                         return self._http_client.execute_query(query, params)
-                    return self.client.query_dataframe(query, params)
+                    return self._tcp_query_dataframe(query, params)
                 logger.error(f"Query execution failed [{self.name}]: {e}")
                 raise
     
@@ -651,25 +769,45 @@ class ClickHouseClient:
         query = """
         SELECT 
             partition,
+            any(partition_id) as partition_id,
+            count() as parts,
             sum(rows) as rows,
             sum(bytes_on_disk) as bytes_on_disk
         FROM system.parts
         WHERE database = %(database)s
         AND table = %(table_name)s
+        AND active
         GROUP BY partition
         ORDER BY partition
         """
         result = self.execute_query(query, params={"database": self.database, "table_name": table_name})
         return result.to_dict('records')
     
-    def optimize_table(self, table_name: str, final: bool = True) -> None:
-        """Optimize table."""
+    def optimize_table(self, table_name: str, final: bool = True,
+                       partition_id: Optional[str] = None) -> None:
+        """Optimize table (or a single partition by its partition_id)."""
         query = f"OPTIMIZE TABLE {table_name}"
+        if partition_id is not None:
+            query += f" PARTITION ID '{partition_id}'"
         if final:
             query += " FINAL"
         self.execute(query)
         logger.info(f"Optimized table {table_name} [{self.name}]")
     
+    def stream(self, query: str, settings: Optional[Dict[str, Any]] = None,
+               timeout: float = 300) -> Iterator[bytes]:
+        """Stream raw query output over HTTP, also when TCP is the active transport."""
+        if self._http_client is None:
+            self._http_client = ClickHouseHttpClient(
+                host=self.host,
+                port=self.http_port,
+                user=self.user,
+                password=self.password,
+                database=self.database,
+                name=f"{self.name}-http"
+            )
+        return self._http_client.stream(query, settings=settings, timeout=timeout)
+    
     def close(self):
         """Close database connection."""
         if self._http_client:
@@ -811,15 +949,21 @@ class DualWriteClient:
         """Get partition info from primary."""
         return self.primary.get_partition_info(table_name)
     
-    def optimize_table(self, table_name: str, final: bool = True) -> None:
+    def optimize_table(self, table_name: str, final: bool = True,
+                       partition_id: Optional[str] = None) -> None:
         """Optimize table on both primary and backup."""
-        self.primary.optimize_table(table_name, final)
+        self.primary.optimize_table(table_name, final, partition_id)
         if self.backup:
             try:
-                self.backup.optimize_table(table_name, final)
+                self.backup.optimize_table(table_name, final, partition_id)
             except Exception as e:
                 logger.warning(f"Failed to optimize table on backup: {e}")
     
+    def stream(self, query: str, settings: Optional[Dict[str, Any]] = None,
+               timeout: float = 300) -> Iterator[bytes]:
+        """Stream raw query output from primary."""
+        return self.primary.stream(query, settings=settings, timeout=timeout)
+    
     def close(self):
         """Close both connections."""
         self.primary.close()
@@ -313,7 +313,10 @@ def get_stock_matrix(force_rebuild: bool = False) -> dict[str, dict[str, Any]]:
 
 
 def invalidate_cache() -> None:
-    """Manually invalidate the stock matrix cache."""
+    """Manually invalidate the stock matrix cache (and the in-process universe)."""
+    from .universe import invalidate_universe
+
     cache = get_cache_service()
     cache.delete(CACHE_KEY)
+    invalidate_universe()
     logger.info("Stock matrix cache invalidated")
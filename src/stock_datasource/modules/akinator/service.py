@@ -9,6 +9,7 @@ import random
 import re
 import time
 import uuid
+from collections import Counter
 from typing import Any
 
 from stock_datasource.models.database import db_client
@@ -16,6 +17,13 @@ from stock_datasource.services.cache_service import get_cache_service
 
 from .attributes import get_stock_matrix
 from .schemas import Predicate, QAEntry, QuestionDTO, StockDTO
+from .universe import (
+    CandidateSet,
+    StockUniverse,
+    get_retained_universe,
+    get_stock_universe,
+    match_stock,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -140,37 +148,33 @@ def _distribution_summary(candidates: list[dict]) -> str:
 
     lines = []
     # Industry top 10
-    from collections import Counter
-
-    industries = Counter(c.get("industry") for c in candidates if c.get("industry"))
+    industries = _value_counts(candidates, "industry")
     top_inds = industries.most_common(10)
     if top_inds:
         ind_str = ", ".join(f"{ind}({cnt})" for ind, cnt in top_inds)
         lines.append(f"行业分布 (top10): {ind_str}")
 
     # Market distribution
-    markets = Counter(c.get("market") for c in candidates if c.get("market"))
+    markets = _value_counts(candidates, "market")
     if markets:
         mkt_str = ", ".join(f"{m}({c})" for m, c in markets.most_common())
         lines.append(f"板块分布: {mkt_str}")
 
     # Index membership
-    hs300 = sum(1 for c in candidates if c.get("in_hs300"))
-    sz50 = sum(1 for c in candidates if c.get("in_sz50"))
-    zz500 = sum(1 for c in candidates if c.get("in_zz500"))
+    hs300 = _count_matches(candidates, _pred("in_hs300", "equals", True))
+    sz50 = _count_matches(candidates, _pred("in_sz50", "equals", True))
+    zz500 = _count_matches(candidates, _pred("in_zz500", "equals", True))
     lines.append(f"指数: 沪深300 {hs300}, 上证50 {sz50}, 中证500 {zz500}")
 
     # Market cap tiers
-    large = sum(1 for c in candidates if (_num(c.get("total_mv")) or 0) >= 5_000_000 * 10000)  # >= 5000亿
-    mid = sum(1 for c in candidates if 1_000_000 * 10000 <= (_num(c.get("total_mv")) or 0) < 5_000_000 * 10000)
-    small = sum(1 for c in candidates if 0 < (_num(c.get("total_mv")) or 0) < 1_000_000 * 10000)
+    large = _count_matches(candidates, _pred("total_mv", "gte", 5_000_000 * 10000))  # >= 5000亿
+    over_1000 = _count_matches(candidates, _pred("total_mv", "gte", 1_000_000 * 10000))
+    mid = over_1000 - large
+    small = _count_matches(candidates, _pred("total_mv", "gt", 0)) - over_1000
     lines.append(f"市值: 大盘(>5000亿) {large}, 中盘(1000-5000亿) {mid}, 小盘(<1000亿) {small}")
 
     # Top concepts
-    all_concepts: Counter = Counter()
-    for c in candidates:
-        for concept in c.get("concepts") or []:
-            all_concepts[concept] += 1
+    all_concepts = _value_counts(candidates, "concepts")
     top_concepts = all_concepts.most_common(15)
     if top_concepts:
         cpt_str = ", ".join(f"{c}({cnt})" for c, cnt in top_concepts)
@@ -190,50 +194,44 @@ def _matches(stock: dict, predicate: Predicate | dict) -> bool:
         field, op, value = predicate.field, predicate.op, predicate.value
     else:
         field, op, value = predicate["field"], predicate["op"], predicate["value"]
+    return match_stock(stock, field, op, value)
 
-    v = stock.get(field)
-    if v is None:
-        return False
 
-    try:
-        if op == "contains":
-            if isinstance(v, list):
-                return any(str(value) in str(x) for x in v)
-            return str(value) in str(v)
-        if op == "equals":
-            return v == value
-        if op == "in_list":
-            if not isinstance(value, list):
-                return False
-            return v in value
-        if op == "startswith":
-            return str(v).startswith(str(value))
-        if op == "endswith":
-            return str(v).endswith(str(value))
-        if op in ("gt", "lt", "gte", "lte"):
-            v_num = float(v)
-            val_num = float(value)
-            return {
-                "gt": v_num > val_num,
-                "lt": v_num < val_num,
-                "gte": v_num >= val_num,
-                "lte": v_num <= val_num,
-            }[op]
-    except Exception as e:
-        logger.debug(f"Predicate eval failed: {e} (field={field}, value={value})")
-        return False
+def _pred(field: str, op: str, value: Any) -> dict:
+    return {"field": field, "op": op, "value": value}
 
-    return False
+
+def _count_matches(candidates: list[dict] | CandidateSet, predicate: Predicate | dict) -> int:
+    """Number of candidates matching predicate (a popcount for bitmap sets)."""
+    if isinstance(candidates, CandidateSet):
+        return candidates.count_matching(predicate)
+    return sum(1 for c in candidates if _matches(c, predicate))
+
+
+def _value_counts(candidates: list[dict] | CandidateSet, field: str) -> Counter:
+    """Per-value candidate counts of a categorical (or list) field."""
+    if isinstance(candidates, CandidateSet):
+        return Counter({v: n for v, n in candidates.value_counts(field).items() if v})
+    counts: Counter = Counter()
+    for c in candidates:
+        v = c.get(field)
+        if isinstance(v, list):
+            counts.update(v)
+        elif v:
+            counts[v] += 1
+    return counts
 
 
 def apply_predicate(
-    candidates: list[dict],
+    candidates: list[dict] | CandidateSet,
     predicate: Predicate | dict,
     answer: str,
-) -> list[dict]:
+) -> list[dict] | CandidateSet:
     """Filter candidates by predicate + user's yes/no answer."""
     if answer == "unknown":
         return candidates
+    if isinstance(candidates, CandidateSet):
+        return candidates.filter(predicate, answer)
     want_yes = answer == "yes"
     return [s for s in candidates if _matches(s, predicate) == want_yes]
 
@@ -415,11 +413,9 @@ def _build_prompt(
 
 def _heuristic_fallback_question(candidates: list[dict], asked_fields: set[str]) -> QuestionDTO:
     """Fallback when LLM fails — pick the most common industry not yet asked."""
-    from collections import Counter
-
     # Try industry split
     if "industry" not in asked_fields:
-        industries = Counter(c.get("industry") for c in candidates if c.get("industry"))
+        industries = _value_counts(candidates, "industry")
         if industries:
             top_ind, cnt = industries.most_common(1)[0]
             if 0 < cnt < len(candidates):
@@ -431,7 +427,7 @@ def _heuristic_fallback_question(candidates: list[dict], asked_fields: set[str])
 
     # Try index membership
     if "in_hs300" not in asked_fields:
-        in_hs300 = sum(1 for c in candidates if c.get("in_hs300"))
+        in_hs300 = _count_matches(candidates, _pred("in_hs300", "equals", True))
         if 0 < in_hs300 < len(candidates):
             return QuestionDTO(
                 question="这只股票是沪深300成分股吗？",
@@ -441,9 +437,7 @@ def _heuristic_fallback_question(candidates: list[dict], asked_fields: set[str])
 
     # Market cap
     if "total_mv" not in asked_fields:
-        large = sum(
-            1 for c in candidates if (_num(c.get("total_mv")) or 0) >= 1_000_000 * 10000
-        )
+        large = _count_matches(candidates, _pred("total_mv", "gte", 1_000_000 * 10000))
         if 0 < large < len(candidates):
             return QuestionDTO(
                 question="这只股票的市值超过1000亿吗？",
@@ -452,9 +446,7 @@ def _heuristic_fallback_question(candidates: list[dict], asked_fields: set[str])
             )
 
     # Last resort: ask about market (主板/创业板/科创板)
-    from collections import Counter
-
-    markets = Counter(c.get("market") for c in candidates if c.get("market"))
+    markets = _value_counts(candidates, "market")
     if markets and "market" not in asked_fields:
         top_market, _ = markets.most_common(1)[0]
         return QuestionDTO(
@@ -507,14 +499,14 @@ def _heuristic_balanced_question(
         key = (field, op, json.dumps(value, sort_keys=True, default=str))
         return key not in asked_predicates
 
-    def count(pred_fn) -> int:
-        return sum(1 for c in candidates if pred_fn(c))
+    def count(field: str, op: str, value) -> int:
+        return _count_matches(candidates, _pred(field, op, value))
 
     candidate_questions: list[tuple[float, QuestionDTO]] = []
 
     # 交易所
     if not_asked("ts_code", "endswith", ".SH"):
-        yes = count(lambda c: (c.get("ts_code") or "").endswith(".SH"))
+        yes = count("ts_code", "endswith", ".SH")
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -525,7 +517,7 @@ def _heuristic_balanced_question(
 
     # 创业板（300 开头）
     if not_asked("ts_code", "startswith", "300"):
-        yes = count(lambda c: (c.get("ts_code") or "").startswith("300"))
+        yes = count("ts_code", "startswith", "300")
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -536,7 +528,7 @@ def _heuristic_balanced_question(
 
     # 科创板（688 开头）
     if not_asked("ts_code", "startswith", "688"):
-        yes = count(lambda c: (c.get("ts_code") or "").startswith("688"))
+        yes = count("ts_code", "startswith", "688")
         s = _balance_score(yes, total)
         if s >= 0.25:
             candidate_questions.append((s, QuestionDTO(
@@ -547,7 +539,7 @@ def _heuristic_balanced_question(
 
     # 沪深300
     if not_asked("in_hs300", "equals", True):
-        yes = count(lambda c: bool(c.get("in_hs300")))
+        yes = count("in_hs300", "equals", True)
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -561,7 +553,7 @@ def _heuristic_balanced_question(
         threshold = yi * 10000  # 转 万元
         if not not_asked("total_mv", "gte", threshold):
             continue
-        yes = count(lambda c, t=threshold: (_num(c.get("total_mv")) or 0) >= t)
+        yes = count("total_mv", "gte", threshold)
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -572,7 +564,7 @@ def _heuristic_balanced_question(
 
     # 中证500
     if not_asked("in_zz500", "equals", True):
-        yes = count(lambda c: bool(c.get("in_zz500")))
+        yes = count("in_zz500", "equals", True)
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -583,7 +575,7 @@ def _heuristic_balanced_question(
 
     # 上市年限（2015-01-01 为界，约 10 年）
     if not_asked("list_date", "lt", "2015-01-01"):
-        yes = count(lambda c: (c.get("list_date") or "") < "2015-01-01")
+        yes = count("list_date", "lt", "2015-01-01")
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -594,7 +586,7 @@ def _heuristic_balanced_question(
 
     # 地域：江浙沪
     if not_asked("area", "in_list", ["上海", "江苏", "浙江"]):
-        yes = count(lambda c: (c.get("area") or "") in {"上海", "江苏", "浙江"})
+        yes = count("area", "in_list", ["上海", "江苏", "浙江"])
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -605,7 +597,7 @@ def _heuristic_balanced_question(
 
     # 盈利能力：ROE > 10%
     if not_asked("roe", "gte", 10):
-        yes = count(lambda c: (_num(c.get("roe")) or 0) >= 10)
+        yes = count("roe", "gte", 10)
         s = _balance_score(yes, total)
         if s >= 0.3:
             candidate_questions.append((s, QuestionDTO(
@@ -615,8 +607,7 @@ def _heuristic_balanced_question(
             )))
 
     # 行业 top-1
-    from collections import Counter as _C
-    inds = _C(c.get("industry") for c in candidates if c.get("industry"))
+    inds = _value_counts(candidates, "industry")
     if inds:
         top_ind, cnt = inds.most_common(1)[0]
         if not_asked("industry", "equals", top_ind):
@@ -706,7 +697,7 @@ async def pick_next_question(
                 continue
 
             # Sanity check the split
-            yes_count = sum(1 for c in candidates if _matches(c, predicate))
+            yes_count = _count_matches(candidates, predicate)
             no_count = len(candidates) - yes_count
             if yes_count == 0 or no_count == 0:
                 logger.info(
@@ -757,6 +748,47 @@ def _delete_session(session_id: str) -> None:
     cache.delete(_session_key(session_id))
 
 
+def _get_universe() -> StockUniverse:
+    universe = get_stock_universe(get_stock_matrix)
+    if universe is None:
+        raise RuntimeError("Stock matrix is empty")
+    return universe
+
+
+def _session_candidates(state: dict, universe: StockUniverse) -> CandidateSet:
+    """Decode a session's candidate bitmap against the current universe."""
+    bitmap = state.get("candidate_bitmap")
+    if bitmap is None:
+        # Sessions saved before candidate bitmaps
+        return universe.candidates(universe.mask_from_codes(state.get("candidate_codes", [])))
+
+    mask = StockUniverse.decode(bitmap)
+    version = state.get("universe_version")
+    if version == universe.version:
+        return universe.candidates(mask)
+
+    source = get_retained_universe(version)
+    if source is not None:
+        return universe.candidates(universe.translate(mask, source))
+
+    # Universe rebuilt elsewhere: replay the answers on the current one
+    candidates = universe.candidates()
+    for entry in state.get("history", []):
+        candidates = candidates.filter(entry["predicate"], entry["answer"])
+    return candidates
+
+
+def _store_candidates(state: dict, candidates: CandidateSet) -> None:
+    state["universe_version"] = candidates.universe.version
+    state["candidate_bitmap"] = StockUniverse.encode(candidates.mask)
+    state.pop("candidate_codes", None)
+
+
+def _by_market_cap(candidates: CandidateSet) -> list[dict]:
+    """Candidates sorted by market cap (most prominent first)."""
+    return sorted(candidates, key=lambda s: _num(s.get("total_mv")) or 0, reverse=True)
+
+
 def _stock_to_dto(stock: dict) -> StockDTO:
     return StockDTO(
         ts_code=stock.get("ts_code", ""),
@@ -779,23 +811,21 @@ async def start_session(user_id: str) -> dict:
     Returns dict with keys: session_id, question (QuestionDTO dict),
     question_count, candidates_remaining, tokens_used.
     """
-    matrix = get_stock_matrix()
-    if not matrix:
-        raise RuntimeError("Stock matrix is empty")
+    universe = _get_universe()
 
     session_id = str(uuid.uuid4())
-    candidates = list(matrix.values())
+    candidates = universe.candidates()
 
     question, tokens = await pick_next_question(candidates, [], user_id, session_id)
 
     state = {
         "user_id": user_id,
         "started_at": time.time(),
-        "candidate_codes": [s["ts_code"] for s in candidates],
         "history": [],
         "pending_question": question.model_dump(),
         "total_tokens": tokens,
     }
+    _store_candidates(state, candidates)
     _save_session(session_id, state)
 
     return {
@@ -820,8 +850,7 @@ async def answer_session(session_id: str, answer: str, user_id: str) -> dict:
     if not pending:
         raise RuntimeError("No pending question in session")
 
-    matrix = get_stock_matrix()
-    candidates = [matrix[code] for code in state["candidate_codes"] if code in matrix]
+    candidates = _session_candidates(state, _get_universe())
 
     predicate = Predicate(**pending["predicate"])
     new_candidates = apply_predicate(candidates, predicate, answer)
@@ -849,12 +878,10 @@ async def answer_session(session_id: str, answer: str, user_id: str) -> dict:
 
     # Termination check
     if len(new_candidates) <= FINISH_THRESHOLD or question_count >= MAX_QUESTIONS:
-        # Sort final candidates by market cap (most prominent first)
-        new_candidates.sort(key=lambda s: s.get("total_mv") or 0, reverse=True)
-        final = [_stock_to_dto(s) for s in new_candidates[:FINISH_THRESHOLD]]
+        final = [_stock_to_dto(s) for s in _by_market_cap(new_candidates)[:FINISH_THRESHOLD]]
 
         # Update state one last time (finished)
-        state["candidate_codes"] = [s["ts_code"] for s in new_candidates]
+        _store_candidates(state, new_candidates)
         state["history"] = [h.model_dump() for h in history]
         state["pending_question"] = None
         _save_session(session_id, state)
@@ -873,7 +900,7 @@ async def answer_session(session_id: str, answer: str, user_id: str) -> dict:
     # Generate next question
     question, tokens = await pick_next_question(new_candidates, history, user_id, session_id)
 
-    state["candidate_codes"] = [s["ts_code"] for s in new_candidates]
+    _store_candidates(state, new_candidates)
     state["history"] = [h.model_dump() for h in history]
     state["pending_question"] = question.model_dump()
     state["total_tokens"] = state.get("total_tokens", 0) + tokens
@@ -977,7 +1004,7 @@ async def pick_next_question_stream(
         return
 
     # Sanity check split
-    yes_count = sum(1 for c in candidates if _matches(c, predicate))
+    yes_count = _count_matches(candidates, predicate)
     if yes_count == 0 or yes_count == len(candidates):
         yield {"type": "error", "message": "LLM 问题切分为 0/全，已兜底"}
         return
@@ -1008,8 +1035,7 @@ async def answer_session_stream(session_id: str, answer: str, user_id: str):
     if not pending:
         raise RuntimeError("No pending question in session")
 
-    matrix = get_stock_matrix()
-    candidates = [matrix[code] for code in state["candidate_codes"] if code in matrix]
+    candidates = _session_candidates(state, _get_universe())
     predicate = Predicate(**pending["predicate"])
     new_candidates = apply_predicate(candidates, predicate, answer)
 
@@ -1041,10 +1067,12 @@ async def answer_session_stream(session_id: str, answer: str, user_id: str):
 
     # Termination
     if len(new_candidates) <= FINISH_THRESHOLD or question_count >= MAX_QUESTIONS:
-        new_candidates.sort(key=lambda s: _num(s.get("total_mv")) or 0, reverse=True)
-        final = [_stock_to_dto(s).model_dump() for s in new_candidates[:FINISH_THRESHOLD]]
+        final = [
+            _stock_to_dto(s).model_dump()
+            for s in _by_market_cap(new_candidates)[:FINISH_THRESHOLD]
+        ]
 
-        state["candidate_codes"] = [s["ts_code"] for s in new_candidates]
+        _store_candidates(state, new_candidates)
         state["history"] = [h.model_dump() for h in history]
         state["pending_question"] = None
         _save_session(session_id, state)
@@ -1089,7 +1117,7 @@ async def answer_session_stream(session_id: str, answer: str, user_id: str):
         question_dict = fallback.model_dump()
         yield {"type": "heuristic", "question": question_dict}
 
-    state["candidate_codes"] = [s["ts_code"] for s in new_candidates]
+    _store_candidates(state, new_candidates)
     state["history"] = [h.model_dump() for h in history]
     state["pending_question"] = question_dict
     _save_session(session_id, state)
@@ -1114,13 +1142,11 @@ def get_candidates(session_id: str, user_id: str) -> dict:
     if state["user_id"] != user_id:
         raise PermissionError("Session belongs to another user")
 
-    matrix = get_stock_matrix()
-    candidates = [matrix[code] for code in state["candidate_codes"] if code in matrix]
-    candidates.sort(key=lambda s: s.get("total_mv") or 0, reverse=True)
+    candidates = _session_candidates(state, _get_universe())
 
     return {
         "session_id": session_id,
-        "candidates": [_stock_to_dto(s) for s in candidates[:20]],
+        "candidates": [_stock_to_dto(s) for s in _by_market_cap(candidates)[:20]],
         "candidates_remaining": len(candidates),
         "question_count": len(state.get("history", [])),
     }
@@ -1133,6 +1159,9 @@ def _archive_session(session_id: str, final_status: str, guessed_ts_code: str =
         return
 
     try:
+        final_codes = [
+            s["ts_code"] for s in _by_market_cap(_session_candidates(state, _get_universe()))[:20]
+        ]
         db_client.execute(
             """
             INSERT INTO akinator_session
@@ -1151,9 +1180,7 @@ def _archive_session(session_id: str, final_status: str, guessed_ts_code: str =
                 "final_status": final_status,
                 "guessed_ts_code": guessed_ts_code,
                 "qa_log": json.dumps(state.get("history", []), ensure_ascii=False),
-                "candidates_final": json.dumps(
-                    state.get("candidate_codes", [])[:20], ensure_ascii=False
-                ),
+                "candidates_final": json.dumps(final_codes, ensure_ascii=False),
                 "total_tokens": state.get("total_tokens", 0),
             },
         )
@@ -0,0 +1,343 @@
+"""Process-resident candidate universe for the Akinator service.
+
+The stock matrix is loaded once per process into a ``StockUniverse``: stocks
+get a fixed bit position, and predicates are answered with Python ``int``
+bitsets. Coarse dimensions (exchange, board, index membership, market-cap
+tiers, listing age) are precomputed at build time; categorical fields
+(industry, market, area, province, concepts) get one bitset per value, so
+``equals`` / ``in_list`` / ``contains`` on them are unions of value bitsets.
+Anything else is evaluated once per universe and memoized.
+
+A session's candidate set is ``universe_version`` + a base64 bitmap; filtering
+is ``mask & pred`` / ``mask & ~pred`` and split counts are popcounts.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+UNIVERSE_TTL_SECONDS = 3600
+# Previous universes kept so bitmaps of in-flight sessions can be translated
+MAX_RETAINED_UNIVERSES = 2
+MAX_MEMOIZED_MASKS = 4096
+
+# Fields indexed by value (one bitset per distinct value)
+VALUE_INDEXED_FIELDS = ("industry", "market", "area", "province", "concepts")
+
+# (field, op, value) predicates precomputed at build time
+PRECOMPUTED_PREDICATES: tuple[tuple[str, str, Any], ...] = (
+    ("ts_code", "endswith", ".SH"),
+    ("ts_code", "endswith", ".SZ"),
+    ("ts_code", "endswith", ".BJ"),
+    ("ts_code", "startswith", "300"),
+    ("ts_code", "startswith", "688"),
+    ("in_hs300", "equals", True),
+    ("in_sz50", "equals", True),
+    ("in_zz500", "equals", True),
+    *(("total_mv", "gte", yi * 10000) for yi in (50, 100, 200, 500, 1000)),
+    ("total_mv", "gte", 1_000_000 * 10000),
+    ("total_mv", "gte", 5_000_000 * 10000),
+    ("list_date", "lt", "2015-01-01"),
+    ("roe", "gte", 10),
+)
+
+
+def _predicate_parts(predicate: Any) -> tuple[str, str, Any]:
+    if isinstance(predicate, dict):
+        return predicate["field"], predicate["op"], predicate["value"]
+    return predicate.field, predicate.op, predicate.value
+
+
+def predicate_key(field: str, op: str, value: Any) -> tuple[str, str, str]:
+    """Hashable key for a predicate (same form as the service's asked set)."""
+    return field, op, json.dumps(value, sort_keys=True, default=str)
+
+
+def match_stock(stock: dict, field: str, op: str, value: Any) -> bool:
+    """Evaluate one predicate against a stock attribute dict."""
+    v = stock.get(field)
+    if v is None:
+        return False
+
+    try:
+        if op == "contains":
+            if isinstance(v, list):
+                return any(str(value) in str(x) for x in v)
+            return str(value) in str(v)
+        if op == "equals":
+            return v == value
+        if op == "in_list":
+            if not isinstance(value, list):
+                return False
+            return v in value
+        if op == "startswith":
+            return str(v).startswith(str(value))
+        if op == "endswith":
+            return str(v).endswith(str(value))
+        if op in ("gt", "lt", "gte", "lte"):
+            try:
+                left, right = float(v), float(value)
+            except (TypeError, ValueError):
+                # ISO dates such as list_date compare as strings
+                if not (isinstance(v, str) and isinstance(value, str)):
+                    raise
+                left, right = v, value
+            return {
+                "gt": left > right,
+                "lt": left < right,
+                "gte": left >= right,
+                "lte": left <= right,
+            }[op]
+    except Exception as e:
+        logger.debug(f"Predicate eval failed: {e} (field={field}, value={value})")
+        return False
+
+    return False
+
+
+def _bits_from_flags(flags: list[bool]) -> int:
+    """Bitset with bit ``i`` set for every true ``flags[i]``."""
+    if not flags:
+        return 0
+    return int("".join("1" if f else "0" for f in reversed(flags)), 2)
+
+
+def _universe_version(codes: list[str]) -> str:
+    return hashlib.blake2b("\n".join(codes).encode(), digest_size=8).hexdigest()
+
+
+class StockUniverse:
+    """Columnar stock matrix with predicate bitsets."""
+
+    def __init__(self, matrix: dict[str, dict[str, Any]]):
+        self.codes: list[str] = list(matrix)
+        self.stocks: list[dict[str, Any]] = [matrix[c] for c in self.codes]
+        self.positions: dict[str, int] = {c: i for i, c in enumerate(self.codes)}
+        self.full: int = (1 << len(self.codes)) - 1
+        self.version: str = _universe_version(self.codes)
+        self.built_at: float = time.time()
+
+        self._value_masks: dict[str, dict[Any, int]] = {
+            field: self._index_values(field) for field in VALUE_INDEXED_FIELDS
+        }
+        self._masks: dict[tuple[str, str, str], int] = {}
+        for field, op, value in PRECOMPUTED_PREDICATES:
+            self.mask_for({"field": field, "op": op, "value": value})
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _index_values(self, field: str) -> dict[Any, int]:
+        positions: dict[Any, list[int]] = {}
+        for i, stock in enumerate(self.stocks):
+            v = stock.get(field)
+            if v is None:
+                continue
+            for item in v if isinstance(v, list) else (v,):
+                try:
+                    positions.setdefault(item, []).append(i)
+                except TypeError:  # unhashable scalar
+                    continue
+        masks = {}
+        for item, idxs in positions.items():
+            mask = 0
+            for i in idxs:
+                mask |= 1 << i
+            masks[item] = mask
+        return masks
+
+    def value_masks(self, field: str) -> dict[Any, int]:
+        """Per-value bitsets of a value-indexed field."""
+        return self._value_masks.get(field, {})
+
+    def _union(self, masks: dict[Any, int], keep: Callable[[Any], bool]) -> int:
+        result = 0
+        for item, mask in masks.items():
+            if keep(item):
+                result |= mask
+        return result
+
+    def _compute(self, field: str, op: str, value: Any) -> int:
+        masks = self._value_masks.get(field)
+        if masks is not None:
+            if op == "contains":
+                needle = str(value)
+                return self._union(masks, lambda item: needle in str(item))
+            if field != "concepts":
+                # list-valued concepts never equal a scalar; scan instead
+                if op == "equals":
+                    try:
+                        return masks.get(value, 0)
+                    except TypeError:
+                        return 0
+                if op == "in_list":
+                    if not isinstance(value, list):
+                        return 0
+                    return self._union(masks, lambda item: item in value)
+        return _bits_from_flags(
+            [match_stock(s, field, op, value) for s in self.stocks]
+        )
+
+    def mask_for(self, predicate: Any) -> int:
+        """Bitset of stocks matching ``predicate`` (Predicate or dict)."""
+        field, op, value = _predicate_parts(predicate)
+        key = predicate_key(field, op, value)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._compute(field, op, value)
+            if len(self._masks) < MAX_MEMOIZED_MASKS:
+                self._masks[key] = mask
+        return mask
+
+    def filter(self, mask: int, predicate: Any, answer: str) -> int:
+        """Narrow ``mask`` by a yes/no answer (``unknown`` keeps it)."""
+        if answer == "unknown":
+            return mask
+        pred = self.mask_for(predicate)
+        return mask & pred if answer == "yes" else mask & ~pred & self.full
+
+    def mask_from_codes(self, codes: list[str]) -> int:
+        mask = 0
+        for code in codes:
+            i = self.positions.get(code)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def indices(self, mask: int) -> list[int]:
+        bits = bin(mask)[:1:-1]
+        return [i for i, b in enumerate(bits) if b == "1"]
+
+    def codes_for(self, mask: int) -> list[str]:
+        return [self.codes[i] for i in self.indices(mask)]
+
+    def translate(self, mask: int, source: StockUniverse) -> int:
+        """Re-express a bitmap of ``source`` in this universe's positions."""
+        if source.version == self.version:
+            return mask
+        return self.mask_from_codes(source.codes_for(mask))
+
+    def candidates(self, mask: int | None = None) -> CandidateSet:
+        return CandidateSet(self, self.full if mask is None else mask)
+
+    @staticmethod
+    def encode(mask: int) -> str:
+        """Compact session representation of a bitmap."""
+        raw = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        return base64.b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def decode(text: str) -> int:
+        return int.from_bytes(base64.b64decode(text), "little")
+
+
+class CandidateSet(Sequence):
+    """A bitmap over a universe that reads like the list of candidate dicts.
+
+    Code written against ``list[dict]`` candidates (prompt building, LLM
+    sampling) keeps working; counting helpers use the bitmap directly.
+    """
+
+    def __init__(self, universe: StockUniverse, mask: int):
+        self.universe = universe
+        self.mask = mask
+        self._size = mask.bit_count()
+        self._stocks: list[dict] | None = None
+
+    def _materialize(self) -> list[dict]:
+        if self._stocks is None:
+            stocks = self.universe.stocks
+            self._stocks = [stocks[i] for i in self.universe.indices(self.mask)]
+        return self._stocks
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._materialize())
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def count_matching(self, predicate: Any) -> int:
+        """Number of candidates matching ``predicate``."""
+        return (self.mask & self.universe.mask_for(predicate)).bit_count()
+
+    def value_counts(self, field: str) -> dict[Any, int]:
+        """Candidate counts per value of a value-indexed field."""
+        counts = {}
+        for item, mask in self.universe.value_masks(field).items():
+            n = (self.mask & mask).bit_count()
+            if n:
+                counts[item] = n
+        return counts
+
+    def filter(self, predicate: Any, answer: str) -> CandidateSet:
+        return CandidateSet(self.universe, self.universe.filter(self.mask, predicate, answer))
+
+    def codes(self) -> list[str]:
+        return [s["ts_code"] for s in self._materialize()]
+
+
+_universes: OrderedDict[str, StockUniverse] = OrderedDict()
+_current: StockUniverse | None = None
+_lock = threading.Lock()
+
+
+def get_stock_universe(
+    loader: Callable[[], dict[str, dict[str, Any]]],
+    max_age: float = UNIVERSE_TTL_SECONDS,
+) -> StockUniverse | None:
+    """Get the process-wide universe, (re)building from ``loader`` when stale.
+
+    Returns None when the loader yields an empty matrix.
+    """
+    global _current
+    current = _current
+    if current is not None and time.time() - current.built_at < max_age:
+        return current
+
+    with _lock:
+        if _current is not None and time.time() - _current.built_at < max_age:
+            return _current
+        matrix = loader()
+        if not matrix:
+            return _current
+        t0 = time.time()
+        universe = StockUniverse(matrix)
+        _universes[universe.version] = universe
+        _universes.move_to_end(universe.version)
+        while len(_universes) > MAX_RETAINED_UNIVERSES:
+            _universes.popitem(last=False)
+        _current = universe
+        logger.info(
+            f"Akinator universe built: {len(universe)} stocks, "
+            f"{len(universe._masks)} predicate bitsets in {time.time() - t0:.2f}s"
+        )
+        return universe
+
+
+def get_retained_universe(version: str) -> StockUniverse | None:
+    """A recently built universe by version (for translating old bitmaps)."""
+    return _universes.get(version)
+
+
+def invalidate_universe() -> None:
+    """Drop the process-wide universe; the next access rebuilds it."""
+    global _current
+    with _lock:
+        _current = None
+        _universes.clear()
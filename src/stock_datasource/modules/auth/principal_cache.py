@@ -0,0 +1,210 @@
+"""In-process cache for authenticated principals.
+
+JWT users and MCP/Open API keys are looked up on every authenticated request
+with ``FINAL`` queries against ReplacingMergeTree tables. ``PrincipalCache``
+keeps recent lookups in memory for a short TTL (bounded LRU) so steady-state
+auth is a dict lookup; writers that change a user or key invalidate the
+entry explicitly.
+
+Invalidations also bump a generation counter in Redis. Every process polls
+it at most once per ``AUTH_CACHE_SYNC_INTERVAL`` seconds and drops its
+whole cache when it moved, so a key revoked or a role changed on one
+worker stops being honoured on the others without waiting for the TTL.
+Without Redis the TTL is the only bound.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from stock_datasource.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """Thread-safe, size-bounded TTL cache (LRU eviction).
+
+    ``name`` enables cross-process invalidation through Redis; unnamed
+    caches are purely in-process.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        name: str | None = None,
+        sync_interval: float = 5.0,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.name = name
+        self.sync_interval = sync_interval
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: Any = None
+        self._next_sync = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _generation_key(self) -> str:
+        return f"auth:principal_generation:{self.name}"
+
+    def _sync(self, now: float) -> None:
+        """Drop all entries if another process invalidated since the last poll."""
+        if self.name is None or now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+        from stock_datasource.services.cache_service import get_cache_service
+
+        generation = get_cache_service().get(self._generation_key)
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._entries.clear()
+
+    def _publish(self) -> None:
+        """Bump the shared generation so other processes drop their entries."""
+        if self.name is None:
+            return
+        from stock_datasource.services.cache_service import get_cache_service
+
+        generation = f"{time.time():.6f}"
+        # Outlive the TTL so a process that polls late still sees the bump
+        if get_cache_service().set(
+            self._generation_key, generation, ttl=int(self.ttl_seconds) + 60
+        ):
+            self._generation = generation
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None when missing or expired."""
+        now = time.monotonic()
+        self._sync(now)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry here and signal other processes."""
+        with self._lock:
+            self._entries.pop(key, None)
+        self._publish()
+
+    def invalidate_where(self, predicate) -> int:
+        """Drop all entries whose value matches ``predicate``.
+
+        Other processes are signalled as well and drop their whole cache.
+        """
+        with self._lock:
+            keys = [k for k, (_, v) in self._entries.items() if predicate(v)]
+            for key in keys:
+                del self._entries[key]
+        self._publish()
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LastUsedTracker:
+    """Coalesces API key ``last_used_at`` bumps into periodic batched writes.
+
+    ``touch`` only records the latest use time per key in memory; a daemon
+    thread hands the accumulated map to ``flush_fn`` every ``interval``
+    seconds, so a busy key costs one write per interval instead of one per
+    request.
+    """
+
+    def __init__(self, flush_fn, interval: float = 60.0):
+        self._flush_fn = flush_fn
+        self.interval = interval
+        self._pending: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def touch(self, key_id: str, used_at) -> None:
+        """Record a key use; starts the flusher thread on first use."""
+        with self._lock:
+            self._pending[key_id] = used_at
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="api-key-last-used"
+                )
+                self._thread.start()
+
+    def flush(self) -> int:
+        """Write all pending bumps now. Returns the number of keys flushed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            self._flush_fn(pending)
+        except Exception as e:
+            logger.warning(f"Failed to flush API key last_used_at: {e}")
+        return len(pending)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                pass  # Keep thread alive
+
+
+_user_cache: PrincipalCache | None = None
+_api_key_cache: PrincipalCache | None = None
+
+
+def get_user_cache() -> PrincipalCache:
+    """Get the process-wide user principal cache (keyed by user id)."""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = PrincipalCache(
+            settings.AUTH_USER_CACHE_TTL,
+            settings.AUTH_USER_CACHE_MAX_ENTRIES,
+            name="user",
+            sync_interval=settings.AUTH_CACHE_SYNC_INTERVAL,
+        )
+    return _user_cache
+
+
+def get_api_key_cache() -> PrincipalCache:
+    """Get the process-wide API key cache (keyed by api_key_hash)."""
+    global _api_key_cache
+    if _api_key_cache is None:
+        _api_key_cache = PrincipalCache(
+            settings.AUTH_API_KEY_CACHE_TTL,
+            settings.AUTH_API_KEY_CACHE_MAX_ENTRIES,
+            name="api_key",
+            sync_interval=settings.AUTH_CACHE_SYNC_INTERVAL,
+        )
+    return _api_key_cache
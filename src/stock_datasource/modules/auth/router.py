@@ -251,6 +251,7 @@ async def update_user_tier(
             "updated_at": datetime.now(),
         },
     )
+    auth_service.invalidate_user(user_id)
 
     return {"success": True, "message": f"用户 {user['email']} 等级已更新为 {tier}"}
 
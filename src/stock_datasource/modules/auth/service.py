@@ -11,6 +11,8 @@ from passlib.context import CryptContext
 
 from stock_datasource.models.database import db_client
 
+from .principal_cache import get_api_key_cache, get_user_cache
+
 logger = logging.getLogger(__name__)
 
 # Password hashing context
@@ -236,7 +238,16 @@ class AuthService:
         return None
 
     def get_user_by_id(self, user_id: str) -> dict | None:
-        """Get user by ID."""
+        """Get user by ID.
+
+        Served from the in-process principal cache when possible; only
+        active users are cached, so a miss always goes to ClickHouse.
+        """
+        cache = get_user_cache()
+        cached = cache.get(user_id)
+        if cached is not None:
+            return dict(cached)
+
         self._ensure_tables()
         query = """
             SELECT id, email, username, password_hash, is_active, is_admin, subscription_tier, created_at, updated_at
@@ -253,7 +264,7 @@ class AuthService:
             tier = row[6] if len(row) > 6 else "free"
             if is_admin:
                 tier = "admin"
-            return {
+            user = {
                 "id": row[0],
                 "email": email,
                 "username": row[2],
@@ -264,8 +275,19 @@ class AuthService:
                 "created_at": row[7] if len(row) > 7 else None,
                 "updated_at": row[8] if len(row) > 8 else None,
             }
+            cache.set(user_id, user)
+            return dict(user)
         return None
 
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a user from the principal caches after it was modified.
+
+        The user's API keys are dropped too, so a deactivated account or a
+        role change is re-checked on the next key-authenticated request.
+        """
+        get_user_cache().invalidate(user_id)
+        get_api_key_cache().invalidate_where(lambda row: row.get("user_id") == user_id)
+
     def _resolve_whitelist_file(self) -> Path | None:
         """Resolve whitelist file path from settings.
 
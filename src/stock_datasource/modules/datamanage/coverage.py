@@ -0,0 +1,319 @@
+"""Date coverage of plugin tables for missing-data detection.
+
+``CoverageEngine.missing_dates`` answers "which of these trading days have no
+rows" for many tables at once:
+
+- Column types for all tables come from one ``system.columns`` query.
+- Distinct dates of every table in the window come from one ``UNION ALL`` of
+  per-table ``GROUP BY`` queries, diffed against the trade calendar in memory.
+- Dates found present are recorded in a per-table coverage bitmap (bit ``i``
+  = ``anchor + i`` calendar days) persisted to ``sys_data_coverage``. Later
+  checks only query dates not yet known to be covered, so a daily check
+  touches the new trading day plus whatever is still missing.
+
+Rows are not expected to disappear from ODS tables; ``invalidate`` forces a
+full re-scan when they do. ``BasePlugin._truncate_table`` (full_replace
+reloads) and ``DataLoader.cleanup_old_versions`` call it, usually from
+TaskWorker subprocesses, so every engine re-reads the bitmaps whenever
+``sys_data_coverage`` has changed since it last loaded them.
+"""
+
+import base64
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from stock_datasource.models.database import _to_clickhouse_literal
+from stock_datasource.utils.logger import logger
+
+COVERAGE_TABLE = "sys_data_coverage"
+# Stored anchor of an empty bitmap
+EMPTY_ANCHOR = date(1970, 1, 1)
+
+COVERAGE_TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {COVERAGE_TABLE} (
+    table_name String,
+    date_column String,
+    anchor_date Date,
+    bitmap String,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+ORDER BY table_name
+"""
+
+
+@dataclass
+class TableCoverage:
+    """Coverage bitmap of one table, in calendar days from ``anchor``."""
+
+    table_name: str
+    date_column: str
+    anchor: date | None = None
+    bits: int = 0
+    dirty: bool = field(default=False, compare=False)
+
+    def has(self, day: date) -> bool:
+        if self.anchor is None or day < self.anchor:
+            return False
+        return bool(self.bits >> (day - self.anchor).days & 1)
+
+    def add(self, days: list[date]) -> None:
+        if not days:
+            return
+        earliest = min(days)
+        if self.anchor is None:
+            self.anchor = earliest
+        elif earliest < self.anchor:
+            self.bits <<= (self.anchor - earliest).days
+            self.anchor = earliest
+        for day in days:
+            self.bits |= 1 << (day - self.anchor).days
+        self.dirty = True
+
+    def encode(self) -> str:
+        raw = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+        return base64.b64encode(raw).decode("ascii")
+
+    @classmethod
+    def decode(
+        cls, table_name: str, date_column: str, anchor: date, bitmap: str
+    ) -> "TableCoverage":
+        bits = int.from_bytes(base64.b64decode(bitmap), "little")
+        return cls(table_name, date_column, anchor if bits else None, bits)
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip().replace("-", "")[:8]
+    return datetime.strptime(text, "%Y%m%d").date()
+
+
+def _date_scan(column: str, column_type: str, start: date, end: date) -> tuple[str, str]:
+    """(select expression, WHERE condition) for dates of ``column`` in [start, end].
+
+    String date columns are compared as raw strings so the primary key still
+    prunes granules; parsing every value would force a full scan. Compact
+    (``YYYYMMDD``) and dashed (``YYYY-MM-DD[ ...]``) ranges never overlap
+    lexically, so both spellings are matched and parsed afterwards in Python.
+    """
+    if "Date" in column_type:
+        expr = f"toDate({column})"
+        return expr, f"{expr} >= toDate('{start}') AND {expr} <= toDate('{end}')"
+    after = end + timedelta(days=1)
+    ranges = [
+        f"({column} >= '{start:%Y%m%d}' AND {column} < '{after:%Y%m%d}')",
+        f"({column} >= '{start:%Y-%m-%d}' AND {column} < '{after:%Y-%m-%d}')",
+    ]
+    return column, f"({' OR '.join(ranges)})"
+
+
+class CoverageEngine:
+    """Batched, incremental date coverage for plugin tables."""
+
+    def __init__(self, db=None):
+        self._db = db
+        self._coverage: dict[str, TableCoverage] | None = None
+        self._version: tuple | None = None
+        self._table_ready = False
+        self._lock = threading.Lock()
+        self.logger = logger.bind(component="CoverageEngine")
+
+    def _get_db(self):
+        if self._db is None:
+            from stock_datasource.models.database import db_client
+
+            self._db = db_client
+        return self._db
+
+    def _database(self) -> str:
+        db = self._get_db()
+        return db.primary.database if hasattr(db, "primary") else db.database
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _ensure_table(self) -> None:
+        if not self._table_ready:
+            self._get_db().create_table(COVERAGE_TABLE_DDL)
+            self._table_ready = True
+
+    def _current_version(self) -> tuple | None:
+        """Row count and latest ``updated_at`` of the coverage table.
+
+        Every insert, from any process, changes the count until the next
+        background merge, and merges leave the latest ``updated_at`` behind.
+        """
+        try:
+            self._ensure_table()
+            df = self._get_db().execute_query(
+                f"SELECT count() AS n, max(updated_at) AS ts FROM {COVERAGE_TABLE}"
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to check data coverage version: {e}")
+            return None
+        if df.empty:
+            return None
+        row = df.iloc[0]
+        return int(row["n"]), str(row["ts"])
+
+    def _load(self) -> dict[str, TableCoverage]:
+        """Known coverage by table, re-read when another engine has saved."""
+        version = self._current_version()
+        if self._coverage is not None and (version is None or version == self._version):
+            return self._coverage
+        coverage: dict[str, TableCoverage] = {}
+        try:
+            self._ensure_table()
+            df = self._get_db().execute_query(
+                f"SELECT table_name, date_column, anchor_date, bitmap "
+                f"FROM {COVERAGE_TABLE} FINAL"
+            )
+            for row in df.itertuples(index=False):
+                coverage[row.table_name] = TableCoverage.decode(
+                    row.table_name, row.date_column, _to_date(row.anchor_date), row.bitmap
+                )
+        except Exception as e:
+            self.logger.warning(f"Failed to load data coverage, starting empty: {e}")
+        self._coverage = coverage
+        self._version = version
+        return coverage
+
+    def _save(self, entries: list[TableCoverage]) -> None:
+        dirty = [c for c in entries if c.dirty]
+        if not dirty:
+            return
+        df = pd.DataFrame(
+            {
+                "table_name": [c.table_name for c in dirty],
+                "date_column": [c.date_column for c in dirty],
+                "anchor_date": [c.anchor or EMPTY_ANCHOR for c in dirty],
+                "bitmap": [c.encode() for c in dirty],
+                "updated_at": [datetime.now()] * len(dirty),
+            }
+        )
+        try:
+            self._ensure_table()
+            self._get_db().insert_dataframe(COVERAGE_TABLE, df)
+            for c in dirty:
+                c.dirty = False
+        except Exception as e:
+            self.logger.warning(f"Failed to persist data coverage: {e}")
+
+    def invalidate(self, table_name: str | None = None) -> None:
+        """Forget known coverage of one table (or all); the next check re-scans."""
+        with self._lock:
+            coverage = self._load()
+            names = [table_name] if table_name else list(coverage)
+            for name in names:
+                entry = coverage.get(name)
+                if entry is not None:
+                    coverage[name] = TableCoverage(name, entry.date_column, dirty=True)
+            self._save([coverage[n] for n in names if n in coverage])
+
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+
+    def _column_types(self, tables: dict[str, str]) -> dict[str, str]:
+        """``{table: type of its date column}`` for tables that have it."""
+        names = ", ".join(_to_clickhouse_literal(t) for t in tables)
+        df = self._get_db().execute_query(
+            f"SELECT table, name, type FROM system.columns "
+            f"WHERE database = {_to_clickhouse_literal(self._database())} "
+            f"AND table IN ({names})"
+        )
+        types = {}
+        for row in df.itertuples(index=False):
+            if tables.get(row.table) == row.name:
+                types[row.table] = row.type
+        return types
+
+    def _present_dates(
+        self, window: dict[str, tuple[str, str, date, date]]
+    ) -> dict[str, set[date]]:
+        """Distinct dates per table within each table's [start, end] window."""
+        parts = []
+        for table, (column, column_type, start, end) in window.items():
+            expr, condition = _date_scan(column, column_type, start, end)
+            # String dates are returned raw; cast so UNION ALL branches match
+            parts.append(
+                f"SELECT {_to_clickhouse_literal(table)} AS tbl, toString({expr}) AS d "
+                f"FROM {table} WHERE {condition} GROUP BY d"
+            )
+        present: dict[str, set[date]] = {t: set() for t in window}
+        if not parts:
+            return present
+        df = self._get_db().execute_query(" UNION ALL ".join(parts))
+        for row in df.itertuples(index=False):
+            if row.d is None or pd.isna(row.d):
+                continue
+            try:
+                present[row.tbl].add(_to_date(row.d))
+            except ValueError:
+                continue
+        return present
+
+    def missing_dates(
+        self, tables: dict[str, str], trading_days: list[str]
+    ) -> dict[str, list[str]]:
+        """Trading days without rows, per table.
+
+        Args:
+            tables: ``{table_name: date_column}``
+            trading_days: Dates to check (YYYY-MM-DD)
+
+        Returns:
+            ``{table_name: [missing YYYY-MM-DD, ...]}``; tables or date columns
+            that do not exist report every day as missing.
+        """
+        if not tables or not trading_days:
+            return {t: [] for t in tables}
+        days = {_to_date(d): d for d in trading_days}
+
+        with self._lock:
+            coverage = self._load()
+            types = self._column_types(tables)
+
+            unknown: dict[str, list[date]] = {}
+            window: dict[str, tuple[str, str, date, date]] = {}
+            for table, column in tables.items():
+                entry = coverage.get(table)
+                if entry is None or entry.date_column != column:
+                    entry = coverage[table] = TableCoverage(table, column)
+                if table not in types:
+                    unknown[table] = list(days)
+                    continue
+                unknown[table] = [d for d in days if not entry.has(d)]
+                if unknown[table]:
+                    window[table] = (column, types[table], min(unknown[table]), max(unknown[table]))
+
+            present = self._present_dates(window)
+            for table, found in present.items():
+                coverage[table].add([d for d in unknown[table] if d in found])
+            self._save([coverage[t] for t in window])
+
+        self.logger.debug(
+            f"Coverage check: {len(tables)} tables, {len(window)} queried, "
+            f"{sum(len(v) for v in unknown.values())} unknown table-dates"
+        )
+        return {
+            table: [days[d] for d in unknown[table] if d not in present.get(table, ())]
+            for table in tables
+        }
+
+
+_coverage_engine: CoverageEngine | None = None
+
+
+def get_coverage_engine() -> CoverageEngine:
+    """Get the process-wide coverage engine."""
+    global _coverage_engine
+    if _coverage_engine is None:
+        _coverage_engine = CoverageEngine()
+    return _coverage_engine
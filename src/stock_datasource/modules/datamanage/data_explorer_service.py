@@ -1,11 +1,16 @@
 """Data Explorer Service for browsing plugin data and executing SQL queries."""
 
-import io
+import codecs
+import itertools
+import json
+import tempfile
 import time
+from collections.abc import Iterator
 from datetime import datetime
 
 import pandas as pd
 
+from stock_datasource.config.settings import settings
 from stock_datasource.core.plugin_manager import plugin_manager
 from stock_datasource.models.database import db_client
 from stock_datasource.utils.logger import logger
@@ -35,6 +40,50 @@ CATEGORY_LABELS = {
     "system": "系统",
 }
 
+# ClickHouse output format requested for each export format
+CLICKHOUSE_EXPORT_FORMATS = {
+    ExportFormat.CSV: "CSVWithNames",
+    ExportFormat.PARQUET: "Parquet",
+    ExportFormat.XLSX: "JSONCompactEachRowWithNames",
+}
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Excel sheet limit (1,048,576 rows) minus the header row
+XLSX_MAX_DATA_ROWS = 1_048_575
+EXPORT_CHUNK_SIZE = 1 << 16
+
+
+def _iter_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Re-split a byte stream into newline-terminated lines."""
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _xlsx_chunks(rows: Iterator[bytes]) -> Iterator[bytes]:
+    """Convert ``JSONCompactEachRowWithNames`` output into a streamed workbook."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for line in _iter_lines(rows):
+        if line.strip():
+            sheet.append(json.loads(line))
+    with tempfile.TemporaryFile() as buffer:
+        workbook.save(buffer)
+        buffer.seek(0)
+        while chunk := buffer.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+
 
 class DataExplorerService:
     """Service for data exploration and SQL query execution."""
@@ -502,46 +551,93 @@ class DataExplorerService:
             truncated=row_count >= max_rows,
         )
 
-    def export_query_result(
+    def stream_export(
         self,
         sql: str,
         format: ExportFormat,
         filename: str | None = None,
-        max_rows: int = 10000,
-    ) -> tuple[bytes, str]:
-        """Export query results to CSV or Excel.
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+    ) -> tuple[Iterator[bytes], str, str]:
+        """Stream query results as CSV, Parquet or Excel.
+
+        ClickHouse renders CSV and Parquet natively and the bytes are passed
+        through chunk by chunk; Excel rows are written into a write-only
+        workbook on disk. Memory use does not grow with the result size.
 
         Args:
             sql: SQL query
-            format: Export format (csv or xlsx)
-            filename: Optional filename
-            max_rows: Maximum rows to export
+            format: Export format
+            filename: Optional filename (without extension)
+            max_rows: Row budget, capped by ``EXPLORER_EXPORT_MAX_ROWS``
+            max_bytes: Result byte budget, capped by ``EXPLORER_EXPORT_MAX_BYTES``
 
         Returns:
-            Tuple of (file content bytes, filename)
+            Tuple of (content chunk iterator, filename, media type)
         """
-        # Execute query
-        result = self.execute_sql_query(sql, max_rows=max_rows)
-        df = pd.DataFrame(result.data)
+        validator = self._get_validator()
+        is_valid, error = validator.validate(sql)
+        if not is_valid:
+            raise ValueError(error)
+
+        row_budget = min(max_rows or settings.EXPLORER_EXPORT_MAX_ROWS, settings.EXPLORER_EXPORT_MAX_ROWS)
+        if format == ExportFormat.XLSX:
+            row_budget = min(row_budget, XLSX_MAX_DATA_ROWS)
+        byte_budget = min(
+            max_bytes or settings.EXPLORER_EXPORT_MAX_BYTES, settings.EXPLORER_EXPORT_MAX_BYTES
+        )
+
+        # Wrapping keeps the user's own LIMIT/SETTINGS and makes the row budget exact
+        inner = sql.strip().rstrip(";")
+        query = f"SELECT * FROM ({inner}) LIMIT {row_budget} FORMAT {CLICKHOUSE_EXPORT_FORMATS[format]}"
+        chunks = db_client.stream(
+            query,
+            settings={
+                "max_execution_time": settings.EXPLORER_EXPORT_TIMEOUT,
+                "max_result_bytes": byte_budget,
+                "result_overflow_mode": "break",
+                "output_format_json_quote_64bit_integers": 0,
+            },
+            timeout=settings.EXPLORER_EXPORT_TIMEOUT + 30,
+        )
+        # Pull the first chunk now so query errors become a 400, not a broken download
+        try:
+            first = next(chunks, b"")
+        except Exception as e:
+            raise ValueError(f"查询执行失败: {e!s}")
+        body = itertools.chain([first], chunks)
+
+        if format == ExportFormat.CSV:
+            body = itertools.chain([codecs.BOM_UTF8], body)  # Excel compatibility
+        elif format == ExportFormat.XLSX:
+            body = _xlsx_chunks(body)
 
-        # Generate filename
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"query_result_{timestamp}"
 
-        # Export based on format
-        if format == ExportFormat.CSV:
-            content = df.to_csv(index=False).encode(
-                "utf-8-sig"
-            )  # UTF-8 with BOM for Excel compatibility
-            filename = f"{filename}.csv"
-        else:  # Excel
-            buffer = io.BytesIO()
-            df.to_excel(buffer, index=False, engine="openpyxl")
-            content = buffer.getvalue()
-            filename = f"{filename}.xlsx"
-
-        return content, filename
+        return (
+            self._log_export(body, format, row_budget),
+            f"{filename}.{format.value}",
+            EXPORT_MEDIA_TYPES[format],
+        )
+
+    def _log_export(
+        self, body: Iterator[bytes], format: ExportFormat, row_budget: int
+    ) -> Iterator[bytes]:
+        start_time = time.time()
+        size = 0
+        try:
+            for chunk in body:
+                size += len(chunk)
+                yield chunk
+        except Exception as e:
+            self.logger.error(f"Export aborted after {size} bytes: {e}")
+            raise
+        self.logger.info(
+            f"Exported {size} bytes as {format.value} (row budget {row_budget}) "
+            f"in {time.time() - start_time:.1f}s"
+        )
 
     # ============ SQL Template Management ============
 
@@ -1,7 +1,6 @@
 """Data management module router - Admin only access."""
 
 import asyncio
-import io
 import logging
 import uuid
 from datetime import datetime
@@ -1514,7 +1513,6 @@ from .schemas import (
     ExplorerSqlExportRequest,
     ExplorerTableListResponse,
     ExplorerTableSchema,
-    ExportFormat,
     SqlTemplate,
     SqlTemplateCreate,
 )
@@ -1592,27 +1590,27 @@ async def export_explorer_sql(
 ):
     """导出查询结果.
 
-    支持 CSV 和 Excel 格式，最大导出 10000 行。
+    支持 CSV、Excel 和 Parquet 格式，结果从 ClickHouse 流式写出，
+    行数与字节数上限可按请求设置（不超过系统配置上限）。
     """
     try:
-        content, filename = data_explorer_service.export_query_result(
-            sql=request.sql, format=request.format, filename=request.filename
-        )
-
-        media_type = (
-            "text/csv"
-            if request.format == ExportFormat.CSV
-            else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-
-        return StreamingResponse(
-            io.BytesIO(content),
-            media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        chunks, filename, media_type = await asyncio.to_thread(
+            data_explorer_service.stream_export,
+            sql=request.sql,
+            format=request.format,
+            filename=request.filename,
+            max_rows=request.max_rows,
+            max_bytes=request.max_bytes,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
 
 @router.get("/explorer/sql/templates", response_model=list[SqlTemplate])
 async def get_explorer_templates(
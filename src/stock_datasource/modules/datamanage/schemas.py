@@ -745,6 +745,7 @@ class ExportFormat(str, Enum):
 
     CSV = "csv"
     XLSX = "xlsx"
+    PARQUET = "parquet"
 
 
 class ExplorerSqlExecuteRequest(BaseModel):
@@ -773,6 +774,12 @@ class ExplorerSqlExportRequest(BaseModel):
     sql: str = Field(..., max_length=10000)
     format: ExportFormat = ExportFormat.CSV
     filename: str | None = None
+    max_rows: int | None = Field(
+        default=None, ge=1, description="行数上限，不超过 EXPLORER_EXPORT_MAX_ROWS"
+    )
+    max_bytes: int | None = Field(
+        default=None, ge=1, description="结果字节上限，不超过 EXPLORER_EXPORT_MAX_BYTES"
+    )
 
 
 class SqlTemplate(BaseModel):
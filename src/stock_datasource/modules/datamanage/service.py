@@ -12,6 +12,7 @@ from stock_datasource.core.trade_calendar import trade_calendar_service
 from stock_datasource.models.database import db_client
 from stock_datasource.utils.logger import logger
 
+from .coverage import get_coverage_engine
 from .schemas import (
     MissingDataInfo,
     MissingDataSummary,
@@ -347,60 +348,75 @@ class DataManageService:
                 plugins=[],
             )
 
-        # Get all plugins
-        plugins_info: list[MissingDataInfo] = []
-        plugins_with_missing = 0
-
+        # Phase 1: collect daily plugins with a date column (no DB queries)
+        plugin_metas = []
+        table_date_map: dict[str, str] = {}
         for plugin_name in plugin_manager.list_plugins():
             try:
                 plugin = plugin_manager.get_plugin(plugin_name)
                 if not plugin:
                     continue
 
-                # Get schedule
-                schedule = plugin.get_schedule()
-                frequency = schedule.get("frequency", "daily")
-
                 # Only check daily plugins for missing data
+                frequency = plugin.get_schedule().get("frequency", "daily")
                 if frequency != "daily":
                     continue
 
-                # Get schema
-                schema = plugin.get_schema()
-                table_name = schema.get("table_name", f"ods_{plugin_name}")
+                table_name = plugin.get_schema().get("table_name", f"ods_{plugin_name}")
                 date_column = self._get_plugin_date_column(plugin_name)
 
                 # Skip dimension tables without date column
                 if not date_column:
                     continue
 
-                # Check each trading day
-                missing_dates = []
-                for trade_date in trading_days:
-                    if not self.check_data_exists(table_name, date_column, trade_date):
-                        missing_dates.append(trade_date)
+                plugin_metas.append((plugin_name, table_name, date_column, frequency))
+                table_date_map[table_name] = date_column
+            except Exception as e:
+                # Log error but continue with other plugins - one plugin failure shouldn't break others
+                self.logger.error(
+                    f"Failed to check missing data for plugin {plugin_name}: {e}"
+                )
 
-                # Get latest date
-                latest_date = self.get_table_latest_date(table_name, date_column)
+        # Phase 2: batched coverage + latest dates for all tables
+        try:
+            missing_by_table = get_coverage_engine().missing_dates(
+                table_date_map, trading_days
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Batched coverage check failed, checking dates one by one: {e}"
+            )
+            missing_by_table = {
+                table: [
+                    d for d in trading_days
+                    if not self.check_data_exists(table, column, d)
+                ]
+                for table, column in table_date_map.items()
+            }
+        latest_dates = self._batch_get_latest_dates(table_date_map)
 
-                info = MissingDataInfo(
+        plugins_info: list[MissingDataInfo] = []
+        plugins_with_missing = 0
+        for plugin_name, table_name, date_column, frequency in plugin_metas:
+            if table_date_map[table_name] != date_column:
+                missing_dates = [
+                    d for d in trading_days
+                    if not self.check_data_exists(table_name, date_column, d)
+                ]
+            else:
+                missing_dates = missing_by_table.get(table_name, [])
+            plugins_info.append(
+                MissingDataInfo(
                     plugin_name=plugin_name,
                     table_name=table_name,
                     schedule_frequency=frequency,
-                    latest_date=latest_date,
+                    latest_date=latest_dates.get(table_name),
                     missing_dates=missing_dates,
                     missing_count=len(missing_dates),
                 )
-                plugins_info.append(info)
-
-                if missing_dates:
-                    plugins_with_missing += 1
-            except Exception as e:
-                # Log error but continue with other plugins - one plugin failure shouldn't break others
-                self.logger.error(
-                    f"Failed to check missing data for plugin {plugin_name}: {e}"
-                )
-                continue
+            )
+            if missing_dates:
+                plugins_with_missing += 1
 
         summary = MissingDataSummary(
             check_time=datetime.now(),
@@ -0,0 +1,447 @@
+"""In-process security search index.
+
+Backs the market search box and code resolution without hitting ClickHouse
+on every keystroke. Codes, symbols, names, ETF short names, index full names
+and pinyin initials from the four basic-info tables are held in sorted key
+lists per market (prefix matching via bisect) plus a 1-3 gram posting index
+(substring matching). Each market is searched up to its own result cap and
+the results are merged by rank:
+
+1. exact code/symbol, then exact name/alias
+2. code/symbol prefix, name prefix, alias (pinyin, ETF/index names) prefix
+3. code/symbol substring, name substring, alias substring
+
+Each table is reloaded on its own when a basic-info plugin loads new data
+in this process, or when its row count / latest ``_ingested_at`` changes
+(checked in the background every ``SECURITY_SEARCH_REFRESH_INTERVAL``
+seconds, which also covers plugins that run in a worker process).
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+_KINDS = ("code", "name", "alias")
+
+# table -> (market, query)
+_SOURCES: dict[str, tuple[str, str]] = {
+    "ods_stock_basic": (
+        "a_share",
+        "SELECT ts_code, symbol, name FROM ods_stock_basic",
+    ),
+    "ods_etf_basic": (
+        "etf",
+        "SELECT ts_code, csname AS name, extname, cname FROM ods_etf_basic",
+    ),
+    "ods_hk_basic": (
+        "hk_stock",
+        "SELECT ts_code, name, cn_spell FROM ods_hk_basic",
+    ),
+    "dim_index_basic": (
+        "index",
+        "SELECT ts_code, name, fullname FROM dim_index_basic",
+    ),
+}
+
+# Same per-market caps as the SQL fallback in MarketService.search_stock
+DEFAULT_MARKET_LIMITS = {"a_share": 15, "etf": 10, "hk_stock": 10, "index": 5}
+
+# Upper bound on candidates examined per market and search
+_MAX_SCAN = 2000
+
+_pinyin_fn = None
+_pinyin_loaded = False
+
+
+def _pinyin_initials(text: str) -> str:
+    """Pinyin initials of a Chinese name (empty if ``pypinyin`` is unavailable)."""
+    global _pinyin_fn, _pinyin_loaded
+    if not _pinyin_loaded:
+        _pinyin_loaded = True
+        try:
+            from pypinyin import Style, lazy_pinyin
+
+            _pinyin_fn = lambda s: "".join(  # noqa: E731
+                lazy_pinyin(s, style=Style.FIRST_LETTER, errors="ignore")
+            )
+        except ImportError:
+            logger.warning(
+                "pypinyin not installed, pinyin search limited to HK cn_spell"
+            )
+    if _pinyin_fn is None or not text:
+        return ""
+    try:
+        return _pinyin_fn(text).lower()
+    except Exception:
+        return ""
+
+
+def _clean(value: Any) -> str:
+    if value is None:
+        return ""
+    text = str(value).strip()
+    return "" if text.lower() in ("nan", "none", "\\n") else text
+
+
+class SecurityEntry(NamedTuple):
+    """One searchable security."""
+
+    code: str
+    name: str
+    market: str
+    keys: tuple[tuple[str, str], ...]  # (kind, lowercased key)
+
+    def to_result(self) -> dict[str, str]:
+        return {"code": self.code, "name": self.name, "market": self.market}
+
+
+def build_entry(market: str, row: dict[str, Any]) -> SecurityEntry | None:
+    """Build an index entry from a basic-info row."""
+    code = _clean(row.get("ts_code")).upper()
+    if not code:
+        return None
+    name = _clean(row.get("name"))
+    symbol = _clean(row.get("symbol")) or code.split(".")[0]
+
+    keys = {("code", code.lower()), ("code", symbol.lower())}
+    if name:
+        keys.add(("name", name.lower()))
+        initials = _pinyin_initials(name)
+        if initials:
+            keys.add(("alias", initials))
+    for column in ("extname", "cname", "fullname", "cn_spell"):
+        alias = _clean(row.get(column)).lower()
+        if alias and alias != name.lower():
+            keys.add(("alias", alias))
+    return SecurityEntry(code, name or code, market, tuple(sorted(keys)))
+
+
+def _grams(key: str) -> set[str]:
+    grams = set(key)
+    for n in (2, 3):
+        grams.update(key[i : i + n] for i in range(len(key) - n + 1))
+    return grams
+
+
+class _MarketSnapshot:
+    """Immutable lookup structures for the entries of one market."""
+
+    def __init__(self, entries: list[SecurityEntry]):
+        self.entries = entries
+        self.by_code: dict[str, SecurityEntry] = {e.code: e for e in entries}
+        self.keys: dict[str, list[str]] = {}
+        self.ids: dict[str, list[int]] = {}
+        self.grams: dict[str, dict[str, list[int]]] = {}
+
+        pairs: dict[str, set[tuple[str, int]]] = {kind: set() for kind in _KINDS}
+        for idx, entry in enumerate(entries):
+            for kind, key in entry.keys:
+                pairs[kind].add((key, idx))
+
+        for kind, kind_pairs in pairs.items():
+            ordered = sorted(kind_pairs)
+            self.keys[kind] = [key for key, _ in ordered]
+            self.ids[kind] = [idx for _, idx in ordered]
+            grams: dict[str, list[int]] = {}
+            for pos, key in enumerate(self.keys[kind]):
+                for gram in _grams(key):
+                    grams.setdefault(gram, []).append(pos)
+            self.grams[kind] = grams
+
+    def _prefix(self, kind: str, keyword: str):
+        keys = self.keys[kind]
+        pos = bisect.bisect_left(keys, keyword)
+        while pos < len(keys) and keys[pos].startswith(keyword):
+            yield keys[pos], self.ids[kind][pos]
+            pos += 1
+
+    def _substring(self, kind: str, keyword: str):
+        grams = self.grams[kind]
+        n = min(len(keyword), 3)
+        postings = [
+            grams.get(keyword[i : i + n], []) for i in range(len(keyword) - n + 1)
+        ]
+        keys = self.keys[kind]
+        for pos in min(postings, key=len):
+            if keyword in keys[pos]:
+                yield self.ids[kind][pos]
+
+    def search(self, keyword: str, limit: int) -> list[tuple[int, SecurityEntry]]:
+        """Up to ``limit`` ``(tier, entry)`` matches in rank order."""
+        seen: set[int] = set()
+        results: list[tuple[int, SecurityEntry]] = []
+        scanned = 0
+
+        def add(tier: int, idx: int) -> bool:
+            """Add a candidate; True when no more results are needed."""
+            nonlocal scanned
+            scanned += 1
+            if idx not in seen:
+                seen.add(idx)
+                results.append((tier, self.entries[idx]))
+            return len(results) >= limit or scanned >= _MAX_SCAN
+
+        if limit <= 0:
+            return results
+        # Exact matches (code/symbol before name/alias)
+        for tier, kind in enumerate(_KINDS):
+            for key, idx in self._prefix(kind, keyword):
+                if key != keyword:
+                    break
+                if add(min(tier, 1), idx):
+                    return results
+        # Prefix matches
+        for tier, kind in enumerate(_KINDS, start=2):
+            for _, idx in self._prefix(kind, keyword):
+                if add(tier, idx):
+                    return results
+        # Substring matches
+        for tier, kind in enumerate(_KINDS, start=5):
+            for idx in self._substring(kind, keyword):
+                if add(tier, idx):
+                    return results
+        return results
+
+
+class _Snapshot:
+    """Per-market snapshots; searched independently and merged by rank."""
+
+    def __init__(self, markets: dict[str, _MarketSnapshot]):
+        self.markets = markets
+        self.size = sum(len(m.entries) for m in self.markets.values())
+
+    def search(
+        self, keyword: str, market_limits: dict[str, int]
+    ) -> list[dict[str, str]]:
+        ranked = []
+        for order, (market, snapshot) in enumerate(self.markets.items()):
+            for pos, (tier, entry) in enumerate(
+                snapshot.search(keyword, market_limits.get(market, 0))
+            ):
+                ranked.append((tier, order, pos, entry))
+        ranked.sort(key=lambda item: item[:3])
+        return [entry.to_result() for *_, entry in ranked]
+
+    def lookup(self, code: str, markets: tuple[str, ...]) -> SecurityEntry | None:
+        for market in markets:
+            snapshot = self.markets.get(market)
+            if snapshot and code in snapshot.by_code:
+                return snapshot.by_code[code]
+        return None
+
+
+class SecuritySearchIndex:
+    """Memory-resident, incrementally refreshed security search index."""
+
+    def __init__(self, db=None, refresh_interval: float = 300.0):
+        self._db = db
+        self.refresh_interval = refresh_interval
+        # Built per table so a reload only recompiles that table
+        self._tables: dict[str, _MarketSnapshot] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._snapshot: _Snapshot | None = None
+        self._stale: set[str] = set()
+        self._lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        self._last_check = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built at least once."""
+        return self._snapshot is not None
+
+    def _get_db(self):
+        if self._db is None:
+            from stock_datasource.models.database import db_client
+
+            self._db = db_client
+        return self._db
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _fingerprint(self, table: str) -> str | None:
+        try:
+            df = self._get_db().execute_query(
+                f"SELECT count() AS n, toString(max(_ingested_at)) AS ts FROM {table}"
+            )
+            if df.empty:
+                return None
+            return f"{df.iloc[0]['n']}|{df.iloc[0]['ts']}"
+        except Exception as e:
+            logger.debug(f"Search index fingerprint for {table} failed: {e}")
+            return None
+
+    def _load_table(self, table: str) -> list[SecurityEntry]:
+        market, query = _SOURCES[table]
+        df = self._get_db().execute_query(query)
+        entries: dict[str, SecurityEntry] = {}
+        for row in df.to_dict("records"):
+            entry = build_entry(market, row)
+            if entry is not None:
+                entries[entry.code] = entry
+        return list(entries.values())
+
+    def load_entries(self, table: str, entries: list[SecurityEntry]) -> None:
+        """Replace one table's entries and recompile the lookup snapshot."""
+        with self._lock:
+            self._tables[table] = _MarketSnapshot(entries)
+            self._compile()
+
+    def _compile(self) -> None:
+        self._snapshot = _Snapshot(
+            {
+                market: self._tables.get(table) or _MarketSnapshot([])
+                for table, (market, _) in _SOURCES.items()
+            }
+        )
+
+    def refresh(self, force: bool = False) -> list[str]:
+        """Reload tables whose data changed. Returns the reloaded tables."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            stale, self._stale = self._stale, set()
+            reloaded = []
+            for table in _SOURCES:
+                fingerprint = self._fingerprint(table)
+                if fingerprint is None and table not in self._tables:
+                    continue
+                if (
+                    not force
+                    and table not in stale
+                    and table in self._tables
+                    and fingerprint == self._fingerprints.get(table)
+                ):
+                    continue
+                try:
+                    entries = self._load_table(table)
+                except Exception as e:
+                    logger.warning(f"Failed to load {table} into search index: {e}")
+                    continue
+                if not entries and self._tables.get(table):
+                    # Keep serving the previous entries rather than an empty
+                    # market (e.g. the table is being re-synced right now)
+                    logger.warning(f"{table} returned no rows; keeping previous entries")
+                    continue
+                self._tables[table] = _MarketSnapshot(entries)
+                self._fingerprints[table] = fingerprint
+                reloaded.append(table)
+
+            # Nothing loaded yet (ClickHouse down): stay not-ready so callers
+            # fall back to querying the database, and retry on the next check
+            if reloaded and any(m.entries for m in self._tables.values()):
+                self._compile()
+                logger.info(
+                    f"Security search index refreshed {reloaded}: "
+                    f"{self._snapshot.size} securities"
+                )
+            return reloaded
+
+    def _maybe_refresh(self) -> None:
+        due = time.monotonic() - self._last_check >= self.refresh_interval
+        if not (self._snapshot is None or self._stale or due):
+            return
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._last_check = time.monotonic()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_safely, daemon=True, name="security-search-index"
+        )
+        self._refresh_thread.start()
+
+    def _refresh_safely(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Security search index refresh failed: {e}")
+
+    def mark_stale(self, table: str) -> None:
+        """Schedule a reload of ``table`` (no-op for unrelated tables)."""
+        if table in _SOURCES:
+            self._stale.add(table)
+            self._maybe_refresh()
+
+    def on_data_loaded(self, plugin_name: str, table_name: str) -> None:
+        """Plugin load listener (see ``BasePlugin.add_load_listener``)."""
+        self.mark_stale(table_name)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        keyword: str,
+        market_limits: dict[str, int] | None = None,
+    ) -> list[dict[str, str]] | None:
+        """Ranked type-ahead search; ``None`` while the index is not built."""
+        self._maybe_refresh()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        keyword = keyword.strip().lower()
+        if not keyword:
+            return []
+        return snapshot.search(keyword, market_limits or DEFAULT_MARKET_LIMITS)
+
+    def resolve(self, code: str) -> dict[str, str] | None:
+        """Resolve a code with or without suffix, like ``resolve_stock_code``."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        code = code.strip().upper()
+        if not code:
+            return None
+
+        if "." in code:
+            suffix = code.split(".")[-1]
+            if suffix in ("SH", "SZ"):
+                entry = snapshot.lookup(code, ("a_share", "etf"))
+            elif suffix == "HK":
+                entry = snapshot.lookup(code, ("hk_stock",))
+            else:
+                entry = None
+            return entry.to_result() if entry else None
+
+        for candidate, markets in (
+            (f"{code}.SH", ("a_share",)),
+            (f"{code}.SZ", ("a_share",)),
+            (f"{code}.BJ", ("a_share",)),
+            (f"{code}.SH", ("etf",)),
+            (f"{code}.SZ", ("etf",)),
+            (f"{code.zfill(5)}.HK", ("hk_stock",)),
+        ):
+            entry = snapshot.lookup(candidate, markets)
+            if entry:
+                return entry.to_result()
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "ready": snapshot is not None,
+            "securities": snapshot.size if snapshot else 0,
+            "tables": {t: len(m.entries) for t, m in self._tables.items()},
+        }
+
+
+_security_search_index: SecuritySearchIndex | None = None
+
+
+def get_security_search_index() -> SecuritySearchIndex:
+    """Get the process-wide security search index."""
+    global _security_search_index
+    if _security_search_index is None:
+        from stock_datasource.config.settings import settings
+        from stock_datasource.core.base_plugin import add_load_listener
+
+        _security_search_index = SecuritySearchIndex(
+            refresh_interval=settings.SECURITY_SEARCH_REFRESH_INTERVAL
+        )
+        add_load_listener(_security_search_index.on_data_loaded)
+    return _security_search_index
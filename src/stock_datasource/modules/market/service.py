@@ -16,12 +16,18 @@ from typing import Any
 
 import pandas as pd
 
+from stock_datasource.utils.adjusted_prices import (
+    adjust_records,
+    get_adjusted_price_store,
+)
+
 from .indicators import (
     calculate_indicators,
     calculate_support_resistance,
     detect_signals,
     determine_trend,
 )
+from .search_index import get_security_search_index
 
 logger = logging.getLogger(__name__)
 
@@ -271,6 +277,14 @@ class MarketService:
         # Detect if this is an ETF code (5xxxxx.SH / 15xxxx.SZ / 56xxxx.SH / 59xxxx.SH etc.)
         is_etf = self._is_etf_code(code)
 
+        # Pre-adjusted bars (maintained when adj factors are loaded)
+        if not is_etf:
+            data = self._get_adjusted_kline_from_store(
+                code, start_date, end_date, adjust
+            )
+            if data:
+                return {"code": code, "name": self._get_stock_name(code), "data": data}
+
         # Try plugin service for A-share
         if self.daily_service and not is_etf:
             try:
@@ -329,6 +343,16 @@ class MarketService:
         Returns:
             K-line data with stock info
         """
+        # Pre-adjusted bars (maintained when adj factors are loaded)
+        data = self._get_adjusted_kline_from_store(code, start_date, end_date, adjust)
+        if data:
+            return {
+                "code": code,
+                "name": self._get_stock_name(code),
+                "data": data,
+                "market_type": "hk_stock",
+            }
+
         # Try using HK Daily Plugin Service
         if self.hk_daily_service:
             try:
@@ -441,97 +465,49 @@ class MarketService:
 
         HK adjustment factor uses cum_adjfactor field.
         """
-        if not adj_factors:
-            return records
-
-        # Create adj_factor lookup by date (HK uses cum_adjfactor)
-        adj_dict = {}
-        for r in adj_factors:
-            trade_date = r.get("trade_date", "")
-            if hasattr(trade_date, "strftime"):
-                trade_date = trade_date.strftime("%Y%m%d")
-            elif "-" in str(trade_date):
-                trade_date = str(trade_date).replace("-", "")
-            adj_dict[trade_date] = float(r.get("cum_adjfactor", 1.0) or 1.0)
-
-        if not adj_dict:
-            return records
-
-        # Get latest adj_factor for forward adjustment
-        sorted_dates = sorted(adj_dict.keys())
-        latest_adj = adj_dict[sorted_dates[-1]] if sorted_dates else 1.0
-
-        def get_adj_factor(trade_date: str) -> float:
-            # Normalize date format
-            if "-" in trade_date:
-                trade_date = trade_date.replace("-", "")
-            if trade_date in adj_dict:
-                return adj_dict[trade_date]
-            for d in reversed(sorted_dates):
-                if d <= trade_date:
-                    return adj_dict[d]
-            return latest_adj
-
-        for record in records:
-            trade_date = record.get("trade_date", "")
-            if hasattr(trade_date, "strftime"):
-                trade_date = trade_date.strftime("%Y%m%d")
-            adj_factor = get_adj_factor(str(trade_date))
-
-            if adjust == "qfq":
-                ratio = adj_factor / latest_adj
-            else:
-                ratio = adj_factor
-
-            for field in ["open", "high", "low", "close"]:
-                if record.get(field):
-                    record[field] = round(float(record[field]) * ratio, 2)
-
-        return records
+        return adjust_records(records, adj_factors, adjust, "cum_adjfactor")
 
     def _apply_adjustment(
         self, records: list[dict], adj_factors: list[dict], adjust: str
     ) -> list[dict]:
-        """Apply price adjustment to K-line data."""
-        if not adj_factors:
-            return records
-
-        # Create adj_factor lookup by date
-        adj_dict = {r["trade_date"]: float(r["adj_factor"]) for r in adj_factors}
-
-        # Get latest adj_factor for forward adjustment
-        # Sort adj factors by date to get the most recent one
-        sorted_dates = sorted(adj_dict.keys())
-        latest_adj = adj_dict[sorted_dates[-1]] if sorted_dates else 1.0
-
-        # For missing dates, use the nearest available adj_factor
-        # by looking up the closest earlier date
-        def get_adj_factor(trade_date: str) -> float:
-            if trade_date in adj_dict:
-                return adj_dict[trade_date]
-            # Find the closest earlier date with adj_factor
-            for d in reversed(sorted_dates):
-                if d <= trade_date:
-                    return adj_dict[d]
-            # If no earlier date found, use the latest
-            return latest_adj
-
-        for record in records:
-            trade_date = record.get("trade_date", "")
-            adj_factor = get_adj_factor(trade_date)
-
-            if adjust == "qfq":
-                # Forward adjustment: divide by latest to normalize
-                ratio = adj_factor / latest_adj
-            else:
-                # Backward adjustment
-                ratio = adj_factor
-
-            for field in ["open", "high", "low", "close"]:
-                if record.get(field):
-                    record[field] = round(float(record[field]) * ratio, 2)
+        """Apply price adjustment to K-line data (as-of factor per bar)."""
+        return adjust_records(records, adj_factors, adjust, "adj_factor")
+
+    def _get_adjusted_kline_from_store(
+        self, code: str, start_date: str, end_date: str, adjust: str
+    ) -> list[dict[str, Any]] | None:
+        """Read pre-adjusted bars from fact_adjusted_daily, if maintained."""
+        if adjust not in ("qfq", "hfq") or self.db is None:
+            return None
+        try:
+            df = get_adjusted_price_store().get_adjusted(
+                code, start_date, end_date, adjust
+            )
+        except Exception as e:
+            logger.debug(f"Adjusted price store unavailable for {code}: {e}")
+            return None
+        if df is None or df.empty:
+            return None
 
-        return records
+        data = []
+        for row in df.to_dict("records"):
+            trade_date = row["trade_date"]
+            if hasattr(trade_date, "strftime"):
+                trade_date = trade_date.strftime("%Y-%m-%d")
+            else:
+                trade_date = self._format_date(str(trade_date))
+            data.append(
+                {
+                    "date": trade_date,
+                    "open": _safe_float(row["open"]),
+                    "high": _safe_float(row["high"]),
+                    "low": _safe_float(row["low"]),
+                    "close": _safe_float(row["close"]),
+                    "volume": _safe_float(row["vol"]),
+                    "amount": _safe_float(row["amount"]),
+                }
+            )
+        return data
 
     async def _get_kline_from_db(
         self, code: str, start_date: str, end_date: str, is_etf: bool = False
@@ -1173,6 +1149,11 @@ class MarketService:
         if not keyword:
             return results
 
+        # In-process index (no ClickHouse round trip once built)
+        indexed = get_security_search_index().search(keyword)
+        if indexed is not None:
+            return indexed
+
         # Normalize: if pure digits, also try with .SH / .SZ / .HK suffixes
         is_pure_digits = keyword.replace(".", "").isdigit() and "." not in keyword
 
@@ -1296,6 +1277,14 @@ class MarketService:
         if not code:
             return None
 
+        # Codes listed after the last index build miss here and fall
+        # through to the database lookup
+        index = get_security_search_index()
+        if index.ready:
+            result = index.resolve(code)
+            if result is not None:
+                return result
+
         # If already has a suffix, validate it exists
         if "." in code:
             suffix = code.split(".")[-1].upper()
@@ -8,6 +8,10 @@ import uuid
 from datetime import datetime, timedelta
 
 from stock_datasource.models.database import db_client
+from stock_datasource.modules.auth.principal_cache import (
+    LastUsedTracker,
+    get_api_key_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +56,7 @@ class McpApiKeyService:
 
     def __init__(self):
         self.client = db_client
+        self._last_used = LastUsedTracker(self._flush_last_used)
 
     def create_api_key(
         self,
@@ -186,6 +191,8 @@ class McpApiKeyService:
                 except Exception as e:
                     logger.warning(f"Failed to revoke API key on backup: {e}")
 
+            get_api_key_cache().invalidate(row["api_key_hash"])
+
             logger.info(f"Revoked MCP API key {key_id} for user {user_id}")
             return True, "API Key 已撤销"
 
@@ -196,22 +203,28 @@ class McpApiKeyService:
     def validate_api_key(self, raw_key: str) -> tuple[bool, dict, str]:
         """Validate an API key.
 
+        Key lookups are served from the in-process principal cache, and
+        ``last_used_at`` bumps are coalesced into periodic batched writes.
+
         Returns:
             (is_valid, user_dict, api_key_id)
         """
-        _ensure_tables()
         try:
             api_key_hash = _hash_key(raw_key)
-            rows = self.client.query(
-                "SELECT id, user_id, is_active, expires_at "
-                "FROM mcp_api_keys FINAL "
-                "WHERE api_key_hash = %(hash)s AND is_active = 1",
-                {"hash": api_key_hash},
-            )
-            if not rows:
-                return False, {}, ""
-
-            row = rows[0]
+            cache = get_api_key_cache()
+            row = cache.get(api_key_hash)
+            if row is None:
+                _ensure_tables()
+                rows = self.client.query(
+                    "SELECT id, user_id, is_active, expires_at "
+                    "FROM mcp_api_keys FINAL "
+                    "WHERE api_key_hash = %(hash)s AND is_active = 1",
+                    {"hash": api_key_hash},
+                )
+                if not rows:
+                    return False, {}, ""
+                row = rows[0]
+                cache.set(api_key_hash, row)
 
             # Check expiration
             expires_at = row.get("expires_at")
@@ -221,20 +234,8 @@ class McpApiKeyService:
             key_id = row["id"]
             user_id = row["user_id"]
 
-            # Update last_used_at (fire-and-forget, best-effort)
-            try:
-                self.client.primary.execute(
-                    "INSERT INTO mcp_api_keys "
-                    "(id, user_id, key_name, api_key_hash, api_key_prefix, "
-                    "is_active, last_used_at, expires_at, created_at, updated_at) "
-                    "SELECT id, user_id, key_name, api_key_hash, api_key_prefix, "
-                    "is_active, %(now)s, expires_at, created_at, %(now)s "
-                    "FROM mcp_api_keys FINAL "
-                    "WHERE id = %(key_id)s AND is_active = 1",
-                    {"key_id": key_id, "now": datetime.now()},
-                )
-            except Exception:
-                pass
+            # Update last_used_at (coalesced, best-effort)
+            self._last_used.touch(key_id, datetime.now())
 
             # Fetch user info
             from stock_datasource.modules.auth.service import get_auth_service
@@ -250,6 +251,26 @@ class McpApiKeyService:
             logger.error(f"Failed to validate API key: {e}")
             return False, {}, ""
 
+    def _flush_last_used(self, last_used: dict[str, datetime]) -> None:
+        """Write coalesced last_used_at bumps with a single INSERT ... SELECT."""
+        key_ids = list(last_used)
+        used_at = [last_used[k] for k in key_ids]
+        self.client.primary.execute(
+            "INSERT INTO mcp_api_keys "
+            "(id, user_id, key_name, api_key_hash, api_key_prefix, "
+            "is_active, last_used_at, expires_at, created_at, updated_at) "
+            "SELECT id, user_id, key_name, api_key_hash, api_key_prefix, "
+            "is_active, toDateTime(%(used_at)s[indexOf(%(key_ids)s, id)]), expires_at, "
+            "created_at, now() "
+            "FROM mcp_api_keys FINAL "
+            "WHERE id IN %(ids)s AND is_active = 1",
+            {"key_ids": key_ids, "used_at": used_at, "ids": tuple(key_ids)},
+        )
+
+    def flush_last_used(self) -> int:
+        """Write pending last_used_at bumps immediately."""
+        return self._last_used.flush()
+
 
 # Singleton
 _service: McpApiKeyService | None = None
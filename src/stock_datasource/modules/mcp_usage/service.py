@@ -3,6 +3,7 @@
 import logging
 import os
 import uuid
+from datetime import datetime
 
 from stock_datasource.models.database import db_client
 
@@ -13,9 +14,18 @@ _schema_initialized = False
 
 async def _ensure_schema():
     """Ensure mcp_tool_usage_log table exists (lazy init)."""
+    _ensure_schema_sync()
+
+
+def _ensure_schema_sync() -> bool:
+    """Synchronous schema init, also used by the telemetry sink flusher.
+
+    Returns True once the schema is in place; failures are retried on the
+    next call.
+    """
     global _schema_initialized
     if _schema_initialized:
-        return
+        return True
     try:
         schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
         with open(schema_path) as f:
@@ -26,8 +36,10 @@ async def _ensure_schema():
                 db_client.execute(statement)
         _schema_initialized = True
         logger.info("MCP tool usage schema initialized")
+        return True
     except Exception as e:
         logger.error(f"Failed to initialize MCP usage schema: {e}")
+        return False
 
 
 class McpUsageService:
@@ -46,19 +58,16 @@ class McpUsageService:
         is_error: bool = False,
         error_message: str = "",
     ) -> None:
-        """Log a single MCP tool call. Fire-and-forget."""
-        await _ensure_schema()
+        """Log a single MCP tool call via the batched telemetry sink."""
         try:
-            log_id = str(uuid.uuid4())
-            db_client.execute(
-                "INSERT INTO mcp_tool_usage_log "
-                "(id, user_id, api_key_id, tool_name, service_prefix, table_name, "
-                "arguments, record_count, duration_ms, is_error, error_message, created_at) "
-                "VALUES (%(id)s, %(user_id)s, %(api_key_id)s, %(tool_name)s, "
-                "%(service_prefix)s, %(table_name)s, %(arguments)s, %(record_count)s, "
-                "%(duration_ms)s, %(is_error)s, %(error_message)s, now())",
+            from stock_datasource.services.telemetry_sink import get_telemetry_sink
+
+            sink = get_telemetry_sink()
+            sink.register_table("mcp_tool_usage_log", ensure_fn=_ensure_schema_sync)
+            sink.emit(
+                "mcp_tool_usage_log",
                 {
-                    "id": log_id,
+                    "id": str(uuid.uuid4()),
                     "user_id": user_id,
                     "api_key_id": api_key_id,
                     "tool_name": tool_name,
@@ -69,6 +78,7 @@ class McpUsageService:
                     "duration_ms": duration_ms,
                     "is_error": int(is_error),
                     "error_message": error_message[:500] if error_message else "",
+                    "created_at": datetime.now(),
                 },
             )
             logger.debug(
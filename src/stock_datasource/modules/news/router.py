@@ -421,17 +421,38 @@ async def get_research_reports(
 async def search_news(
     keyword: str = Query(..., min_length=1, description="搜索关键词"),
     limit: int = Query(default=20, ge=1, le=100, description="返回数量"),
+    start_date: str | None = Query(
+        default=None, description="开始日期，格式：YYYY-MM-DD"
+    ),
+    end_date: str | None = Query(
+        default=None, description="结束日期，格式：YYYY-MM-DD"
+    ),
     current_user: dict = Depends(get_current_user),
 ):
-    """按关键词搜索新闻
+    """按关键词搜索新闻（全文索引，覆盖全部归档新闻）
 
     Args:
         keyword: 搜索关键词
         limit: 返回数量
+        start_date: 开始日期（可选）
+        end_date: 结束日期（可选，含当天）
     """
+    from datetime import datetime, timedelta
+
+    start_time = end_time = None
+    try:
+        if start_date:
+            start_time = datetime.strptime(start_date, "%Y-%m-%d")
+        if end_date:
+            end_time = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(
+                days=1, microseconds=-1
+            )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式应为 YYYY-MM-DD")
+
     try:
         service = get_news_service()
-        news_items = await service.search_news(keyword, limit)
+        news_items = await service.search_news(keyword, limit, start_time, end_time)
 
         return NewsListResponse(
             success=True,
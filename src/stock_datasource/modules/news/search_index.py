@@ -0,0 +1,273 @@
+"""On-disk inverted index for news full-text search.
+
+新闻全文检索的倒排索引（SQLite 持久化，位于 ``data/news/cache/search_index.db``）：
+
+- 分词：连续的中日韩字符切成字符二元组（另存片段末字），ASCII 字母数字按词
+  切分并转小写；查询中的二元组精确匹配，单字与 ASCII 词按前缀匹配，
+  所有词项都命中才算匹配。
+- ``NewsFileStorage`` 每次写入新闻文件时增量更新索引；首次使用时对已有的
+  全部新闻文件建一次索引，因此检索范围是整个归档而不只是内存缓存窗口。
+- 排序：词项 IDF × (正文词频 + 标题加权词频)，同分按发布时间倒序；
+  支持按发布时间区间与来源过滤。
+"""
+
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TITLE_WEIGHT = 3
+# SQLite 绑定参数上限 999（每个词项 4 个参数）
+_MAX_QUERY_TERMS = 200
+
+_TOKEN_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+|[0-9a-z]+"
+)
+# Upper bound of a prefix range on ``postings.term``
+_PREFIX_END = "\U0010ffff"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id     INTEGER PRIMARY KEY,
+    news_id    TEXT NOT NULL UNIQUE,
+    source     TEXT,
+    file       TEXT,
+    publish_ts INTEGER,
+    item       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_publish ON docs(publish_ts);
+CREATE INDEX IF NOT EXISTS idx_docs_file ON docs(file);
+CREATE TABLE IF NOT EXISTS postings (
+    term     TEXT NOT NULL,
+    doc_id   INTEGER NOT NULL,
+    tf       INTEGER NOT NULL,
+    title_tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def tokenize(text: str | None) -> list[str]:
+    """中日韩字符二元组 + 每段末字单字 + ASCII 词项（小写）
+
+    每个字符要么是某个二元组的首字，要么是片段末字，因此单字查询可以
+    用前缀范围命中所有出现位置。
+    """
+    if not text:
+        return []
+    terms = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if run[0].isascii():
+            terms.append(run)
+        else:
+            terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+            terms.append(run[-1])
+    return terms
+
+
+def _query_ranges(keyword: str) -> list[tuple[str, str, str]]:
+    """查询词项 -> (term, lo, hi)：二元组精确匹配，单字和 ASCII 词按前缀匹配"""
+    ranges = []
+    for run in dict.fromkeys(_TOKEN_RE.findall(keyword.lower())):
+        if run[0].isascii() or len(run) == 1:
+            ranges.append((run, run, run + _PREFIX_END))
+        else:
+            for i in range(len(run) - 1):
+                bigram = run[i : i + 2]
+                ranges.append((bigram, bigram, bigram + "\x00"))
+    return list({r[0]: r for r in ranges}.values())[:_MAX_QUERY_TERMS]
+
+
+def _to_ts(value: Any) -> int | None:
+    """publish_time (datetime / ISO 字符串) -> epoch 秒"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    try:
+        return int(datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+class NewsSearchIndex:
+    """SQLite-backed inverted index over stored news items."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._get_conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # 连接管理
+    # ------------------------------------------------------------------
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取当前线程的 SQLite 连接（懒初始化）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def is_built(self) -> bool:
+        row = self._get_conn().execute(
+            "SELECT value FROM meta WHERE key = 'built_at'"
+        ).fetchone()
+        return row is not None
+
+    def mark_built(self) -> None:
+        with self._write_lock, self._get_conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('built_at', ?)",
+                (datetime.now().isoformat(),),
+            )
+
+    def add(self, items: Iterable[dict[str, Any]], source: str, file: str | None = None) -> int:
+        """Index (or re-index) news items; returns the number of items written."""
+        count = 0
+        with self._write_lock, self._get_conn() as conn:
+            for item in items:
+                news_id = item.get("id")
+                if not news_id:
+                    continue
+                row = conn.execute(
+                    "SELECT doc_id FROM docs WHERE news_id = ?", (news_id,)
+                ).fetchone()
+                payload = json.dumps(item, ensure_ascii=False, default=str)
+                publish_ts = _to_ts(item.get("publish_time"))
+                if row:
+                    doc_id = row[0]
+                    conn.execute(
+                        "UPDATE docs SET source = ?, file = COALESCE(?, file), "
+                        "publish_ts = ?, item = ? WHERE doc_id = ?",
+                        (source, file, publish_ts, payload, doc_id),
+                    )
+                    conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                else:
+                    doc_id = conn.execute(
+                        "INSERT INTO docs(news_id, source, file, publish_ts, item) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (news_id, source, file, publish_ts, payload),
+                    ).lastrowid
+
+                title_tf = Counter(tokenize(item.get("title")))
+                tf = Counter(tokenize(item.get("content")))
+                conn.executemany(
+                    "INSERT INTO postings(term, doc_id, tf, title_tf) VALUES (?, ?, ?, ?)",
+                    [
+                        (term, doc_id, tf.get(term, 0), title_tf.get(term, 0))
+                        for term in title_tf.keys() | tf.keys()
+                    ],
+                )
+                count += 1
+        return count
+
+    def remove_file(self, file: str) -> int:
+        """Drop every item indexed from ``file`` (e.g. after cleanup)."""
+        with self._write_lock, self._get_conn() as conn:
+            doc_ids = [
+                r[0] for r in conn.execute("SELECT doc_id FROM docs WHERE file = ?", (file,))
+            ]
+            conn.executemany(
+                "DELETE FROM postings WHERE doc_id = ?", [(d,) for d in doc_ids]
+            )
+            conn.execute("DELETE FROM docs WHERE file = ?", (file,))
+        return len(doc_ids)
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        keyword: str,
+        limit: int = 20,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        source: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Ranked lookup of items containing every term of ``keyword``."""
+        ranges = _query_ranges(keyword)
+        if not ranges:
+            return []
+        conn = self._get_conn()
+        t0 = time.perf_counter()
+
+        total = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        params: list[Any] = []
+        for term, lo, hi in ranges:
+            df = conn.execute(
+                "SELECT COUNT(DISTINCT doc_id) FROM postings WHERE term >= ? AND term < ?",
+                (lo, hi),
+            ).fetchone()[0]
+            if not df:
+                return []
+            params.extend((term, lo, hi, math.log(1 + (total - df + 0.5) / (df + 0.5))))
+
+        values = ",".join("(?, ?, ?, ?)" for _ in ranges)
+        where = []
+        if start_time is not None:
+            where.append("d.publish_ts >= ?")
+            params.append(int(start_time.timestamp()))
+        if end_time is not None:
+            where.append("d.publish_ts <= ?")
+            params.append(int(end_time.timestamp()))
+        if source:
+            where.append("d.source = ?")
+            params.append(source)
+        params.extend((len(ranges), limit))
+
+        rows = conn.execute(
+            f"""
+            WITH q(term, lo, hi, idf) AS (VALUES {values})
+            SELECT d.item
+            FROM q
+            JOIN postings p ON p.term >= q.lo AND p.term < q.hi
+            JOIN docs d ON d.doc_id = p.doc_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            GROUP BY p.doc_id
+            HAVING COUNT(DISTINCT q.term) = ?
+            ORDER BY SUM(q.idf * (p.tf + {TITLE_WEIGHT} * p.title_tf)) DESC,
+                     d.publish_ts DESC
+            LIMIT ?
+            """,
+            params,
+        ).fetchall()
+        logger.debug(
+            f"News index search {keyword!r}: {len(rows)} hits in "
+            f"{(time.perf_counter() - t0) * 1000:.1f}ms"
+        )
+        return [json.loads(r[0]) for r in rows]
+
+    def stats(self) -> dict[str, Any]:
+        conn = self._get_conn()
+        return {
+            "docs": conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0],
+            "terms": conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0],
+            "built": self.is_built(),
+        }
@@ -0,0 +1,408 @@
+"""Process-wide, deduplicated job queue for news sentiment analysis.
+
+新闻情绪分析任务队列（进程内单例）：
+
+- 任务按内容哈希（规范化后的标题 + 股票背景）去重：同一标题在同一股票背景下
+  无论来自哪个来源、被多少个并发请求提交，都只排队一次；已在分析中的直接等待
+  同一结果。不同股票背景下同一新闻的影响可能不同，因此分别评分。
+- 后台线程运行独立的事件循环，把排队中的新闻合并成多条目的批量 prompt，
+  每批一次 LLM 调用，并用信号量限制同时在途的调用数。
+- LLM 结果按哈希持久化到 ``data/news/cache/sentiment_cache.db``，
+  重启或其他来源的相同标题直接命中；规则降级结果不落盘，LLM 恢复后会重新评分。
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .schemas import NewsItem, NewsSentiment
+
+logger = logging.getLogger(__name__)
+
+Analyzer = Callable[[list[NewsItem], str | None], Awaitable[list[NewsSentiment]]]
+Fallback = Callable[[list[NewsItem]], list[NewsSentiment]]
+OnDone = Callable[[list[NewsItem], list[NewsSentiment]], None]
+
+_NORMALIZE_RE = re.compile(r"[\W_]+")
+
+# SQLite 绑定参数上限 999
+_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiments (
+    key          TEXT PRIMARY KEY,
+    sentiment    TEXT NOT NULL,
+    score        REAL NOT NULL,
+    impact_level TEXT NOT NULL,
+    reasoning    TEXT,
+    updated_at   REAL NOT NULL
+);
+"""
+
+
+def sentiment_key(item: NewsItem, stock_context: str | None = None) -> str:
+    """内容哈希：忽略大小写、空白与标点的标题（无标题时取正文开头）
+
+    有股票背景时附加其哈希；无背景的键保持不变，已有缓存继续命中。
+    """
+    text = item.title or (item.content or "")[:200]
+    normalized = _NORMALIZE_RE.sub("", text.lower())
+    key = hashlib.sha1(normalized.encode()).hexdigest()[:20]
+    if stock_context and stock_context.strip():
+        context = hashlib.sha1(stock_context.strip().encode()).hexdigest()[:12]
+        key = f"{key}:{context}"
+    return key
+
+
+def _to_result(sentiment: NewsSentiment) -> dict[str, Any]:
+    return {
+        "sentiment": sentiment.sentiment,
+        "score": max(-1.0, min(1.0, float(sentiment.score))),
+        "impact_level": sentiment.impact_level,
+        "reasoning": sentiment.reasoning or "",
+    }
+
+
+def _to_sentiment(item: NewsItem, result: dict[str, Any]) -> NewsSentiment:
+    return NewsSentiment(news_id=item.id, title=item.title, **result)
+
+
+class SentimentCache:
+    """Hash-addressed SQLite store of LLM sentiment results."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._get_conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取当前线程的 SQLite 连接（懒初始化）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        conn = self._get_conn()
+        for i in range(0, len(keys), _CHUNK_SIZE):
+            chunk = keys[i : i + _CHUNK_SIZE]
+            rows = conn.execute(
+                "SELECT key, sentiment, score, impact_level, reasoning FROM sentiments "
+                f"WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, sentiment, score, impact_level, reasoning in rows:
+                results[key] = {
+                    "sentiment": sentiment,
+                    "score": score,
+                    "impact_level": impact_level,
+                    "reasoning": reasoning or "",
+                }
+        return results
+
+    def put_many(self, results: dict[str, dict[str, Any]]) -> None:
+        if not results:
+            return
+        now = time.time()
+        with self._get_conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sentiments"
+                "(key, sentiment, score, impact_level, reasoning, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        key,
+                        r["sentiment"],
+                        r["score"],
+                        r["impact_level"],
+                        r["reasoning"],
+                        now,
+                    )
+                    for key, r in results.items()
+                ],
+            )
+
+
+@dataclass
+class _Job:
+    key: str
+    item: NewsItem
+    stock_context: str | None
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+
+
+class SentimentJobQueue:
+    """Deduplicating batch queue in front of the sentiment LLM call."""
+
+    def __init__(
+        self,
+        analyzer: Analyzer,
+        fallback: Fallback,
+        cache: SentimentCache | None = None,
+        batch_size: int = 20,
+        max_inflight: int = 2,
+        flush_delay: float = 0.2,
+    ):
+        self.analyzer = analyzer
+        self.fallback = fallback
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        self.flush_delay = flush_delay
+
+        self._pending: OrderedDict[str, _Job] = OrderedDict()
+        self._inflight: dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+        self.llm_calls = 0
+        self.cache_hits = 0
+        self.deduplicated = 0
+
+    # ------------------------------------------------------------------
+    # 提交
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        news_items: list[NewsItem],
+        stock_context: str | None = None,
+        on_done: OnDone | None = None,
+    ) -> list[concurrent.futures.Future]:
+        """排队分析新闻情绪，返回与 ``news_items`` 一一对应的 future
+
+        future 的结果是情绪字段字典；``on_done`` 在全部完成后于队列线程中调用。
+        """
+        keys = [sentiment_key(item, stock_context) for item in news_items]
+        cached: dict[str, dict[str, Any]] = {}
+        if self.cache is not None:
+            try:
+                cached = self.cache.get_many(list(dict.fromkeys(keys)))
+            except Exception as e:
+                logger.warning(f"Sentiment cache lookup failed: {e}")
+
+        futures: list[concurrent.futures.Future] = []
+        queued = False
+        with self._lock:
+            for item, key in zip(news_items, keys, strict=True):
+                if key in cached:
+                    self.cache_hits += 1
+                    future = concurrent.futures.Future()
+                    future.set_result(cached[key])
+                    futures.append(future)
+                    continue
+                job = self._pending.get(key) or self._inflight.get(key)
+                if job is not None:
+                    self.deduplicated += 1
+                else:
+                    job = _Job(key, item, stock_context)
+                    self._pending[key] = job
+                    queued = True
+                futures.append(job.future)
+
+        if queued:
+            self._ensure_thread()
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        if on_done is not None:
+            self._when_all_done(news_items, futures, on_done)
+        return futures
+
+    async def analyze(
+        self,
+        news_items: list[NewsItem],
+        stock_context: str | None = None,
+    ) -> list[NewsSentiment]:
+        """提交并等待结果（可在任意事件循环中调用）"""
+        if not news_items:
+            return []
+        futures = self.submit(news_items, stock_context)
+        results = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+        return [
+            _to_sentiment(item, result)
+            for item, result in zip(news_items, results, strict=True)
+        ]
+
+    def _when_all_done(
+        self,
+        news_items: list[NewsItem],
+        futures: list[concurrent.futures.Future],
+        on_done: OnDone,
+    ) -> None:
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def _callback(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                sentiments = [
+                    _to_sentiment(item, f.result())
+                    for item, f in zip(news_items, futures, strict=True)
+                ]
+                on_done(news_items, sentiments)
+            except Exception as e:
+                logger.warning(f"Sentiment completion callback failed: {e}")
+
+        for future in futures:
+            future.add_done_callback(_callback)
+
+    # ------------------------------------------------------------------
+    # 后台事件循环
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(ready,), daemon=True, name="news-sentiment"
+                )
+                self._thread.start()
+                ready.wait()
+
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        ready.set()
+        self._loop.run_until_complete(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        semaphore = asyncio.Semaphore(self.max_inflight)
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # 短暂等待，让并发请求提交的新闻合并到同一批
+            await asyncio.sleep(self.flush_delay)
+            while True:
+                await semaphore.acquire()
+                batch = self._take_batch()
+                if not batch:
+                    semaphore.release()
+                    break
+                task = asyncio.create_task(self._process(batch))
+                task.add_done_callback(lambda _: semaphore.release())
+
+    def _take_batch(self) -> list[_Job]:
+        """取出最多 ``batch_size`` 个相同股票背景的排队任务"""
+        with self._lock:
+            if not self._pending:
+                return []
+            context = next(iter(self._pending.values())).stock_context
+            batch = []
+            for key, job in list(self._pending.items()):
+                if job.stock_context != context:
+                    continue
+                batch.append(job)
+                del self._pending[key]
+                self._inflight[key] = job
+                if len(batch) >= self.batch_size:
+                    break
+            return batch
+
+    async def _process(self, batch: list[_Job]) -> None:
+        items = [job.item for job in batch]
+        scored: dict[str, dict[str, Any]] = {}
+        try:
+            self.llm_calls += 1
+            sentiments = await self.analyzer(items, batch[0].stock_context)
+            by_id = {s.news_id: s for s in sentiments}
+            scored = {
+                job.key: _to_result(by_id[job.item.id])
+                for job in batch
+                if job.item.id in by_id
+            }
+        except Exception as e:
+            logger.warning(f"LLM sentiment batch of {len(batch)} failed: {e}")
+
+        if scored and self.cache is not None:
+            try:
+                self.cache.put_many(scored)
+            except Exception as e:
+                logger.warning(f"Failed to persist sentiment results: {e}")
+
+        error: Exception | None = None
+        missing = [job for job in batch if job.key not in scored]
+        if missing:
+            try:
+                fallback = self.fallback([job.item for job in missing])
+                by_id = {s.news_id: s for s in fallback}
+                for job in missing:
+                    scored[job.key] = _to_result(by_id[job.item.id])
+            except Exception as e:
+                error = e
+
+        with self._lock:
+            for job in batch:
+                self._inflight.pop(job.key, None)
+        for job in batch:
+            if job.key in scored:
+                job.future.set_result(scored[job.key])
+            else:
+                job.future.set_exception(error or KeyError(job.item.id))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "inflight": len(self._inflight),
+                "llm_calls": self.llm_calls,
+                "cache_hits": self.cache_hits,
+                "deduplicated": self.deduplicated,
+            }
+
+
+_sentiment_queue: SentimentJobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_sentiment_queue() -> SentimentJobQueue:
+    """Get the process-wide sentiment job queue."""
+    global _sentiment_queue
+    if _sentiment_queue is None:
+        with _queue_lock:
+            if _sentiment_queue is None:
+                from .service import get_news_service
+                from .storage import get_news_storage
+
+                service = get_news_service()
+                cache = None
+                try:
+                    cache = SentimentCache(
+                        get_news_storage().cache_dir / "sentiment_cache.db"
+                    )
+                except Exception as e:
+                    logger.warning(f"Sentiment cache unavailable: {e}")
+                _sentiment_queue = SentimentJobQueue(
+                    analyzer=service._llm_analyze_sentiment,
+                    fallback=service._simple_sentiment_analysis,
+                    cache=cache,
+                    batch_size=int(os.getenv("NEWS_SENTIMENT_BATCH_SIZE", "20")),
+                    max_inflight=int(os.getenv("NEWS_SENTIMENT_MAX_INFLIGHT", "2")),
+                    flush_delay=float(os.getenv("NEWS_SENTIMENT_FLUSH_DELAY", "0.2")),
+                )
+    return _sentiment_queue
@@ -24,6 +24,7 @@ from .schemas import (
     NewsSentiment,
     SentimentType,
 )
+from .sentiment_queue import get_sentiment_queue
 from .storage import get_news_storage
 
 logger = logging.getLogger(__name__)
@@ -557,29 +558,25 @@ class NewsService:
         news_items: list[NewsItem],
         stock_context: str | None = None,
     ) -> None:
-        """后台异步分析情绪（不阻塞请求）"""
+        """提交到情绪任务队列后台分析（不阻塞请求），完成后写回存储"""
         missing = [item for item in news_items if item.sentiment is None]
         if not missing:
             return
         try:
-            asyncio.create_task(
-                self._background_analyze_sentiment(missing, stock_context)
+            get_sentiment_queue().submit(
+                missing, stock_context, on_done=self._persist_sentiments
             )
         except Exception as e:
             logger.warning(f"Failed to schedule sentiment analysis: {e}")
 
-    async def _background_analyze_sentiment(
+    def _persist_sentiments(
         self,
         news_items: list[NewsItem],
-        stock_context: str | None = None,
+        sentiments: list[NewsSentiment],
     ) -> None:
-        """后台执行情绪分析并持久化结果"""
-        try:
-            sentiments = await self.analyze_news_sentiment(news_items, stock_context)
-            self._apply_sentiments_to_news(news_items, sentiments)
-            self._save_news_to_storage(news_items)
-        except Exception as e:
-            logger.warning(f"Background sentiment analysis failed: {e}")
+        """将后台分析结果写入新闻并持久化"""
+        self._apply_sentiments_to_news(news_items, sentiments)
+        self._save_news_to_storage(news_items)
 
     async def backfill_cached_news_sentiment(
         self,
@@ -588,6 +585,9 @@ class NewsService:
     ) -> dict[str, Any]:
         """批量补齐缓存新闻的情绪字段
 
+        所有文件中缺失情绪的新闻一次性提交到情绪任务队列（跨文件去重、
+        命中哈希缓存的直接复用），再逐个写回有变化的文件。
+
         Args:
             days: 处理最近 N 天的缓存文件
             sources: 指定来源（sina/tushare），不传则处理全部
@@ -600,8 +600,7 @@ class NewsService:
 
         total_files = len(files)
         total_items = 0
-        updated_items = 0
-        updated_files = 0
+        loaded: list[tuple[Any, list[NewsItem], list[NewsItem]]] = []
 
         for file_path in files:
             try:
@@ -612,20 +611,24 @@ class NewsService:
 
                 news_items = [NewsItem(**item) for item in raw_items]
                 missing = [item for item in news_items if item.sentiment is None]
-                if not missing:
-                    continue
+                if missing:
+                    loaded.append((file_path, news_items, missing))
+            except Exception as e:
+                logger.warning(f"Failed to load {file_path} for sentiment backfill: {e}")
 
-                sentiments = await self.analyze_news_sentiment(missing)
-                self._apply_sentiments_to_news(missing, sentiments)
+        all_missing = [item for _, _, missing in loaded for item in missing]
+        sentiments = await get_sentiment_queue().analyze(all_missing)
+        self._apply_sentiments_to_news(all_missing, sentiments)
 
+        updated_items = 0
+        updated_files = 0
+        for file_path, news_items, missing in loaded:
+            try:
+                storage.save_news_file(file_path, [item.model_dump() for item in news_items])
                 updated_items += len(missing)
                 updated_files += 1
-
-                updated_raw = [item.model_dump() for item in news_items]
-                storage.save_news_file(file_path, updated_raw)
             except Exception as e:
                 logger.warning(f"Failed to backfill sentiment for {file_path}: {e}")
-                continue
 
         storage.force_refresh_cache()
 
@@ -640,16 +643,32 @@ class NewsService:
         self,
         keyword: str,
         limit: int = 20,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
     ) -> list[NewsItem]:
         """按关键词搜索新闻
 
+        优先走本地归档的全文索引（覆盖全部历史文件，按相关度排序），
+        索引不可用时退化为对最新市场新闻的子串匹配。
+
         Args:
             keyword: 搜索关键词
             limit: 返回数量
+            start_time: 发布时间下限（可选）
+            end_time: 发布时间上限（可选）
 
         Returns:
             新闻列表
         """
+        try:
+            storage = get_news_storage()
+            items = await asyncio.to_thread(
+                storage.search_news, keyword, limit, start_time, end_time
+            )
+            return [NewsItem(**item) for item in items]
+        except Exception as e:
+            logger.warning(f"News index search failed, falling back to scan: {e}")
+
         # 获取市场新闻
         all_news = await self.get_market_news(NewsCategory.ALL, limit * 2)
 
@@ -658,8 +677,12 @@ class NewsService:
         matched = [
             news
             for news in all_news
-            if keyword_lower in news.title.lower()
-            or keyword_lower in news.content.lower()
+            if (
+                keyword_lower in news.title.lower()
+                or keyword_lower in news.content.lower()
+            )
+            and (start_time is None or (news.publish_time and news.publish_time >= start_time))
+            and (end_time is None or (news.publish_time and news.publish_time <= end_time))
         ]
 
         return matched[:limit]
@@ -671,45 +694,39 @@ class NewsService:
     ) -> list[NewsSentiment]:
         """分析新闻情绪
 
-        使用 LLM 分析新闻情绪倾向。
+        通过进程内情绪任务队列分析：相同标题只分析一次，结果按内容哈希缓存，
+        并与其他请求的待分析新闻合并为批量 LLM 调用。
 
         Args:
             news_items: 新闻列表
             stock_context: 股票背景信息（可选）
 
         Returns:
-            情绪分析结果列表
+            情绪分析结果列表（与 news_items 一一对应）
         """
         if not news_items:
             return []
+        return await get_sentiment_queue().analyze(news_items, stock_context)
 
-        results: list[NewsSentiment] = []
-
-        # 构建分析 prompt
-        prompt = self._build_sentiment_prompt(news_items, stock_context)
-
-        try:
-            if self.llm_client:
-                result = await self.llm_client.chat(
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                )
-                response = (
-                    result.get("content", "")
-                    if isinstance(result, dict)
-                    else str(result)
-                )
+    async def _llm_analyze_sentiment(
+        self,
+        news_items: list[NewsItem],
+        stock_context: str | None = None,
+    ) -> list[NewsSentiment]:
+        """单次 LLM 调用分析一批新闻（由情绪任务队列调用）
 
-                # 解析结果
-                results = self._parse_sentiment_response(response, news_items)
-            else:
-                # 降级：使用简单规则
-                results = self._simple_sentiment_analysis(news_items)
-        except Exception as e:
-            logger.warning(f"LLM sentiment analysis failed: {e}")
-            results = self._simple_sentiment_analysis(news_items)
+        LLM 不可用或调用失败时抛出异常，由队列降级为规则分析。
+        """
+        if not self.llm_client:
+            raise RuntimeError("LLM client unavailable")
 
-        return results
+        prompt = self._build_sentiment_prompt(news_items, stock_context)
+        result = await self.llm_client.chat(
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+        )
+        response = result.get("content", "") if isinstance(result, dict) else str(result)
+        return self._parse_sentiment_response(response, news_items)
 
     async def summarize_news(
         self,
@@ -1228,7 +1245,7 @@ class NewsService:
         news_text = "\n".join(
             [
                 f"{i + 1}. [ID:{item.id}] {item.title}"
-                for i, item in enumerate(news_items[:10])  # 限制数量避免 token 过多
+                for i, item in enumerate(news_items)  # 批量大小由情绪任务队列控制
             ]
         )
 
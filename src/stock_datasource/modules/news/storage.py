@@ -11,6 +11,8 @@ from pathlib import Path
 from threading import Lock
 from typing import Any, Optional
 
+from .search_index import NewsSearchIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +27,8 @@ class NewsFileStorage:
     ├── tushare/
     │   └── ...
     └── cache/
-        └── latest.json          # 最新缓存（快速读取）
+        ├── latest.json          # 最新缓存（快速读取）
+        └── search_index.db      # 全文检索倒排索引（覆盖全部归档文件）
     """
 
     _instance: Optional["NewsFileStorage"] = None
@@ -67,6 +70,9 @@ class NewsFileStorage:
         self._memory_cache_time: datetime | None = None
         self._memory_cache_ttl = 60  # 内存缓存有效期（秒）
 
+        self._search_index: NewsSearchIndex | None = None
+        self._search_index_lock = Lock()
+
         self._initialized = True
         logger.info(f"NewsFileStorage initialized at: {self.base_dir}")
 
@@ -94,7 +100,7 @@ class NewsFileStorage:
 
         # 去重合并（支持情绪字段更新）
         new_items = []
-        updated_items = 0
+        updated = []
         for item in news_list:
             news_id = item.get("id")
             if not news_id:
@@ -104,18 +110,19 @@ class NewsFileStorage:
             existing_item = existing_by_id.get(news_id)
             if existing_item:
                 if self._merge_sentiment_fields(existing_item, item):
-                    updated_items += 1
+                    updated.append(existing_item)
                 continue
             new_items.append(item)
             existing_by_id[news_id] = item
 
-        if new_items or updated_items:
+        if new_items or updated:
             merged = existing + new_items
             self._save_json(file_path, merged)
             logger.info(
                 f"Saved {len(new_items)} new {source} news to {file_path}; "
-                f"updated {updated_items} items"
+                f"updated {len(updated)} items"
             )
+            self._index_items(new_items + updated, file_path)
 
             # 更新缓存
             self._update_cache()
@@ -259,6 +266,68 @@ class NewsFileStorage:
     def save_news_file(self, file_path: Path, news_list: list[dict[str, Any]]):
         """保存指定新闻文件"""
         self._save_json(file_path, news_list)
+        self._index_items(news_list, file_path)
+
+    # ------------------------------------------------------------------
+    # 全文检索
+    # ------------------------------------------------------------------
+
+    def get_search_index(self) -> NewsSearchIndex:
+        """全文检索索引；首次使用时对已有的全部新闻文件建索引"""
+        if self._search_index is not None:
+            return self._search_index
+        with self._search_index_lock:
+            if self._search_index is None:
+                index = NewsSearchIndex(self.cache_dir / "search_index.db")
+                if not index.is_built():
+                    files = self.list_news_files()
+                    total = sum(
+                        index.add(self.load_news_file(f), f.parent.name, str(f))
+                        for f in files
+                    )
+                    index.mark_built()
+                    logger.info(
+                        f"Built news search index: {total} items from {len(files)} files"
+                    )
+                self._search_index = index
+        return self._search_index
+
+    def _index_items(self, items: list[dict[str, Any]], file_path: Path) -> None:
+        """增量更新全文索引（失败不影响文件写入）"""
+        if not items:
+            return
+        try:
+            self.get_search_index().add(items, file_path.parent.name, str(file_path))
+        except Exception as e:
+            logger.warning(f"Failed to index news from {file_path}: {e}")
+
+    def search_news(
+        self,
+        keyword: str,
+        limit: int = 20,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        source: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """按关键词检索全部归档新闻，按相关度排序
+
+        Args:
+            keyword: 搜索关键词（中文按二元组、英文/数字按词匹配，需全部命中）
+            limit: 返回数量
+            start_time: 发布时间下限（可选）
+            end_time: 发布时间上限（可选）
+            source: 按来源筛选（可选）
+
+        Returns:
+            新闻列表
+        """
+        return self.get_search_index().search(
+            keyword,
+            limit=limit,
+            start_time=start_time,
+            end_time=end_time,
+            source=source if source and source != "all" else None,
+        )
 
     def _update_cache(self, days: int = 3):
         """聚合最近 N 天的新闻到缓存文件
@@ -333,6 +402,8 @@ class NewsFileStorage:
                         file_date = datetime.strptime(file_path.stem, "%Y-%m-%d")
                         if file_date < cutoff:
                             file_path.unlink()
+                            if self._search_index is not None:
+                                self._search_index.remove_file(str(file_path))
                             cleaned_count += 1
                             logger.debug(f"Cleaned old file: {file_path}")
                     except ValueError:
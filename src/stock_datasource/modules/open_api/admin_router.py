@@ -142,3 +142,13 @@ async def get_usage_stats(
         period=f"最近 {days} 天",
         total_calls=total_calls,
     )
+
+
+@admin_router.get("/telemetry")
+async def get_telemetry_stats(
+    _admin: dict = Depends(require_admin),
+):
+    """Get telemetry sink queue depth and drop/spill counters."""
+    from stock_datasource.services.telemetry_sink import get_telemetry_sink
+
+    return get_telemetry_sink().stats()
@@ -5,9 +5,10 @@ Reuses MCP API Key (sk-xxx) validation. Supports:
 - Query:  ?api_key=sk-xxx
 """
 
+import asyncio
 import logging
+import threading
 import time
-from collections import defaultdict
 
 from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -66,21 +67,102 @@ async def require_api_key(
 
 
 # ---------------------------------------------------------------------------
-# In-process sliding-window rate limiter
+# Sliding-window-counter rate limiter (Redis-shared, in-process fallback)
 # ---------------------------------------------------------------------------
+#
+# Each window (per-minute, per-day) keeps one counter per fixed bucket. The
+# sliding count is estimated as ``prev_bucket * overlap + current_bucket``,
+# where ``overlap`` is the fraction of the previous bucket still inside the
+# window. Every check is O(1) regardless of the limit.
+
+_WINDOWS = (
+    ("min", 60, "超过每分钟速率限制 ({limit}/min)"),
+    ("day", 86400, "超过每日速率限制 ({limit}/day)"),
+)
+
+# Records already-granted fast-path hits (``pending`` for the current bucket,
+# ``pending_prev`` for hits granted before the bucket rolled over), then checks
+# and counts the current request in every window atomically.
+# KEYS: cur_1, prev_1, cur_2, prev_2, ...
+# ARGV: per window -> limit, window_seconds, prev_weight, pending, pending_prev
+# Returns: {denied_window_index (0 = allowed), estimate_1, estimate_2, ...}
+_SLIDING_WINDOW_LUA = """
+local n = #KEYS / 2
+local estimates = {}
+local denied = 0
+for i = 1, n do
+    local cur_key = KEYS[2 * i - 1]
+    local prev_key = KEYS[2 * i]
+    local limit = tonumber(ARGV[5 * i - 4])
+    local window = tonumber(ARGV[5 * i - 3])
+    local weight = tonumber(ARGV[5 * i - 2])
+    local pending = tonumber(ARGV[5 * i - 1])
+    local pending_prev = tonumber(ARGV[5 * i])
+    local cur = tonumber(redis.call('GET', cur_key) or '0')
+    if pending > 0 then
+        cur = redis.call('INCRBY', cur_key, pending)
+        redis.call('EXPIRE', cur_key, window * 2)
+    end
+    local prev = tonumber(redis.call('GET', prev_key) or '0')
+    if pending_prev > 0 then
+        prev = redis.call('INCRBY', prev_key, pending_prev)
+        redis.call('EXPIRE', prev_key, window)
+    end
+    local estimate = prev * weight + cur
+    estimates[i] = tostring(estimate)
+    if denied == 0 and estimate + 1 > limit then
+        denied = i
+    end
+end
+if denied == 0 then
+    for i = 1, n do
+        local cur_key = KEYS[2 * i - 1]
+        redis.call('INCR', cur_key)
+        redis.call('EXPIRE', cur_key, tonumber(ARGV[5 * i - 3]) * 2)
+        estimates[i] = tostring(tonumber(estimates[i]) + 1)
+    end
+end
+local result = {denied}
+for i = 1, n do
+    result[i + 1] = estimates[i]
+end
+return result
+"""
+
+
+def _bucket(now: float, window: int) -> tuple[int, float]:
+    """Return (bucket index, weight of the previous bucket) for ``now``."""
+    bucket = int(now // window)
+    prev_weight = 1.0 - (now - bucket * window) / window
+    return bucket, prev_weight
 
 
 class _SlidingWindowRateLimiter:
-    """Simple in-process sliding-window rate limiter.
+    """In-process sliding-window-counter rate limiter.
 
-    Keyed by (api_key_id, api_path). Tracks per-minute and per-day windows.
-    For multi-instance deployments, replace with Redis-backed implementation.
+    Keyed by (api_key_id, api_path). Tracks per-minute and per-day windows
+    with two counters each, so a check is constant time. Used directly when
+    Redis is unavailable and as the single-process reference behaviour.
     """
 
     def __init__(self):
-        # {key: [timestamp, ...]}
-        self._minute_windows: dict[str, list[float]] = defaultdict(list)
-        self._day_windows: dict[str, list[float]] = defaultdict(list)
+        # {(key, window_name): [bucket, current_count, previous_count]}
+        self._counters: dict[tuple[str, str], list[int]] = {}
+        # check() runs on worker threads; the check and the increment must
+        # be atomic or concurrent requests can both pass the last slot
+        self._lock = threading.Lock()
+
+    def _estimate(self, key: str, name: str, window: int, now: float) -> float:
+        bucket, prev_weight = _bucket(now, window)
+        state = self._counters.get((key, name))
+        if state is None:
+            return 0.0
+        if state[0] != bucket:
+            # Roll the buckets forward
+            state[2] = state[1] if state[0] == bucket - 1 else 0
+            state[1] = 0
+            state[0] = bucket
+        return state[2] * prev_weight + state[1]
 
     def check(
         self,
@@ -92,41 +174,242 @@ class _SlidingWindowRateLimiter:
         """Check rate limit. Returns (allowed, error_message)."""
         now = time.time()
         key = f"{api_key_id}:{api_path}"
+        limits = {"min": limit_per_min, "day": limit_per_day}
+
+        with self._lock:
+            for name, window, message in _WINDOWS:
+                limit = limits[name]
+                if self._estimate(key, name, window, now) + 1 > limit:
+                    return False, message.format(limit=limit)
+
+            for name, window, _ in _WINDOWS:
+                state = self._counters.setdefault(
+                    (key, name), [_bucket(now, window)[0], 0, 0]
+                )
+                state[1] += 1
+
+        return True, ""
+
+    def cleanup(self):
+        """Remove counters whose windows have fully expired."""
+        now = time.time()
+        with self._lock:
+            for (key, name), state in list(self._counters.items()):
+                window = 60 if name == "min" else 86400
+                if state[0] < _bucket(now, window)[0] - 1:
+                    del self._counters[(key, name)]
+
+
+class _RedisRateLimiter:
+    """Sliding-window-counter rate limiter shared across API processes.
+
+    Counters live in Redis and are checked/updated by one Lua script, so all
+    uvicorn workers enforce one combined limit. Keys that are clearly under
+    their limit take an in-process fast path: each process may admit up to
+    ``fast_path_fraction`` of the remaining headroom (as last seen in Redis)
+    locally for ``sync_interval`` seconds, then reports those hits on its next
+    Redis round-trip. When Redis is unavailable, checks fall back to the
+    in-process limiter and unreported hits are kept for the next round-trip.
+
+    Stale per-key state is dropped every ``cleanup_interval`` seconds as part
+    of a regular check, so memory stays bounded by the keys in active use.
+    """
+
+    KEY_PREFIX = "stock:open_api_rl"
+
+    def __init__(
+        self,
+        fast_path_fraction: float = 0.1,
+        sync_interval: float = 1.0,
+        redis_getter=None,
+        cleanup_interval: float = 300.0,
+    ):
+        self.fast_path_fraction = fast_path_fraction
+        self.sync_interval = sync_interval
+        self.cleanup_interval = cleanup_interval
+        self._next_cleanup = time.time() + cleanup_interval
+        self._redis_getter = redis_getter
+        self._script = None
+        self._script_client = None
+        self._local = _SlidingWindowRateLimiter()
+        self._lock = threading.Lock()
+        # {key: {"buckets": (..), "headroom": [..], "pending": [..], "synced_at": float}}
+        self._fast: dict[str, dict] = {}
+
+    def _get_redis(self):
+        if self._redis_getter is not None:
+            return self._redis_getter()
+        try:
+            from stock_datasource.services.cache_service import get_cache_service
+
+            return get_cache_service()._get_redis()  # noqa: SLF001
+        except Exception:
+            return None
+
+    def _get_script(self, redis):
+        if self._script is None or self._script_client is not redis:
+            self._script = redis.register_script(_SLIDING_WINDOW_LUA)
+            self._script_client = redis
+        return self._script
+
+    def _try_fast_path(
+        self, key: str, buckets: tuple[int, ...], limits: tuple[int, ...], now: float
+    ) -> bool:
+        state = self._fast.get(key)
+        if (
+            state is None
+            or state["buckets"] != buckets
+            or now - state["synced_at"] > self.sync_interval
+        ):
+            return False
+        for i in range(len(limits)):
+            budget = int(state["headroom"][i] * self.fast_path_fraction)
+            if state["pending"][i] + 1 > budget:
+                return False
+        for i in range(len(limits)):
+            state["pending"][i] += 1
+        return True
+
+    def _fast_check(
+        self, key: str, limits: tuple[int, ...], now: float
+    ) -> tuple[bool, list[tuple[int, float]]]:
+        """Try the in-process fast path. Returns (granted, bucket info)."""
+        bucket_info = [_bucket(now, window) for _, window, _ in _WINDOWS]
+        buckets = tuple(b for b, _ in bucket_info)
+        with self._lock:
+            return self._try_fast_path(key, buckets, limits, now), bucket_info
+
+    def check(
+        self,
+        api_key_id: str,
+        api_path: str,
+        limit_per_min: int,
+        limit_per_day: int,
+    ) -> tuple[bool, str]:
+        """Check rate limit. Returns (allowed, error_message).
+
+        May block on a Redis round-trip; use :meth:`acheck` from async code.
+        """
+        now = time.time()
+        key = f"{api_key_id}:{api_path}"
+        limits = (limit_per_min, limit_per_day)
+        granted, bucket_info = self._fast_check(key, limits, now)
+        if granted:
+            return True, ""
+        return self._sync_check(api_key_id, api_path, limits, bucket_info, now)
+
+    async def acheck(
+        self,
+        api_key_id: str,
+        api_path: str,
+        limit_per_min: int,
+        limit_per_day: int,
+    ) -> tuple[bool, str]:
+        """Async :meth:`check`: the Redis round-trip runs in a worker thread."""
+        now = time.time()
+        key = f"{api_key_id}:{api_path}"
+        limits = (limit_per_min, limit_per_day)
+        granted, bucket_info = self._fast_check(key, limits, now)
+        if granted:
+            return True, ""
+        return await asyncio.to_thread(
+            self._sync_check, api_key_id, api_path, limits, bucket_info, now
+        )
+
+    def _sync_check(
+        self,
+        api_key_id: str,
+        api_path: str,
+        limits: tuple[int, ...],
+        bucket_info: list[tuple[int, float]],
+        now: float,
+    ) -> tuple[bool, str]:
+        """Check and count the request in Redis, reporting fast-path hits."""
+        if now >= self._next_cleanup:
+            self._next_cleanup = now + self.cleanup_interval
+            self.cleanup()
 
-        # --- per-minute ---
-        minute_ago = now - 60
-        window = self._minute_windows[key]
-        # Prune old entries
-        window[:] = [t for t in window if t > minute_ago]
-        if len(window) >= limit_per_min:
-            return False, f"超过每分钟速率限制 ({limit_per_min}/min)"
-        window.append(now)
-
-        # --- per-day ---
-        day_ago = now - 86400
-        day_window = self._day_windows[key]
-        day_window[:] = [t for t in day_window if t > day_ago]
-        if len(day_window) >= limit_per_day:
-            return False, f"超过每日速率限制 ({limit_per_day}/day)"
-        day_window.append(now)
+        key = f"{api_key_id}:{api_path}"
+        buckets = tuple(b for b, _ in bucket_info)
+        with self._lock:
+            state = self._fast.pop(key, None)
 
+        # Hand unreported fast-path hits to Redis, attributed to the bucket
+        # they were granted in (hits older than the previous bucket no longer
+        # affect any window).
+        pending = [0] * len(_WINDOWS)
+        pending_prev = [0] * len(_WINDOWS)
+        if state is not None:
+            for i, (old, new) in enumerate(zip(state["buckets"], buckets)):
+                if old == new:
+                    pending[i] = state["pending"][i]
+                elif old == new - 1:
+                    pending_prev[i] = state["pending"][i]
+
+        redis = self._get_redis()
+        if redis is None:
+            self._keep_unreported(key, state)
+            return self._local.check(api_key_id, api_path, *limits)
+
+        keys: list[str] = []
+        args: list = []
+        for (name, window, _), (bucket, prev_weight), limit, hits, prev_hits in zip(
+            _WINDOWS, bucket_info, limits, pending, pending_prev
+        ):
+            keys.append(f"{self.KEY_PREFIX}:{key}:{name}:{bucket}")
+            keys.append(f"{self.KEY_PREFIX}:{key}:{name}:{bucket - 1}")
+            args.extend([limit, window, prev_weight, hits, prev_hits])
+
+        try:
+            result = self._get_script(redis)(keys=keys, args=args)
+        except Exception as e:
+            logger.warning(f"Redis rate limit check failed, using local limiter: {e}")
+            self._keep_unreported(key, state)
+            return self._local.check(api_key_id, api_path, *limits)
+
+        denied = int(result[0])
+        estimates = [float(v) for v in result[1:]]
+        if denied:
+            _, _, message = _WINDOWS[denied - 1]
+            return False, message.format(limit=limits[denied - 1])
+
+        with self._lock:
+            self._fast[key] = {
+                "buckets": buckets,
+                "headroom": [max(lim - est, 0) for lim, est in zip(limits, estimates)],
+                "pending": [0] * len(_WINDOWS),
+                "synced_at": now,
+            }
         return True, ""
 
+    def _keep_unreported(self, key: str, state: dict | None) -> None:
+        """Put fast-path hits Redis never saw back, with no fast-path budget.
+
+        They are reported on the next successful round-trip instead of being
+        lost while Redis is unavailable.
+        """
+        if state is None or not any(state["pending"]):
+            return
+        with self._lock:
+            current = self._fast.get(key)
+            if current is not None:
+                # Another thread synced meanwhile; merge into its state
+                for i, (old, new) in enumerate(zip(state["buckets"], current["buckets"])):
+                    if old == new:
+                        current["pending"][i] += state["pending"][i]
+                return
+            state["headroom"] = [0] * len(_WINDOWS)
+            self._fast[key] = state
+
     def cleanup(self):
-        """Remove stale entries (call periodically if needed)."""
+        """Drop stale fast-path state and local counters."""
         now = time.time()
-        day_ago = now - 86400
-        for key in list(self._minute_windows.keys()):
-            self._minute_windows[key] = [
-                t for t in self._minute_windows[key] if t > now - 60
-            ]
-            if not self._minute_windows[key]:
-                del self._minute_windows[key]
-        for key in list(self._day_windows.keys()):
-            self._day_windows[key] = [t for t in self._day_windows[key] if t > day_ago]
-            if not self._day_windows[key]:
-                del self._day_windows[key]
+        with self._lock:
+            for key, state in list(self._fast.items()):
+                if now - state["synced_at"] > max(self.sync_interval, 60):
+                    del self._fast[key]
+        self._local.cleanup()
 
 
 # Global singleton
-rate_limiter = _SlidingWindowRateLimiter()
+rate_limiter = _RedisRateLimiter()
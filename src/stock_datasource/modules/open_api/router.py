@@ -8,9 +8,18 @@ CRITICAL DESIGN CONSTRAINT:
 import json
 import logging
 import time
+from collections.abc import Iterator
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from stock_datasource.core.base_service import (
+    QueryShape,
+    query_shape,
+    streams_natively,
+    supports_pushdown,
+)
 
 from .dependencies import rate_limiter, require_api_key
 from .schemas import EndpointInfo, EndpointListResponse, OpenApiResponse
@@ -20,6 +29,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Streaming formats rendered natively by ClickHouse for pushed-down queries
+_STREAM_FORMATS = {"ndjson": "JSONEachRow", "arrow": "ArrowStream"}
+_STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+_NDJSON_CHUNK_ROWS = 1000
+
 
 def _get_plugin_service(plugin_name: str):
     """Get plugin service instance by name.
@@ -59,12 +76,20 @@ def _get_plugin_method(plugin_name: str, method_name: str):
     "/v1/{plugin_name}/{method_name}",
     response_model=OpenApiResponse,
     summary="调用开放数据接口",
-    description="通过 API Key 调用已开放的 Plugin 数据查询接口",
+    description=(
+        "通过 API Key 调用已开放的 Plugin 数据查询接口。"
+        "limit/offset/fields 会尽量下推为 SQL 的 LIMIT/OFFSET/SELECT；"
+        "format=ndjson 或 arrow 时以流式分块返回"
+    ),
 )
 async def call_open_api(
     plugin_name: str,
     method_name: str,
     request: Request,
+    limit: int | None = Query(default=None, ge=1, description="返回记录数上限（不超过策略 max_records）"),
+    offset: int = Query(default=0, ge=0, description="跳过的记录数，配合 next_offset 翻页"),
+    fields: str | None = Query(default=None, description="返回字段，逗号分隔"),
+    format: str = Query(default="json", pattern="^(json|ndjson|arrow)$", description="响应格式"),
     auth: tuple[dict, str] = Depends(require_api_key),
 ):
     """Unified open API entry point.
@@ -74,8 +99,9 @@ async def call_open_api(
     2. Verify plugin exists in PluginManager (code-level isolation)
     3. Check access policy (is_enabled)
     4. Rate limiting
-    5. Forward to plugin service method
-    6. Response wrapping + usage logging
+    5. Forward to plugin service method, with the row window and column
+       projection pushed into its SQL when the method supports it
+    6. Response wrapping (JSON or streamed NDJSON/Arrow) + usage logging
     """
     user, api_key_id = auth
     api_path = f"{plugin_name}/{method_name}"
@@ -131,7 +157,7 @@ async def call_open_api(
         )
 
     # --- 3. Rate limiting ---
-    allowed, limit_msg = rate_limiter.check(
+    allowed, limit_msg = await rate_limiter.acheck(
         api_key_id=api_key_id,
         api_path=api_path,
         limit_per_min=policy.get("rate_limit_per_min", 60),
@@ -157,45 +183,111 @@ async def call_open_api(
         body = {}
 
     # --- 5. Call plugin method ---
+    max_records = policy.get("max_records", 5000)
+    row_limit = min(limit or max_records, max_records)
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    method_func = method_info["method"]
+    pushdown = supports_pushdown(method_func)
+    streaming = format in _STREAM_FORMATS
+    # Native streaming skips the method body, so only for methods that
+    # return their rows unconverted; others stream their own records
+    native = streaming and streams_natively(method_func)
+
+    if format == "arrow" and not native:
+        raise HTTPException(status_code=400, detail=f"接口 '{api_path}' 不支持 arrow 格式")
+
     try:
-        method_func = method_info["method"]
-        result = method_func(**body)
-    except TypeError as e:
+        shape = None
+        if pushdown:
+            # One extra row tells whether the JSON response was truncated
+            shape = QueryShape(
+                limit=row_limit if streaming else row_limit + 1,
+                offset=offset,
+                columns=columns,
+                capture=native,
+            )
+            with query_shape(shape):
+                result = method_func(**body)
+        else:
+            result = method_func(**body)
+    except (TypeError, ValueError) as e:
         _log_error(
             open_api_svc, api_path, user, api_key_id, 400, str(e), client_ip, start_time
         )
         raise HTTPException(status_code=400, detail=f"参数错误: {e}")
     except Exception as e:
+        missing = _unknown_fields(e, columns)
+        if missing:
+            message = _unknown_fields_message(missing)
+            _log_error(
+                open_api_svc, api_path, user, api_key_id, 400, message, client_ip, start_time
+            )
+            raise HTTPException(status_code=400, detail=f"参数错误: {message}")
         _log_error(
             open_api_svc, api_path, user, api_key_id, 500, str(e), client_ip, start_time
         )
         raise HTTPException(status_code=500, detail=f"查询执行失败: {e}")
 
-    # --- 6. Response wrapping + truncation ---
-    max_records = policy.get("max_records", 5000)
-    record_count, truncated, data = _process_result(result, max_records)
-
-    elapsed_ms = int((time.time() - start_time) * 1000)
-
-    # Async usage log (fire-and-forget)
-    try:
-        open_api_svc.log_usage(
-            api_path=api_path,
-            user_id=user.get("id", ""),
-            api_key_id=api_key_id,
-            record_count=record_count,
-            response_time_ms=elapsed_ms,
-            status_code=200,
-            client_ip=client_ip,
+    def _log_success(record_count: int) -> None:
+        try:
+            open_api_svc.log_usage(
+                api_path=api_path,
+                user_id=user.get("id", ""),
+                api_key_id=api_key_id,
+                record_count=record_count,
+                response_time_ms=int((time.time() - start_time) * 1000),
+                status_code=200,
+                client_ip=client_ip,
+            )
+        except Exception:
+            pass
+
+    if not (shape and shape.applied):
+        # Not pushed down: apply the window and projection to the result
+        try:
+            result = _window_result(result, offset, columns)
+        except ValueError as e:
+            _log_error(
+                open_api_svc, api_path, user, api_key_id, 400, str(e), client_ip, start_time
+            )
+            raise HTTPException(status_code=400, detail=f"参数错误: {e}")
+
+    # --- 6a. Streaming response ---
+    if streaming:
+        if shape and shape.captured_sql:
+            try:
+                body_iter = _stream_query(shape.captured_sql, format)
+            except Exception as e:
+                missing = _unknown_fields(e, columns)
+                if missing:
+                    message = _unknown_fields_message(missing)
+                    _log_error(
+                        open_api_svc, api_path, user, api_key_id, 400, message, client_ip, start_time
+                    )
+                    raise HTTPException(status_code=400, detail=f"参数错误: {message}")
+                _log_error(
+                    open_api_svc, api_path, user, api_key_id, 500, str(e), client_ip, start_time
+                )
+                raise HTTPException(status_code=500, detail=f"查询执行失败: {e}")
+        elif format == "ndjson":
+            body_iter = _ndjson_chunks(_process_result(result, row_limit)[2])
+        else:
+            raise HTTPException(status_code=400, detail=f"接口 '{api_path}' 不支持 arrow 格式")
+        return StreamingResponse(
+            _count_streamed(body_iter, format, _log_success),
+            media_type=_STREAM_MEDIA_TYPES[format],
         )
-    except Exception:
-        pass
+
+    # --- 6b. Response wrapping + truncation ---
+    record_count, truncated, data = _process_result(result, row_limit)
+    _log_success(record_count)
 
     return OpenApiResponse(
         status="success",
         data=data,
         record_count=record_count,
         truncated=truncated,
+        next_offset=offset + record_count if truncated else None,
     )
 
 
@@ -306,6 +398,96 @@ def _process_result(result: Any, max_records: int) -> tuple:
     return record_count, truncated, data
 
 
+def _window_result(result: Any, offset: int, columns: list[str] | None) -> Any:
+    """Apply offset and column projection to an already materialized result.
+
+    Raises ValueError for requested columns the result does not have, like
+    ClickHouse does for pushed-down projections.
+    """
+    import pandas as pd
+
+    if isinstance(result, pd.DataFrame):
+        if columns:
+            missing = [c for c in columns if c not in result.columns]
+            if missing:
+                raise ValueError(_unknown_fields_message(missing))
+        if offset:
+            result = result.iloc[offset:]
+        if columns:
+            result = result[columns]
+    elif isinstance(result, list):
+        if columns:
+            known = {k for row in result if isinstance(row, dict) for k in row}
+            missing = [c for c in columns if c not in known]
+            if result and missing:
+                raise ValueError(_unknown_fields_message(missing))
+        if offset:
+            result = result[offset:]
+        if columns:
+            result = [
+                {k: row[k] for k in columns if k in row} if isinstance(row, dict) else row
+                for row in result
+            ]
+    return result
+
+
+def _unknown_fields_message(missing: list[str]) -> str:
+    return f"未知字段: {', '.join(missing)}"
+
+
+def _unknown_fields(exc: Exception, columns: list[str] | None) -> list[str]:
+    """Requested ``columns`` that ClickHouse rejected as unknown identifiers."""
+    if not columns:
+        return []
+    response = getattr(exc, "response", None)
+    error_text = f"{getattr(response, 'text', '') or ''}\n{exc}"
+    if "UNKNOWN_IDENTIFIER" not in error_text:
+        return []
+    return [c for c in columns if f"`{c}`" in error_text or f"'{c}'" in error_text]
+
+
+def _stream_query(sql: str, format: str) -> Iterator[bytes]:
+    """Stream a pushed-down query straight from ClickHouse.
+
+    The first chunk is pulled eagerly so query errors surface as a 500
+    instead of a broken response body.
+    """
+    from stock_datasource.models.database import db_client
+
+    chunks = db_client.stream(
+        f"{sql}\nFORMAT {_STREAM_FORMATS[format]}",
+        settings={"output_format_json_quote_64bit_integers": 0},
+    )
+    first = next(chunks, b"")
+
+    def _body() -> Iterator[bytes]:
+        if first:
+            yield first
+        yield from chunks
+
+    return _body()
+
+
+def _ndjson_chunks(data: Any) -> Iterator[bytes]:
+    """Serialize materialized rows as NDJSON, a block of rows at a time."""
+    rows = data if isinstance(data, list) else ([] if data is None else [data])
+    for start in range(0, len(rows), _NDJSON_CHUNK_ROWS):
+        block = rows[start : start + _NDJSON_CHUNK_ROWS]
+        yield "".join(
+            json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in block
+        ).encode("utf-8")
+
+
+def _count_streamed(body: Iterator[bytes], format: str, on_done) -> Iterator[bytes]:
+    """Pass chunks through and log the usage once the stream is complete."""
+    rows = 0
+    for chunk in body:
+        if format == "ndjson":
+            rows += chunk.count(b"\n")
+        yield chunk
+    on_done(rows)
+
+
 def _log_error(
     svc,
     api_path: str,
@@ -16,6 +16,7 @@ class OpenApiResponse(BaseModel):
     message: str | None = None
     record_count: int = 0
     truncated: bool = False
+    next_offset: int | None = None
 
 
 # ---- Access policy schemas ----
@@ -14,11 +14,14 @@ logger = logging.getLogger(__name__)
 _schema_initialized = False
 
 
-def _ensure_tables() -> None:
-    """Ensure api_access_policies and api_usage_log tables exist (lazy init, dual-write)."""
+def _ensure_tables() -> bool:
+    """Ensure api_access_policies and api_usage_log tables exist (lazy init, dual-write).
+
+    Returns True once the schema has been applied.
+    """
     global _schema_initialized
     if _schema_initialized:
-        return
+        return True
 
     schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
     try:
@@ -40,8 +43,10 @@ def _ensure_tables() -> None:
                         )
         _schema_initialized = True
         logger.info("Open API Gateway schema initialized")
+        return True
     except Exception as e:
         logger.error(f"Failed to initialize Open API Gateway schema: {e}")
+        return False
 
 
 class OpenApiService:
@@ -280,33 +285,28 @@ class OpenApiService:
         error_message: str = "",
         client_ip: str = "",
     ) -> None:
-        """Write a usage log entry (fire-and-forget)."""
-        _ensure_tables()
+        """Queue a usage log entry on the batched telemetry sink."""
         try:
-            log_id = str(uuid.uuid4())
-            now = datetime.now()
-            insert_sql = (
-                "INSERT INTO api_usage_log "
-                "(log_id, api_path, api_type, user_id, api_key_id, "
-                "record_count, response_time_ms, status_code, error_message, "
-                "client_ip, created_at) "
-                "VALUES (%(log_id)s, %(api_path)s, 'http', %(user_id)s, "
-                "%(api_key_id)s, %(record_count)s, %(response_time_ms)s, "
-                "%(status_code)s, %(error_message)s, %(client_ip)s, %(now)s)"
+            from stock_datasource.services.telemetry_sink import get_telemetry_sink
+
+            sink = get_telemetry_sink()
+            sink.register_table("api_usage_log", ensure_fn=_ensure_tables)
+            sink.emit(
+                "api_usage_log",
+                {
+                    "log_id": str(uuid.uuid4()),
+                    "api_path": api_path,
+                    "api_type": "http",
+                    "user_id": user_id,
+                    "api_key_id": api_key_id,
+                    "record_count": record_count,
+                    "response_time_ms": response_time_ms,
+                    "status_code": status_code,
+                    "error_message": error_message,
+                    "client_ip": client_ip,
+                    "created_at": datetime.now(),
+                },
             )
-            params = {
-                "log_id": log_id,
-                "api_path": api_path,
-                "user_id": user_id,
-                "api_key_id": api_key_id,
-                "record_count": record_count,
-                "response_time_ms": response_time_ms,
-                "status_code": status_code,
-                "error_message": error_message,
-                "client_ip": client_ip,
-                "now": now,
-            }
-            self.client.primary.execute(insert_sql, params)
         except Exception as e:
             logger.warning(f"Failed to log API usage: {e}")
 
@@ -11,6 +11,7 @@ import numpy as np
 import pandas as pd
 
 from stock_datasource.models.database import db_client
+from stock_datasource.utils.latest_state import get_latest_state_manager, latest_source
 from stock_datasource.strategies.base import TradingSignal
 from stock_datasource.strategies.builtin.market_regime_strategy import RegimeState
 
@@ -220,7 +221,7 @@ class PaperTradingService:
     async def get_positions(self, user_id: str, account_id: str) -> list[Position]:
         """获取持仓列表"""
         sql = f"""
-            SELECT * FROM paper_trading_positions FINAL
+            SELECT * FROM {latest_source('paper_trading_positions')}
             WHERE user_id = '{user_id}' AND account_id = '{account_id}'
               AND quantity > 0
         """
@@ -468,7 +469,7 @@ class PaperTradingService:
         # 查询已有持仓
         sql = f"""
             SELECT quantity, avg_cost, first_buy_date
-            FROM paper_trading_positions FINAL
+            FROM {latest_source('paper_trading_positions')}
             WHERE user_id = '{user_id}'
               AND account_id = '{account_id}'
               AND ts_code = '{ts_code}'
@@ -507,7 +508,11 @@ class PaperTradingService:
                 }
             ]
         )
+        self._write_positions(pos_df)
+
+    def _write_positions(self, pos_df: pd.DataFrame) -> None:
         self._db.insert_dataframe("paper_trading_positions", pos_df)
+        get_latest_state_manager().mark_dirty("paper_trading_positions")
 
     async def _clear_position(
         self, user_id: str, account_id: str, ts_code: str
@@ -528,7 +533,7 @@ class PaperTradingService:
                 }
             ]
         )
-        self._db.insert_dataframe("paper_trading_positions", pos_df)
+        self._write_positions(pos_df)
 
     def _update_account_cash(
         self, user_id: str, account_id: str, new_cash: float
@@ -607,56 +612,9 @@ class PaperTradingService:
 
     async def mark_to_market(self, user_id: str, account_id: str) -> None:
         """按最新收盘价更新所有持仓的 current_price 和 unrealized_pnl"""
-        positions = await self.get_positions(user_id, account_id)
-        if not positions:
-            return
-
-        ts_codes = [p.ts_code for p in positions]
-        codes_str = ", ".join(f"'{c}'" for c in ts_codes)
-
-        # 查询每只股票最新收盘价
-        sql = f"""
-            SELECT ts_code, close
-            FROM ods_daily
-            WHERE ts_code IN ({codes_str})
-            ORDER BY ts_code, trade_date DESC
-            LIMIT 1 BY ts_code
-        """
-        try:
-            price_df = self._db.execute_query(sql)
-        except Exception as e:
-            logger.warning(f"Mark-to-market query failed: {e}")
-            return
-
-        if price_df is None or price_df.empty:
-            return
-
-        latest_prices = dict(zip(price_df["ts_code"], price_df["close"].astype(float)))
-
-        # 更新每个持仓的 current_price
-        for pos in positions:
-            new_price = latest_prices.get(pos.ts_code)
-            if new_price is None or new_price <= 0:
-                continue
-
-            unrealized_pnl = (new_price - pos.avg_cost) * pos.quantity
-
-            pos_df = pd.DataFrame(
-                [
-                    {
-                        "user_id": user_id,
-                        "account_id": account_id,
-                        "ts_code": pos.ts_code,
-                        "quantity": pos.quantity,
-                        "avg_cost": pos.avg_cost,
-                        "current_price": new_price,
-                        "unrealized_pnl": unrealized_pnl,
-                        "first_buy_date": pos.first_buy_date,
-                        "last_update": datetime.now(),
-                    }
-                ]
-            )
-            self._db.insert_dataframe("paper_trading_positions", pos_df)
+        self._mark_positions(self._load_valued_positions(
+            self._account_filter([(user_id, account_id)])
+        ))
 
     async def take_daily_snapshot(
         self,
@@ -665,54 +623,205 @@ class PaperTradingService:
         regime: RegimeState | None = None,
     ) -> None:
         """记录每日净值快照（先按市价更新持仓）"""
-        # 先刷新市价
-        await self.mark_to_market(user_id, account_id)
-
-        account = await self.get_account(user_id, account_id)
-        if not account:
-            return
+        self.run_end_of_day_valuation(
+            regime=regime, accounts=[(user_id, account_id)], active_only=False
+        )
 
-        positions = await self.get_positions(user_id, account_id)
-        positions_value = sum(p.market_value for p in positions)
-        total_value = account.current_cash + positions_value
-        total_pnl = total_value - account.initial_capital
-        total_return = total_pnl / account.initial_capital if account.initial_capital > 0 else 0
+    def run_end_of_day_valuation(
+        self,
+        regime: RegimeState | None = None,
+        accounts: list[tuple[str, str]] | None = None,
+        active_only: bool = True,
+        snapshot_date: date | None = None,
+    ) -> dict[str, int]:
+        """批量收盘估值：所有账户一次取持仓+最新价，向量化计算盈亏，每表一次写入
+
+        Args:
+            regime: 写入快照的市场状态（None 时沿用当日已有快照的 regime）
+            accounts: 限定 (user_id, account_id) 列表，None 表示全部账户
+            active_only: 仅估值 status='active' 的账户
+            snapshot_date: 快照日期，默认今天
+
+        Returns:
+            {"accounts": 快照账户数, "positions": 更新持仓数}
+        """
+        snapshot_date = snapshot_date or date.today()
+        if accounts is not None and not accounts:
+            return {"accounts": 0, "positions": 0}
+        account_filter = self._account_filter(accounts)
 
-        # 获取昨日快照计算日收益
-        yesterday_sql = f"""
-            SELECT total_value FROM paper_trading_daily_snapshots FINAL
-            WHERE user_id = '{user_id}'
-              AND account_id = '{account_id}'
-              AND snapshot_date < today()
-            ORDER BY snapshot_date DESC
-            LIMIT 1
+        sql = f"""
+            SELECT user_id, account_id, initial_capital, current_cash
+            FROM paper_trading_accounts FINAL
+            WHERE 1 = 1{account_filter}{" AND status = 'active'" if active_only else ""}
+        """
+        accounts_df = self._db.execute_query(sql)
+        if accounts_df is None or accounts_df.empty:
+            return {"accounts": 0, "positions": 0}
+
+        keys = ["user_id", "account_id"]
+        positions = self._load_valued_positions(account_filter)
+        if positions is not None and not positions.empty:
+            positions = positions.merge(accounts_df[keys], on=keys)
+        updated = self._mark_positions(positions)
+
+        snap = accounts_df[keys].copy()
+        snap["cash"] = accounts_df["current_cash"].astype(float)
+        initial = accounts_df["initial_capital"].astype(float)
+
+        if positions is not None and not positions.empty:
+            held = positions.groupby(keys, as_index=False).agg(
+                positions_value=("market_value", "sum"),
+                position_count=("ts_code", "size"),
+            )
+            snap = snap.merge(held, on=keys, how="left")
+        else:
+            snap["positions_value"] = 0.0
+            snap["position_count"] = 0
+        snap["positions_value"] = snap["positions_value"].fillna(0.0).astype(float)
+        snap["position_count"] = snap["position_count"].fillna(0).astype("int32")
+
+        history = self._snapshot_history(account_filter, snapshot_date)
+        if history is not None and not history.empty:
+            snap = snap.merge(history, on=keys, how="left")
+        else:
+            snap["prev_value"] = np.nan
+            snap["regime"] = ""
+            snap["position_level"] = 0.0
+
+        snap["snapshot_date"] = snapshot_date
+        snap["total_value"] = snap["cash"] + snap["positions_value"]
+        initial = initial.to_numpy()
+        snap["total_pnl"] = snap["total_value"] - initial
+        snap["total_return"] = np.divide(
+            snap["total_pnl"].to_numpy(), initial, out=np.zeros(len(snap)), where=initial > 0
+        )
+        prev_value = pd.to_numeric(snap["prev_value"], errors="coerce")
+        snap["daily_pnl"] = (snap["total_value"] - prev_value).where(prev_value.notna(), 0.0)
+        if regime is not None:
+            snap["regime"] = regime.regime
+            snap["position_level"] = regime.position_level
+        snap["regime"] = snap["regime"].fillna("")
+        snap["position_level"] = snap["position_level"].fillna(0.0).astype(float)
+        snap["created_at"] = datetime.now()
+
+        self._db.insert_dataframe(
+            "paper_trading_daily_snapshots",
+            snap[
+                [
+                    "user_id",
+                    "account_id",
+                    "snapshot_date",
+                    "total_value",
+                    "cash",
+                    "positions_value",
+                    "daily_pnl",
+                    "total_pnl",
+                    "total_return",
+                    "position_count",
+                    "regime",
+                    "position_level",
+                    "created_at",
+                ]
+            ],
+        )
+        return {"accounts": len(snap), "positions": updated}
+
+    @staticmethod
+    def _account_filter(accounts: list[tuple[str, str]] | None) -> str:
+        if accounts is None:
+            return ""
+        if not accounts:
+            # ``IN ()`` is a syntax error; an empty selection matches nothing
+            return " AND 0"
+        pairs = ", ".join(f"('{u}', '{a}')" for u, a in accounts)
+        return f" AND (user_id, account_id) IN ({pairs})"
+
+    def _load_valued_positions(self, account_filter: str) -> pd.DataFrame | None:
+        """一次查询取出持仓，批量取每只股票的最新收盘价，向量化计算市值与浮动盈亏"""
+        from stock_datasource.services.price_resolver import get_price_resolver
+
+        # FINAL: the rows are written back, so a superseded row (e.g. the
+        # position before a sell-out) must never be read here
+        sql = f"""
+            SELECT user_id, account_id, ts_code, quantity, avg_cost,
+                   current_price, first_buy_date
+            FROM paper_trading_positions FINAL
+            WHERE quantity > 0{account_filter}
         """
-        yesterday_df = self._db.execute_query(yesterday_sql)
-        daily_pnl = 0.0
-        if yesterday_df is not None and not yesterday_df.empty:
-            yesterday_value = float(yesterday_df.iloc[0]["total_value"])
-            daily_pnl = total_value - yesterday_value
+        try:
+            df = self._db.execute_query(sql)
+        except Exception as e:
+            logger.warning(f"Mark-to-market query failed: {e}")
+            return None
+        if df is None or df.empty:
+            return df
 
-        snapshot_df = pd.DataFrame(
+        # 收盘估值只用日线收盘价（A股/ETF/港股/指数按代码选表，一次查询）
+        prices = get_price_resolver().resolve(
+            df["ts_code"].unique().tolist(), include_realtime=False, use_cache=False
+        )
+        df["close"] = df["ts_code"].map(
+            {code: info["close"] for code, info in prices.items()}
+        )
+        df["quantity"] = df["quantity"].astype(int)
+        df["avg_cost"] = df["avg_cost"].astype(float)
+        close = pd.to_numeric(df["close"], errors="coerce").fillna(0.0)
+        df["priced"] = close > 0
+        df["current_price"] = np.where(
+            df["priced"], close, df["current_price"].astype(float)
+        )
+        df["unrealized_pnl"] = (df["current_price"] - df["avg_cost"]) * df["quantity"]
+        df["market_value"] = df["current_price"] * df["quantity"]
+        return df
+
+    def _mark_positions(self, positions: pd.DataFrame | None) -> int:
+        """把有新价格的持仓一次性写回"""
+        if positions is None or positions.empty:
+            return 0
+        rows = positions.loc[
+            positions["priced"],
             [
-                {
-                    "user_id": user_id,
-                    "account_id": account_id,
-                    "snapshot_date": date.today(),
-                    "total_value": total_value,
-                    "cash": account.current_cash,
-                    "positions_value": positions_value,
-                    "daily_pnl": daily_pnl,
-                    "total_pnl": total_pnl,
-                    "total_return": total_return,
-                    "position_count": len(positions),
-                    "regime": regime.regime if regime else "",
-                    "position_level": regime.position_level if regime else 0,
-                    "created_at": datetime.now(),
-                }
-            ]
+                "user_id",
+                "account_id",
+                "ts_code",
+                "quantity",
+                "avg_cost",
+                "current_price",
+                "unrealized_pnl",
+                "first_buy_date",
+            ],
+        ].copy()
+        if rows.empty:
+            return 0
+        rows["last_update"] = datetime.now()
+        self._write_positions(rows)
+        return len(rows)
+
+    def _snapshot_history(self, account_filter: str, snapshot_date: date) -> pd.DataFrame | None:
+        """各账户上一快照的总值，以及当日已有快照的 regime"""
+        day = snapshot_date.isoformat()
+        sql = f"""
+            SELECT user_id, account_id,
+                   argMaxIf(total_value, snapshot_date, snapshot_date < '{day}') AS prev_value,
+                   countIf(snapshot_date < '{day}') AS prev_count,
+                   anyIf(regime, snapshot_date = '{day}') AS regime,
+                   anyIf(position_level, snapshot_date = '{day}') AS position_level
+            FROM paper_trading_daily_snapshots FINAL
+            WHERE snapshot_date <= '{day}'{account_filter}
+            GROUP BY user_id, account_id
+        """
+        try:
+            df = self._db.execute_query(sql)
+        except Exception as e:
+            logger.warning(f"Snapshot history query failed: {e}")
+            return None
+        if df is None or df.empty:
+            return df
+        df["prev_value"] = pd.to_numeric(df["prev_value"], errors="coerce").where(
+            df["prev_count"].astype(int) > 0
         )
-        self._db.insert_dataframe("paper_trading_daily_snapshots", snapshot_df)
+        return df.drop(columns=["prev_count"])
 
     # ------------------------------------------------------------------
     # 绩效查询
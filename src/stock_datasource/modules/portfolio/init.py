@@ -158,8 +158,12 @@ def ensure_portfolio_tables():
         raise
 
 
-def ensure_profile_id_column():
-    """Add profile_id column to user_positions if not exists."""
+def ensure_profile_id_column(strict: bool = False):
+    """Add profile_id column to user_positions if not exists.
+
+    Failures are logged and ignored unless ``strict`` is set, which the
+    startup schema bootstrap uses so a failed ALTER is not fingerprinted.
+    """
     try:
         client = db_client
         client.execute(
@@ -168,3 +172,5 @@ def ensure_profile_id_column():
         logger.info("profile_id column ensured in user_positions")
     except Exception as e:
         logger.warning(f"Failed to add profile_id column: {e}")
+        if strict:
+            raise
@@ -28,11 +28,12 @@ def get_enhanced_portfolio_service():
         return None
 
 
-def get_daily_analysis_service():
+def get_daily_analysis_service(user_id: str):
+    # Same service and portfolio_analysis table the scheduled daily run uses
     try:
-        from ...services.daily_analysis_service import DailyAnalysisService
+        from ...services.daily_analysis_service import PortfolioAnalysisService
 
-        return DailyAnalysisService()
+        return PortfolioAnalysisService(user_id=user_id)
     except ImportError as e:
         logger.warning(f"Daily analysis service not available: {e}")
         return None
@@ -348,11 +349,9 @@ async def get_profit_history(
 async def trigger_daily_analysis(current_user: dict = Depends(get_current_user)):
     """Trigger daily analysis."""
     try:
-        analysis_service = get_daily_analysis_service()
+        analysis_service = get_daily_analysis_service(current_user["id"])
         if analysis_service:
-            task_id = await analysis_service.trigger_analysis(
-                user_id=current_user["id"]
-            )
+            task_id = await analysis_service.trigger_analysis()
             return {"task_id": task_id, "success": True}
         else:
             return {
@@ -371,7 +370,7 @@ async def get_analysis(
 ):
     """Get daily analysis."""
     try:
-        analysis_service = get_daily_analysis_service()
+        analysis_service = get_daily_analysis_service(current_user["id"])
         if analysis_service:
             analysis = await analysis_service.get_analysis(date=date)
             if analysis:
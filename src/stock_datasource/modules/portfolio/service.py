@@ -352,15 +352,9 @@ class PortfolioService:
     @staticmethod
     def _is_market_closed() -> bool:
         """判断当前是否已收盘（A股 15:00 后、港股 16:10 后视为收盘）。"""
-        now = datetime.now()
-        hhmm = now.hour * 100 + now.minute
-        weekday = now.weekday()
-        if weekday >= 5:  # 周末
-            return True
-        # A 股 15:05 后视为收盘
-        if hhmm > 1505:
-            return True
-        return False
+        from stock_datasource.services.price_resolver import is_market_closed
+
+        return is_market_closed()
 
     async def _batch_get_latest_prices(
         self, ts_codes: list[str]
@@ -369,77 +363,25 @@ class PortfolioService:
 
         Returns dict mapping ts_code -> {'close': float, 'trade_time': str, 'prev_close': float|None}
 
-        Priority logic:
+        Priority logic (see ``services.price_resolver``, one bulk read per source):
           - 盘中: rt_minute_latest (realtime) > on-demand TuShare API > ods_daily (daily close)
           - 收盘后: 如果 rt_minute_latest 的时间 < 15:00 (说明不是收盘价),
                     则 fallback 到日线收盘价(15:00:00), 避免显示盘中过期时间
         """
-        prices = {}
         if not ts_codes:
-            return prices
+            return {}
 
-        market_closed = self._is_market_closed()
+        from stock_datasource.services.price_resolver import get_price_resolver
 
-        # 1. 从分钟缓存获取最新价
         try:
-            from stock_datasource.modules.realtime_minute.cache_store import (
-                get_cache_store,
+            prices = get_price_resolver().resolve(
+                ts_codes, on_demand=self._fetch_ondemand_rt_prices
             )
-
-            cache = get_cache_store()
-            if cache.available:
-                for code in ts_codes:
-                    latest = cache.get_latest("", code, "1min")
-                    if latest and latest.get("close") is not None:
-                        trade_time = latest.get("trade_time", "")
-                        # 收盘后，如果分钟数据时间 < 15:00，说明该数据不是最终收盘快照，
-                        # 可能是低流动性ETF盘中最后成交时间（如14:30），
-                        # 不应作为"最新价"展示，需 fallback 到日线收盘价
-                        if market_closed and trade_time:
-                            try:
-                                time_part = (
-                                    trade_time.split(" ")[-1]
-                                    if " " in trade_time
-                                    else trade_time
-                                )
-                                hhmm = int(time_part[:2]) * 100 + int(time_part[3:5])
-                                if hhmm < 1500:
-                                    # 跳过这个过期的分钟数据，让后续步骤用日线数据
-                                    logger.debug(
-                                        f"Skipping stale minute data for {code}: trade_time={trade_time}"
-                                    )
-                                    continue
-                            except (ValueError, IndexError):
-                                pass
-                        prices[code] = {
-                            "close": float(latest["close"]),
-                            "trade_time": trade_time,
-                            "prev_close": None,  # 将在步骤3补充
-                        }
         except Exception as e:
-            logger.warning(f"Failed to get prices from rt_minute cache: {e}")
-
-        # 2. 对于缓存中没有（或被跳过）的代码，按需从 TuShare API 实时拉取
-        missing_codes = [c for c in ts_codes if c not in prices]
-        if missing_codes:
-            try:
-                on_demand_prices = self._fetch_ondemand_rt_prices(missing_codes)
-                prices.update(on_demand_prices)
-            except Exception as e:
-                logger.warning(f"Failed to on-demand fetch prices: {e}")
-
-        # 3. 仍未命中的 fallback 到 ClickHouse 日线表
-        still_missing = [c for c in ts_codes if c not in prices]
-        if still_missing and self.db is not None:
-            try:
-                for code in still_missing:
-                    price_info = self._get_daily_latest_price(code)
-                    if price_info:
-                        prices[code] = price_info
-            except Exception as e:
-                logger.warning(f"Failed to batch get prices from database: {e}")
+            logger.warning(f"Failed to batch resolve latest prices: {e}")
+            return {}
 
-        # 4. 批量获取昨收价(prev_close)用于计算今日涨跌
+        # 日线缺失/过期时补数据并重新获取昨收价(prev_close)
         if prices and self.db is not None:
             await self._batch_fill_prev_close(prices)
 
@@ -513,96 +455,12 @@ class PortfolioService:
         """从 ClickHouse 日线表获取最新收盘价和日期。返回秒级精度的 trade_time。"""
         if self.db is None:
             return None
-        try:
-            market_type = self._infer_market_type(ts_code)
-
-            # 按市场类型查询对应日线表
-            queries = []
-            if market_type == "index":
-                queries.append(("ods_index_daily", "index"))
-            elif market_type == "etf":
-                queries.append(("ods_etf_fund_daily", "etf"))
-            elif market_type == "hk":
-                queries.append(("ods_hk_daily", "hk"))
-            else:
-                queries.append(("ods_daily", "a_stock"))
+        from stock_datasource.services.price_resolver import get_price_resolver
 
-            for table, mtype in queries:
-                query = f"""
-                    SELECT close, trade_date, pre_close FROM {table}
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df = self.db.execute_query(query, {"code": ts_code})
-                if not df.empty:
-                    trade_date = df.iloc[0]["trade_date"]
-                    trade_time = self._format_trade_datetime(
-                        trade_date, market_type=mtype
-                    )
-                    prev_close = (
-                        float(df.iloc[0]["pre_close"])
-                        if "pre_close" in df.columns
-                        and pd.notna(df.iloc[0]["pre_close"])
-                        else None
-                    )
-                    return {
-                        "close": float(df.iloc[0]["close"]),
-                        "trade_time": trade_time,
-                        "prev_close": prev_close,
-                    }
-
-            # Fallback: 如果推断不准，尝试所有表
-            if market_type != "a_stock":
-                df = self.db.execute_query(
-                    "SELECT close, trade_date, pre_close FROM ods_daily WHERE ts_code = %(code)s ORDER BY trade_date DESC LIMIT 1",
-                    {"code": ts_code},
-                )
-                if not df.empty:
-                    trade_date = df.iloc[0]["trade_date"]
-                    return {
-                        "close": float(df.iloc[0]["close"]),
-                        "trade_time": self._format_trade_datetime(trade_date),
-                        "prev_close": float(df.iloc[0]["pre_close"])
-                        if "pre_close" in df.columns
-                        and pd.notna(df.iloc[0]["pre_close"])
-                        else None,
-                    }
-
-            if market_type != "etf":
-                df_etf = self.db.execute_query(
-                    "SELECT close, trade_date, pre_close FROM ods_etf_fund_daily WHERE ts_code = %(code)s ORDER BY trade_date DESC LIMIT 1",
-                    {"code": ts_code},
-                )
-                if not df_etf.empty:
-                    trade_date = df_etf.iloc[0]["trade_date"]
-                    return {
-                        "close": float(df_etf.iloc[0]["close"]),
-                        "trade_time": self._format_trade_datetime(
-                            trade_date, market_type="etf"
-                        ),
-                        "prev_close": float(df_etf.iloc[0]["pre_close"])
-                        if "pre_close" in df_etf.columns
-                        and pd.notna(df_etf.iloc[0]["pre_close"])
-                        else None,
-                    }
-
-            if market_type != "hk" and ts_code.endswith(".HK"):
-                df_hk = self.db.execute_query(
-                    "SELECT close, trade_date, pre_close FROM ods_hk_daily WHERE ts_code = %(code)s ORDER BY trade_date DESC LIMIT 1",
-                    {"code": ts_code},
-                )
-                if not df_hk.empty:
-                    trade_date = df_hk.iloc[0]["trade_date"]
-                    return {
-                        "close": float(df_hk.iloc[0]["close"]),
-                        "trade_time": self._format_trade_datetime(
-                            trade_date, market_type="hk"
-                        ),
-                        "prev_close": float(df_hk.iloc[0]["pre_close"])
-                        if "pre_close" in df_hk.columns
-                        and pd.notna(df_hk.iloc[0]["pre_close"])
-                        else None,
-                    }
+        try:
+            return get_price_resolver().resolve(
+                [ts_code], include_realtime=False, use_cache=False
+            ).get(ts_code)
         except Exception as e:
             logger.warning(f"Failed to get daily price for {ts_code}: {e}")
         return None
@@ -616,15 +474,9 @@ class PortfolioService:
         - ETF: 15:00:00
         - 港股: 16:00:00 (16:08 收盘，取整 16:00)
         """
-        if hasattr(trade_date, "strftime"):
-            date_str = trade_date.strftime("%Y-%m-%d")
-        else:
-            date_str = str(trade_date)
-            if len(date_str) == 8 and "-" not in date_str:
-                date_str = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+        from stock_datasource.services.price_resolver import format_trade_datetime
 
-        close_time = "16:00:00" if market_type == "hk" else "15:00:00"
-        return f"{date_str} {close_time}"
+        return format_trade_datetime(trade_date, market_type)
 
     async def _update_position_prices(
         self, position: Position, prices_cache: dict[str, Any] = None
@@ -722,88 +574,59 @@ class PortfolioService:
         然后重新查询。
 
         核心逻辑：
-        1. 先从DB查询 prev_close
-        2. 批量检查所有持仓的日线数据是否新鲜
-        3. 如果日线数据过期，触发同步补数据
-        4. 同步后重新查询 prev_close
+        1. 批量检查所有持仓的日线数据是否新鲜
+        2. 如果日线数据过期，触发同步补数据
+        3. 同步后一次查询重新获取缺失的 prev_close
         """
-        codes_need_prev = [
-            code for code, info in prices.items() if info.get("prev_close") is None
-        ]
-        if not codes_need_prev or self.db is None:
+        if not prices or self.db is None:
             return
         try:
-            # 第一次尝试：直接从DB查询
-            for code in codes_need_prev:
-                prev_close = self._get_prev_close_from_db(code)
-                if prev_close is not None:
-                    prices[code]["prev_close"] = prev_close
-
-            # 批量检查所有代码的日线数据新鲜度（包括已获取到 prev_close 的）
-            # 因为即使拿到了 prev_close，如果日线数据不是最新的，prev_close 可能不准
+            # 即使拿到了 prev_close，如果日线数据不是最新的，prev_close 可能不准
             all_codes = list(prices.keys())
             stale_codes = self._batch_check_markets_freshness(all_codes)
 
-            # 触发缺失/过期的日线数据同步
             # stale_codes: {ts_code: market_type}，提取需要同步的市场类型
-            if stale_codes:
-                markets_to_sync = set(stale_codes.values())
-                synced_markets = await self._trigger_daily_sync_for_markets(
-                    markets_to_sync
+            if not stale_codes:
+                return
+            synced_markets = await self._trigger_daily_sync_for_markets(
+                set(stale_codes.values())
+            )
+            if not synced_markets:
+                return
+
+            from stock_datasource.services.price_resolver import get_price_resolver
+
+            resolver = get_price_resolver()
+            resolver.invalidate(all_codes)
+            codes_need_prev = [
+                code for code, info in prices.items() if info.get("prev_close") is None
+            ]
+            if not codes_need_prev:
+                return
+            await asyncio.sleep(2)  # 等待数据写入
+            daily = resolver.daily_latest(codes_need_prev)
+            for code in codes_need_prev:
+                row = daily.get(code)
+                if row is None:
+                    continue
+                info = prices[code]
+                prev_close = (
+                    row["pre_close"] if info.get("source") == "daily" else row["close"]
                 )
-                if synced_markets:
-                    # 同步后重新查询所有需要 prev_close 的代码
-                    await asyncio.sleep(2)  # 等待数据写入
-                    for code in codes_need_prev:
-                        prev_close = self._get_prev_close_from_db(code)
-                        if prev_close is not None:
-                            prices[code]["prev_close"] = prev_close
-                            logger.info(
-                                f"Synced daily data, got prev_close for {code}: {prev_close}"
-                            )
+                if prev_close is not None:
+                    info["prev_close"] = prev_close
+                    logger.info(
+                        f"Synced daily data, got prev_close for {code}: {prev_close}"
+                    )
         except Exception as e:
             logger.warning(f"Failed to batch fill prev_close: {e}")
 
     @staticmethod
     def _infer_market_type(ts_code: str) -> str:
         """从 ts_code 推断市场类型: a_stock / etf / hk / index"""
-        if not isinstance(ts_code, str) or len(ts_code) < 3:
-            return "a_stock"
-        if ts_code.endswith(".HK"):
-            return "hk"
-        # 指数: 000001.SH, 399001.SZ 等
-        if ts_code.startswith(("0000", "3990", "3991", "3993", "3996", "3999")):
-            # 区分指数和股票：指数通常是 000001.SH(上证指数) 或 399001.SZ(深证成指)
-            # 但 000001.SZ 是平安银行，需要更精确判断
-            suffix = ts_code[-2:]
-            prefix = ts_code[:6]
-            if suffix == "SH" and prefix.startswith("0000"):
-                return "index"
-            if suffix == "SZ" and prefix.startswith("399"):
-                return "index"
-        # ETF
-        prefix = ts_code[:3]
-        if prefix in (
-            "510",
-            "511",
-            "512",
-            "513",
-            "515",
-            "516",
-            "518",
-            "520",
-            "560",
-            "561",
-            "562",
-            "563",
-            "588",
-            "159",
-            "150",
-            "501",
-            "502",
-        ):
-            return "etf"
-        return "a_stock"
+        from stock_datasource.services.price_resolver import infer_market_type
+
+        return infer_market_type(ts_code)
 
     @staticmethod
     def _get_daily_table_for_market(market_type: str) -> str:
@@ -1043,111 +866,11 @@ class PortfolioService:
         """
         if self.db is None:
             return None
-        try:
-            market_type = self._infer_market_type(ts_code)
-
-            # 指数日线
-            if market_type == "index":
-                query_idx = """
-                    SELECT close FROM ods_index_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df_idx = self.db.execute_query(query_idx, {"code": ts_code})
-                if (
-                    not df_idx.empty
-                    and "close" in df_idx.columns
-                    and pd.notna(df_idx.iloc[0]["close"])
-                ):
-                    return float(df_idx.iloc[0]["close"])
-
-            # A股
-            if market_type == "a_stock":
-                query = """
-                    SELECT close FROM ods_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df = self.db.execute_query(query, {"code": ts_code})
-                if (
-                    not df.empty
-                    and "close" in df.columns
-                    and pd.notna(df.iloc[0]["close"])
-                ):
-                    return float(df.iloc[0]["close"])
-
-            # ETF
-            if market_type == "etf":
-                query_etf = """
-                    SELECT close FROM ods_etf_fund_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df_etf = self.db.execute_query(query_etf, {"code": ts_code})
-                if (
-                    not df_etf.empty
-                    and "close" in df_etf.columns
-                    and pd.notna(df_etf.iloc[0]["close"])
-                ):
-                    return float(df_etf.iloc[0]["close"])
-
-            # 港股
-            if market_type == "hk":
-                query_hk = """
-                    SELECT close FROM ods_hk_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df_hk = self.db.execute_query(query_hk, {"code": ts_code})
-                if (
-                    not df_hk.empty
-                    and "close" in df_hk.columns
-                    and pd.notna(df_hk.iloc[0]["close"])
-                ):
-                    return float(df_hk.iloc[0]["close"])
+        from stock_datasource.services.price_resolver import get_price_resolver
 
-            # Fallback: 如果 market_type 推断不准，按原顺序尝试所有表
-            if market_type not in ("a_stock",):
-                query = """
-                    SELECT close FROM ods_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df = self.db.execute_query(query, {"code": ts_code})
-                if (
-                    not df.empty
-                    and "close" in df.columns
-                    and pd.notna(df.iloc[0]["close"])
-                ):
-                    return float(df.iloc[0]["close"])
-
-            if market_type not in ("etf",):
-                query_etf = """
-                    SELECT close FROM ods_etf_fund_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df_etf = self.db.execute_query(query_etf, {"code": ts_code})
-                if (
-                    not df_etf.empty
-                    and "close" in df_etf.columns
-                    and pd.notna(df_etf.iloc[0]["close"])
-                ):
-                    return float(df_etf.iloc[0]["close"])
-
-            if market_type not in ("hk",) and ts_code.endswith(".HK"):
-                query_hk = """
-                    SELECT close FROM ods_hk_daily 
-                    WHERE ts_code = %(code)s 
-                    ORDER BY trade_date DESC LIMIT 1
-                """
-                df_hk = self.db.execute_query(query_hk, {"code": ts_code})
-                if (
-                    not df_hk.empty
-                    and "close" in df_hk.columns
-                    and pd.notna(df_hk.iloc[0]["close"])
-                ):
-                    return float(df_hk.iloc[0]["close"])
+        try:
+            row = get_price_resolver().daily_latest([ts_code]).get(ts_code)
+            return row["close"] if row else None
         except Exception as e:
             logger.warning(f"Failed to get prev_close for {ts_code}: {e}")
         return None
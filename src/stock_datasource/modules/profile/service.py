@@ -36,9 +36,15 @@ class ProfileService:
     # Ensure table exists
     # ------------------------------------------------------------------
 
-    def ensure_table(self):
-        """Create portfolio_profiles table if not exists."""
+    def ensure_table(self, strict: bool = False):
+        """Create portfolio_profiles table if not exists.
+
+        With ``strict`` a missing client or failed DDL raises instead of
+        being logged, so the schema bootstrap does not record it as applied.
+        """
         if self.db is None:
+            if strict:
+                raise RuntimeError("Database client unavailable")
             return
         try:
             self.db.execute("""
@@ -57,6 +63,8 @@ class ProfileService:
             """)
         except Exception as e:
             logger.warning("Failed to ensure portfolio_profiles table: %s", e)
+            if strict:
+                raise
 
     # ------------------------------------------------------------------
     # CRUD
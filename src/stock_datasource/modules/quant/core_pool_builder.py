@@ -13,6 +13,7 @@ import numpy as np
 import pandas as pd
 
 from stock_datasource.models.database import db_client
+from stock_datasource.utils.latest_state import latest_source
 
 from .data_readiness import get_data_readiness_checker
 from .factor_scorer import get_factor_scorer
@@ -140,10 +141,11 @@ class CorePoolBuilder:
             return []
         try:
             codes_str = "','".join(ts_codes)
+            source = latest_source("fact_fina_indicator") or "fact_fina_indicator"
             df = db_client.execute_query(
                 f"""SELECT ts_code,
                        argMax(roe, end_date) as latest_roe
-                FROM fact_fina_indicator
+                FROM {source}
                 WHERE ts_code IN ('{codes_str}')
                 AND end_date >= '20240101'
                 GROUP BY ts_code
@@ -9,6 +9,7 @@ import logging
 import pandas as pd
 
 from stock_datasource.models.database import db_client
+from stock_datasource.utils.latest_state import latest_source
 
 from .schemas import FactorScoreDetail, FactorWeight
 
@@ -253,6 +254,16 @@ class FactorScorer:
     def _load_fina_data(self, ts_codes: list[str]) -> pd.DataFrame:
         try:
             codes_str = "','".join(ts_codes)
+            source = latest_source("fact_fina_indicator")
+            if source is not None:
+                return db_client.execute_query(
+                    f"""SELECT ts_code, end_date, roe, revenue_yoy, netprofit_yoy,
+                           grossprofit_margin, debt_to_assets
+                    FROM {source}
+                    WHERE ts_code IN ('{codes_str}')
+                    AND end_date >= '20220101'
+                    ORDER BY ts_code, end_date DESC"""
+                )
             return db_client.execute_query(
                 f"""SELECT ts_code, end_date,
                        argMax(roe, _ingested_at) as roe,
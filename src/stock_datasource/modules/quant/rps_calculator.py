@@ -11,6 +11,7 @@ import numpy as np
 import pandas as pd
 
 from stock_datasource.models.database import db_client
+from stock_datasource.utils.adjusted_prices import get_adjusted_price_store
 
 from .data_readiness import get_data_readiness_checker
 from .schemas import RPSRankItem, RPSResult
@@ -164,6 +165,14 @@ class RPSCalculator:
 
     def _load_daily_data(self) -> pd.DataFrame:
         """Load daily bar + adj factor from ClickHouse."""
+        # Maintained hfq prices: no join against the adj factor table
+        try:
+            df = get_adjusted_price_store().load_a_share_window(400)
+            if not df.empty:
+                return df
+        except Exception as e:
+            logger.debug(f"Adjusted price store unavailable: {e}")
+
         try:
             return db_client.execute_query(
                 """SELECT d.ts_code, d.trade_date, d.close, d.pct_chg,
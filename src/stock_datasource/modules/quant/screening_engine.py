@@ -14,6 +14,7 @@ import numpy as np
 import pandas as pd
 
 from stock_datasource.models.database import db_client
+from stock_datasource.utils.latest_state import latest_source
 
 from .benford_checker import check_benford_for_stock
 from .data_readiness import get_data_readiness_checker
@@ -552,6 +553,14 @@ class ScreeningEngine:
     def _load_fina_data(self) -> pd.DataFrame:
         """Load financial indicator data from ClickHouse."""
         try:
+            source = latest_source("fact_fina_indicator")
+            if source is not None:
+                return db_client.execute_query(
+                    f"""SELECT ts_code, end_date, roe, revenue_yoy, netprofit_yoy
+                    FROM {source}
+                    WHERE end_date >= '20200101'
+                    ORDER BY ts_code, end_date DESC"""
+                )
             return db_client.execute_query(
                 """SELECT ts_code, end_date,
                        argMax(roe, _ingested_at) as roe,
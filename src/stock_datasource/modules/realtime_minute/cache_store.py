@@ -344,6 +344,31 @@ class RealtimeMinuteCacheStore:
             logger.warning("SQLite get_latest failed: %s", e)
             return None
 
+    def get_latest_many(
+        self, ts_codes: list[str], freq: str = "1min"
+    ) -> dict[str, dict[str, Any]]:
+        """批量获取多个代码的最新 bar 快照，返回 {ts_code: bar}。"""
+        result: dict[str, dict[str, Any]] = {}
+        codes = list(dict.fromkeys(ts_codes))
+        try:
+            conn = self._get_conn()
+            # SQLite 绑定参数上限 999，分块查询
+            for i in range(0, len(codes), 500):
+                chunk = codes[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"""SELECT ts_code, market_type, freq, trade_time,
+                               open, close, high, low, vol, amount
+                        FROM rt_minute_latest
+                        WHERE freq=? AND ts_code IN ({placeholders})""",
+                    (freq, *chunk),
+                ).fetchall()
+                for r in rows:
+                    result[r["ts_code"]] = dict(r)
+        except Exception as e:
+            logger.warning("SQLite get_latest_many failed: %s", e)
+        return result
+
     def get_all_latest(
         self, market: str | None = None, freq: str = "1min"
     ) -> list[dict[str, Any]]:
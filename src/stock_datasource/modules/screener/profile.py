@@ -8,8 +8,9 @@ from datetime import datetime, timedelta
 from typing import Any
 
 import numpy as np
+import pandas as pd
 
-from stock_datasource.models.database import db_client
+from stock_datasource.models.database import _to_clickhouse_literal, db_client
 from stock_datasource.plugins.tushare_daily.service import TuShareDailyService
 from stock_datasource.plugins.tushare_daily_basic.service import (
     TuShareDailyBasicService,
@@ -19,6 +20,7 @@ from stock_datasource.plugins.tushare_stock_basic.service import (
 )
 
 from .schemas import ProfileDimension, StockProfile
+from .snapshot import MarketSnapshot, get_market_snapshot_cache, load_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -62,19 +64,26 @@ def _score_to_level(score: float) -> str:
 
 
 def _calculate_percentile(
-    value: float, values: list[float], reverse: bool = False
+    value: float, values, reverse: bool = False
 ) -> float:
-    """计算百分位排名 (0-100)"""
-    if not values or value is None:
+    """计算百分位排名 (0-100)；values 可为已排序的 ndarray（市场快照分布）"""
+    if values is None or not len(values) or value is None:
         return 50.0
 
-    values_sorted = sorted(values)
-    rank = sum(1 for v in values_sorted if v < value) / len(values_sorted) * 100
+    values_sorted = values if isinstance(values, np.ndarray) else np.sort(values)
+    rank = np.searchsorted(values_sorted, value, side="left") / len(values_sorted) * 100
 
     if reverse:
         rank = 100 - rank
 
-    return min(100, max(0, rank))
+    return float(min(100, max(0, rank)))
+
+
+def _records(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """DataFrame -> records with NaN as None (same shape as plugin query methods)."""
+    if df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict("records")
 
 
 class ProfileService:
@@ -86,18 +95,42 @@ class ProfileService:
         self.stock_basic_service = TuShareStockBasicService()
         self.daily_service = TuShareDailyService()
 
+    def _query_latest_trade_date(self) -> str | None:
+        query = "SELECT max(trade_date) as max_date FROM ods_daily"
+        df = self.db.execute_query(query)
+        if df.empty or df.iloc[0]["max_date"] is None:
+            return None
+        return _format_date(df.iloc[0]["max_date"])
+
     def get_latest_trade_date(self) -> str | None:
-        """获取最新交易日期"""
+        """获取最新交易日期（进程内缓存，新数据入库后失效）"""
         try:
-            query = "SELECT max(trade_date) as max_date FROM ods_daily"
-            df = self.db.execute_query(query)
-            if df.empty or df.iloc[0]["max_date"] is None:
-                return None
-            return _format_date(df.iloc[0]["max_date"])
+            return get_market_snapshot_cache().latest_trade_date(
+                self._query_latest_trade_date
+            )
         except Exception as e:
             logger.error(f"Failed to get latest trade date: {e}")
             return None
 
+    def get_snapshot(self) -> MarketSnapshot | None:
+        """最新交易日的市场快照（与选股共享缓存）"""
+        latest_date = self.get_latest_trade_date()
+        if not latest_date:
+            return None
+        try:
+            return get_market_snapshot_cache().get(
+                latest_date,
+                lambda d: load_market_snapshot(
+                    d,
+                    self.daily_service,
+                    self.daily_basic_service,
+                    self.stock_basic_service,
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load market snapshot: {e}")
+            return None
+
     def _get_stock_info(self, ts_code: str) -> dict[str, Any]:
         """获取股票基本信息"""
         try:
@@ -132,62 +165,81 @@ class ProfileService:
             logger.warning(f"Failed to get valuation data for {ts_code}: {e}")
             return []
 
-    def _get_market_pe_distribution(self) -> list[float]:
-        """获取市场PE分布（用于百分位计算）"""
+    def _get_history_batch(
+        self, ts_codes: list[str], days: int = 60
+    ) -> tuple[dict[str, list[dict[str, Any]]], dict[str, list[dict[str, Any]]]]:
+        """一次查询取多只股票最近N天的日线和估值数据（与单只查询的字段/顺序一致）"""
+        end_date = datetime.now().strftime("%Y%m%d")
+        start_date = (datetime.now() - timedelta(days=days * 2)).strftime("%Y%m%d")
+        codes = ", ".join(_to_clickhouse_literal(c) for c in ts_codes)
+        where = (
+            f"WHERE ts_code IN ({codes}) "
+            f"AND trade_date >= '{start_date}' AND trade_date <= '{end_date}'"
+        )
+        daily: dict[str, list[dict[str, Any]]] = {c: [] for c in ts_codes}
+        valuation: dict[str, list[dict[str, Any]]] = {c: [] for c in ts_codes}
         try:
-            latest_date = self.get_latest_trade_date()
-            if not latest_date:
-                return []
-
-            query = f"""
-                SELECT pe_ttm 
-                FROM ods_daily_basic 
-                WHERE trade_date = '{latest_date}' 
-                AND pe_ttm > 0 AND pe_ttm < 1000
-            """
-            df = self.db.execute_query(query)
-            return df["pe_ttm"].tolist() if not df.empty else []
+            df = self.db.execute_query(
+                f"""
+                SELECT ts_code, trade_date, open, high, low, close, vol, amount
+                FROM ods_daily {where}
+                ORDER BY ts_code, trade_date ASC
+                """
+            )
+            for record in _records(df):
+                rows = daily.setdefault(record["ts_code"], [])
+                if len(rows) < days:
+                    rows.append(record)
         except Exception as e:
-            logger.warning(f"Failed to get market PE distribution: {e}")
+            logger.warning(f"Failed to batch get daily data: {e}")
+        try:
+            df = self.db.execute_query(
+                f"""
+                SELECT ts_code, trade_date, close, turnover_rate, turnover_rate_f,
+                       volume_ratio, pe, pe_ttm, pb, ps, ps_ttm, dv_ratio, dv_ttm,
+                       total_share, float_share, free_share, total_mv, circ_mv
+                FROM ods_daily_basic {where}
+                ORDER BY ts_code, trade_date ASC
+                """
+            )
+            for record in _records(df):
+                valuation.setdefault(record["ts_code"], []).append(record)
+        except Exception as e:
+            logger.warning(f"Failed to batch get valuation data: {e}")
+        return daily, valuation
+
+    def _get_market_pe_distribution(self) -> list[float]:
+        """获取市场PE分布（用于百分位计算，来自市场快照）"""
+        snapshot = self.get_snapshot()
+        if snapshot is None:
             return []
+        return snapshot.distributions.get("pe_ttm", np.array([])).tolist()
 
     def _get_market_pb_distribution(self) -> list[float]:
-        """获取市场PB分布"""
-        try:
-            latest_date = self.get_latest_trade_date()
-            if not latest_date:
-                return []
-
-            query = f"""
-                SELECT pb 
-                FROM ods_daily_basic 
-                WHERE trade_date = '{latest_date}' 
-                AND pb > 0 AND pb < 100
-            """
-            df = self.db.execute_query(query)
-            return df["pb"].tolist() if not df.empty else []
-        except Exception as e:
-            logger.warning(f"Failed to get market PB distribution: {e}")
+        """获取市场PB分布（来自市场快照）"""
+        snapshot = self.get_snapshot()
+        if snapshot is None:
             return []
+        return snapshot.distributions.get("pb", np.array([])).tolist()
 
     def calculate_valuation_score(
         self,
         pe_ttm: float | None,
         pb: float | None,
-        pe_distribution: list[float],
-        pb_distribution: list[float],
+        pe_distribution: list[float] | np.ndarray,
+        pb_distribution: list[float] | np.ndarray,
     ) -> ProfileDimension:
         """计算估值维度评分 - 低估值得高分"""
         indicators = {"pe_ttm": pe_ttm, "pb": pb}
 
         scores = []
-        if pe_ttm and pe_ttm > 0 and pe_distribution:
+        if pe_ttm and pe_ttm > 0 and len(pe_distribution):
             # PE越低越好，使用 reverse=True
             pe_score = _calculate_percentile(pe_ttm, pe_distribution, reverse=True)
             scores.append(pe_score)
             indicators["pe_percentile"] = 100 - pe_score  # 显示原始百分位
 
-        if pb and pb > 0 and pb_distribution:
+        if pb and pb > 0 and len(pb_distribution):
             pb_score = _calculate_percentile(pb, pb_distribution, reverse=True)
             scores.append(pb_score)
             indicators["pb_percentile"] = 100 - pb_score
@@ -415,22 +467,50 @@ class ProfileService:
             indicators=indicators,
         )
 
+    def _stock_info_from_snapshot(
+        self, ts_code: str, snapshot: MarketSnapshot | None
+    ) -> dict[str, Any]:
+        """股票基本信息：优先取快照中的名称/行业，缺失时单独查询"""
+        row = snapshot.row(ts_code) if snapshot is not None else None
+        if row and row.get("stock_name") and row["stock_name"] != ts_code:
+            return {"ts_code": ts_code, "name": row["stock_name"], "industry": row.get("industry")}
+        return self._get_stock_info(ts_code)
+
     def calculate_profile(self, ts_code: str) -> StockProfile | None:
         """计算股票十维画像"""
         try:
-            # 获取股票基本信息
-            stock_info = self._get_stock_info(ts_code)
-            stock_name = stock_info.get("name", ts_code)
-
-            # 获取日线数据
-            daily_data = self._get_daily_data(ts_code, 60)
+            snapshot = self.get_snapshot()
+            return self._build_profile(
+                ts_code,
+                self._stock_info_from_snapshot(ts_code, snapshot),
+                self._get_daily_data(ts_code, 60),
+                self._get_valuation_data(ts_code, 60),
+                snapshot,
+            )
+        except Exception as e:
+            logger.error(f"Failed to calculate profile for {ts_code}: {e}")
+            return None
 
-            # 获取估值数据
-            valuation_data = self._get_valuation_data(ts_code, 60)
+    def _build_profile(
+        self,
+        ts_code: str,
+        stock_info: dict[str, Any],
+        daily_data: list[dict[str, Any]],
+        valuation_data: list[dict[str, Any]],
+        snapshot: MarketSnapshot | None,
+    ) -> StockProfile | None:
+        """由已取得的数据计算画像（不再访问数据库）"""
+        try:
+            stock_name = stock_info.get("name", ts_code)
 
-            # 获取市场分布数据（用于百分位计算）
-            pe_distribution = self._get_market_pe_distribution()
-            pb_distribution = self._get_market_pb_distribution()
+            # 市场分布数据（用于百分位计算）
+            empty = np.array([])
+            pe_distribution = (
+                snapshot.distributions.get("pe_ttm", empty) if snapshot else empty
+            )
+            pb_distribution = (
+                snapshot.distributions.get("pb", empty) if snapshot else empty
+            )
 
             # 当前估值数据
             latest_valuation = valuation_data[0] if valuation_data else {}
@@ -511,7 +591,7 @@ class ProfileService:
             return StockProfile(
                 ts_code=ts_code,
                 stock_name=stock_name,
-                trade_date=self.get_latest_trade_date() or "",
+                trade_date=snapshot.trade_date if snapshot else "",
                 total_score=round(total_score, 1),
                 dimensions=dimensions,
                 recommendation=recommendation,
@@ -554,10 +634,20 @@ class ProfileService:
         return "".join(parts)
 
     def batch_calculate_profiles(self, ts_codes: list[str]) -> list[StockProfile]:
-        """批量计算股票画像"""
+        """批量计算股票画像：共享一份市场快照，历史数据两次批量查询，其余在内存中计算"""
+        if not ts_codes:
+            return []
+        snapshot = self.get_snapshot()
+        daily, valuation = self._get_history_batch(ts_codes, 60)
         profiles = []
         for ts_code in ts_codes:
-            profile = self.calculate_profile(ts_code)
+            profile = self._build_profile(
+                ts_code,
+                self._stock_info_from_snapshot(ts_code, snapshot),
+                daily.get(ts_code, []),
+                valuation.get(ts_code, []),
+                snapshot,
+            )
             if profile:
                 profiles.append(profile)
         return profiles
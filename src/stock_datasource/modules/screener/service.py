@@ -18,6 +18,7 @@ from stock_datasource.plugins.tushare_stock_basic.service import (
 )
 
 from .schemas import ScreenerCondition, SectorInfo, StockItem
+from .snapshot import MarketSnapshot, get_market_snapshot_cache, load_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +84,9 @@ FIELD_MAPPING = {
     "low": "low",
     "vol": "vol",
     "amount": "amount",
+    # 市场百分位 (快照预计算)
+    "pe_percentile": "pe_ttm_percentile",
+    "pb_percentile": "pb_percentile",
     # 基本信息 (来自 stock_basic)
     "industry": "industry",
 }
@@ -114,7 +118,6 @@ class ScreenerService:
         # 缓存
         self._stock_names: dict[str, str] = {}
         self._stock_industries: dict[str, str] = {}
-        self._latest_date: str | None = None
 
     def _load_stock_basic_cache(self):
         """加载股票基本信息缓存"""
@@ -128,12 +131,11 @@ class ScreenerService:
             logger.error(f"Failed to load stock basic cache: {e}")
 
     def get_latest_trade_date(self) -> str | None:
-        """获取最新交易日期 - 使用 daily_service"""
-        if self._latest_date:
-            return self._latest_date
+        """获取最新交易日期 - 使用 daily_service（进程内缓存，新数据入库后失效）"""
         try:
-            self._latest_date = self.daily_service.get_latest_trade_date()
-            return self._latest_date
+            return get_market_snapshot_cache().latest_trade_date(
+                self.daily_service.get_latest_trade_date
+            )
         except Exception as e:
             logger.error(f"Failed to get latest trade date: {e}")
             return None
@@ -143,50 +145,26 @@ class ScreenerService:
         self._load_stock_basic_cache()
         return {code: self._stock_names.get(code, code) for code in ts_codes}
 
+    def get_snapshot(self, trade_date: str | None = None) -> MarketSnapshot | None:
+        """获取某交易日的市场快照（daily + daily_basic + stock_basic，按日缓存）"""
+        target_date = trade_date or self.get_latest_trade_date()
+        if not target_date:
+            return None
+        return get_market_snapshot_cache().get(
+            target_date,
+            lambda d: load_market_snapshot(
+                d, self.daily_service, self.daily_basic_service, self.stock_basic_service
+            ),
+        )
+
     def _get_merged_data(self, trade_date: str) -> pd.DataFrame:
         """
-        获取合并后的股票数据 - 使用 Plugin Services
+        获取合并后的股票数据 - 来自按交易日缓存的市场快照
 
-        合并 daily + daily_basic + stock_basic 数据
+        快照只读共享，调用方过滤/排序得到的都是新 DataFrame
         """
-        # 1. 获取日行情数据 - 使用 daily_service
-        daily_df = self.daily_service.get_all_daily_by_date(trade_date)
-        if daily_df.empty:
-            return pd.DataFrame()
-
-        # 2. 获取日基本指标数据 - 使用 daily_basic_service
-        daily_basic_df = self.daily_basic_service.get_all_daily_basic_by_date(
-            trade_date
-        )
-
-        # 3. 获取股票基本信息 - 使用 stock_basic_service
-        self._load_stock_basic_cache()
-
-        # 4. 合并数据
-        # 合并 daily 和 daily_basic
-        if not daily_basic_df.empty:
-            # 避免重复列
-            merge_cols = ["ts_code", "trade_date"]
-            basic_cols = [
-                c
-                for c in daily_basic_df.columns
-                if c not in daily_df.columns or c in merge_cols
-            ]
-            merged_df = daily_df.merge(
-                daily_basic_df[basic_cols], on=merge_cols, how="left"
-            )
-        else:
-            merged_df = daily_df
-
-        # 添加股票名称和行业
-        merged_df["stock_name"] = merged_df["ts_code"].map(
-            lambda x: self._stock_names.get(x, x)
-        )
-        merged_df["industry"] = merged_df["ts_code"].map(
-            lambda x: self._stock_industries.get(x)
-        )
-
-        return merged_df
+        snapshot = self.get_snapshot(trade_date)
+        return snapshot.frame if snapshot is not None else pd.DataFrame()
 
     def _apply_conditions(
         self, df: pd.DataFrame, conditions: list[ScreenerCondition]
@@ -218,8 +196,10 @@ class ScreenerService:
                 elif isinstance(cond.value, str) and field == "industry":
                     mask &= df[field] == cond.value
                 else:
-                    # 数值比较
-                    col = pd.to_numeric(df[field], errors="coerce")
+                    # 数值比较（快照中的数值列已是 float）
+                    col = df[field]
+                    if not pd.api.types.is_numeric_dtype(col):
+                        col = pd.to_numeric(col, errors="coerce")
                     mask &= op_func(col, float(cond.value))
             except Exception as e:
                 logger.warning(f"Failed to apply condition {cond}: {e}")
@@ -764,6 +744,8 @@ class ScreenerService:
         return [
             {"field": "pe", "label": "PE (市盈率)", "type": "number"},
             {"field": "pb", "label": "PB (市净率)", "type": "number"},
+            {"field": "pe_percentile", "label": "PE 全市场百分位", "type": "number"},
+            {"field": "pb_percentile", "label": "PB 全市场百分位", "type": "number"},
             {"field": "ps", "label": "PS (市销率)", "type": "number"},
             {"field": "dv_ratio", "label": "股息率 (%)", "type": "number"},
             {"field": "turnover_rate", "label": "换手率 (%)", "type": "number"},
@@ -0,0 +1,255 @@
+"""Per-trade-date market snapshot shared by the screener and stock profiles.
+
+A ``MarketSnapshot`` is the day's ``daily`` + ``daily_basic`` + ``stock_basic``
+merged once into one frame with float columns, plus sorted PE/PB
+distributions and each stock's precomputed percentile within them. Condition
+filtering, sorting, pagination and batch profiling then run on the cached
+frame instead of re-querying and re-merging per request.
+
+``MarketSnapshotCache`` keeps the most recent dates in process. Entries expire
+after ``SCREENER_SNAPSHOT_TTL`` seconds (loads done by other processes) and
+are dropped as soon as a plugin in this process loads one of the source
+tables (``BasePlugin.add_load_listener``).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_DATES = 4
+
+SOURCE_TABLES = {"ods_daily", "ods_daily_basic", "ods_stock_basic"}
+
+NUMERIC_COLUMNS = (
+    "open",
+    "high",
+    "low",
+    "close",
+    "pre_close",
+    "change",
+    "pct_chg",
+    "vol",
+    "amount",
+    "turnover_rate",
+    "turnover_rate_f",
+    "volume_ratio",
+    "pe",
+    "pe_ttm",
+    "pb",
+    "ps",
+    "ps_ttm",
+    "dv_ratio",
+    "dv_ttm",
+    "total_share",
+    "float_share",
+    "free_share",
+    "total_mv",
+    "circ_mv",
+)
+
+# field -> (low, high) exclusive bounds of values counted in the distribution
+PERCENTILE_FIELDS = {"pe_ttm": (0, 1000), "pb": (0, 100)}
+
+
+def normalize_trade_date(trade_date) -> str:
+    """YYYYMMDD / YYYY-MM-DD / date -> YYYY-MM-DD."""
+    if hasattr(trade_date, "strftime"):
+        return trade_date.strftime("%Y-%m-%d")
+    text = str(trade_date).split()[0].split("T")[0]
+    if len(text) == 8 and "-" not in text:
+        return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    return text
+
+
+@dataclass
+class MarketSnapshot:
+    """One trade date of merged market data."""
+
+    trade_date: str
+    frame: pd.DataFrame
+    # field -> sorted values within PERCENTILE_FIELDS bounds
+    distributions: dict[str, np.ndarray] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self._rows = self.frame.set_index("ts_code", drop=False)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def row(self, ts_code: str) -> dict | None:
+        """One stock's merged row, or None when it did not trade that day."""
+        if ts_code not in self._rows.index:
+            return None
+        row = self._rows.loc[ts_code]
+        if isinstance(row, pd.DataFrame):
+            row = row.iloc[0]
+        return row.to_dict()
+
+    def percentile(self, field_name: str, value: float | None) -> float | None:
+        """Share (0-100) of the market distribution strictly below ``value``."""
+        dist = self.distributions.get(field_name)
+        if dist is None or not len(dist) or value is None or pd.isna(value):
+            return None
+        return float(np.searchsorted(dist, value, side="left")) / len(dist) * 100
+
+
+def build_market_snapshot(
+    trade_date: str,
+    daily_df: pd.DataFrame,
+    daily_basic_df: pd.DataFrame | None,
+    stock_basic_df: pd.DataFrame | None,
+) -> MarketSnapshot | None:
+    """Merge one day's frames into a snapshot; None when there is no daily data."""
+    if daily_df is None or daily_df.empty:
+        return None
+
+    merged = daily_df
+    if daily_basic_df is not None and not daily_basic_df.empty:
+        merge_cols = ["ts_code", "trade_date"]
+        basic_cols = [
+            c for c in daily_basic_df.columns if c not in daily_df.columns or c in merge_cols
+        ]
+        basic = daily_basic_df[basic_cols].drop_duplicates("ts_code")
+        merged = merged.merge(basic.drop(columns="trade_date"), on="ts_code", how="left")
+
+    if stock_basic_df is not None and not stock_basic_df.empty:
+        names = stock_basic_df[["ts_code", "name", "industry"]].drop_duplicates("ts_code")
+        merged = merged.merge(
+            names.rename(columns={"name": "stock_name"}), on="ts_code", how="left"
+        )
+    else:
+        merged = merged.assign(stock_name=None, industry=None)
+    merged["stock_name"] = merged["stock_name"].fillna(merged["ts_code"])
+    merged["industry"] = merged["industry"].astype(object).where(
+        merged["industry"].notna(), None
+    )
+
+    for col in NUMERIC_COLUMNS:
+        if col in merged.columns:
+            merged[col] = pd.to_numeric(merged[col], errors="coerce").astype("float64")
+
+    distributions = {}
+    for col, (low, high) in PERCENTILE_FIELDS.items():
+        if col not in merged.columns:
+            continue
+        values = merged[col].to_numpy()
+        valid = (values > low) & (values < high)
+        dist = np.sort(values[valid])
+        distributions[col] = dist
+        pct = np.full(len(values), np.nan)
+        if len(dist):
+            pct[valid] = np.searchsorted(dist, values[valid], side="left") / len(dist) * 100
+        merged[f"{col}_percentile"] = pct
+
+    return MarketSnapshot(
+        trade_date=normalize_trade_date(trade_date),
+        frame=merged.reset_index(drop=True),
+        distributions=distributions,
+    )
+
+
+def load_market_snapshot(
+    trade_date: str, daily_service, daily_basic_service, stock_basic_service
+) -> MarketSnapshot | None:
+    """Fetch one day's frames through the plugin services and build a snapshot."""
+    daily_df = daily_service.get_all_daily_by_date(trade_date)
+    if daily_df is None or daily_df.empty:
+        return None
+    daily_basic_df = daily_basic_service.get_all_daily_basic_by_date(trade_date)
+    try:
+        stock_basic_df = stock_basic_service.get_all_stock_basic_df()
+    except Exception as e:
+        logger.error(f"Failed to load stock basic for snapshot: {e}")
+        stock_basic_df = None
+    return build_market_snapshot(trade_date, daily_df, daily_basic_df, stock_basic_df)
+
+
+class MarketSnapshotCache:
+    """Process-wide LRU of market snapshots by trade date."""
+
+    def __init__(self, ttl: float, max_dates: int = MAX_CACHED_DATES):
+        self.ttl = ttl
+        self.max_dates = max_dates
+        self._snapshots: OrderedDict[str, MarketSnapshot] = OrderedDict()
+        self._latest_date: tuple[float, str] | None = None
+        self._lock = threading.Lock()
+
+    def _fresh(self, built_at: float) -> bool:
+        return time.time() - built_at < self.ttl
+
+    def get(
+        self, trade_date: str, builder: Callable[[str], MarketSnapshot | None]
+    ) -> MarketSnapshot | None:
+        """Cached snapshot of ``trade_date``, built with ``builder`` on a miss."""
+        key = normalize_trade_date(trade_date)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and self._fresh(snapshot.built_at):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and self._fresh(snapshot.built_at):
+                self._snapshots.move_to_end(key)
+                return snapshot
+            t0 = time.time()
+            snapshot = builder(trade_date)
+            if snapshot is None:
+                self._snapshots.pop(key, None)
+                return None
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_dates:
+                self._snapshots.popitem(last=False)
+        logger.info(
+            f"Market snapshot {key} built: {len(snapshot)} stocks in {time.time() - t0:.2f}s"
+        )
+        return snapshot
+
+    def latest_trade_date(self, loader: Callable[[], str | None]) -> str | None:
+        """Latest trade date with daily data, re-read after the TTL."""
+        cached = self._latest_date
+        if cached is not None and self._fresh(cached[0]):
+            return cached[1]
+        latest = loader()
+        if latest:
+            self._latest_date = (time.time(), normalize_trade_date(latest))
+            return self._latest_date[1]
+        return None
+
+    def invalidate(self, trade_date: str | None = None) -> None:
+        """Drop one date (or everything, including the latest trade date)."""
+        with self._lock:
+            if trade_date is None:
+                self._snapshots.clear()
+                self._latest_date = None
+            else:
+                self._snapshots.pop(normalize_trade_date(trade_date), None)
+
+    def on_data_loaded(self, plugin_name: str, table_name: str) -> None:
+        """Plugin load listener (see ``BasePlugin.add_load_listener``)."""
+        if table_name in SOURCE_TABLES:
+            self.invalidate()
+
+
+_snapshot_cache: MarketSnapshotCache | None = None
+
+
+def get_market_snapshot_cache() -> MarketSnapshotCache:
+    """Get the process-wide market snapshot cache."""
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        from stock_datasource.config.settings import settings
+        from stock_datasource.core.base_plugin import add_load_listener
+
+        _snapshot_cache = MarketSnapshotCache(ttl=settings.SCREENER_SNAPSHOT_TTL)
+        add_load_listener(_snapshot_cache.on_data_loaded)
+    return _snapshot_cache
@@ -6,6 +6,7 @@ import logging
 from datetime import datetime
 
 from stock_datasource.models.database import db_client
+from stock_datasource.utils.latest_state import latest_source
 
 from ..core.base_sentinel import BaseSentinel
 from ..schemas import AlertCategory, AlertSeverity, SentinelAlert
@@ -50,9 +51,10 @@ class FinancialAnomalySentinel(BaseSentinel):
             codes_str = "', '".join(ts_codes)
 
             # Get the latest 2 quarters of financial data for pool stocks
+            fina_source = latest_source("fact_fina_indicator") or "fact_fina_indicator"
             fina_sql = f"""
                 SELECT ts_code, end_date, roe, revenue_yoy, netprofit_yoy
-                FROM fact_fina_indicator
+                FROM {fina_source}
                 WHERE ts_code IN ('{codes_str}')
                 ORDER BY ts_code, end_date DESC
                 LIMIT 2 BY ts_code
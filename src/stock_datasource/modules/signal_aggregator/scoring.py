@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
+
 from .schemas import (
     CapitalFlowSignalInput,
     DimensionScore,
@@ -134,6 +136,53 @@ class SignalScoringService:
             },
         )
 
+    def score_capital_batch(
+        self, signals: list[CapitalFlowSignalInput]
+    ) -> list[DimensionScore]:
+        """批量计算资金面评分, 与 score_capital 逐项等价的向量化实现."""
+        if not signals:
+            return []
+        inst = np.array([s.net_institutional_flow for s in signals], dtype=float)
+        hot = np.array([s.hot_money_count for s in signals], dtype=float)
+        hhi = np.array([s.seat_hhi for s in signals], dtype=float)
+        north = np.array([s.northbound_net_flow for s in signals], dtype=float)
+        rank = np.array(
+            [s.sector_flow_rank if s.sector_flow_rank is not None else 0 for s in signals],
+            dtype=float,
+        )
+
+        score = np.full(len(signals), 50.0)
+        inst_direction = np.where(inst > 0, 1.0, -1.0)
+        inst_magnitude = np.abs(inst)
+        score += np.where(
+            inst_magnitude > 0,
+            inst_direction * np.minimum(np.log10(inst_magnitude / 1e8 + 1) * 10, 25),
+            0.0,
+        )
+        score += np.where(hot > 0, np.minimum(hot * 2, 10), 0.0)
+        score += np.where(hhi > 0, inst_direction * hhi * 10, 0.0)
+        score += np.sign(north) * np.minimum(np.abs(north) / 1e8 * 2, 10)
+        score += np.where(rank > 0, np.maximum(0.0, 20 - rank) / 20 * 5, 0.0)
+        score = np.clip(score, 0.0, 100.0)
+
+        results = []
+        for signal, value in zip(signals, score.tolist(), strict=True):
+            value = round(value, 1)
+            results.append(
+                DimensionScore(
+                    score=value,
+                    direction="bullish" if value > 60 else ("bearish" if value < 40 else "neutral"),
+                    detail={
+                        "net_institutional_flow": signal.net_institutional_flow,
+                        "hot_money_count": signal.hot_money_count,
+                        "seat_hhi": signal.seat_hhi,
+                        "northbound_net_flow": signal.northbound_net_flow,
+                        "sector_flow_rank": signal.sector_flow_rank,
+                    },
+                )
+            )
+        return results
+
     def score_tech(self, signal: TechSignalInput) -> DimensionScore:
         """计算技术面评分.
 
@@ -199,3 +248,25 @@ class SignalScoringService:
 
         direction = "bullish" if composite > 60 else ("bearish" if composite < 40 else "neutral")
         return composite, direction
+
+    def compute_composite_batch(
+        self,
+        news_scores: list[DimensionScore],
+        capital_scores: list[DimensionScore],
+        tech_scores: list[DimensionScore],
+    ) -> list[tuple[float, str]]:
+        """批量计算综合评分, 与 compute_composite 等价."""
+        w_news, w_capital, w_tech = self._weights.normalized()
+        composite = (
+            np.array([s.score for s in news_scores], dtype=float) * w_news
+            + np.array([s.score for s in capital_scores], dtype=float) * w_capital
+            + np.array([s.score for s in tech_scores], dtype=float) * w_tech
+        )
+        composite = np.clip(composite, 0.0, 100.0)
+
+        results = []
+        for value in composite.tolist():
+            value = round(value, 1)
+            direction = "bullish" if value > 60 else ("bearish" if value < 40 else "neutral")
+            results.append((value, direction))
+        return results
@@ -10,9 +10,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import time
 from datetime import datetime
 from typing import Any
 
@@ -22,7 +22,6 @@ from stock_datasource.models.database import db_client
 
 from .schemas import (
     CapitalFlowSignalInput,
-    DimensionScore,
     NewsSignalInput,
     SignalAggregationResponse,
     SignalSnapshot,
@@ -36,6 +35,9 @@ from .scoring import SignalScoringService
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent per-stock news fetches (news sources have no batch API)
+_NEWS_CONCURRENCY = 8
+
 
 class SignalAggregator:
     """信号聚合引擎.
@@ -68,15 +70,13 @@ class SignalAggregator:
             SignalAggregationResponse 包含所有股票的评分
         """
         signal_date = signal_date or datetime.now().strftime("%Y%m%d")
-        summaries: list[StockSignalSummary] = []
         stock_names = self._load_stock_names()
 
-        for ts_code in ts_codes:
-            try:
-                summary = await self._aggregate_single(ts_code, signal_date, stock_names)
-                summaries.append(summary)
-            except Exception as e:
-                logger.warning("Signal aggregation failed for %s: %s", ts_code, e)
+        observations = await self._aggregate_batch(
+            list(dict.fromkeys(ts_codes)), signal_date, stock_names
+        )
+        self.save_snapshots(observations)
+        summaries = [self._to_summary(obs) for obs in observations]
 
         # 按综合评分排序
         summaries.sort(key=lambda s: s.composite_score, reverse=True)
@@ -96,29 +96,9 @@ class SignalAggregator:
         signal_date = signal_date or datetime.now().strftime("%Y%m%d")
         stock_names = self._load_stock_names()
         try:
-            summary = await self._aggregate_single(ts_code, signal_date, stock_names)
-            return StockObservationScore(
-                ts_code=ts_code,
-                stock_name=summary.stock_name,
-                signal_date=signal_date,
-                news_score=DimensionScore(
-                    score=summary.news_score,
-                    direction="bullish" if summary.news_score > 60 else ("bearish" if summary.news_score < 40 else "neutral"),
-                    detail=summary.news_detail,
-                ),
-                capital_score=DimensionScore(
-                    score=summary.capital_score,
-                    direction="bullish" if summary.capital_score > 60 else ("bearish" if summary.capital_score < 40 else "neutral"),
-                    detail=summary.capital_detail,
-                ),
-                tech_score=DimensionScore(
-                    score=summary.tech_score,
-                    direction="bullish" if summary.tech_score > 60 else ("bearish" if summary.tech_score < 40 else "neutral"),
-                    detail=summary.tech_detail,
-                ),
-                composite_score=summary.composite_score,
-                composite_direction=summary.composite_direction,
-            )
+            observations = await self._aggregate_batch([ts_code], signal_date, stock_names)
+            self.save_snapshots(observations)
+            return observations[0] if observations else None
         except Exception as e:
             logger.error("Signal aggregation failed for %s: %s", ts_code, e)
             return None
@@ -148,8 +128,14 @@ class SignalAggregator:
 
     def save_snapshot(self, score: StockObservationScore) -> None:
         """将评分结果持久化到ClickHouse."""
-        try:
-            snapshot = SignalSnapshot(
+        self.save_snapshots([score])
+
+    def save_snapshots(self, scores: list[StockObservationScore]) -> None:
+        """将一批评分结果以单次 INSERT 持久化到ClickHouse."""
+        if not scores:
+            return
+        snapshots = [
+            SignalSnapshot(
                 ts_code=score.ts_code,
                 signal_date=score.signal_date,
                 news_score=score.news_score.score,
@@ -159,91 +145,115 @@ class SignalAggregator:
                 news_detail=score.news_score.detail,
                 capital_detail=score.capital_score.detail,
             )
-            self._insert_snapshot(snapshot)
-        except Exception as e:
-            logger.warning("Failed to save signal snapshot for %s: %s", score.ts_code, e)
+            for score in scores
+        ]
+        self._insert_snapshots(snapshots)
 
-    def _insert_snapshot(self, snapshot: SignalSnapshot) -> None:
-        """Insert snapshot to ClickHouse."""
+    def _insert_snapshots(self, snapshots: list[SignalSnapshot]) -> None:
+        """Insert snapshots to ClickHouse in one batch."""
         try:
-            row = {
-                "ts_code": snapshot.ts_code,
-                "signal_date": snapshot.signal_date,
-                "news_score": snapshot.news_score,
-                "capital_score": snapshot.capital_score,
-                "tech_score": snapshot.tech_score,
-                "composite_score": snapshot.composite_score,
-                "news_detail": json.dumps(snapshot.news_detail, ensure_ascii=False, default=str),
-                "capital_detail": json.dumps(snapshot.capital_detail, ensure_ascii=False, default=str),
-                "created_at": snapshot.created_at,
-            }
-            df = pd.DataFrame([row])
-            self._db.insert_dataframe("obs_stock_signal_snapshot", df)
-            logger.info("Saved signal snapshot for %s on %s", snapshot.ts_code, snapshot.signal_date)
+            rows = [
+                {
+                    "ts_code": snapshot.ts_code,
+                    "signal_date": snapshot.signal_date,
+                    "news_score": snapshot.news_score,
+                    "capital_score": snapshot.capital_score,
+                    "tech_score": snapshot.tech_score,
+                    "composite_score": snapshot.composite_score,
+                    "news_detail": json.dumps(snapshot.news_detail, ensure_ascii=False, default=str),
+                    "capital_detail": json.dumps(snapshot.capital_detail, ensure_ascii=False, default=str),
+                    "created_at": snapshot.created_at,
+                }
+                for snapshot in snapshots
+            ]
+            self._db.insert_dataframe("obs_stock_signal_snapshot", pd.DataFrame(rows))
+            logger.info(
+                "Saved %d signal snapshots for %s", len(rows), snapshots[0].signal_date
+            )
         except Exception as e:
             logger.warning("ClickHouse insert failed for obs_stock_signal_snapshot: %s", e)
 
     # ------------------------------------------------------------------
-    # 内部: 单股聚合
+    # 内部: 批量聚合
     # ------------------------------------------------------------------
 
-    async def _aggregate_single(
+    async def _aggregate_batch(
         self,
-        ts_code: str,
+        ts_codes: list[str],
         signal_date: str,
         stock_names: dict[str, str],
-    ) -> StockSignalSummary:
-        """为单只股票聚合3个维度的信号."""
-        # 1. 消息面信号
-        news_input = await self._collect_news_signal(ts_code)
-        news_score = self._scoring.score_news(news_input)
-
-        # 2. 资金面信号
-        capital_input = await self._collect_capital_signal(ts_code)
-        capital_score = self._scoring.score_capital(capital_input)
-
-        # 3. 技术面信号
-        tech_input = await self._collect_tech_signal(ts_code)
-        tech_score = self._scoring.score_tech(tech_input)
-
-        # 4. 综合评分
-        composite_score, composite_direction = self._scoring.compute_composite(
-            news_score, capital_score, tech_score
-        )
+    ) -> list[StockObservationScore]:
+        """为一批股票聚合3个维度的信号.
 
-        summary = StockSignalSummary(
-            ts_code=ts_code,
-            stock_name=stock_names.get(ts_code, ""),
-            composite_score=composite_score,
-            composite_direction=composite_direction,
-            news_score=news_score.score,
-            capital_score=capital_score.score,
-            tech_score=tech_score.score,
-            news_detail=news_score.detail,
-            capital_detail=capital_score.detail,
-            tech_detail=tech_score.detail,
-            signal_date=signal_date,
+        资金面按信号族各一条分组查询, 技术面一次生成全部信号, 消息面
+        并发拉取; 评分向量化计算.
+        """
+        if not ts_codes:
+            return []
+
+        news_inputs, capital_inputs, tech_inputs = await asyncio.gather(
+            self._collect_news_signals(ts_codes),
+            asyncio.to_thread(self._collect_capital_signals, ts_codes),
+            self._collect_tech_signals(ts_codes),
         )
 
-        # 5. 持久化
-        observation = StockObservationScore(
-            ts_code=ts_code,
-            stock_name=stock_names.get(ts_code, ""),
-            signal_date=signal_date,
-            news_score=news_score,
-            capital_score=capital_score,
-            tech_score=tech_score,
-            composite_score=composite_score,
-            composite_direction=composite_direction,
+        news_scores = [self._scoring.score_news(news_inputs[c]) for c in ts_codes]
+        capital_scores = self._scoring.score_capital_batch(
+            [capital_inputs[c] for c in ts_codes]
+        )
+        tech_scores = [self._scoring.score_tech(tech_inputs[c]) for c in ts_codes]
+        composites = self._scoring.compute_composite_batch(
+            news_scores, capital_scores, tech_scores
         )
-        self.save_snapshot(observation)
 
-        return summary
+        return [
+            StockObservationScore(
+                ts_code=ts_code,
+                stock_name=stock_names.get(ts_code, ""),
+                signal_date=signal_date,
+                news_score=news,
+                capital_score=capital,
+                tech_score=tech,
+                composite_score=composite,
+                composite_direction=direction,
+            )
+            for ts_code, news, capital, tech, (composite, direction) in zip(
+                ts_codes, news_scores, capital_scores, tech_scores, composites,
+                strict=True,
+            )
+        ]
+
+    @staticmethod
+    def _to_summary(observation: StockObservationScore) -> StockSignalSummary:
+        return StockSignalSummary(
+            ts_code=observation.ts_code,
+            stock_name=observation.stock_name,
+            composite_score=observation.composite_score,
+            composite_direction=observation.composite_direction,
+            news_score=observation.news_score.score,
+            capital_score=observation.capital_score.score,
+            tech_score=observation.tech_score.score,
+            news_detail=observation.news_score.detail,
+            capital_detail=observation.capital_score.detail,
+            tech_detail=observation.tech_score.detail,
+            signal_date=observation.signal_date,
+        )
 
     # ------------------------------------------------------------------
     # 数据采集
     # ------------------------------------------------------------------
 
+    async def _collect_news_signals(self, ts_codes: list[str]) -> dict[str, NewsSignalInput]:
+        """并发采集消息面信号 (新闻源按股票提供, 并发度受限)."""
+        semaphore = asyncio.Semaphore(_NEWS_CONCURRENCY)
+
+        async def _one(ts_code: str) -> NewsSignalInput:
+            async with semaphore:
+                return await self._collect_news_signal(ts_code)
+
+        results = await asyncio.gather(*(_one(code) for code in ts_codes))
+        return dict(zip(ts_codes, results, strict=True))
+
     async def _collect_news_signal(self, ts_code: str) -> NewsSignalInput:
         """采集消息面信号."""
         try:
@@ -283,114 +293,145 @@ class SignalAggregator:
             logger.warning("News signal collection failed for %s: %s", ts_code, e)
             return NewsSignalInput(ts_code=ts_code)
 
-    async def _collect_capital_signal(self, ts_code: str) -> CapitalFlowSignalInput:
-        """采集资金面信号."""
-        try:
-            from stock_datasource.services.toplist_analysis_service import TopListAnalysisService
-
-            service = TopListAnalysisService()
+    def _collect_capital_signals(
+        self, ts_codes: list[str]
+    ) -> dict[str, CapitalFlowSignalInput]:
+        """采集资金面信号: 机构/游资/北向各一条分组查询覆盖全部股票."""
+        institutional = self._query_institutional_flows(ts_codes)
+        hot_money = self._query_hot_money_counts(ts_codes)
+        northbound = self._query_northbound_flows(ts_codes)
 
-            # 席位集中度
-            concentration = await service.calculate_seat_concentration(ts_code, days=10)
-            hhi = concentration.get("hhi", 0.0) if isinstance(concentration, dict) else 0.0
-
-            # 机构净流入
-            net_inst_flow = self._query_institutional_net_flow(ts_code)
-
-            # 游资
-            hot_money_count = self._query_hot_money_count(ts_code)
-
-            # 北向资金
-            northbound_flow = self._query_northbound_flow(ts_code)
-
-            return CapitalFlowSignalInput(
+        inputs = {}
+        for ts_code in ts_codes:
+            net_flow, hhi = institutional.get(ts_code, (0.0, 0.0))
+            inputs[ts_code] = CapitalFlowSignalInput(
                 ts_code=ts_code,
-                net_institutional_flow=net_inst_flow,
-                hot_money_count=hot_money_count,
-                seat_hhi=float(hhi) if hhi else 0.0,
-                northbound_net_flow=northbound_flow,
+                net_institutional_flow=net_flow,
+                hot_money_count=hot_money.get(ts_code, 0),
+                seat_hhi=min(max(hhi, 0.0), 1.0),
+                northbound_net_flow=northbound.get(ts_code, 0.0),
             )
-        except Exception as e:
-            logger.warning("Capital signal collection failed for %s: %s", ts_code, e)
-            return CapitalFlowSignalInput(ts_code=ts_code)
-
-    async def _collect_tech_signal(self, ts_code: str) -> TechSignalInput:
-        """采集技术面信号."""
+        return inputs
+
+    async def _collect_tech_signals(self, ts_codes: list[str]) -> dict[str, TechSignalInput]:
+        """采集技术面信号 (一次生成全部股票的信号)."""
+        inputs = {
+            code: TechSignalInput(ts_code=code, signal_type="hold", confidence=0.0)
+            for code in ts_codes
+        }
         try:
             from stock_datasource.modules.quant.signal_generator import get_signal_generator
 
             generator = get_signal_generator()
-            result = await generator.generate_signals([ts_code])
-
-            if result.signals:
-                # 取最新信号(置信度最高的)
-                best = max(result.signals, key=lambda s: s.confidence)
-                return TechSignalInput(
+            result = await generator.generate_signals(ts_codes)
+
+            # 每只股票取置信度最高的信号
+            best: dict[str, Any] = {}
+            for signal in result.signals:
+                current = best.get(signal.ts_code)
+                if current is None or signal.confidence > current.confidence:
+                    best[signal.ts_code] = signal
+            for ts_code, signal in best.items():
+                if ts_code not in inputs:
+                    continue
+                inputs[ts_code] = TechSignalInput(
                     ts_code=ts_code,
-                    signal_type=best.signal_type,
-                    confidence=best.confidence,
-                    target_position=best.target_position,
-                    reason=best.reason,
-                    ma_short=best.ma25,
-                    ma_long=best.ma120,
+                    signal_type=signal.signal_type,
+                    confidence=signal.confidence,
+                    target_position=signal.target_position,
+                    reason=signal.reason,
+                    ma_short=signal.ma25,
+                    ma_long=signal.ma120,
                 )
-
-            # 无信号则返回hold
-            return TechSignalInput(ts_code=ts_code, signal_type="hold", confidence=0.0)
         except Exception as e:
-            logger.warning("Tech signal collection failed for %s: %s", ts_code, e)
-            return TechSignalInput(ts_code=ts_code, signal_type="hold", confidence=0.0)
+            logger.warning("Tech signal collection failed for %d stocks: %s", len(ts_codes), e)
+        return inputs
 
     # ------------------------------------------------------------------
-    # ClickHouse 直接查询
+    # ClickHouse 直接查询 (按股票分组, 每个信号族一条)
     # ------------------------------------------------------------------
 
-    def _query_institutional_net_flow(self, ts_code: str) -> float:
-        """查询机构净流入."""
+    def _query_institutional_flows(
+        self, ts_codes: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        """查询机构净流入及席位集中度HHI: {ts_code: (net_flow, hhi)}."""
         try:
-            df = self._db.execute_query(f"""
-                SELECT sum(net_buy) as total_net
-                FROM ods_top_inst
-                WHERE ts_code = '{ts_code}'
-                AND trade_date >= toString(subtractDays(today(), 10))
-            """)
-            if not df.empty and df.iloc[0]["total_net"] is not None:
-                return float(df.iloc[0]["total_net"])
+            df = self._db.execute_query(
+                """
+                SELECT ts_code,
+                       sum(seat_net) AS total_net,
+                       if(sum(seat_abs) > 0,
+                          sum(seat_net * seat_net) / (sum(seat_abs) * sum(seat_abs)),
+                          0) AS hhi
+                FROM (
+                    SELECT ts_code, exalter,
+                           sum(net_buy) AS seat_net,
+                           sum(abs(net_buy)) AS seat_abs
+                    FROM ods_top_inst
+                    WHERE ts_code IN %(ts_codes)s
+                    AND trade_date >= toString(subtractDays(today(), 10))
+                    GROUP BY ts_code, exalter
+                )
+                GROUP BY ts_code
+                """,
+                {"ts_codes": tuple(ts_codes)},
+            )
+            return {
+                row.ts_code: (
+                    float(row.total_net) if pd.notna(row.total_net) else 0.0,
+                    float(row.hhi) if pd.notna(row.hhi) else 0.0,
+                )
+                for row in df.itertuples(index=False)
+            }
         except Exception as e:
             logger.debug("Institutional flow query failed: %s", e)
-        return 0.0
+            return {}
 
-    def _query_hot_money_count(self, ts_code: str) -> int:
+    def _query_hot_money_counts(self, ts_codes: list[str]) -> dict[str, int]:
         """查询游资参与席位数量."""
         try:
-            df = self._db.execute_query(f"""
-                SELECT count(DISTINCT exalter) as seat_count
+            df = self._db.execute_query(
+                """
+                SELECT ts_code, count(DISTINCT exalter) AS seat_count
                 FROM ods_top_list
-                WHERE ts_code = '{ts_code}'
+                WHERE ts_code IN %(ts_codes)s
                 AND trade_date >= toString(subtractDays(today(), 10))
-                AND exalter NOT LIKE '%机构%'
-                AND exalter NOT LIKE '%证券%'
-            """)
-            if not df.empty and df.iloc[0]["seat_count"] is not None:
-                return int(df.iloc[0]["seat_count"])
+                AND exalter NOT LIKE '%%机构%%'
+                AND exalter NOT LIKE '%%证券%%'
+                GROUP BY ts_code
+                """,
+                {"ts_codes": tuple(ts_codes)},
+            )
+            return {
+                row.ts_code: int(row.seat_count)
+                for row in df.itertuples(index=False)
+                if pd.notna(row.seat_count)
+            }
         except Exception as e:
             logger.debug("Hot money count query failed: %s", e)
-        return 0
+            return {}
 
-    def _query_northbound_flow(self, ts_code: str) -> float:
+    def _query_northbound_flows(self, ts_codes: list[str]) -> dict[str, float]:
         """查询北向资金净流入."""
         try:
-            df = self._db.execute_query(f"""
-                SELECT sum(vol) as total_vol
+            df = self._db.execute_query(
+                """
+                SELECT ts_code, sum(vol) AS total_vol
                 FROM ods_hsgt_top10
-                WHERE ts_code = '{ts_code}'
+                WHERE ts_code IN %(ts_codes)s
                 AND trade_date >= toString(subtractDays(today(), 10))
-            """)
-            if not df.empty and df.iloc[0]["total_vol"] is not None:
-                return float(df.iloc[0]["total_vol"])
+                GROUP BY ts_code
+                """,
+                {"ts_codes": tuple(ts_codes)},
+            )
+            return {
+                row.ts_code: float(row.total_vol)
+                for row in df.itertuples(index=False)
+                if pd.notna(row.total_vol)
+            }
         except Exception as e:
             logger.debug("Northbound flow query failed: %s", e)
-        return 0.0
+            return {}
 
     def _load_snapshots_from_clickhouse(
         self, ts_code: str, days: int
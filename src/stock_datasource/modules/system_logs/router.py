@@ -19,6 +19,8 @@ from .schemas import (
     LogListResponse,
     LogStatsResponse,
     OperationTimelineResponse,
+    QueryProfilerConfig,
+    QueryProfilerStatus,
 )
 from .service import get_log_service
 
@@ -259,6 +261,84 @@ async def get_log_files(log_service=Depends(get_log_service)):
         )
 
 
+@router.get(
+    "/queries/profiler",
+    response_model=QueryProfilerStatus,
+    dependencies=[Depends(require_admin)],
+    summary="Get query profiler status",
+    description="Whether ClickHouse query profiling is on and what it has collected",
+)
+async def get_query_profiler_status():
+    """Get query profiler status."""
+    from stock_datasource.utils.query_profiler import query_profiler
+
+    return query_profiler.status()
+
+
+@router.put(
+    "/queries/profiler",
+    response_model=QueryProfilerStatus,
+    dependencies=[Depends(require_admin)],
+    summary="Configure query profiler",
+    description="Enable/disable ClickHouse query profiling or change the slow threshold",
+)
+async def configure_query_profiler(config: QueryProfilerConfig):
+    """Update query profiler settings for this process."""
+    from stock_datasource.utils.query_profiler import query_profiler
+
+    query_profiler.configure(
+        enabled=config.enabled, slow_threshold_ms=config.slow_threshold_ms
+    )
+    return query_profiler.status()
+
+
+@router.delete(
+    "/queries/profiler",
+    response_model=QueryProfilerStatus,
+    dependencies=[Depends(require_admin)],
+    summary="Reset query profiler",
+    description="Clear collected slow queries and fingerprint statistics",
+)
+async def reset_query_profiler():
+    """Clear profiler data."""
+    from stock_datasource.utils.query_profiler import query_profiler
+
+    query_profiler.reset()
+    return query_profiler.status()
+
+
+@router.get(
+    "/queries/slow",
+    dependencies=[Depends(require_admin)],
+    summary="Get slow queries",
+    description="Most recent ClickHouse queries above the slow threshold, newest first",
+)
+async def get_slow_queries(limit: int = 100, fingerprint: str = None):
+    """Get slow queries from the in-memory ring buffer."""
+    from stock_datasource.utils.query_profiler import query_profiler
+
+    limit = max(1, min(limit, 1000))
+    return {"items": query_profiler.slow_queries(limit=limit, fingerprint=fingerprint)}
+
+
+@router.get(
+    "/queries/fingerprints",
+    dependencies=[Depends(require_admin)],
+    summary="Get query fingerprints",
+    description="Profiled queries grouped by normalised SQL, worst offenders first",
+)
+async def get_query_fingerprints(sort_by: str = "total_elapsed_ms", limit: int = 50):
+    """Get per-fingerprint query statistics."""
+    from stock_datasource.utils.query_profiler import query_profiler
+
+    limit = max(1, min(limit, 500))
+    try:
+        items = query_profiler.top_fingerprints(sort_by=sort_by, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items}
+
+
 @router.get(
     "/archives",
     response_model=ArchiveListResponse,
@@ -189,3 +189,21 @@ class ArchiveListResponse(BaseModel):
     """Response for archive list query."""
 
     archives: List[LogFileInfo] = Field(..., description="Archive files")
+
+
+class QueryProfilerConfig(BaseModel):
+    """Runtime settings of the ClickHouse query profiler."""
+
+    enabled: Optional[bool] = Field(None, description="Turn query profiling on or off")
+    slow_threshold_ms: Optional[float] = Field(
+        None, ge=0, description="Wall time at or above which a query is logged as slow"
+    )
+
+
+class QueryProfilerStatus(BaseModel):
+    """Current state of the ClickHouse query profiler."""
+
+    enabled: bool
+    slow_threshold_ms: float
+    fingerprints: int = Field(..., description="Distinct SQL fingerprints tracked")
+    slow_buffered: int = Field(..., description="Slow queries held in the ring buffer")
@@ -4,6 +4,7 @@ import logging
 import math
 import os
 import uuid
+from datetime import datetime
 
 from ...models.database import db_client
 
@@ -16,9 +17,18 @@ _schema_initialized = False
 
 async def _ensure_schema():
     """Ensure token usage tables exist (lazy init)."""
+    _ensure_schema_sync()
+
+
+def _ensure_schema_sync() -> bool:
+    """Synchronous schema init, also used by the telemetry sink flusher.
+
+    Returns True once the schema is in place; failures are retried on the
+    next call.
+    """
     global _schema_initialized
     if _schema_initialized:
-        return
+        return True
     try:
         schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
         with open(schema_path) as f:
@@ -29,8 +39,10 @@ async def _ensure_schema():
                 db_client.execute(statement)
         _schema_initialized = True
         logger.info("Token usage schema initialized")
+        return True
     except Exception as e:
         logger.error(f"Failed to initialize token usage schema: {e}")
+        return False
 
 
 class TokenUsageService:
@@ -138,17 +150,15 @@ class TokenUsageService:
                 },
             )
 
-            # Insert usage log
-            log_id = str(uuid.uuid4())
-            db_client.execute(
-                "INSERT INTO token_usage_log "
-                "(id, user_id, session_id, message_id, agent_name, model_name, "
-                "prompt_tokens, completion_tokens, total_tokens, created_at) "
-                "VALUES (%(id)s, %(user_id)s, %(session_id)s, %(message_id)s, "
-                "%(agent_name)s, %(model_name)s, %(prompt_tokens)s, "
-                "%(completion_tokens)s, %(total_tokens)s, now())",
+            # Queue usage log (batched by the telemetry sink)
+            from stock_datasource.services.telemetry_sink import get_telemetry_sink
+
+            sink = get_telemetry_sink()
+            sink.register_table("token_usage_log", ensure_fn=_ensure_schema_sync)
+            sink.emit(
+                "token_usage_log",
                 {
-                    "id": log_id,
+                    "id": str(uuid.uuid4()),
                     "user_id": user_id,
                     "session_id": session_id,
                     "message_id": message_id,
@@ -157,6 +167,7 @@ class TokenUsageService:
                     "prompt_tokens": prompt_tokens,
                     "completion_tokens": completion_tokens,
                     "total_tokens": total_tokens,
+                    "created_at": datetime.now(),
                 },
             )
 
@@ -2,6 +2,8 @@
 
 import importlib
 import pkgutil
+import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -10,6 +12,46 @@ from stock_datasource.core.base_plugin import BasePlugin
 from stock_datasource.utils.logger import logger
 
 
+def lazy_exports(
+    package: str,
+    exports: dict[str, str],
+    optional: tuple[str, ...] = (),
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Module ``__getattr__`` / ``__dir__`` for a plugin package ``__init__``.
+
+    Importing a plugin's ``plugin.py`` instantiates its extractor, and most
+    extractors create a Tushare ``pro_api()`` client on construction. Package
+    ``__init__`` files therefore re-export their classes lazily: importing
+    ``<package>.service`` (HTTP/MCP service registration) no longer runs the
+    plugin and extractor modules; they are imported when one of ``exports``
+    is first accessed.
+
+    Args:
+        package: The package ``__name__``.
+        exports: ``{attribute: relative submodule}``, e.g. ``{"X": ".plugin"}``.
+        optional: Exports that resolve to None if their submodule fails to
+            import.
+    """
+
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        try:
+            value = getattr(importlib.import_module(submodule, package), name)
+        except Exception:
+            if name not in optional:
+                raise
+            value = None
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*exports, *vars(sys.modules[package])})
+
+    return __getattr__, __dir__
+
+
 class PluginManager:
     """Manages data plugins."""
 
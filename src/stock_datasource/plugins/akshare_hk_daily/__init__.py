@@ -1,5 +1,8 @@
 """AKShare Hong Kong daily data plugin."""
 
-from .plugin import AKShareHKDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["AKShareHKDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"AKShareHKDailyPlugin": ".plugin"})
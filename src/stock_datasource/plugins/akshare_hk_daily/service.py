@@ -51,6 +51,7 @@ class AKShareHKDailyService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="raw",
     )
     def get_hk_daily(
         self, symbol: str, start_date: str | None = None, end_date: str | None = None
@@ -106,6 +107,7 @@ class AKShareHKDailyService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="raw",
     )
     def get_latest_hk_daily(self, symbol: str, limit: int = 10) -> list[dict[str, Any]]:
         """
@@ -1,5 +1,8 @@
 """AKShare Hong Kong stock list plugin."""
 
-from .plugin import AKShareHKStockListPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["AKShareHKStockListPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"AKShareHKStockListPlugin": ".plugin"})
@@ -29,7 +29,7 @@ class AKShareHKStockListService(BaseService):
     def __init__(self):
         super().__init__("akshare_hk_stock_list")
 
-    @query_method(description="Query all Hong Kong stocks", params=[])
+    @query_method(description="Query all Hong Kong stocks", params=[], pushdown="raw")
     def get_all_hk_stocks(self) -> list[dict[str, Any]]:
         """
         Query all Hong Kong stocks.
@@ -61,6 +61,7 @@ class AKShareHKStockListService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="raw",
     )
     def get_hk_stock_by_symbol(self, symbol: str) -> list[dict[str, Any]]:
         """
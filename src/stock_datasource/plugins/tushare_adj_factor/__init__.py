@@ -1,5 +1,8 @@
 """TuShare adjustment factor plugin."""
 
-from .plugin import TuShareAdjFactorPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareAdjFactorPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareAdjFactorPlugin": ".plugin"})
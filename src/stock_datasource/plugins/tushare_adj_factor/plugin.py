@@ -9,6 +9,7 @@ import pandas as pd
 
 from stock_datasource.core.base_plugin import PluginCategory, PluginRole
 from stock_datasource.plugins import BasePlugin
+from stock_datasource.utils.adjusted_prices import get_adjusted_price_store
 
 from .extractor import extractor
 
@@ -156,6 +157,9 @@ class TuShareAdjFactorPlugin(BasePlugin):
             self.db.insert_dataframe("ods_adj_factor", ods_data)
 
             self.logger.info(f"Loaded {len(ods_data)} records into ods_adj_factor")
+
+            # Keep fact_adjusted_daily in sync for the loaded dates
+            get_adjusted_price_store().on_data_loaded("a_share", ods_data)
             return {
                 "status": "success",
                 "table": "ods_adj_factor",
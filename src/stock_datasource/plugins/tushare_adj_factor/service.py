@@ -51,6 +51,7 @@ class TuShareAdjFactorService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_adj_factor(
         self,
@@ -95,6 +96,7 @@ class TuShareAdjFactorService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_adj_factor(
         self,
@@ -1,4 +1,12 @@
-from .plugin import TuShareBalancesheetPlugin
-from .service import TuShareBalancesheetService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareBalancesheetPlugin", "TuShareBalancesheetService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareBalancesheetPlugin": ".plugin",
+        "TuShareBalancesheetService": ".service",
+    },
+)
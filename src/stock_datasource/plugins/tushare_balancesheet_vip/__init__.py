@@ -1,6 +1,14 @@
 """TuShare balance sheet VIP data plugin."""
 
-from .plugin import TuShareBalancesheetVipPlugin
-from .service import TuShareBalancesheetVipService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareBalancesheetVipPlugin", "TuShareBalancesheetVipService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareBalancesheetVipPlugin": ".plugin",
+        "TuShareBalancesheetVipService": ".service",
+    },
+)
@@ -1,4 +1,12 @@
-from .plugin import TuShareCashflowPlugin
-from .service import TuShareCashflowService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareCashflowPlugin", "TuShareCashflowService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareCashflowPlugin": ".plugin",
+        "TuShareCashflowService": ".service",
+    },
+)
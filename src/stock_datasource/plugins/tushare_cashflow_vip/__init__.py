@@ -1,6 +1,14 @@
 """TuShare cash flow VIP data plugin."""
 
-from .plugin import TuShareCashflowVipPlugin
-from .service import TuShareCashflowVipService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareCashflowVipPlugin", "TuShareCashflowVipService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareCashflowVipPlugin": ".plugin",
+        "TuShareCashflowVipService": ".service",
+    },
+)
@@ -1,5 +1,8 @@
 """TuShare ci_daily plugin."""
 
-from .plugin import TuShareCiDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareCiDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareCiDailyPlugin": ".plugin"})
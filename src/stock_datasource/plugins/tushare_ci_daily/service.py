@@ -41,6 +41,7 @@ class TuShareCiDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_ci_daily(
         self, ts_code: str, start_date: str, end_date: str
@@ -67,6 +68,7 @@ class TuShareCiDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_ci_daily_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
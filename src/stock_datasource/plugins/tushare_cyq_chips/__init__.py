@@ -1,6 +1,14 @@
 """TuShare cyq_chips (筹码分布) plugin."""
 
-from .plugin import TuShareCyqChipsPlugin
-from .service import TuShareCyqChipsService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareCyqChipsPlugin", "TuShareCyqChipsService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareCyqChipsPlugin": ".plugin",
+        "TuShareCyqChipsService": ".service",
+    },
+)
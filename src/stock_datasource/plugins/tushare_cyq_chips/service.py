@@ -51,6 +51,7 @@ class TuShareCyqChipsService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_date_range(
         self,
@@ -104,6 +105,7 @@ class TuShareCyqChipsService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_date(
         self,
@@ -148,6 +150,7 @@ class TuShareCyqChipsService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest(
         self,
@@ -329,6 +332,7 @@ class TuShareCyqChipsService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_concentration(
         self,
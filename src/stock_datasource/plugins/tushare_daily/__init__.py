@@ -1,5 +1,8 @@
 """TuShare daily data plugin."""
 
-from .plugin import TuShareDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareDailyPlugin": ".plugin"})
@@ -10,6 +10,7 @@ import pandas as pd
 from stock_datasource.core.base_plugin import PluginCategory, PluginRole
 from stock_datasource.data_sources.qmt import QmtHistoricalProvider
 from stock_datasource.plugins import BasePlugin
+from stock_datasource.utils.adjusted_prices import get_adjusted_price_store
 
 from .extractor import extractor
 
@@ -231,6 +232,9 @@ class TuShareDailyPlugin(BasePlugin):
             results["total_records"] += len(ods_data)
             self.logger.info(f"Loaded {len(ods_data)} records into ods_daily")
 
+            # Bars whose factors were loaded first only join now
+            get_adjusted_price_store().on_data_loaded("a_share", ods_data)
+
             # Load into Fact table
             self.logger.info(f"Loading {len(data)} records into fact_daily_bar")
             fact_data = data.copy()
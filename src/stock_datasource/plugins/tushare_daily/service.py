@@ -51,6 +51,7 @@ class TuShareDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_daily_data(
         self,
@@ -107,6 +108,7 @@ class TuShareDailyService(BaseService):
                 default=1,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_daily(
         self,
@@ -231,6 +233,7 @@ class TuShareDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="raw",
     )
     def get_all_daily_by_date(
         self,
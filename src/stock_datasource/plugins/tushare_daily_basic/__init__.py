@@ -1,5 +1,8 @@
 """TuShare daily basic indicators plugin."""
 
-from .plugin import TuShareDailyBasicPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareDailyBasicPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareDailyBasicPlugin": ".plugin"})
@@ -51,6 +51,7 @@ class TuShareDailyBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_daily_basic(
         self,
@@ -122,6 +123,7 @@ class TuShareDailyBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="raw",
     )
     def get_all_daily_basic_by_date(
         self,
@@ -172,6 +174,7 @@ class TuShareDailyBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_daily_basic(
         self,
@@ -244,6 +247,7 @@ class TuShareDailyBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="raw",
     )
     def get_all_daily_basic_by_date(
         self,
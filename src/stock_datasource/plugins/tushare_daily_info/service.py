@@ -41,6 +41,7 @@ class TuShareDailyInfoService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_daily_info(
         self, start_date: str, end_date: str, exchange: str | None = None
@@ -68,6 +69,7 @@ class TuShareDailyInfoService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_daily_info_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
@@ -1,5 +1,8 @@
 """TuShare ETF basic information plugin."""
 
-from .plugin import TuShareETFBasicPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareETFBasicPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareETFBasicPlugin": ".plugin"})
@@ -39,6 +39,7 @@ class TuShareETFBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_etf_basic(self, ts_code: str) -> list[dict[str, Any]]:
         """Query ETF basic information by code.
@@ -90,6 +91,7 @@ class TuShareETFBasicService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_all_etfs(
         self, list_status: str = "L", exchange: str | None = None
@@ -144,6 +146,7 @@ class TuShareETFBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_etfs_by_index(self, index_code: str) -> list[dict[str, Any]]:
         """Query ETFs by tracking index.
@@ -190,6 +193,7 @@ class TuShareETFBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_etfs_by_manager(self, mgr_name: str) -> list[dict[str, Any]]:
         """Query ETFs by manager.
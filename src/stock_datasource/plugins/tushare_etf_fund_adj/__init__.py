@@ -1,5 +1,8 @@
 """TuShare ETF fund adjustment factor plugin."""
 
-from .plugin import TuShareETFFundAdjPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareETFFundAdjPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareETFFundAdjPlugin": ".plugin"})
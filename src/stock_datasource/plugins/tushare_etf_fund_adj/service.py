@@ -51,6 +51,7 @@ class TuShareETFFundAdjService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_etf_adj_factor(
         self,
@@ -131,6 +132,7 @@ class TuShareETFFundAdjService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_adj_factors_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         """Query adjustment factors for all ETFs on a specific date.
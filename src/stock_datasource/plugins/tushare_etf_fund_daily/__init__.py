@@ -1,5 +1,8 @@
 """TuShare ETF fund daily data plugin."""
 
-from .plugin import TuShareETFFundDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareETFFundDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareETFFundDailyPlugin": ".plugin"})
@@ -51,6 +51,7 @@ class TuShareETFFundDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_etf_daily(
         self,
@@ -109,6 +110,7 @@ class TuShareETFFundDailyService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_etf_daily(
         self,
@@ -1,7 +1,15 @@
 """TuShare ETF基准指数列表插件."""
 
-from .extractor import ETFIndexExtractor
-from .plugin import TuShareETFIndexPlugin
-from .service import ETFIndexService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["ETFIndexExtractor", "ETFIndexService", "TuShareETFIndexPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ETFIndexExtractor": ".extractor",
+        "TuShareETFIndexPlugin": ".plugin",
+        "ETFIndexService": ".service",
+    },
+)
@@ -1,5 +1,8 @@
 """TuShare ETF stk_mins data plugin."""
 
-from .plugin import TuShareETFStkMinsPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareETFStkMinsPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareETFStkMinsPlugin": ".plugin"})
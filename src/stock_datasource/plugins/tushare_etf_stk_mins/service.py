@@ -57,6 +57,7 @@ class TuShareETFStkMinsService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_etf_mins(
         self,
@@ -122,6 +123,7 @@ class TuShareETFStkMinsService(BaseService):
                 default=100,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_etf_mins(
         self,
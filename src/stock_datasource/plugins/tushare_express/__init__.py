@@ -1,6 +1,14 @@
 """Tushare 业绩快报插件"""
 
-from .plugin import TuShareExpressPlugin
-from .service import TuShareExpressService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareExpressPlugin", "TuShareExpressService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareExpressPlugin": ".plugin",
+        "TuShareExpressService": ".service",
+    },
+)
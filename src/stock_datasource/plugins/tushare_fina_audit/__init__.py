@@ -1,6 +1,14 @@
 """TuShare financial audit opinion data plugin."""
 
-from .plugin import TuShareFinaAuditPlugin
-from .service import TuShareFinaAuditService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareFinaAuditPlugin", "TuShareFinaAuditService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareFinaAuditPlugin": ".plugin",
+        "TuShareFinaAuditService": ".service",
+    },
+)
@@ -1,4 +1,12 @@
-from .plugin import TuShareFinaceIndicatorPlugin
-from .service import TuShareFinaceIndicatorService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareFinaceIndicatorPlugin", "TuShareFinaceIndicatorService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareFinaceIndicatorPlugin": ".plugin",
+        "TuShareFinaceIndicatorService": ".service",
+    },
+)
@@ -1,4 +1,12 @@
-from .plugin import TuShareForecastPlugin
-from .service import TuShareForecastService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareForecastPlugin", "TuShareForecastService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareForecastPlugin": ".plugin",
+        "TuShareForecastService": ".service",
+    },
+)
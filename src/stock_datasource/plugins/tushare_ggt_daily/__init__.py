@@ -1,7 +1,15 @@
 """港股通每日成交统计插件"""
 
-from stock_datasource.plugins.tushare_ggt_daily.extractor import GgtDailyExtractor
-from stock_datasource.plugins.tushare_ggt_daily.plugin import GgtDailyPlugin
-from stock_datasource.plugins.tushare_ggt_daily.service import GgtDailyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["GgtDailyExtractor", "GgtDailyPlugin", "GgtDailyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GgtDailyExtractor": ".extractor",
+        "GgtDailyPlugin": ".plugin",
+        "GgtDailyService": ".service",
+    },
+)
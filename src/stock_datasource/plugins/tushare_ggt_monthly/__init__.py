@@ -1,7 +1,15 @@
 """港股通每月成交统计插件"""
 
-from stock_datasource.plugins.tushare_ggt_monthly.extractor import GgtMonthlyExtractor
-from stock_datasource.plugins.tushare_ggt_monthly.plugin import GgtMonthlyPlugin
-from stock_datasource.plugins.tushare_ggt_monthly.service import GgtMonthlyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["GgtMonthlyExtractor", "GgtMonthlyPlugin", "GgtMonthlyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GgtMonthlyExtractor": ".extractor",
+        "GgtMonthlyPlugin": ".plugin",
+        "GgtMonthlyService": ".service",
+    },
+)
@@ -1,7 +1,15 @@
 """港股通十大成交股插件"""
 
-from stock_datasource.plugins.tushare_ggt_top10.extractor import GgtTop10Extractor
-from stock_datasource.plugins.tushare_ggt_top10.plugin import GgtTop10Plugin
-from stock_datasource.plugins.tushare_ggt_top10.service import GgtTop10Service
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["GgtTop10Extractor", "GgtTop10Plugin", "GgtTop10Service"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GgtTop10Extractor": ".extractor",
+        "GgtTop10Plugin": ".plugin",
+        "GgtTop10Service": ".service",
+    },
+)
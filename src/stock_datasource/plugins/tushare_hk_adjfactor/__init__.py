@@ -1,6 +1,14 @@
 """TuShare Hong Kong Stock Adjustment Factor plugin."""
 
-from .plugin import TuShareHKAdjFactorPlugin
-from .service import TuShareHKAdjFactorService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKAdjFactorPlugin", "TuShareHKAdjFactorService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKAdjFactorPlugin": ".plugin",
+        "TuShareHKAdjFactorService": ".service",
+    },
+)
@@ -9,6 +9,7 @@ import pandas as pd
 
 from stock_datasource.core.base_plugin import PluginCategory, PluginRole
 from stock_datasource.plugins import BasePlugin
+from stock_datasource.utils.adjusted_prices import get_adjusted_price_store
 
 from .extractor import extractor
 
@@ -172,6 +173,9 @@ class TuShareHKAdjFactorPlugin(BasePlugin):
             results["total_records"] += len(load_data)
             self.logger.info(f"Loaded {len(load_data)} records into {table_name}")
 
+            # Keep fact_adjusted_daily in sync for the loaded dates
+            get_adjusted_price_store().on_data_loaded("hk_stock", load_data)
+
         except Exception as e:
             self.logger.error(f"Failed to load data: {e}")
             results["status"] = "failed"
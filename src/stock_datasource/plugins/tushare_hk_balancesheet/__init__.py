@@ -1,4 +1,12 @@
-from .plugin import TuShareHKBalancesheetPlugin
-from .service import TuShareHKBalancesheetService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKBalancesheetPlugin", "TuShareHKBalancesheetService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKBalancesheetPlugin": ".plugin",
+        "TuShareHKBalancesheetService": ".service",
+    },
+)
@@ -1,6 +1,14 @@
 """TuShare Hong Kong Stock Basic Info plugin."""
 
-from .plugin import TuShareHKBasicPlugin
-from .service import TuShareHKBasicService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKBasicPlugin", "TuShareHKBasicService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKBasicPlugin": ".plugin",
+        "TuShareHKBasicService": ".service",
+    },
+)
@@ -55,6 +55,7 @@ class TuShareHKBasicService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="raw",
     )
     def get_stock_list(
         self,
@@ -95,6 +96,7 @@ class TuShareHKBasicService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="raw",
     )
     def search(
         self,
@@ -136,6 +138,7 @@ class TuShareHKBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="raw",
     )
     def get_by_market(self, market: str) -> list[dict[str, Any]]:
         """
@@ -200,6 +203,7 @@ class TuShareHKBasicService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="raw",
     )
     def get_recent_ipo(
         self,
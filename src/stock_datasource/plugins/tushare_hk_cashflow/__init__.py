@@ -1,4 +1,12 @@
-from .plugin import TuShareHKCashflowPlugin
-from .service import TuShareHKCashflowService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKCashflowPlugin", "TuShareHKCashflowService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKCashflowPlugin": ".plugin",
+        "TuShareHKCashflowService": ".service",
+    },
+)
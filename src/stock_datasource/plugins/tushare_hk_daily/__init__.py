@@ -1,6 +1,14 @@
 """TuShare Hong Kong Stock Daily plugin module."""
 
-from .plugin import TuShareHKDailyPlugin
-from .service import TuShareHKDailyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKDailyPlugin", "TuShareHKDailyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKDailyPlugin": ".plugin",
+        "TuShareHKDailyService": ".service",
+    },
+)
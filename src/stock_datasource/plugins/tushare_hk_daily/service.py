@@ -51,6 +51,7 @@ class TuShareHKDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_date_range(
         self,
@@ -105,6 +106,7 @@ class TuShareHKDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_trade_date(
         self,
@@ -158,6 +160,7 @@ class TuShareHKDailyService(BaseService):
                 default=1,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest(
         self,
@@ -310,6 +313,7 @@ class TuShareHKDailyService(BaseService):
                 default=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_movers(
         self,
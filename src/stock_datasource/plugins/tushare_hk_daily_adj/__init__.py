@@ -1,6 +1,14 @@
 """TuShare Hong Kong Stock Daily Adjusted data plugin."""
 
-from .plugin import TuShareHKDailyAdjPlugin
-from .service import TuShareHKDailyAdjService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKDailyAdjPlugin", "TuShareHKDailyAdjService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKDailyAdjPlugin": ".plugin",
+        "TuShareHKDailyAdjService": ".service",
+    },
+)
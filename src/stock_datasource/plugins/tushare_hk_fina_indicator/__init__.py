@@ -1,4 +1,12 @@
-from .plugin import TuShareHKFinaIndicatorPlugin
-from .service import TuShareHKFinaIndicatorService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKFinaIndicatorPlugin", "TuShareHKFinaIndicatorService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKFinaIndicatorPlugin": ".plugin",
+        "TuShareHKFinaIndicatorService": ".service",
+    },
+)
@@ -1,4 +1,12 @@
-from .plugin import TuShareHKIncomePlugin
-from .service import TuShareHKIncomeService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKIncomePlugin", "TuShareHKIncomeService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKIncomePlugin": ".plugin",
+        "TuShareHKIncomeService": ".service",
+    },
+)
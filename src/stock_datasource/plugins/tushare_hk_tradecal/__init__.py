@@ -1,6 +1,14 @@
 """TuShare Hong Kong Stock Trade Calendar plugin module."""
 
-from .plugin import TuShareHKTradeCalPlugin
-from .service import TuShareHKTradeCalService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareHKTradeCalPlugin", "TuShareHKTradeCalService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareHKTradeCalPlugin": ".plugin",
+        "TuShareHKTradeCalService": ".service",
+    },
+)
@@ -45,6 +45,7 @@ class TuShareHKTradeCalService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_trade_calendar(
         self,
@@ -94,6 +95,7 @@ class TuShareHKTradeCalService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_trading_days(
         self,
@@ -1,7 +1,15 @@
 """Tushare沪深股通十大成交股插件"""
 
-from .extractor import HsgtTop10Extractor
-from .plugin import HsgtTop10Plugin
-from .service import HsgtTop10Service
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["HsgtTop10Extractor", "HsgtTop10Plugin", "HsgtTop10Service"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "HsgtTop10Extractor": ".extractor",
+        "HsgtTop10Plugin": ".plugin",
+        "HsgtTop10Service": ".service",
+    },
+)
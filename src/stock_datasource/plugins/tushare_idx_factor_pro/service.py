@@ -58,6 +58,7 @@ class TuShareIdxFactorProService(BaseService):
                 default=[],
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_factors(
         self,
@@ -130,6 +131,7 @@ class TuShareIdxFactorProService(BaseService):
                 default=1,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_factors(
         self,
@@ -192,6 +194,7 @@ class TuShareIdxFactorProService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_technical_indicators(
         self,
@@ -1,6 +1,14 @@
 """TuShare idx_mins plugin - 指数历史分钟行情."""
 
-from stock_datasource.plugins.tushare_idx_mins.extractor import IdxMinsExtractor
-from stock_datasource.plugins.tushare_idx_mins.plugin import TuShareIdxMinsPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["IdxMinsExtractor", "TuShareIdxMinsPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "IdxMinsExtractor": ".extractor",
+        "TuShareIdxMinsPlugin": ".plugin",
+    },
+)
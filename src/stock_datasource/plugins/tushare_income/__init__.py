@@ -1,4 +1,12 @@
-from .plugin import TuShareIncomePlugin
-from .service import TuShareIncomeService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIncomePlugin", "TuShareIncomeService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareIncomePlugin": ".plugin",
+        "TuShareIncomeService": ".service",
+    },
+)
@@ -1,6 +1,14 @@
 """TuShare income statement VIP data plugin."""
 
-from .plugin import TuShareIncomeVipPlugin
-from .service import TuShareIncomeVipService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIncomeVipPlugin", "TuShareIncomeVipService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareIncomeVipPlugin": ".plugin",
+        "TuShareIncomeVipService": ".service",
+    },
+)
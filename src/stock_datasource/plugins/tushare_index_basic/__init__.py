@@ -1,3 +1,6 @@
-from .plugin import TuShareIndexBasicPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexBasicPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareIndexBasicPlugin": ".plugin"})
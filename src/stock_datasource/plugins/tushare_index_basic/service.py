@@ -94,6 +94,7 @@ class TuShareIndexBasicService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_indices_by_market(
         self,
@@ -152,6 +153,7 @@ class TuShareIndexBasicService(BaseService):
                 default=100,
             ),
         ],
+        pushdown="mapped",
     )
     def search_indices(
         self,
@@ -188,7 +190,7 @@ class TuShareIndexBasicService(BaseService):
         records = df.to_dict("records")
         return [_convert_to_json_serializable(record) for record in records]
 
-    @query_method(description="Get all index categories", params=[])
+    @query_method(description="Get all index categories", params=[], pushdown="mapped")
     def get_index_categories(
         self,
     ) -> list[dict[str, Any]]:
@@ -1,5 +1,8 @@
 """TuShare index classify plugin."""
 
-from .plugin import TuShareIndexClassifyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexClassifyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareIndexClassifyPlugin": ".plugin"})
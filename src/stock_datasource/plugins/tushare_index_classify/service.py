@@ -32,6 +32,7 @@ class TuShareIndexClassifyService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_classify_by_level(
         self, level: str, src: str | None = None
@@ -59,6 +60,7 @@ class TuShareIndexClassifyService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_all_index_classify(self, src: str | None = None) -> list[dict[str, Any]]:
         where = "1=1"
@@ -84,6 +86,7 @@ class TuShareIndexClassifyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_industry_by_code(self, index_code: str) -> list[dict[str, Any]]:
         query = f"""
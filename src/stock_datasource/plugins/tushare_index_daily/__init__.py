@@ -1,5 +1,8 @@
 """TuShare index daily plugin."""
 
-from .plugin import TuShareIndexDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareIndexDailyPlugin": ".plugin"})
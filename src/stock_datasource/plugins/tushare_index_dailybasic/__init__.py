@@ -1,5 +1,13 @@
 """TuShare index dailybasic plugin."""
 
-from .plugin import TuShareIndexDailybasicPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexDailybasicPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareIndexDailybasicPlugin": ".plugin",
+    },
+)
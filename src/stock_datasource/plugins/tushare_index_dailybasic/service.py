@@ -40,6 +40,7 @@ class TuShareIndexDailybasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_dailybasic(
         self, ts_code: str, start_date: str, end_date: str
@@ -67,6 +68,7 @@ class TuShareIndexDailybasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_dailybasic_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
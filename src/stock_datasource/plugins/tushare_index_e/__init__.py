@@ -1,5 +1,8 @@
 """TuShare index_e plugin."""
 
-from .plugin import TuShareIndexEPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexEPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareIndexEPlugin": ".plugin"})
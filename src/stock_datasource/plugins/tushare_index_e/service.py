@@ -38,6 +38,7 @@ class TuShareIndexEService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_e(
         self, ts_code: str, start_date: str, end_date: str
@@ -64,6 +65,7 @@ class TuShareIndexEService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_e_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
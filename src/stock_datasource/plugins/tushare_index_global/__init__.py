@@ -1,5 +1,8 @@
 """TuShare index global plugin."""
 
-from .plugin import TuShareIndexGlobalPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexGlobalPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareIndexGlobalPlugin": ".plugin"})
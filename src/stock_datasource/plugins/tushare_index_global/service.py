@@ -40,6 +40,7 @@ class TuShareIndexGlobalService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_global(
         self, ts_code: str, start_date: str, end_date: str
@@ -66,6 +67,7 @@ class TuShareIndexGlobalService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_global_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
@@ -1,5 +1,8 @@
 """TuShare index member plugin."""
 
-from .plugin import TuShareIndexMemberPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexMemberPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareIndexMemberPlugin": ".plugin"})
@@ -32,6 +32,7 @@ class TuShareIndexMemberService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_member(
         self, index_code: str, is_new: str | None = None
@@ -56,6 +57,7 @@ class TuShareIndexMemberService(BaseService):
                 name="con_code", type="str", description="Stock code", required=True
             ),
         ],
+        pushdown="mapped",
     )
     def get_stock_indices(self, con_code: str) -> list[dict[str, Any]]:
         query = f"""
@@ -1,6 +1,14 @@
 """TuShare index monthly plugin."""
 
-from .plugin import TuShareIndexMonthlyPlugin
-from .service import TuShareIndexMonthlyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexMonthlyPlugin", "TuShareIndexMonthlyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareIndexMonthlyPlugin": ".plugin",
+        "TuShareIndexMonthlyService": ".service",
+    },
+)
@@ -59,6 +59,7 @@ class TuShareIndexMonthlyService(BaseService):
                 default=100,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_code(
         self,
@@ -117,6 +118,7 @@ class TuShareIndexMonthlyService(BaseService):
                 default=100,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_date(
         self,
@@ -199,6 +201,7 @@ class TuShareIndexMonthlyService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_gainers(
         self,
@@ -244,6 +247,7 @@ class TuShareIndexMonthlyService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_losers(
         self,
@@ -288,6 +292,7 @@ class TuShareIndexMonthlyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_yearly_trend(
         self,
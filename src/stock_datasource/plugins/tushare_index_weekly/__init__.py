@@ -1,6 +1,14 @@
 """TuShare index weekly plugin."""
 
-from .plugin import TuShareIndexWeeklyPlugin
-from .service import TuShareIndexWeeklyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareIndexWeeklyPlugin", "TuShareIndexWeeklyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareIndexWeeklyPlugin": ".plugin",
+        "TuShareIndexWeeklyService": ".service",
+    },
+)
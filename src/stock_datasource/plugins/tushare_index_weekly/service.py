@@ -59,6 +59,7 @@ class TuShareIndexWeeklyService(BaseService):
                 default=100,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_code(
         self,
@@ -117,6 +118,7 @@ class TuShareIndexWeeklyService(BaseService):
                 default=100,
             ),
         ],
+        pushdown="mapped",
     )
     def get_by_date(
         self,
@@ -199,6 +201,7 @@ class TuShareIndexWeeklyService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_gainers(
         self,
@@ -244,6 +247,7 @@ class TuShareIndexWeeklyService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_losers(
         self,
@@ -282,6 +286,7 @@ class TuShareIndexWeeklyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_batch(
         self,
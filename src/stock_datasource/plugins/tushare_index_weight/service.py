@@ -45,6 +45,7 @@ class TuShareIndexWeightService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_index_constituents(
         self,
@@ -105,6 +106,7 @@ class TuShareIndexWeightService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_constituent_weight_history(
         self,
@@ -166,6 +168,7 @@ class TuShareIndexWeightService(BaseService):
                 default=10,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_constituents(
         self,
@@ -1,7 +1,15 @@
 """Tushare月线行情插件"""
 
-from .extractor import MonthlyExtractor
-from .plugin import MonthlyPlugin
-from .service import MonthlyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["MonthlyExtractor", "MonthlyPlugin", "MonthlyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "MonthlyExtractor": ".extractor",
+        "MonthlyPlugin": ".plugin",
+        "MonthlyService": ".service",
+    },
+)
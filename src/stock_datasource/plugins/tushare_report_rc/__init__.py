@@ -1,5 +1,8 @@
 """TuShare research report (研报盈利预测) data plugin."""
 
-from .plugin import TuShareReportRcPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareReportRcPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareReportRcPlugin": ".plugin"})
@@ -28,6 +28,7 @@ class ReportRcService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_reports_by_date(
         self, report_date: str, limit: int = 100
@@ -86,6 +87,7 @@ class ReportRcService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_reports_by_stock(
         self,
@@ -146,6 +148,7 @@ class ReportRcService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_hot_covered_stocks(
         self, days: int = 30, limit: int = 20
@@ -188,6 +191,7 @@ class ReportRcService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_org_stats(self, days: int = 30, limit: int = 20) -> list[dict[str, Any]]:
         """Get statistics by research organization."""
@@ -221,6 +225,7 @@ class ReportRcService(BaseService):
                 description="预测报告期，如 2024Q4",
             ),
         ],
+        pushdown="raw",
     )
     def get_consensus_forecast(
         self, ts_code: str, quarter: str | None = None
@@ -270,6 +275,7 @@ class ReportRcService(BaseService):
                 description="统计天数",
             ),
         ],
+        pushdown="raw",
     )
     def get_rating_distribution(
         self, ts_code: str | None = None, days: int = 30
@@ -315,6 +321,7 @@ class ReportRcService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def search_report_title(
         self, keyword: str, days: int = 90, limit: int = 50
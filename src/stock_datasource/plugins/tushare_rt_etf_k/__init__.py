@@ -1,6 +1,14 @@
 """TuShare rt_etf_k plugin - ETF实时日线."""
 
-from stock_datasource.plugins.tushare_rt_etf_k.extractor import RtEtfKExtractor
-from stock_datasource.plugins.tushare_rt_etf_k.plugin import TuShareRtEtfKPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["RtEtfKExtractor", "TuShareRtEtfKPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "RtEtfKExtractor": ".extractor",
+        "TuShareRtEtfKPlugin": ".plugin",
+    },
+)
@@ -1,10 +1,15 @@
 """TuShare rt_etf_min plugin - ETF实时分钟K线数据."""
 
-from .plugin import TuShareRtEtfMinPlugin
-
-try:
-    from .service import RtEtfMinService
-except Exception:
-    RtEtfMinService = None
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["RtEtfMinService", "TuShareRtEtfMinPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareRtEtfMinPlugin": ".plugin",
+        "RtEtfMinService": ".service",
+    },
+    optional=("RtEtfMinService",),
+)
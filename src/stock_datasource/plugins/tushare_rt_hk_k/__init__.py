@@ -1,6 +1,14 @@
 """TuShare rt_hk_k plugin - 港股实时日线."""
 
-from stock_datasource.plugins.tushare_rt_hk_k.extractor import RtHkKExtractor
-from stock_datasource.plugins.tushare_rt_hk_k.plugin import TuShareRtHkKPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["RtHkKExtractor", "TuShareRtHkKPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "RtHkKExtractor": ".extractor",
+        "TuShareRtHkKPlugin": ".plugin",
+    },
+)
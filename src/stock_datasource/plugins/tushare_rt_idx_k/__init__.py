@@ -1,6 +1,14 @@
 """TuShare rt_idx_k plugin - 指数实时日线."""
 
-from stock_datasource.plugins.tushare_rt_idx_k.extractor import RtIdxKExtractor
-from stock_datasource.plugins.tushare_rt_idx_k.plugin import TuShareRtIdxKPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["RtIdxKExtractor", "TuShareRtIdxKPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "RtIdxKExtractor": ".extractor",
+        "TuShareRtIdxKPlugin": ".plugin",
+    },
+)
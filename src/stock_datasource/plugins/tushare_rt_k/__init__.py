@@ -1,6 +1,14 @@
 """TuShare rt_k plugin - 沪深京实时日线."""
 
-from stock_datasource.plugins.tushare_rt_k.extractor import RtKExtractor
-from stock_datasource.plugins.tushare_rt_k.plugin import TuShareRtKPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["RtKExtractor", "TuShareRtKPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "RtKExtractor": ".extractor",
+        "TuShareRtKPlugin": ".plugin",
+    },
+)
@@ -1,10 +1,15 @@
 """TuShare rt_min plugin - A股实时分钟K线数据."""
 
-from .plugin import TuShareRtMinPlugin
-
-try:
-    from .service import RtMinService
-except Exception:
-    RtMinService = None
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["RtMinService", "TuShareRtMinPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareRtMinPlugin": ".plugin",
+        "RtMinService": ".service",
+    },
+    optional=("RtMinService",),
+)
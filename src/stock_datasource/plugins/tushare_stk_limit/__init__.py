@@ -1,5 +1,8 @@
 """TuShare stock limit plugin."""
 
-from .plugin import TuShareStkLimitPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareStkLimitPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareStkLimitPlugin": ".plugin"})
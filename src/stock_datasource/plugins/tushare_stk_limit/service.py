@@ -51,6 +51,7 @@ class TuShareStkLimitService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_stk_limit(
         self,
@@ -96,6 +97,7 @@ class TuShareStkLimitService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_stk_limit(
         self,
@@ -1,6 +1,14 @@
 """TuShare stk_mins plugin - A股历史分钟行情."""
 
-from stock_datasource.plugins.tushare_stk_mins.extractor import StkMinsExtractor
-from stock_datasource.plugins.tushare_stk_mins.plugin import TuShareStkMinsPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["StkMinsExtractor", "TuShareStkMinsPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "StkMinsExtractor": ".extractor",
+        "TuShareStkMinsPlugin": ".plugin",
+    },
+)
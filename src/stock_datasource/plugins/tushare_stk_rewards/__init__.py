@@ -1,5 +1,8 @@
 """TuShare stk_rewards plugin."""
 
-from .plugin import TuShareStkRewardsPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareStkRewardsPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareStkRewardsPlugin": ".plugin"})
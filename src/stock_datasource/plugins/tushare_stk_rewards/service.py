@@ -32,6 +32,7 @@ class TuShareStkRewardsService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_stk_rewards(
         self, ts_code: str, end_date: str | None = None
@@ -65,6 +66,7 @@ class TuShareStkRewardsService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_top_rewards(self, end_date: str, limit: int = 100) -> list[dict[str, Any]]:
         query = f"""
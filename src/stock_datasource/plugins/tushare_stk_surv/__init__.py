@@ -1,5 +1,8 @@
 """TuShare institutional survey (机构调研) data plugin."""
 
-from .plugin import TuShareStkSurvPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareStkSurvPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareStkSurvPlugin": ".plugin"})
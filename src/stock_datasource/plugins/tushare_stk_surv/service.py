@@ -28,6 +28,7 @@ class StkSurvService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_surveys_by_date(
         self, surv_date: str, limit: int = 100
@@ -81,6 +82,7 @@ class StkSurvService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_surveys_by_stock(
         self,
@@ -136,6 +138,7 @@ class StkSurvService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def get_hot_surveyed_stocks(
         self, days: int = 30, limit: int = 20
@@ -174,6 +177,7 @@ class StkSurvService(BaseService):
                 description="统计天数",
             ),
         ],
+        pushdown="raw",
     )
     def get_org_type_stats(
         self, ts_code: str | None = None, days: int = 30
@@ -218,6 +222,7 @@ class StkSurvService(BaseService):
                 description="返回记录数限制",
             ),
         ],
+        pushdown="raw",
     )
     def search_survey_content(
         self, keyword: str, days: int = 90, limit: int = 50
@@ -1,5 +1,8 @@
 """TuShare stock basic information plugin."""
 
-from .plugin import TuShareStockBasicPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareStockBasicPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareStockBasicPlugin": ".plugin"})
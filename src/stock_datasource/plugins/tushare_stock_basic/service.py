@@ -39,6 +39,7 @@ class TuShareStockBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_stock_basic(
         self,
@@ -88,7 +89,11 @@ class TuShareStockBasicService(BaseService):
         df = self.db.execute_query(query)
         return dict(zip(df["ts_code"], df["name"]))
 
-    @query_method(description="Get all stock basic info as DataFrame", params=[])
+    @query_method(
+        description="Get all stock basic info as DataFrame",
+        params=[],
+        pushdown="raw",
+    )
     def get_all_stock_basic_df(self) -> pd.DataFrame:
         """
         Get all listed stocks basic info as DataFrame.
@@ -109,7 +114,11 @@ class TuShareStockBasicService(BaseService):
         """
         return self.db.execute_query(query)
 
-    @query_method(description="Get all industries with stock count", params=[])
+    @query_method(
+        description="Get all industries with stock count",
+        params=[],
+        pushdown="raw",
+    )
     def get_all_industries(self) -> list[dict[str, Any]]:
         """
         Get all industries with stock count.
@@ -138,6 +147,7 @@ class TuShareStockBasicService(BaseService):
                 default="L",
             ),
         ],
+        pushdown="mapped",
     )
     def get_all_stocks(
         self,
@@ -188,7 +198,11 @@ class TuShareStockBasicService(BaseService):
         df = self.db.execute_query(query)
         return dict(zip(df["ts_code"], df["name"]))
 
-    @query_method(description="Get all stock basic info as DataFrame", params=[])
+    @query_method(
+        description="Get all stock basic info as DataFrame",
+        params=[],
+        pushdown="raw",
+    )
     def get_all_stock_basic_df(self) -> pd.DataFrame:
         """
         Get all listed stocks basic info as DataFrame.
@@ -209,7 +223,11 @@ class TuShareStockBasicService(BaseService):
         """
         return self.db.execute_query(query)
 
-    @query_method(description="Get all industries with stock count", params=[])
+    @query_method(
+        description="Get all industries with stock count",
+        params=[],
+        pushdown="raw",
+    )
     def get_all_industries(self) -> list[dict[str, Any]]:
         """
         Get all industries with stock count.
@@ -237,6 +255,7 @@ class TuShareStockBasicService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_stocks_by_industry(
         self,
@@ -288,7 +307,11 @@ class TuShareStockBasicService(BaseService):
         df = self.db.execute_query(query)
         return dict(zip(df["ts_code"], df["name"]))
 
-    @query_method(description="Get all stock basic info as DataFrame", params=[])
+    @query_method(
+        description="Get all stock basic info as DataFrame",
+        params=[],
+        pushdown="raw",
+    )
     def get_all_stock_basic_df(self) -> pd.DataFrame:
         """
         Get all listed stocks basic info as DataFrame.
@@ -309,7 +332,11 @@ class TuShareStockBasicService(BaseService):
         """
         return self.db.execute_query(query)
 
-    @query_method(description="Get all industries with stock count", params=[])
+    @query_method(
+        description="Get all industries with stock count",
+        params=[],
+        pushdown="raw",
+    )
     def get_all_industries(self) -> list[dict[str, Any]]:
         """
         Get all industries with stock count.
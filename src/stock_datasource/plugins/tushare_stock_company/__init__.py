@@ -1,10 +1,14 @@
 """TuShare stock company plugin - 上市公司基础信息."""
 
-from stock_datasource.plugins.tushare_stock_company.extractor import (
-    StockCompanyExtractor,
-)
-from stock_datasource.plugins.tushare_stock_company.plugin import (
-    TuShareStockCompanyPlugin,
-)
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["StockCompanyExtractor", "TuShareStockCompanyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "StockCompanyExtractor": ".extractor",
+        "TuShareStockCompanyPlugin": ".plugin",
+    },
+)
@@ -1,6 +1,14 @@
 """TuShare stock HSGT (沪深港通) plugin."""
 
-from .plugin import TuShareStockHSGTPlugin
-from .service import TuShareStockHSGTService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareStockHSGTPlugin", "TuShareStockHSGTService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareStockHSGTPlugin": ".plugin",
+        "TuShareStockHSGTService": ".service",
+    },
+)
@@ -45,6 +45,7 @@ class TuShareStockHSGTService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_hsgt_stocks_by_date(
         self,
@@ -217,6 +218,7 @@ class TuShareStockHSGTService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_hsgt_history_by_code(
         self,
@@ -270,6 +272,7 @@ class TuShareStockHSGTService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_hsgt_count_by_type(
         self,
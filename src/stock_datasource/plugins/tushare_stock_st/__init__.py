@@ -1,6 +1,14 @@
 """TuShare stock ST plugin."""
 
-from .plugin import TuShareStockSTPlugin
-from .service import TuShareStockSTService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareStockSTPlugin", "TuShareStockSTService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareStockSTPlugin": ".plugin",
+        "TuShareStockSTService": ".service",
+    },
+)
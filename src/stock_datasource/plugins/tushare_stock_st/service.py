@@ -39,6 +39,7 @@ class TuShareStockSTService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_st_stocks_by_date(
         self,
@@ -91,6 +92,7 @@ class TuShareStockSTService(BaseService):
                 required=False,
             ),
         ],
+        pushdown="mapped",
     )
     def get_st_history_by_code(
         self,
@@ -134,7 +136,7 @@ class TuShareStockSTService(BaseService):
         records = df.to_dict("records")
         return [_convert_to_json_serializable(record) for record in records]
 
-    @query_method(description="Get latest ST stocks list", params=[])
+    @query_method(description="Get latest ST stocks list", params=[], pushdown="mapped")
     def get_latest_st_stocks(self) -> list[dict[str, Any]]:
         """
         Get latest ST stocks list.
@@ -231,6 +233,7 @@ class TuShareStockSTService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_st_stocks_by_date_range(
         self,
@@ -1,7 +1,15 @@
 """Tushare每日停复牌信息插件"""
 
-from .extractor import SuspendDExtractor
-from .plugin import SuspendDPlugin
-from .service import SuspendDService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["SuspendDExtractor", "SuspendDPlugin", "SuspendDService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "SuspendDExtractor": ".extractor",
+        "SuspendDPlugin": ".plugin",
+        "SuspendDService": ".service",
+    },
+)
@@ -1,5 +1,8 @@
 """TuShare sw_daily plugin."""
 
-from .plugin import TuShareSwDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareSwDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareSwDailyPlugin": ".plugin"})
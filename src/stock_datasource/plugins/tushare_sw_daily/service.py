@@ -41,6 +41,7 @@ class TuShareSwDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_sw_daily(
         self, ts_code: str, start_date: str, end_date: str
@@ -67,6 +68,7 @@ class TuShareSwDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_sw_daily_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
@@ -1,5 +1,8 @@
 """TuShare sz_daily_info plugin."""
 
-from .plugin import TuShareSzDailyInfoPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareSzDailyInfoPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareSzDailyInfoPlugin": ".plugin"})
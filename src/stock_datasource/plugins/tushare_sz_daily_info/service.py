@@ -35,6 +35,7 @@ class TuShareSzDailyInfoService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_sz_daily_info(self, start_date: str, end_date: str) -> list[dict[str, Any]]:
         query = f"""
@@ -59,6 +60,7 @@ class TuShareSzDailyInfoService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_sz_daily_info_by_date(self, trade_date: str) -> list[dict[str, Any]]:
         query = f"""
@@ -1,5 +1,8 @@
 """TuShare THS daily plugin."""
 
-from .plugin import TuShareTHSDailyPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareTHSDailyPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareTHSDailyPlugin": ".plugin"})
@@ -49,6 +49,7 @@ class TuShareTHSDailyService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_ths_daily_data(
         self,
@@ -111,6 +112,7 @@ class TuShareTHSDailyService(BaseService):
                 default=1,
             ),
         ],
+        pushdown="mapped",
     )
     def get_latest_ths_daily(
         self,
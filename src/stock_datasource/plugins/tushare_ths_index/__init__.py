@@ -1,6 +1,14 @@
 """TuShare THS index metadata plugin."""
 
-from .plugin import TuShareTHSIndexPlugin
-from .service import TuShareTHSIndexService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareTHSIndexPlugin", "TuShareTHSIndexService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TuShareTHSIndexPlugin": ".plugin",
+        "TuShareTHSIndexService": ".service",
+    },
+)
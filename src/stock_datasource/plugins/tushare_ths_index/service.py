@@ -51,6 +51,7 @@ class TuShareTHSIndexService(BaseService):
                 default=1000,
             ),
         ],
+        pushdown="mapped",
     )
     def get_ths_index_list(
         self,
@@ -141,6 +142,7 @@ class TuShareTHSIndexService(BaseService):
                 default=50,
             ),
         ],
+        pushdown="mapped",
     )
     def search_ths_index_by_name(
         self,
@@ -175,6 +177,7 @@ class TuShareTHSIndexService(BaseService):
     @query_method(
         description="Get THS index statistics by type",
         params=[],
+        pushdown="mapped",
     )
     def get_ths_index_stats(self) -> list[dict[str, Any]]:
         """Get THS index statistics grouped by type."""
@@ -1,5 +1,8 @@
 """TuShare ths_member plugin."""
 
-from .plugin import TuShareThsMemberPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareThsMemberPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareThsMemberPlugin": ".plugin"})
@@ -29,6 +29,7 @@ class TuShareThsMemberService(BaseService):
                 required=True,
             ),
         ],
+        pushdown="mapped",
     )
     def get_ths_member(self, ts_code: str) -> list[dict[str, Any]]:
         query = f"""
@@ -48,6 +49,7 @@ class TuShareThsMemberService(BaseService):
                 name="code", type="str", description="Stock code", required=True
             ),
         ],
+        pushdown="mapped",
     )
     def get_stock_ths_concepts(self, code: str) -> list[dict[str, Any]]:
         query = f"""
@@ -1,5 +1,8 @@
 """TuShare top institutional seats data plugin."""
 
-from .plugin import TuShareTopInstPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareTopInstPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareTopInstPlugin": ".plugin"})
@@ -1,5 +1,8 @@
 """TuShare top list data plugin."""
 
-from .plugin import TuShareTopListPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareTopListPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareTopListPlugin": ".plugin"})
@@ -1,5 +1,8 @@
 """TuShare trade calendar plugin."""
 
-from .plugin import TuShareTradeCalendarPlugin
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["TuShareTradeCalendarPlugin"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(__name__, {"TuShareTradeCalendarPlugin": ".plugin"})
@@ -52,6 +52,7 @@ class TuShareTradeCalendarService(BaseService):
                 default="SSE",
             ),
         ],
+        pushdown="mapped",
     )
     def get_trade_calendar(
         self,
@@ -110,6 +111,7 @@ class TuShareTradeCalendarService(BaseService):
                 default="SSE",
             ),
         ],
+        pushdown="mapped",
     )
     def get_trading_days(
         self,
@@ -163,6 +165,7 @@ class TuShareTradeCalendarService(BaseService):
                 default="SSE",
             ),
         ],
+        pushdown="mapped",
     )
     def get_next_trading_day(
         self,
@@ -1,7 +1,15 @@
 """Tushare周线行情插件"""
 
-from .extractor import WeeklyExtractor
-from .plugin import WeeklyPlugin
-from .service import WeeklyService
+from stock_datasource.plugins import lazy_exports
 
 __all__ = ["WeeklyExtractor", "WeeklyPlugin", "WeeklyService"]
+
+# Imported on first access: plugin.py builds the extractor (Tushare client)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "WeeklyExtractor": ".extractor",
+        "WeeklyPlugin": ".plugin",
+        "WeeklyService": ".service",
+    },
+)
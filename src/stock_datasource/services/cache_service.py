@@ -7,8 +7,15 @@ from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar
 
+from stock_datasource.utils.metrics import registry as metrics_registry
+
 logger = logging.getLogger(__name__)
 
+_CACHE_REQUESTS = metrics_registry.counter(
+    "cache_requests_total", "CacheService reads by result (hit/miss/unavailable/error)",
+    ("result",),
+)
+
 T = TypeVar("T")
 
 
@@ -133,11 +140,14 @@ class CacheService:
         """Get cached value (sync)."""
         redis = self._get_redis()
         if redis is None:
+            _CACHE_REQUESTS.inc(result="unavailable")
             return None
         try:
             data = redis.get(self._key(key))
+            _CACHE_REQUESTS.inc(result="miss" if data is None else "hit")
             return self._deserialize(data)
         except Exception as e:
+            _CACHE_REQUESTS.inc(result="error")
             logger.warning(f"Cache get failed for {key}: {e}")
             return None
 
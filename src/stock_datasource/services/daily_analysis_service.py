@@ -8,10 +8,53 @@ from dataclasses import asdict, dataclass
 from datetime import date, datetime, timedelta
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Calendar days searched backwards for the latest price/valuation row
+_MARKET_LOOKBACK_DAYS = 30
+
+_POSITION_NUMERIC_COLUMNS = [
+    "quantity",
+    "cost_price",
+    "current_price",
+    "market_value",
+    "profit_loss",
+    "profit_rate",
+]
+_POSITION_COLUMNS = [
+    "user_id",
+    "ts_code",
+    "stock_name",
+    *_POSITION_NUMERIC_COLUMNS,
+    "sector",
+    "industry",
+    "buy_date",
+]
+# Latest-row frames: ts_code, as-of date, then numeric values
+_TECHNICAL_COLUMNS = [
+    "ts_code",
+    "indicator_date",
+    "ma5",
+    "ma10",
+    "ma20",
+    "rsi",
+    "macd",
+    "macd_signal",
+]
+_PRICE_COLUMNS = ["ts_code", "price_date", "close", "pct_chg"]
+_FUNDAMENTAL_COLUMNS = ["ts_code", "fundamental_date", "pe_ttm", "pb", "total_mv"]
+
+
+def _empty_frame(columns: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({col: pd.Series(dtype=object) for col in columns})
+
+
+def _or_default(value: Any, default: Any) -> Any:
+    return default if value is None or pd.isna(value) else value
+
 
 @dataclass
 class AnalysisReport:
@@ -65,7 +108,7 @@ class StockAnalysis:
     resistance_level: float | None = None
 
 
-class DailyAnalysisService:
+class PortfolioAnalysisService:
     """Daily analysis service with ClickHouse optimizations."""
 
     def __init__(self, user_id: str = "default_user"):
@@ -257,86 +300,116 @@ class DailyAnalysisService:
         except Exception as e:
             logger.error(f"Analysis task {task_id} failed: {e}")
 
+    async def analyze_all_users(
+        self,
+        analysis_date: date | None = None,
+        analysis_type: str = "daily",
+        user_ids: list[str] | None = None,
+    ) -> dict[str, dict[str, Any] | None]:
+        """Analyze every active portfolio in one set-based pass.
+
+        Positions, technical indicators, prices and fundamentals are each
+        loaded with a single query covering all holdings, and the reports
+        are written with one insert, so the number of queries does not grow
+        with users or positions. Users whose report could not be built map
+        to ``None``.
+        """
+        analysis_date = analysis_date or datetime.now().date()
+
+        positions = self._load_positions(user_ids)
+        if positions.empty:
+            return {}
+
+        market_env = await self._analyze_market_environment(analysis_date)
+        scored = self._score_positions(positions, analysis_date)
+
+        results: dict[str, dict[str, Any] | None] = {}
+        for user_id, frame in scored.groupby("user_id", sort=False):
+            try:
+                results[user_id] = await self._build_analysis(
+                    user_id, frame, market_env, analysis_date, analysis_type
+                )
+            except Exception as e:
+                logger.error(f"Failed to build analysis for user {user_id}: {e}")
+                results[user_id] = None
+
+        self._save_analyses([a for a in results.values() if a])
+        return results
+
     async def _generate_analysis(
         self, analysis_date: date, analysis_type: str
     ) -> dict[str, Any] | None:
         """Generate comprehensive analysis using ClickHouse data and AI."""
         try:
             # Get user positions
-            positions = await self._get_user_positions()
-            if not positions:
+            positions = self._load_positions([self.user_id])
+            if positions.empty:
                 return self._get_mock_analysis(str(analysis_date))
 
             # Analyze market environment
             market_env = await self._analyze_market_environment(analysis_date)
 
-            # Analyze individual stocks
-            stock_analyses = await self._analyze_stocks(positions, analysis_date)
+            # Score all positions against the latest market data
+            scored = self._score_positions(positions, analysis_date)
 
-            # Calculate portfolio metrics
-            portfolio_metrics = await self._calculate_portfolio_metrics(positions)
-
-            # Generate risk alerts
-            risk_alerts = await self._generate_risk_alerts(positions, portfolio_metrics)
-
-            # Generate AI recommendations
-            recommendations = await self._generate_recommendations(
-                positions, stock_analyses, market_env, portfolio_metrics
+            return await self._build_analysis(
+                self.user_id, scored, market_env, analysis_date, analysis_type
             )
 
-            # Create analysis summary
-            analysis_summary = await self._create_analysis_summary(
-                portfolio_metrics, market_env, len(risk_alerts), len(recommendations)
-            )
-
-            analysis_id = str(uuid.uuid4())
-
-            return {
-                "id": analysis_id,
-                "user_id": self.user_id,
-                "analysis_date": str(analysis_date),
-                "analysis_type": analysis_type,
-                "analysis_summary": analysis_summary,
-                "stock_analyses": stock_analyses,
-                "risk_alerts": risk_alerts,
-                "recommendations": recommendations,
-                "market_sentiment": market_env.get("sentiment", "neutral"),
-                "technical_signals": json.dumps(
-                    market_env.get("technical_signals", {})
-                ),
-                "fundamental_scores": json.dumps(
-                    market_env.get("fundamental_scores", {})
-                ),
-                "created_at": str(datetime.now()),
-                "updated_at": str(datetime.now()),
-            }
-
         except Exception as e:
             logger.error(f"Failed to generate analysis: {e}")
             return None
 
-    async def _get_user_positions(self) -> list[dict[str, Any]]:
-        """Get user positions from ClickHouse."""
-        if not self.db:
-            return []
+    async def _build_analysis(
+        self,
+        user_id: str,
+        scored: pd.DataFrame,
+        market_env: dict[str, Any],
+        analysis_date: date,
+        analysis_type: str,
+    ) -> dict[str, Any]:
+        """Assemble one user's report from their scored positions."""
+        positions = scored.fillna(
+            {col: 0 for col in _POSITION_NUMERIC_COLUMNS}
+        ).to_dict("records")
 
-        try:
-            query = """
-                SELECT 
-                    ts_code, stock_name, quantity, cost_price, 
-                    current_price, market_value, profit_loss, profit_rate,
-                    sector, industry, buy_date
-                FROM user_positions 
-                WHERE user_id = %(user_id)s AND is_active = 1
-                ORDER BY market_value DESC
-            """
+        # Analyze individual stocks
+        stock_analyses = self._analyze_stocks(scored)
 
-            df = self.db.execute_query(query, {"user_id": self.user_id})
-            return df.to_dict("records") if not df.empty else []
+        # Calculate portfolio metrics
+        portfolio_metrics = await self._calculate_portfolio_metrics(positions)
 
-        except Exception as e:
-            logger.error(f"Failed to get user positions: {e}")
-            return []
+        # Generate risk alerts
+        risk_alerts = await self._generate_risk_alerts(positions, portfolio_metrics)
+
+        # Generate AI recommendations
+        recommendations = await self._generate_recommendations(
+            positions, stock_analyses, market_env, portfolio_metrics
+        )
+
+        # Create analysis summary
+        analysis_summary = await self._create_analysis_summary(
+            portfolio_metrics, market_env, len(risk_alerts), len(recommendations)
+        )
+
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "analysis_date": str(analysis_date),
+            "analysis_type": analysis_type,
+            "analysis_summary": analysis_summary,
+            "stock_analyses": stock_analyses,
+            "risk_alerts": risk_alerts,
+            "recommendations": recommendations,
+            "portfolio_metrics": portfolio_metrics,
+            "market_sentiment": market_env.get("sentiment", "neutral"),
+            "technical_signals": json.dumps(market_env.get("technical_signals", {})),
+            "fundamental_scores": json.dumps(
+                market_env.get("fundamental_scores", {})
+            ),
+            "created_at": str(datetime.now()),
+            "updated_at": str(datetime.now()),
+        }
 
     async def _analyze_market_environment(self, analysis_date: date) -> dict[str, Any]:
         """Analyze market environment using ClickHouse aggregations."""
@@ -399,150 +472,264 @@ class DailyAnalysisService:
             logger.error(f"Failed to analyze market environment: {e}")
             return self._get_mock_market_environment()
 
-    async def _analyze_stocks(
-        self, positions: list[dict[str, Any]], analysis_date: date
-    ) -> dict[str, Any]:
-        """Analyze individual stocks using technical and fundamental data."""
-        stock_analyses = {}
 
-        for position in positions:
-            ts_code = position["ts_code"]
+    def _load_positions(self, user_ids: list[str] | None = None) -> pd.DataFrame:
+        """Load active positions for the given users, or for every user."""
+        if not self.db:
+            return _empty_frame(_POSITION_COLUMNS)
 
-            try:
-                # Get technical indicators
-                technical_score = await self._calculate_technical_score(ts_code)
+        try:
+            query = """
+                SELECT 
+                    user_id, ts_code, stock_name, quantity, cost_price, 
+                    current_price, market_value, profit_loss, profit_rate,
+                    sector, industry, buy_date
+                FROM user_positions 
+                WHERE is_active = 1
+            """
+            params: dict[str, Any] = {}
+            if user_ids is not None:
+                if not user_ids:
+                    return _empty_frame(_POSITION_COLUMNS)
+                query += " AND user_id IN %(user_ids)s"
+                params["user_ids"] = tuple(user_ids)
+            query += " ORDER BY user_id, market_value DESC"
+
+            df = self.db.execute_query(query, params)
+            if df.empty:
+                return _empty_frame(_POSITION_COLUMNS)
 
-                # Get fundamental score (simplified)
-                fundamental_score = await self._calculate_fundamental_score(ts_code)
+            # Decimal columns arrive as objects; score them as floats
+            for col in _POSITION_NUMERIC_COLUMNS:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
+            return df
 
-                # Calculate risk score
-                risk_score = await self._calculate_risk_score(position)
+        except Exception as e:
+            logger.error(f"Failed to get user positions: {e}")
+            return _empty_frame(_POSITION_COLUMNS)
 
-                # Generate recommendation
-                recommendation = self._generate_stock_recommendation(
-                    technical_score, fundamental_score, risk_score
-                )
+    def _load_latest_technicals(self, ts_codes: tuple[str, ...]) -> pd.DataFrame:
+        """Latest technical indicator row per code.
 
-                stock_analyses[ts_code] = {
-                    "stock_name": position["stock_name"],
-                    "current_price": position.get("current_price", 0),
-                    "profit_rate": position.get("profit_rate", 0),
-                    "technical_score": technical_score,
-                    "fundamental_score": fundamental_score,
-                    "risk_score": risk_score,
-                    "recommendation": recommendation,
-                    "key_points": self._generate_key_points(
-                        position, technical_score, fundamental_score
-                    ),
-                }
+        ``LIMIT 1 BY`` keeps each row intact; ``argMax`` would skip NULLs
+        and could mix indicator values from different days.
+        """
+        query = """
+            SELECT ts_code, indicator_date, ma5, ma10, ma20, rsi, macd, macd_signal
+            FROM technical_indicators 
+            WHERE ts_code IN %(ts_codes)s
+            ORDER BY ts_code, indicator_date DESC
+            LIMIT 1 BY ts_code
+        """
+        return self._load_latest(query, {"ts_codes": ts_codes}, _TECHNICAL_COLUMNS)
+
+    def _load_latest_prices(
+        self, ts_codes: tuple[str, ...], analysis_date: date
+    ) -> pd.DataFrame:
+        """Latest close and daily change per code as of the analysis date."""
+        query = """
+            SELECT ts_code,
+                   max(trade_date) AS price_date,
+                   argMax(close, trade_date) AS close,
+                   argMax(pct_chg, trade_date) AS pct_chg
+            FROM ods_daily
+            WHERE ts_code IN %(ts_codes)s
+            AND trade_date BETWEEN %(start_date)s AND %(end_date)s
+            GROUP BY ts_code
+        """
+        params = {
+            "ts_codes": ts_codes,
+            "start_date": analysis_date - timedelta(days=_MARKET_LOOKBACK_DAYS),
+            "end_date": analysis_date,
+        }
+        return self._load_latest(query, params, _PRICE_COLUMNS)
 
-            except Exception as e:
-                logger.warning(f"Failed to analyze stock {ts_code}: {e}")
-                continue
+    def _load_latest_fundamentals(
+        self, ts_codes: tuple[str, ...], analysis_date: date
+    ) -> pd.DataFrame:
+        """Latest valuation row per code as of the analysis date.
 
-        return stock_analyses
+        A NULL ``pe_ttm`` means the company is loss-making, so the row is
+        taken whole rather than through NULL-skipping ``argMax``.
+        """
+        query = """
+            SELECT ts_code, trade_date AS fundamental_date, pe_ttm, pb, total_mv
+            FROM ods_daily_basic
+            WHERE ts_code IN %(ts_codes)s
+            AND trade_date BETWEEN %(start_date)s AND %(end_date)s
+            ORDER BY ts_code, trade_date DESC
+            LIMIT 1 BY ts_code
+        """
+        params = {
+            "ts_codes": ts_codes,
+            "start_date": analysis_date - timedelta(days=_MARKET_LOOKBACK_DAYS),
+            "end_date": analysis_date,
+        }
+        return self._load_latest(query, params, _FUNDAMENTAL_COLUMNS)
+
+    def _load_latest(
+        self, query: str, params: dict[str, Any], columns: list[str]
+    ) -> pd.DataFrame:
+        """Run a per-code latest-row query, degrading to an empty frame."""
+        if not self.db or not params.get("ts_codes"):
+            return _empty_frame(columns)
 
-    async def _calculate_technical_score(self, ts_code: str) -> float:
-        """Calculate technical analysis score using ClickHouse."""
         try:
-            if not self.db:
-                return 65.0  # Mock score
+            df = self.db.execute_query(query, params)
+        except Exception as e:
+            logger.warning(f"Failed to load latest market data: {e}")
+            return _empty_frame(columns)
 
-            # Get latest technical indicators
-            query = """
-                SELECT ma5, ma10, ma20, rsi, macd, macd_signal
-                FROM technical_indicators 
-                WHERE ts_code = %(ts_code)s
-                ORDER BY indicator_date DESC
-                LIMIT 1
-            """
+        return _empty_frame(columns) if df.empty else df.reindex(columns=columns)
 
-            df = self.db.execute_query(query, {"ts_code": ts_code})
+    def _score_positions(
+        self, positions: pd.DataFrame, analysis_date: date
+    ) -> pd.DataFrame:
+        """Join the latest market data onto positions and score them."""
+        ts_codes = tuple(sorted(positions["ts_code"].dropna().unique()))
 
-            if df.empty:
-                return 65.0  # Default score
+        frame = (
+            positions.merge(
+                self._load_latest_technicals(ts_codes), on="ts_code", how="left"
+            )
+            .merge(
+                self._load_latest_prices(ts_codes, analysis_date),
+                on="ts_code",
+                how="left",
+            )
+            .merge(
+                self._load_latest_fundamentals(ts_codes, analysis_date),
+                on="ts_code",
+                how="left",
+            )
+        )
 
-            row = df.iloc[0]
-            score = 50.0  # Base score
-
-            # MA trend analysis
-            if pd.notna(row["ma5"]) and pd.notna(row["ma10"]) and pd.notna(row["ma20"]):
-                if row["ma5"] > row["ma10"] > row["ma20"]:
-                    score += 15  # Uptrend
-                elif row["ma5"] < row["ma10"] < row["ma20"]:
-                    score -= 15  # Downtrend
-
-            # RSI analysis
-            if pd.notna(row["rsi"]):
-                rsi = float(row["rsi"])
-                if 30 <= rsi <= 70:
-                    score += 10  # Neutral zone
-                elif rsi < 30:
-                    score += 5  # Oversold (potential buy)
-                elif rsi > 70:
-                    score -= 5  # Overbought (potential sell)
-
-            # MACD analysis
-            if pd.notna(row["macd"]) and pd.notna(row["macd_signal"]):
-                if row["macd"] > row["macd_signal"]:
-                    score += 10  # Bullish signal
-                else:
-                    score -= 10  # Bearish signal
-
-            return max(0, min(100, score))
+        # Decimal/NULL values arrive as objects; score them as floats
+        for columns in (_TECHNICAL_COLUMNS, _PRICE_COLUMNS, _FUNDAMENTAL_COLUMNS):
+            for col in columns[2:]:
+                frame[col] = pd.to_numeric(frame[col], errors="coerce").astype(float)
+
+        # Revalue positions at the latest close where one is available
+        has_close = frame["close"].notna()
+        cost = frame["quantity"] * frame["cost_price"]
+        frame.loc[has_close, "current_price"] = frame.loc[has_close, "close"]
+        frame.loc[has_close, "market_value"] = (
+            frame.loc[has_close, "quantity"] * frame.loc[has_close, "close"]
+        )
+        frame.loc[has_close, "profit_loss"] = (
+            frame.loc[has_close, "market_value"] - cost[has_close]
+        )
+        revalued = has_close & (cost > 0)
+        frame.loc[revalued, "profit_rate"] = (
+            frame.loc[revalued, "profit_loss"] / cost[revalued] * 100
+        )
 
-        except Exception as e:
-            logger.warning(f"Failed to calculate technical score for {ts_code}: {e}")
-            return 65.0
+        frame["technical_score"] = self._technical_scores(frame)
+        frame["fundamental_score"] = self._fundamental_scores(frame)
+        frame["risk_score"] = self._risk_scores(frame)
+        frame["recommendation"] = self._recommendations(
+            frame["technical_score"], frame["fundamental_score"], frame["risk_score"]
+        )
+        return frame
 
-    async def _calculate_fundamental_score(self, ts_code: str) -> float:
-        """Calculate fundamental analysis score."""
-        try:
-            # This would typically use financial data from ClickHouse
-            # For now, return a mock score based on some basic logic
-            return 70.0  # Mock fundamental score
+    def _analyze_stocks(self, scored: pd.DataFrame) -> dict[str, Any]:
+        """Build per-stock analysis entries from scored positions."""
+        stock_analyses = {}
 
-        except Exception as e:
-            logger.warning(f"Failed to calculate fundamental score for {ts_code}: {e}")
-            return 70.0
+        for position in scored.to_dict("records"):
+            ts_code = position["ts_code"]
+            stock_analyses[ts_code] = {
+                "stock_name": position["stock_name"],
+                "current_price": _or_default(position.get("current_price"), 0),
+                "price_change_pct": _or_default(position.get("pct_chg"), 0),
+                "profit_rate": _or_default(position.get("profit_rate"), 0),
+                "technical_score": position["technical_score"],
+                "fundamental_score": position["fundamental_score"],
+                "risk_score": position["risk_score"],
+                "recommendation": position["recommendation"],
+                "key_points": self._generate_key_points(
+                    position,
+                    position["technical_score"],
+                    position["fundamental_score"],
+                ),
+            }
 
-    async def _calculate_risk_score(self, position: dict[str, Any]) -> float:
-        """Calculate risk score for a position."""
-        try:
-            risk_score = 50.0  # Base risk
+        return stock_analyses
 
-            # Position size risk
-            profit_rate = position.get("profit_rate", 0)
-            if abs(profit_rate) > 20:
-                risk_score += 20  # High volatility
-            elif abs(profit_rate) > 10:
-                risk_score += 10  # Medium volatility
+    @staticmethod
+    def _technical_scores(frame: pd.DataFrame) -> pd.Series:
+        """Score the latest MA, RSI and MACD readings of each position."""
+        ma5, ma10, ma20 = frame["ma5"], frame["ma10"], frame["ma20"]
+        rsi = frame["rsi"]
+        macd, macd_signal = frame["macd"], frame["macd_signal"]
 
-            # Sector concentration risk (would need portfolio context)
-            # For now, use a simple calculation
+        score = pd.Series(50.0, index=frame.index)  # Base score
 
-            return max(0, min(100, risk_score))
+        # MA trend analysis (NaN comparisons are False, so gaps score 0)
+        score += np.select(
+            [(ma5 > ma10) & (ma10 > ma20), (ma5 < ma10) & (ma10 < ma20)],
+            [15, -15],  # Uptrend / downtrend
+            0,
+        )
 
-        except Exception as e:
-            logger.warning(f"Failed to calculate risk score: {e}")
-            return 50.0
+        # RSI analysis
+        score += np.select(
+            [rsi.between(30, 70), rsi < 30, rsi > 70],
+            [10, 5, -5],  # Neutral zone / oversold / overbought
+            0,
+        )
 
-    def _generate_stock_recommendation(
-        self, technical_score: float, fundamental_score: float, risk_score: float
-    ) -> str:
-        """Generate stock recommendation based on scores."""
-        combined_score = (technical_score + fundamental_score) / 2 - (risk_score - 50)
-
-        if combined_score >= 80:
-            return "strong_buy"
-        elif combined_score >= 65:
-            return "buy"
-        elif combined_score >= 35:
-            return "hold"
-        elif combined_score >= 20:
-            return "sell"
-        else:
-            return "strong_sell"
+        # MACD analysis
+        has_macd = macd.notna() & macd_signal.notna()
+        score += np.where(has_macd, np.where(macd > macd_signal, 10, -10), 0)
+
+        score = score.clip(0, 100)
+        # Default score when no indicators have been computed for the code
+        return score.where(frame["indicator_date"].notna(), 65.0)
+
+    @staticmethod
+    def _fundamental_scores(frame: pd.DataFrame) -> pd.Series:
+        """Score the latest valuation of each position."""
+        pe_ttm, pb = frame["pe_ttm"], frame["pb"]
+
+        score = pd.Series(70.0, index=frame.index)  # Base score
+
+        # Valuation: loss-makers have no TTM PE, rich multiples cost points
+        score += np.select(
+            [pe_ttm.isna(), pe_ttm > 100, pe_ttm <= 30],
+            [-20, -10, 5],
+            0,
+        )
+        score += np.where(pb > 10, -5, 0)
+
+        score = score.clip(0, 100)
+        # Default score when no valuation data is available for the code
+        return score.where(frame["fundamental_date"].notna(), 70.0)
+
+    @staticmethod
+    def _risk_scores(frame: pd.DataFrame) -> pd.Series:
+        """Score the position-level risk of each holding."""
+        # Position size risk
+        profit_rate = frame["profit_rate"].fillna(0).abs()
+        risk = 50.0 + np.select(
+            [profit_rate > 20, profit_rate > 10],
+            [20, 10],  # High / medium volatility
+            0,
+        )
+        return pd.Series(risk, index=frame.index).clip(0, 100)
+
+    @staticmethod
+    def _recommendations(
+        technical: pd.Series, fundamental: pd.Series, risk: pd.Series
+    ) -> pd.Series:
+        """Map combined scores to stock recommendations."""
+        combined = (technical + fundamental) / 2 - (risk - 50)
+        labels = np.select(
+            [combined >= 80, combined >= 65, combined >= 35, combined >= 20],
+            ["strong_buy", "buy", "hold", "sell"],
+            "strong_sell",
+        )
+        return pd.Series(labels, index=technical.index)
 
     def _generate_key_points(
         self, position: dict[str, Any], technical_score: float, fundamental_score: float
@@ -730,27 +917,7 @@ class DailyAnalysisService:
                         %(fundamental_scores)s, %(created_at)s, %(updated_at)s)
             """
 
-            params = {
-                "id": analysis_data["id"],
-                "user_id": analysis_data["user_id"],
-                "analysis_date": analysis_data["analysis_date"],
-                "analysis_type": analysis_data["analysis_type"],
-                "analysis_summary": analysis_data["analysis_summary"],
-                "stock_analyses": json.dumps(
-                    analysis_data["stock_analyses"], ensure_ascii=False
-                ),
-                "risk_alerts": json.dumps(
-                    analysis_data["risk_alerts"], ensure_ascii=False
-                ),
-                "recommendations": json.dumps(
-                    analysis_data["recommendations"], ensure_ascii=False
-                ),
-                "market_sentiment": analysis_data["market_sentiment"],
-                "technical_signals": analysis_data["technical_signals"],
-                "fundamental_scores": analysis_data["fundamental_scores"],
-                "created_at": analysis_data["created_at"],
-                "updated_at": analysis_data["updated_at"],
-            }
+            params = self._analysis_params(analysis_data)
 
             self.db.execute(query, params)
             logger.info(f"Analysis {analysis_data['id']} saved successfully")
@@ -758,6 +925,46 @@ class DailyAnalysisService:
         except Exception as e:
             logger.error(f"Failed to save analysis: {e}")
 
+    def _save_analyses(self, analyses: list[dict[str, Any]]):
+        """Save many analyses to ClickHouse with a single insert."""
+        if not self.db or not analyses:
+            return
+
+        try:
+            df = pd.DataFrame([self._analysis_params(a) for a in analyses])
+            df["analysis_date"] = pd.to_datetime(df["analysis_date"]).dt.date
+            df["created_at"] = pd.to_datetime(df["created_at"])
+            df["updated_at"] = pd.to_datetime(df["updated_at"])
+
+            self.db.insert_dataframe("portfolio_analysis", df)
+            logger.info(f"Saved {len(analyses)} analyses")
+
+        except Exception as e:
+            logger.error(f"Failed to save analyses: {e}")
+
+    @staticmethod
+    def _analysis_params(analysis_data: dict[str, Any]) -> dict[str, Any]:
+        """Map an analysis dict onto ``portfolio_analysis`` columns."""
+        return {
+            "id": analysis_data["id"],
+            "user_id": analysis_data["user_id"],
+            "analysis_date": analysis_data["analysis_date"],
+            "analysis_type": analysis_data["analysis_type"],
+            "analysis_summary": analysis_data["analysis_summary"],
+            "stock_analyses": json.dumps(
+                analysis_data["stock_analyses"], ensure_ascii=False
+            ),
+            "risk_alerts": json.dumps(analysis_data["risk_alerts"], ensure_ascii=False),
+            "recommendations": json.dumps(
+                analysis_data["recommendations"], ensure_ascii=False
+            ),
+            "market_sentiment": analysis_data["market_sentiment"],
+            "technical_signals": analysis_data["technical_signals"],
+            "fundamental_scores": analysis_data["fundamental_scores"],
+            "created_at": analysis_data["created_at"],
+            "updated_at": analysis_data["updated_at"],
+        }
+
     def _safe_json_parse(self, json_str: str) -> Any:
         """Safely parse JSON string."""
         try:
@@ -1,5 +1,6 @@
 """HTTP server for stock data service."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -235,35 +236,6 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Auth initialization failed: {e}")
     
-    # Initialize portfolio tables
-    try:
-        from stock_datasource.modules.portfolio.init import ensure_portfolio_tables, ensure_profile_id_column
-        ensure_portfolio_tables()
-        ensure_profile_id_column()
-    except Exception as e:
-        logger.warning(f"Portfolio table initialization failed: {e}")
-
-    # Initialize profile tables
-    try:
-        from stock_datasource.modules.profile.service import get_profile_service
-        get_profile_service().ensure_table()
-    except Exception as e:
-        logger.warning(f"Profile table initialization failed: {e}")
-
-    # Initialize financial analysis tables
-    try:
-        from stock_datasource.modules.financial_analysis.tables import ensure_financial_analysis_tables
-        ensure_financial_analysis_tables()
-    except Exception as e:
-        logger.warning(f"Financial analysis table initialization failed: {e}")
-
-    # Initialize Open API Gateway tables
-    try:
-        from stock_datasource.modules.open_api.service import _ensure_tables as _ensure_open_api_tables
-        _ensure_open_api_tables()
-    except Exception as e:
-        logger.warning(f"Open API Gateway table initialization failed: {e}")
-    
     # Initialize plugin manager
     try:
         from stock_datasource.core.plugin_manager import plugin_manager
@@ -272,61 +244,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Plugin discovery failed: {e}")
 
-    # Ensure ClickHouse tables exist (predefined + essential plugin tables)
-    # Keep it lightweight and synchronous to avoid long lock contention at runtime.
+    # Ensure ClickHouse tables exist (portfolio, profile, financial analysis,
+    # open API, predefined + essential plugin tables). Modules whose DDL
+    # fingerprint is unchanged are skipped; the rest run on a bounded pool.
     try:
-        from stock_datasource.config.settings import settings
-        from stock_datasource.models.database import db_client
-        from stock_datasource.models.schemas import PREDEFINED_SCHEMAS
-        from stock_datasource.utils.schema_manager import schema_manager, dict_to_schema
         from stock_datasource.core.plugin_manager import plugin_manager
+        from stock_datasource.utils.schema_bootstrap import (
+            bootstrap_schemas,
+            startup_schema_modules,
+        )
 
-        # Ensure database exists
-        db_client.create_database(settings.CLICKHOUSE_DATABASE)
-
-        # Create predefined tables (meta + core facts) via DDL only (no extra exists checks / changelog writes)
-        for schema in PREDEFINED_SCHEMAS.values():
-            try:
-                db_client.create_table(schema_manager._build_create_table_sql(schema))
-            except Exception as inner_e:
-                logger.warning(f"Failed to ensure predefined table {schema.table_name}: {inner_e}")
-
-        # Create only configured plugin tables required by frontend pages.
-        # You can override by env: REQUIRED_PLUGIN_TABLES=tushare_daily_basic,tushare_daily,...
-        default_required_plugins = [
-            "tushare_ths_daily",      # 同花顺行情数据
-            "tushare_ths_index",      # 同花顺指数
-            "tushare_idx_factor_pro", # 指数因子
-            "tushare_index_basic",    # 指数基础信息
-            "tushare_etf_fund_daily", # ETF日线数据
-            "tushare_etf_basic",      # ETF基础信息
-            "tushare_cyq_chips",      # 筹码分布数据
-            "tushare_stk_surv",       # 机构调研数据
-            "tushare_report_rc",      # 研报覆盖数据
-        ]
-        required_plugins_env = os.getenv("REQUIRED_PLUGIN_TABLES", "")
-        required_plugins = [
-            p.strip() for p in required_plugins_env.split(",") if p.strip()
-        ] or default_required_plugins
-
-        for plugin_name in required_plugins:
-            try:
-                plugin = plugin_manager.get_plugin(plugin_name)
-                if not plugin:
-                    logger.warning(f"Required plugin not found: {plugin_name}")
-                    continue
-
-                schema_dict = plugin.get_schema()
-                if not schema_dict or not schema_dict.get("table_name"):
-                    logger.warning(f"Plugin {plugin_name} schema is empty")
-                    continue
-
-                schema = dict_to_schema(schema_dict)
-                db_client.create_table(schema_manager._build_create_table_sql(schema))
-            except Exception as inner_e:
-                logger.warning(f"Failed to ensure table for plugin {plugin_name}: {inner_e}")
-
-        logger.info("ClickHouse table initialization completed")
+        bootstrap_schemas(startup_schema_modules(plugin_manager))
     except Exception as e:
         logger.warning(f"ClickHouse table initialization failed: {e}")
 
@@ -458,6 +386,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"SyncTaskManager stop failed: {e}")
 
+    # Flush batched usage telemetry
+    try:
+        from stock_datasource.services.telemetry_sink import get_telemetry_sink
+        get_telemetry_sink().close()
+        logger.info("Telemetry sink flushed")
+    except Exception as e:
+        logger.warning(f"Telemetry sink flush failed: {e}")
+
+    # Publish final metrics snapshot for the scrape endpoint
+    try:
+        from stock_datasource.utils.metrics import registry as metrics_registry
+        metrics_registry.flush()
+    except Exception as e:
+        logger.warning(f"Metrics flush failed: {e}")
+
     # Flush Langfuse traces
     try:
         from stock_datasource.llm.client import flush_langfuse
@@ -534,6 +477,16 @@ def create_app() -> FastAPI:
         
         return response
     
+    # Prometheus scrape endpoint (aggregates API server and worker processes)
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        from fastapi.responses import PlainTextResponse
+
+        from stock_datasource.utils.metrics import registry as metrics_registry
+
+        body = await asyncio.to_thread(metrics_registry.render)
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+    
     # Root endpoint
     @app.get("/")
     async def root():
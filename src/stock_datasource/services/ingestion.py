@@ -160,29 +160,56 @@ class IngestionService:
 
             for trade_date in trade_dates:
                 try:
-                    # For backfill, we need to modify the daily ingestion to use backfill mode
+                    # For backfill, we need to modify the daily ingestion to use backfill mode.
+                    # Quality checks run once for the whole range afterwards.
                     daily_result = self._ingest_daily_data_backfill(
-                        trade_date, run_quality_checks
+                        trade_date, run_quality_checks=False
                     )
                     result["dates_processed"].append(daily_result)
 
-                    # Update summary
-                    if daily_result["status"] == "success":
-                        result["summary"]["successful"] += 1
-                    elif daily_result["status"] == "warning":
-                        result["summary"]["warnings"] += 1
-                    else:
-                        result["summary"]["failed"] += 1
-
                     logger.info(
                         f"Backfill progress: {trade_date} - {daily_result['status']}"
                     )
 
                 except Exception as e:
                     logger.error(f"Failed to process {trade_date}: {e}")
-                    result["summary"]["failed"] += 1
+                    result["dates_processed"].append(
+                        {"trade_date": trade_date, "status": "failed", "error": str(e)}
+                    )
                     continue
 
+            if run_quality_checks and trade_dates:
+                ingested = [
+                    d["trade_date"]
+                    for d in result["dates_processed"]
+                    if d["status"] != "failed"
+                ]
+                qc_results = self._run_backfill_quality_checks_for_dates(ingested)
+                for daily_result in result["dates_processed"]:
+                    qc_result = qc_results.get(daily_result["trade_date"])
+                    if qc_result is None:
+                        continue
+                    daily_result["quality_checks"] = qc_result
+                    if (
+                        daily_result["status"] == "success"
+                        and qc_result.get("overall_status") == "failed"
+                    ):
+                        # For backfill, treat quality check failures as warnings
+                        daily_result["status"] = "warning"
+                        logger.warning(
+                            f"Quality checks failed for {daily_result['trade_date']} "
+                            f"but treating as warning for backfill"
+                        )
+
+            # Update summary
+            for daily_result in result["dates_processed"]:
+                if daily_result["status"] == "success":
+                    result["summary"]["successful"] += 1
+                elif daily_result["status"] == "warning":
+                    result["summary"]["warnings"] += 1
+                else:
+                    result["summary"]["failed"] += 1
+
             # Determine overall status
             if result["summary"]["failed"] > 0:
                 result["status"] = "failed"
@@ -313,71 +340,86 @@ class IngestionService:
 
     def _run_backfill_quality_checks(self, trade_date: str) -> dict[str, Any]:
         """Run quality checks with relaxed rules for backfill operations."""
-        logger.info(f"Running backfill quality checks for {trade_date}")
+        return self._run_backfill_quality_checks_for_dates([trade_date])[trade_date]
+
+    def _run_backfill_quality_checks_for_dates(
+        self, trade_dates: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Run relaxed backfill quality checks for many dates in one pass.
 
-        # Create a modified quality checker that's more lenient for backfill
-        from stock_datasource.utils.quality_checks import quality_checker
+        Each check is evaluated once over all dates. The relaxed results are
+        not persisted: ``meta_quality_check`` rows carry the strict per-table
+        statuses, which would disagree with what is returned here.
+        """
+        logger.info(f"Running backfill quality checks for {len(trade_dates)} dates")
 
         # Run basic checks but be more tolerant of failures
         try:
-            result = quality_checker.run_all_checks(trade_date)
-
-            # For backfill, convert some failures to warnings
-            modified_checks = []
-            for check in result["checks"]:
-                if check["check_name"] == "trade_date_alignment":
-                    # For backfill, alignment issues are less critical
-                    if check["status"] == "failed":
-                        check["status"] = "warning"
-                        check["backfill_note"] = (
-                            "Converted from failed to warning for backfill"
-                        )
-
-                modified_checks.append(check)
-
-            result["checks"] = modified_checks
-
-            # Recalculate overall status
-            failed_checks = [c for c in modified_checks if c["status"] == "failed"]
-            warning_checks = [c for c in modified_checks if c["status"] == "warning"]
+            results = self.quality_checker.run_checks_for_dates(trade_dates)
+        except Exception as e:
+            logger.error(f"Backfill quality checks failed: {e}")
+            return {
+                trade_date: {
+                    "trade_date": trade_date,
+                    "overall_status": "error",
+                    "error": str(e),
+                    "checks": [],
+                    "summary": {
+                        "total_checks": 0,
+                        "passed": 0,
+                        "warning": 0,
+                        "failed": 0,
+                        "skipped": 0,
+                        "error": 1,
+                    },
+                }
+                for trade_date in trade_dates
+            }
 
-            if failed_checks:
-                result["overall_status"] = "failed"
-            elif warning_checks:
-                result["overall_status"] = "warning"
-            else:
-                result["overall_status"] = "passed"
+        return {
+            trade_date: self._relax_backfill_checks(result)
+            for trade_date, result in results.items()
+        }
 
-            # Update summary
-            result["summary"] = {
-                "total_checks": len(modified_checks),
-                "passed": len([c for c in modified_checks if c["status"] == "passed"]),
-                "warning": len(warning_checks),
-                "failed": len(failed_checks),
-                "skipped": len(
-                    [c for c in modified_checks if c["status"] == "skipped"]
-                ),
-                "error": len([c for c in modified_checks if c["status"] == "error"]),
-            }
+    @staticmethod
+    def _relax_backfill_checks(result: dict[str, Any]) -> dict[str, Any]:
+        """Convert alignment failures to warnings and recompute the summary."""
+        modified_checks = []
+        for check in result["checks"]:
+            if check["check_name"] == "trade_date_alignment":
+                # For backfill, alignment issues are less critical
+                if check["status"] == "failed":
+                    check["status"] = "warning"
+                    check["backfill_note"] = (
+                        "Converted from failed to warning for backfill"
+                    )
 
-            return result
+            modified_checks.append(check)
+
+        result["checks"] = modified_checks
+
+        # Recalculate overall status
+        failed_checks = [c for c in modified_checks if c["status"] == "failed"]
+        warning_checks = [c for c in modified_checks if c["status"] == "warning"]
+
+        if failed_checks:
+            result["overall_status"] = "failed"
+        elif warning_checks:
+            result["overall_status"] = "warning"
+        else:
+            result["overall_status"] = "passed"
+
+        # Update summary
+        result["summary"] = {
+            "total_checks": len(modified_checks),
+            "passed": len([c for c in modified_checks if c["status"] == "passed"]),
+            "warning": len(warning_checks),
+            "failed": len(failed_checks),
+            "skipped": len([c for c in modified_checks if c["status"] == "skipped"]),
+            "error": len([c for c in modified_checks if c["status"] == "error"]),
+        }
 
-        except Exception as e:
-            logger.error(f"Backfill quality checks failed for {trade_date}: {e}")
-            return {
-                "trade_date": trade_date,
-                "overall_status": "error",
-                "error": str(e),
-                "checks": [],
-                "summary": {
-                    "total_checks": 0,
-                    "passed": 0,
-                    "warning": 0,
-                    "failed": 0,
-                    "skipped": 0,
-                    "error": 1,
-                },
-            }
+        return result
 
     def get_ingestion_status(self, trade_date: str) -> dict[str, Any]:
         """Get ingestion status for a specific trade date."""
@@ -1,15 +1,24 @@
 """MCP server for stock data service."""
 
 import asyncio
+import functools
 import importlib
 import inspect
 import json
 import logging
+import math
 import os
+import threading
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
+import pandas as pd
 from fastmcp import FastMCP
 
+from stock_datasource.config.settings import settings
 from stock_datasource.core.base_service import BaseService
 from stock_datasource.core.service_generator import ServiceGenerator
 
@@ -18,6 +27,142 @@ logger = logging.getLogger(__name__)
 # Global cache for services
 _services_cache = {}
 
+# Bounded pool for blocking service calls made by MCP tools
+_tool_executor: ThreadPoolExecutor | None = None
+_tool_executor_lock = threading.Lock()
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    _orjson = None
+
+
+def _get_tool_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool that runs MCP tool service calls."""
+    global _tool_executor
+    if _tool_executor is None:
+        with _tool_executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.MCP_TOOL_WORKERS),
+                    thread_name_prefix="mcp-tool",
+                )
+    return _tool_executor
+
+
+def _max_result_rows() -> int:
+    return settings.MCP_MAX_RESULT_ROWS
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON (orjson when installed)."""
+    if _orjson is not None:
+        return _orjson.dumps(
+            obj,
+            default=str,
+            option=_orjson.OPT_NON_STR_KEYS | _orjson.OPT_SERIALIZE_NUMPY,
+        ).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _clean_value(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is pd.NaT:
+        return None
+    return value
+
+
+def _columnar(columns: list[str], values: dict[str, list], total_rows: int) -> dict:
+    """Column-oriented layout for tabular tool results."""
+    row_count = len(values[columns[0]]) if columns else 0
+    return {
+        "row_count": row_count,
+        "total_rows": total_rows,
+        "truncated": row_count < total_rows,
+        "columns": {c: [_clean_value(v) for v in values[c]] for c in columns},
+    }
+
+
+def _is_record_list(result: Any) -> bool:
+    if not isinstance(result, list) or not result:
+        return False
+    if not all(isinstance(row, dict) for row in result):
+        return False
+    keys = result[0].keys()
+    return all(row.keys() == keys for row in result)
+
+
+def _encode_tool_result(result: Any, max_rows: int | None = None) -> str:
+    """Encode a service method result as the text returned by an MCP tool.
+
+    DataFrames and lists of uniform records are capped at ``max_rows`` and
+    laid out column-wise (``{"row_count", "total_rows", "truncated",
+    "columns": {name: [values]}}``), which repeats each field name once
+    instead of once per row. Other dicts/lists are compact JSON; anything
+    else is returned as ``str()``.
+    """
+    if max_rows is None:
+        max_rows = _max_result_rows()
+
+    if isinstance(result, pd.DataFrame):
+        total = len(result)
+        head = result.head(max_rows)
+        columns = [str(c) for c in head.columns]
+        values = {str(c): head[c].tolist() for c in head.columns}
+        return _dumps(_columnar(columns, values, total))
+
+    if _is_record_list(result):
+        total = len(result)
+        head = result[:max_rows]
+        columns = list(head[0].keys())
+        values = {c: [row[c] for row in head] for c in columns}
+        encoded = _columnar([str(c) for c in columns], {str(c): v for c, v in values.items()}, total)
+        return _dumps(encoded)
+
+    if isinstance(result, list) and len(result) > max_rows:
+        return _dumps({
+            "row_count": max_rows,
+            "total_rows": len(result),
+            "truncated": True,
+            "data": result[:max_rows],
+        })
+
+    if isinstance(result, (dict, list)):
+        return _dumps(result)
+    return str(result)
+
+
+def _make_tool_handler(tool_name: str, method: Callable) -> Callable:
+    """Build the async MCP handler for a service query method.
+
+    The handler exposes the method's parameters (without annotations, so
+    raw MCP arguments reach ``_convert_tool_arguments`` untouched) and runs
+    the blocking service call on the shared tool pool, keeping the event
+    loop free for concurrent tool calls.
+    """
+    sig = inspect.signature(method)
+    params = [
+        inspect.Parameter(p.name, inspect.Parameter.KEYWORD_ONLY, default=p.default)
+        for p in sig.parameters.values()
+        if p.name != "self"
+        and p.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+    ]
+
+    async def handler(**kwargs) -> str:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                _get_tool_executor(), functools.partial(method, **kwargs)
+            )
+            return _encode_tool_result(result)
+        except Exception as e:
+            return f"Error calling {tool_name}: {e!s}"
+
+    handler.__name__ = tool_name
+    handler.__signature__ = inspect.Signature(params, return_annotation=str)
+    return handler
+
 
 def _get_or_create_service(service_class, service_name: str):
     """Get or create service instance (lazy initialization)."""
@@ -274,66 +419,7 @@ def create_mcp_server() -> tuple[FastMCP, dict]:
                     logger.warning(f"Tool handler not found: {tool_name}")
                     continue
 
-                # Get parameter names from the method signature
-                sig = inspect.signature(method)
-                param_names = [p for p in sig.parameters.keys() if p != "self"]
-
-                # Create tool handler with closure
-                def make_tool_handler(
-                    service_prefix_inner: str,
-                    tool_name_inner: str,
-                    generator_inner: ServiceGenerator,
-                    param_names_inner: list,
-                ):
-                    # Create handler with explicit parameters
-                    def handler_factory():
-                        # Build handler with explicit parameters
-                        if not param_names_inner:
-
-                            def handler() -> str:
-                                try:
-                                    method = generator_inner.get_tool_handler(
-                                        tool_name_inner
-                                    )
-                                    result = method()
-                                    if isinstance(result, (dict, list)):
-                                        return json.dumps(
-                                            result, ensure_ascii=False, indent=2
-                                        )
-                                    return str(result)
-                                except Exception as e:
-                                    return f"Error calling {tool_name_inner}: {e!s}"
-
-                            return handler
-                        else:
-                            # Create handler with parameters
-                            exec_globals = {
-                                "generator_inner": generator_inner,
-                                "tool_name_inner": tool_name_inner,
-                                "json": json,
-                            }
-
-                            # Build function signature dynamically
-                            params_str = ", ".join(param_names_inner)
-                            handler_code = f"""def handler({params_str}) -> str:
-    try:
-        method = generator_inner.get_tool_handler(tool_name_inner)
-        result = method({params_str})
-        if isinstance(result, (dict, list)):
-            return json.dumps(result, ensure_ascii=False, indent=2)
-        return str(result)
-    except Exception as e:
-        return f"Error calling {{tool_name_inner}}: {{str(e)}}"
-"""
-                            exec(handler_code, exec_globals)
-                            return exec_globals["handler"]
-
-                    return handler_factory()
-
-                # Create handler
-                handler = make_tool_handler(
-                    service_prefix, tool_name, generator, param_names
-                )
+                handler = _make_tool_handler(tool_name, method)
 
                 # Register tool with MCP server using decorator
                 server.tool(
@@ -356,10 +442,23 @@ def create_app():
     from fastapi.responses import JSONResponse
     from starlette.responses import StreamingResponse
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # Flush batched MCP tool usage telemetry
+        try:
+            from stock_datasource.services.telemetry_sink import get_telemetry_sink
+
+            get_telemetry_sink().close()
+            logger.info("Telemetry sink flushed")
+        except Exception as e:
+            logger.warning(f"Telemetry sink flush failed: {e}")
+
     app = FastAPI(
         title="Stock Data Service - MCP",
         description="MCP server for querying stock data via HTTP",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     # Add CORS middleware
@@ -473,6 +572,8 @@ def create_app():
         """
         try:
             data = json.loads(result_text)
+            if isinstance(data, dict) and isinstance(data.get("row_count"), int):
+                return data["row_count"]
             if isinstance(data, list):
                 return len(data)
             if isinstance(data, dict):
@@ -496,26 +597,15 @@ def create_app():
     async def _log_mcp_usage(
         user_info: dict, tool_name: str, record_count: int, auth_type: str
     ):
-        """Fire-and-forget usage logging."""
+        """Fire-and-forget usage logging (batched by the telemetry sink)."""
         try:
-            import uuid
-            from datetime import datetime
-
-            from stock_datasource.models.database import db_client
+            from stock_datasource.modules.mcp_usage.service import McpUsageService
 
-            db_client.execute(
-                "INSERT INTO mcp_tool_usage_log "
-                "(id, user_id, api_key_id, tool_name, record_count, created_at) "
-                "VALUES (%(id)s, %(user_id)s, %(api_key_id)s, %(tool_name)s, "
-                "%(record_count)s, %(now)s)",
-                {
-                    "id": str(uuid.uuid4()),
-                    "user_id": user_info.get("id", "") or user_info.get("username", ""),
-                    "api_key_id": user_info.get("key_id", ""),
-                    "tool_name": tool_name,
-                    "record_count": record_count,
-                    "now": datetime.now(),
-                },
+            await McpUsageService.log_usage(
+                user_id=user_info.get("id", "") or user_info.get("username", ""),
+                api_key_id=user_info.get("key_id", ""),
+                tool_name=tool_name,
+                record_count=record_count,
             )
         except Exception as e:
             logger.warning(f"Usage logging failed: {e}")
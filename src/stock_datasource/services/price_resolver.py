@@ -0,0 +1,362 @@
+"""Batched latest-price resolution shared by portfolio, paper trading and agents.
+
+``LatestPriceResolver.resolve`` prices many codes with one round trip per
+source instead of one per code:
+
+1. Short-lived in-process cache (``PRICE_RESOLVER_CACHE_TTL``).
+2. Realtime minute cache: one multi-key read of ``rt_minute_latest``. After
+   the close, bars stamped before 15:00 are stale (a thinly traded ETF's last
+   intraday trade) and fall through to the daily close.
+3. Optional on-demand fetcher for codes the minute cache does not hold.
+4. Daily tables: one ``UNION ALL`` of per-table ``LIMIT 1 BY ts_code``
+   queries over every candidate table of every code, merged by each code's
+   table precedence (inferred market first, then the other tables).
+
+The daily row doubles as the previous close of realtime quotes: its
+``close`` is "yesterday's" close, while daily-sourced quotes carry the row's
+own ``pre_close``.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MARKET_DAILY_TABLES = {
+    "a_stock": "ods_daily",
+    "etf": "ods_etf_fund_daily",
+    "hk": "ods_hk_daily",
+    "index": "ods_index_daily",
+}
+
+ETF_PREFIXES = (
+    "510",
+    "511",
+    "512",
+    "513",
+    "515",
+    "516",
+    "518",
+    "520",
+    "560",
+    "561",
+    "562",
+    "563",
+    "588",
+    "159",
+    "150",
+    "501",
+    "502",
+)
+
+# ts_code -> {'close', 'trade_time', 'prev_close', 'source'}
+PriceMap = dict[str, dict[str, Any]]
+OnDemandFetcher = Callable[[list[str]], PriceMap]
+
+
+def infer_market_type(ts_code: str) -> str:
+    """从 ts_code 推断市场类型: a_stock / etf / hk / index"""
+    if not isinstance(ts_code, str) or len(ts_code) < 3:
+        return "a_stock"
+    if ts_code.endswith(".HK"):
+        return "hk"
+    # 指数: 000001.SH(上证指数), 399001.SZ(深证成指)；000001.SZ 是平安银行
+    suffix = ts_code[-2:]
+    if suffix == "SH" and ts_code.startswith("0000"):
+        return "index"
+    if suffix == "SZ" and ts_code.startswith(("3990", "3991", "3993", "3996", "3999")):
+        return "index"
+    if ts_code[:3] in ETF_PREFIXES:
+        return "etf"
+    return "a_stock"
+
+
+def candidate_tables(ts_code: str) -> list[str]:
+    """Daily tables to look a code up in, in order of precedence."""
+    tables = [MARKET_DAILY_TABLES[infer_market_type(ts_code)]]
+    for fallback in ("ods_daily", "ods_etf_fund_daily"):
+        if fallback not in tables:
+            tables.append(fallback)
+    return tables
+
+
+def format_trade_datetime(trade_date, market_type: str = "a_stock") -> str:
+    """日线 trade_date 补上收盘时间（A股/ETF 15:00:00，港股 16:00:00）"""
+    if hasattr(trade_date, "strftime"):
+        date_str = trade_date.strftime("%Y-%m-%d")
+    else:
+        date_str = str(trade_date)
+        if len(date_str) == 8 and "-" not in date_str:
+            date_str = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+    close_time = "16:00:00" if market_type == "hk" else "15:00:00"
+    return f"{date_str} {close_time}"
+
+
+def is_market_closed(now: datetime | None = None) -> bool:
+    """判断当前是否已收盘（周末，或 15:05 之后）"""
+    now = now or datetime.now()
+    return now.weekday() >= 5 or now.hour * 100 + now.minute > 1505
+
+
+def is_stale_after_close(trade_time: str) -> bool:
+    """收盘后时间早于 15:00 的分钟快照不是收盘价"""
+    if not trade_time:
+        return False
+    time_part = trade_time.split(" ")[-1]
+    try:
+        return int(time_part[:2]) * 100 + int(time_part[3:5]) < 1500
+    except (ValueError, IndexError):
+        return False
+
+
+def _float_or_none(value) -> float | None:
+    if value is None or pd.isna(value):
+        return None
+    return float(value)
+
+
+class LatestPriceResolver:
+    """Resolve latest prices for many codes with batched source reads."""
+
+    def __init__(self, db=None, cache_store=None, cache_ttl: float | None = None):
+        self._db = db
+        self._cache_store = cache_store
+        self._cache_ttl = cache_ttl
+        # (ts_code, include_realtime) -> (expires_at, price info)
+        self._cache: dict[tuple[str, bool], tuple[float, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from stock_datasource.models.database import db_client
+
+            self._db = db_client
+        return self._db
+
+    @property
+    def cache_ttl(self) -> float:
+        if self._cache_ttl is None:
+            from stock_datasource.config.settings import settings
+
+            self._cache_ttl = settings.PRICE_RESOLVER_CACHE_TTL
+        return self._cache_ttl
+
+    def _get_cache_store(self):
+        if self._cache_store is None:
+            from stock_datasource.modules.realtime_minute.cache_store import (
+                get_cache_store,
+            )
+
+            self._cache_store = get_cache_store()
+        return self._cache_store
+
+    # ------------------------------------------------------------------
+    # In-process cache
+    # ------------------------------------------------------------------
+
+    def _cached(self, codes: list[str], include_realtime: bool) -> PriceMap:
+        now = time.monotonic()
+        hits = {}
+        with self._lock:
+            for code in codes:
+                entry = self._cache.get((code, include_realtime))
+                if entry and entry[0] > now:
+                    hits[code] = dict(entry[1])
+        return hits
+
+    def _remember(self, prices: PriceMap, include_realtime: bool) -> None:
+        if self.cache_ttl <= 0 or not prices:
+            return
+        expires_at = time.monotonic() + self.cache_ttl
+        with self._lock:
+            for code, info in prices.items():
+                self._cache[(code, include_realtime)] = (expires_at, dict(info))
+
+    def invalidate(self, ts_codes: list[str] | None = None) -> None:
+        """Drop cached prices of some codes (or all)."""
+        with self._lock:
+            if ts_codes is None:
+                self._cache.clear()
+                return
+            drop = set(ts_codes)
+            for key in [k for k in self._cache if k[0] in drop]:
+                del self._cache[key]
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def _realtime_latest(self, codes: list[str], market_closed: bool) -> PriceMap:
+        """One multi-key read of the minute cache."""
+        prices: PriceMap = {}
+        try:
+            cache = self._get_cache_store()
+            if not cache.available:
+                return prices
+            bars = cache.get_latest_many(codes, "1min")
+        except Exception as e:
+            logger.warning(f"Failed to get prices from rt_minute cache: {e}")
+            return prices
+        for code, bar in bars.items():
+            if bar.get("close") is None:
+                continue
+            trade_time = bar.get("trade_time") or ""
+            if market_closed and is_stale_after_close(trade_time):
+                logger.debug(f"Skipping stale minute data for {code}: {trade_time}")
+                continue
+            prices[code] = {
+                "close": float(bar["close"]),
+                "trade_time": trade_time,
+                "prev_close": None,
+                "source": "realtime",
+            }
+        return prices
+
+    def daily_latest(self, ts_codes: list[str]) -> dict[str, dict[str, Any]]:
+        """Latest daily row of each code from its first candidate table that has one.
+
+        Returns:
+            ``{ts_code: {'table', 'close', 'trade_date', 'pre_close'}}``
+        """
+        from stock_datasource.models.database import _to_clickhouse_literal
+
+        by_table: dict[str, list[str]] = {}
+        for code in dict.fromkeys(ts_codes):
+            for table in candidate_tables(code):
+                by_table.setdefault(table, []).append(code)
+        if not by_table:
+            return {}
+
+        def part(table: str, codes: list[str]) -> str:
+            in_list = ", ".join(_to_clickhouse_literal(c) for c in codes)
+            return (
+                f"SELECT '{table}' AS src, ts_code, close, "
+                f"toString(trade_date) AS trade_date, pre_close FROM {table} "
+                f"WHERE ts_code IN ({in_list}) "
+                f"ORDER BY ts_code, trade_date DESC LIMIT 1 BY ts_code"
+            )
+
+        try:
+            frames = [
+                self.db.execute_query(
+                    " UNION ALL ".join(part(t, c) for t, c in by_table.items())
+                )
+            ]
+        except Exception as e:
+            # A missing table fails the whole UNION; retry table by table
+            logger.warning(f"Batched daily price query failed, querying per table: {e}")
+            frames = []
+            for table, codes in by_table.items():
+                try:
+                    frames.append(self.db.execute_query(part(table, codes)))
+                except Exception as table_error:
+                    logger.debug(f"Daily price query on {table} failed: {table_error}")
+
+        rows: dict[tuple[str, str], Any] = {}
+        for df in frames:
+            if df is None or df.empty:
+                continue
+            for row in df.itertuples(index=False):
+                rows[(row.ts_code, row.src)] = row
+
+        result = {}
+        for code in dict.fromkeys(ts_codes):
+            for table in candidate_tables(code):
+                row = rows.get((code, table))
+                if row is None or _float_or_none(row.close) is None:
+                    continue
+                result[code] = {
+                    "table": table,
+                    "close": float(row.close),
+                    "trade_date": row.trade_date,
+                    "pre_close": _float_or_none(row.pre_close),
+                }
+                break
+        return result
+
+    # ------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------
+
+    def resolve(
+        self,
+        ts_codes: list[str],
+        include_realtime: bool = True,
+        on_demand: OnDemandFetcher | None = None,
+        use_cache: bool = True,
+    ) -> PriceMap:
+        """Latest price of each code.
+
+        Args:
+            ts_codes: Codes to price
+            include_realtime: Use minute-cache/on-demand quotes; ``False``
+                prices from daily closes only (end-of-day valuation)
+            on_demand: Fetcher for codes without a usable minute bar
+            use_cache: Serve and store results in the in-process cache
+
+        Returns:
+            ``{ts_code: {'close', 'trade_time', 'prev_close', 'source'}}`` for
+            codes that have a price; ``source`` is ``realtime``, ``on_demand``
+            or ``daily``.
+        """
+        codes = list(dict.fromkeys(c for c in ts_codes if c))
+        if not codes:
+            return {}
+        prices = self._cached(codes, include_realtime) if use_cache else {}
+        pending = [c for c in codes if c not in prices]
+        if not pending:
+            return prices
+
+        resolved: PriceMap = {}
+        if include_realtime:
+            resolved.update(self._realtime_latest(pending, is_market_closed()))
+            missing = [c for c in pending if c not in resolved]
+            if missing and on_demand is not None:
+                try:
+                    for code, info in on_demand(missing).items():
+                        resolved[code] = {**info, "prev_close": None, "source": "on_demand"}
+                except Exception as e:
+                    logger.warning(f"Failed to on-demand fetch prices: {e}")
+
+        try:
+            daily = self.daily_latest(pending)
+        except Exception as e:
+            logger.warning(f"Failed to get daily prices: {e}")
+            daily = {}
+
+        for code in pending:
+            row = daily.get(code)
+            if code in resolved:
+                if row is not None:
+                    resolved[code]["prev_close"] = row["close"]
+            elif row is not None:
+                market_type = "hk" if row["table"] == "ods_hk_daily" else "a_stock"
+                resolved[code] = {
+                    "close": row["close"],
+                    "trade_time": format_trade_datetime(row["trade_date"], market_type),
+                    "prev_close": row["pre_close"],
+                    "source": "daily",
+                }
+
+        if use_cache:
+            self._remember(resolved, include_realtime)
+        prices.update(resolved)
+        return prices
+
+
+_price_resolver: LatestPriceResolver | None = None
+
+
+def get_price_resolver() -> LatestPriceResolver:
+    """Get the process-wide price resolver."""
+    global _price_resolver
+    if _price_resolver is None:
+        _price_resolver = LatestPriceResolver()
+    return _price_resolver
@@ -16,9 +16,22 @@ from typing import Any
 from redis import Redis
 
 from stock_datasource.config.settings import settings
+from stock_datasource.utils.metrics import registry as metrics_registry
 
 logger = logging.getLogger(__name__)
 
+_TASKS_TOTAL = metrics_registry.counter(
+    "task_queue_tasks_total", "Task queue transitions", ("event",)
+)
+_TASK_WAIT_SECONDS = metrics_registry.histogram(
+    "task_queue_wait_seconds", "Time tasks spent queued before a worker picked them up",
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 3600),
+)
+_QUEUE_DEPTH = metrics_registry.gauge(
+    "task_queue_depth", "Tasks waiting per priority queue", ("priority",),
+    multiprocess_mode="max",
+)
+
 
 class RedisUnavailableError(RuntimeError):
     """Raised when Redis is required but unavailable."""
@@ -165,6 +178,7 @@ class TaskQueue:
             queue_key = self.QUEUE_KEY.format(priority=priority.value)
             redis.lpush(queue_key, task_id)
 
+            _TASKS_TOTAL.inc(event="enqueued")
             logger.info(
                 f"Enqueued task {task_id} for plugin {plugin_name} with priority {priority.name}"
             )
@@ -237,6 +251,15 @@ class TaskQueue:
             )
             redis.sadd(self.RUNNING_KEY, task_id)
 
+            _TASKS_TOTAL.inc(event="dequeued")
+            try:
+                created = datetime.fromisoformat(task_data.get("created_at", ""))
+                _TASK_WAIT_SECONDS.observe(
+                    max((datetime.now() - created).total_seconds(), 0.0)
+                )
+            except ValueError:
+                pass
+
             return task_data
 
         except Exception as e:
@@ -299,6 +322,7 @@ class TaskQueue:
                 },
             )
             redis.srem(self.RUNNING_KEY, task_id)
+            _TASKS_TOTAL.inc(event="completed")
             logger.info(f"Task {task_id} completed with {records_processed} records")
         except Exception as e:
             logger.error(f"Failed to complete task: {e}")
@@ -327,6 +351,7 @@ class TaskQueue:
                 },
             )
             redis.srem(self.RUNNING_KEY, task_id)
+            _TASKS_TOTAL.inc(event="failed")
             logger.error(f"Task {task_id} failed: {error_message[:200]}")
         except Exception as e:
             logger.error(f"Failed to mark task as failed: {e}")
@@ -376,13 +401,16 @@ class TaskQueue:
             return {"available": False, "error": str(e)}
 
         try:
-            return {
+            stats = {
                 "available": True,
                 "high_priority": redis.llen(self.QUEUE_KEY.format(priority=0)),
                 "normal_priority": redis.llen(self.QUEUE_KEY.format(priority=1)),
                 "low_priority": redis.llen(self.QUEUE_KEY.format(priority=2)),
                 "running": redis.scard(self.RUNNING_KEY),
             }
+            for name in ("high_priority", "normal_priority", "low_priority", "running"):
+                _QUEUE_DEPTH.set(stats[name], priority=name)
+            return stats
         except Exception as e:
             logger.error(f"Failed to get queue stats: {e}")
             return {"available": False, "error": str(e)}
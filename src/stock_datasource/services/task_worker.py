@@ -25,6 +25,7 @@ from stock_datasource.services.task_queue import TaskPriority, task_queue
 
 # Use unified Loguru logging
 from stock_datasource.utils.logger import logger, setup_logging
+from stock_datasource.utils.metrics import registry as metrics_registry
 
 setup_logging()
 
@@ -439,6 +440,9 @@ def _run_plugin_in_subprocess(
     except Exception as e:
         msg = str(e)
         result_queue.put((False, 0, _classify_error_type(msg), msg))
+    finally:
+        # multiprocessing children skip atexit; publish plugin metrics now
+        metrics_registry.flush()
 
 
 class TaskWorker:
@@ -499,6 +503,7 @@ class TaskWorker:
                 traceback.print_exc()
                 time.sleep(1)  # Prevent tight error loop
 
+        metrics_registry.flush()
         logger.info(f"Worker {self.worker_id}: Stopped")
 
     def _cleanup_stale_running_tasks(self):
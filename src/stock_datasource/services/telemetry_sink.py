@@ -0,0 +1,303 @@
+"""Batched, asynchronous sink for usage telemetry rows.
+
+API usage, MCP tool usage and token usage logs used to be written with one
+synchronous single-row INSERT on the request path. ``TelemetrySink`` takes
+those rows off the request path:
+
+- ``emit`` puts a row on a bounded in-memory queue and returns immediately
+  (rows are dropped and counted when the queue is full).
+- A daemon thread groups rows per table and writes each group with one
+  ``insert_dataframe`` call once ``batch_size`` rows are pending or
+  ``flush_interval`` seconds have passed.
+- If ClickHouse is unavailable, the batch is appended to a per-table JSONL
+  spill file and replayed on the next successful flush.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class TelemetrySink:
+    """In-process telemetry queue with a background batch flusher."""
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_queue_size: int = 50000,
+        spill_dir: Path | None = None,
+        client=None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._client = client
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._buffers: dict[str, list[dict[str, Any]]] = {}
+        self._tables: dict[str, dict[str, Any]] = {}
+        # Held for a whole flush (including the ClickHouse insert)
+        self._flush_lock = threading.Lock()
+        # Guards buffers and counters; only ever held briefly
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_flush = time.monotonic()
+
+        # Counters
+        self.emitted = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.failed_batches = 0
+
+    # ------------------------------------------------------------------
+    # Registration / emit
+    # ------------------------------------------------------------------
+
+    def register_table(
+        self,
+        table: str,
+        ensure_fn: Callable[[], Any] | None = None,
+        datetime_columns: tuple[str, ...] = ("created_at",),
+    ) -> None:
+        """Declare a target table.
+
+        Args:
+            table: ClickHouse table name.
+            ensure_fn: Schema bootstrap, called from the flusher thread
+                before writing to this table until it returns True.
+            datetime_columns: Columns to parse back into datetimes when
+                replaying spilled rows.
+        """
+        if table not in self._tables:
+            self._tables[table] = {
+                "ensure_fn": ensure_fn,
+                "ensured": ensure_fn is None,
+                "datetime_columns": datetime_columns,
+            }
+
+    def emit(self, table: str, row: dict[str, Any]) -> bool:
+        """Queue a row for ``table``. Never blocks; returns False if dropped."""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self._count("dropped", 1)
+            return False
+        self._count("emitted", 1)
+        return True
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _get_client(self):
+        if self._client is None:
+            from stock_datasource.models.database import db_client
+
+            self._client = db_client
+        return self._client
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="telemetry-sink"
+                )
+                self._thread.start()
+
+    def _drain_queue(self) -> int:
+        """Move queued rows into per-table buffers (caller holds ``_lock``)."""
+        count = 0
+        while True:
+            try:
+                table, row = self._queue.get_nowait()
+            except queue.Empty:
+                return count
+            self._buffers.setdefault(table, []).append(row)
+            count += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                table, row = self._queue.get(timeout=self.flush_interval)
+                with self._lock:
+                    self._buffers.setdefault(table, []).append(row)
+            except queue.Empty:
+                pass
+
+            try:
+                due = time.monotonic() - self._last_flush >= self.flush_interval
+                with self._lock:
+                    self._drain_queue()
+                    full = any(
+                        len(rows) >= self.batch_size for rows in self._buffers.values()
+                    )
+                if due or full:
+                    self.flush()
+            except Exception as e:
+                logger.warning(f"Telemetry flush loop error: {e}")
+
+    def flush(self) -> int:
+        """Write all pending rows now. Returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            with self._lock:
+                self._drain_queue()
+                buffers, self._buffers = self._buffers, {}
+            self._last_flush = time.monotonic()
+
+            for table, rows in buffers.items():
+                if not rows:
+                    continue
+                if self._write(table, rows):
+                    written += len(rows)
+                    self._replay_spill(table)
+                else:
+                    self._spill(table, rows)
+        return written
+
+    def _write(self, table: str, rows: list[dict[str, Any]]) -> bool:
+        meta = self._tables.get(table)
+        try:
+            if meta and not meta["ensured"]:
+                # Bootstraps log and swallow their errors; retry until one
+                # reports success
+                meta["ensured"] = bool(meta["ensure_fn"]())
+            self._get_client().insert_dataframe(table, pd.DataFrame(rows))
+            self._count("flushed", len(rows))
+            return True
+        except Exception as e:
+            self._count("failed_batches", 1)
+            logger.warning(f"Telemetry write to {table} failed ({len(rows)} rows): {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Spill file (survives short ClickHouse outages)
+    # ------------------------------------------------------------------
+
+    def _spill_path(self, table: str) -> Path | None:
+        if self.spill_dir is None:
+            return None
+        return self.spill_dir / f"{table}.jsonl"
+
+    def _spill(self, table: str, rows: list[dict[str, Any]]) -> None:
+        path = self._spill_path(table)
+        if path is None:
+            self._count("dropped", len(rows))
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False, default=_json_default))
+                    f.write("\n")
+            self._count("spilled", len(rows))
+        except Exception as e:
+            self._count("dropped", len(rows))
+            logger.error(f"Failed to spill telemetry rows for {table}: {e}")
+
+    def _replay_spill(self, table: str) -> None:
+        path = self._spill_path(table)
+        if path is None or not path.exists():
+            return
+        pending = path.with_suffix(".replay")
+        try:
+            path.replace(pending)
+            with open(pending, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        except Exception as e:
+            logger.warning(f"Failed to read telemetry spill file {path}: {e}")
+            return
+
+        datetime_columns = self._tables.get(table, {}).get(
+            "datetime_columns", ("created_at",)
+        )
+        for row in rows:
+            for col in datetime_columns:
+                if isinstance(row.get(col), str):
+                    row[col] = datetime.fromisoformat(row[col])
+
+        if rows and not self._write(table, rows):
+            # Still failing: put them back for the next attempt
+            self._spill(table, rows)
+            self._count("spilled", -len(rows))
+        else:
+            self._count("replayed", len(rows))
+        pending.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Lifecycle / stats
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Stop the flusher thread and write everything still pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 1)
+            self._thread = None
+        self.flush()
+
+    def _count(self, counter: str, n: int) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and counters for monitoring.
+
+        Does not wait for an in-flight flush, so it is safe to call from
+        the event loop.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "buffered": {
+                    t: len(rows) for t, rows in self._buffers.items() if rows
+                },
+                "emitted": self.emitted,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "spilled": self.spilled,
+                "replayed": self.replayed,
+                "failed_batches": self.failed_batches,
+            }
+
+
+_telemetry_sink: TelemetrySink | None = None
+
+
+def get_telemetry_sink() -> TelemetrySink:
+    """Get the process-wide telemetry sink."""
+    global _telemetry_sink
+    if _telemetry_sink is None:
+        from stock_datasource.config.settings import settings
+
+        _telemetry_sink = TelemetrySink(
+            batch_size=settings.TELEMETRY_BATCH_SIZE,
+            flush_interval=settings.TELEMETRY_FLUSH_INTERVAL,
+            max_queue_size=settings.TELEMETRY_MAX_QUEUE,
+            spill_dir=settings.LOGS_DIR / "telemetry_spill",
+        )
+    return _telemetry_sink
@@ -17,7 +17,7 @@ class DailyPortfolioAnalysisTask:
     def __init__(self):
         self._is_running = False
         self._scheduler_thread = None
-        self._analysis_service = None
+        self._portfolio_analysis_service = None
         self._notification_service = None
 
         # Default schedule: 18:30 every day
@@ -25,18 +25,18 @@ class DailyPortfolioAnalysisTask:
         self.enabled = True
 
     @property
-    def analysis_service(self):
-        """Lazy load analysis service."""
-        if self._analysis_service is None:
+    def portfolio_analysis_service(self):
+        """Lazy load the set-based portfolio analysis service."""
+        if self._portfolio_analysis_service is None:
             try:
                 from stock_datasource.services.daily_analysis_service import (
-                    get_daily_analysis_service,
+                    PortfolioAnalysisService,
                 )
 
-                self._analysis_service = get_daily_analysis_service()
+                self._portfolio_analysis_service = PortfolioAnalysisService()
             except Exception as e:
-                logger.error(f"Failed to get analysis service: {e}")
-        return self._analysis_service
+                logger.error(f"Failed to get portfolio analysis service: {e}")
+        return self._portfolio_analysis_service
 
     @property
     def notification_service(self):
@@ -120,53 +120,44 @@ class DailyPortfolioAnalysisTask:
             logger.error(f"Daily analysis job failed: {e}")
 
     async def _execute_daily_analysis(self):
-        """Execute daily analysis for all users."""
-        if not self.analysis_service:
+        """Execute daily analysis for all users.
+
+        Every user's positions are analyzed in one set-based pass, so the
+        run costs a fixed number of queries however many holdings exist.
+        """
+        if not self.portfolio_analysis_service:
             logger.error("Analysis service not available")
             return
 
-        # Get list of users (for now, just default user)
-        users = ["default_user"]  # In production, get from user service
+        try:
+            analyses = await self.portfolio_analysis_service.analyze_all_users(
+                date.today()
+            )
+        except Exception as e:
+            logger.error(f"Failed to run daily analysis: {e}")
+            return
 
         analysis_results = []
 
-        for user_id in users:
-            try:
-                logger.info(f"Running daily analysis for user: {user_id}")
-
-                # Run analysis
-                report = await self.analysis_service.run_daily_analysis(user_id)
-
-                if report.status == "completed":
-                    logger.info(f"Daily analysis completed for user {user_id}")
-                    analysis_results.append(
-                        {
-                            "user_id": user_id,
-                            "status": "success",
-                            "report_id": report.id,
-                        }
-                    )
-
-                    # Send notification if available
-                    await self._send_analysis_notification(user_id, report)
-
-                else:
-                    logger.warning(
-                        f"Daily analysis failed for user {user_id}: {report.status}"
-                    )
-                    analysis_results.append(
-                        {
-                            "user_id": user_id,
-                            "status": "failed",
-                            "error": f"Analysis status: {report.status}",
-                        }
-                    )
-
-            except Exception as e:
-                logger.error(f"Failed to run daily analysis for user {user_id}: {e}")
+        for user_id, analysis in analyses.items():
+            if analysis is None:
+                logger.warning(f"Daily analysis failed for user {user_id}")
                 analysis_results.append(
-                    {"user_id": user_id, "status": "error", "error": str(e)}
+                    {
+                        "user_id": user_id,
+                        "status": "failed",
+                        "error": "Analysis could not be generated",
+                    }
                 )
+                continue
+
+            logger.info(f"Daily analysis completed for user {user_id}")
+            analysis_results.append(
+                {"user_id": user_id, "status": "success", "report_id": analysis["id"]}
+            )
+
+            # Send notification if available
+            await self._send_analysis_notification(user_id, analysis)
 
         # Log summary
         successful = len([r for r in analysis_results if r["status"] == "success"])
@@ -177,7 +168,7 @@ class DailyPortfolioAnalysisTask:
         if total > 0:
             await self._send_admin_summary(analysis_results)
 
-    async def _send_analysis_notification(self, user_id: str, report):
+    async def _send_analysis_notification(self, user_id: str, analysis: dict):
         """Send analysis notification to user."""
         if not self.notification_service:
             logger.debug("Notification service not available")
@@ -185,11 +176,13 @@ class DailyPortfolioAnalysisTask:
 
         try:
             # Extract key insights from report
-            summary = self._extract_report_summary(report)
+            summary = self._extract_analysis_summary(analysis)
 
             # Send notification
             await self.notification_service.send_analysis_notification(
-                user_id=user_id, report_date=report.report_date, summary=summary
+                user_id=user_id,
+                report_date=date.fromisoformat(analysis["analysis_date"]),
+                summary=summary,
             )
 
             logger.info(f"Analysis notification sent to user {user_id}")
@@ -220,66 +213,62 @@ class DailyPortfolioAnalysisTask:
         except Exception as e:
             logger.error(f"Failed to send admin summary: {e}")
 
-    def _extract_report_summary(self, report) -> dict:
-        """Extract key summary from analysis report."""
+    def _extract_analysis_summary(self, analysis: dict) -> dict:
+        """Extract key summary from an analysis result."""
         try:
-            import json
-
-            # Parse portfolio summary
-            portfolio_summary = {}
-            if report.portfolio_summary:
-                try:
-                    portfolio_summary = json.loads(report.portfolio_summary)
-                except:
-                    pass
-
-            # Parse recommendations
-            recommendations = []
-            if report.recommendations:
-                try:
-                    recs = json.loads(report.recommendations)
-                    if isinstance(recs, list):
-                        recommendations = [
-                            r.get("description", "") for r in recs[:3]
-                        ]  # Top 3
-                except:
-                    pass
+            metrics = analysis.get("portfolio_metrics") or {}
+            summary_text = analysis.get("analysis_summary", "")
 
             return {
-                "total_value": portfolio_summary.get("total_value", 0),
-                "total_profit": portfolio_summary.get("total_profit", 0),
-                "profit_rate": portfolio_summary.get("profit_rate", 0),
-                "position_count": portfolio_summary.get("position_count", 0),
-                "top_recommendations": recommendations,
-                "ai_insights": report.ai_insights[:200] + "..."
-                if len(report.ai_insights) > 200
-                else report.ai_insights,
+                "total_value": metrics.get("total_value", 0),
+                "total_profit": metrics.get("total_profit", 0),
+                "profit_rate": metrics.get("profit_rate", 0),
+                "position_count": metrics.get("position_count", 0),
+                "top_recommendations": list(analysis.get("recommendations", []))[
+                    :3
+                ],  # Top 3
+                "ai_insights": summary_text[:200] + "..."
+                if len(summary_text) > 200
+                else summary_text,
             }
 
         except Exception as e:
-            logger.error(f"Failed to extract report summary: {e}")
+            logger.error(f"Failed to extract analysis summary: {e}")
             return {"error": "Failed to parse report"}
 
     async def run_manual_analysis(
         self, user_id: str = "default_user", analysis_date: date | None = None
     ) -> dict:
-        """Run manual analysis (for testing or on-demand execution)."""
-        if not self.analysis_service:
+        """Run manual analysis (for testing or on-demand execution).
+
+        Uses the same set-based pass as the scheduled run, restricted to
+        ``user_id``; the report is stored in ``portfolio_analysis`` as a
+        ``manual`` analysis.
+        """
+        if not self.portfolio_analysis_service:
             return {"error": "Analysis service not available"}
 
         try:
             logger.info(f"Running manual analysis for user: {user_id}")
 
-            report = await self.analysis_service.run_daily_analysis(
-                user_id, analysis_date
+            analyses = await self.portfolio_analysis_service.analyze_all_users(
+                analysis_date or date.today(), "manual", user_ids=[user_id]
             )
+            analysis = analyses.get(user_id)
+            if analysis is None:
+                error = (
+                    "Analysis could not be generated"
+                    if user_id in analyses
+                    else "No active positions to analyze"
+                )
+                return {"status": "error", "user_id": user_id, "error": error}
 
             return {
                 "status": "success",
                 "user_id": user_id,
-                "report_id": report.id,
-                "report_status": report.status,
-                "analysis_date": report.report_date.isoformat(),
+                "report_id": analysis["id"],
+                "analysis_type": analysis["analysis_type"],
+                "analysis_date": analysis["analysis_date"],
             }
 
         except Exception as e:
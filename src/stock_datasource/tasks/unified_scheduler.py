@@ -20,6 +20,13 @@ from typing import Any
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from stock_datasource.config.settings import settings
+from stock_datasource.utils.adjusted_prices import register_adjusted_price_jobs
+from stock_datasource.utils.latest_state import (
+    JOB_LATEST_STATE_COMPACTION,
+    register_latest_state_jobs,
+)
+
 logger = logging.getLogger(__name__)
 
 # Job IDs (constants for reschedule / remove)
@@ -27,6 +34,7 @@ JOB_DAILY_SYNC = "unified_daily_sync"
 JOB_WEEKLY_SYNC = "unified_weekly_sync"
 JOB_MONTHLY_SYNC = "unified_monthly_sync"
 JOB_MISSING_CHECK = "unified_missing_check"
+JOB_PAPER_TRADING_VALUATION = "paper_trading_eod_valuation"
 
 # Default configuration values
 _DEFAULTS: dict[str, Any] = {
@@ -131,7 +139,14 @@ class UnifiedScheduler:
         self._load_config()
 
         # Remove existing jobs then re-register
-        for job_id in (JOB_DAILY_SYNC, JOB_WEEKLY_SYNC, JOB_MONTHLY_SYNC, JOB_MISSING_CHECK):
+        for job_id in (
+            JOB_DAILY_SYNC,
+            JOB_WEEKLY_SYNC,
+            JOB_MONTHLY_SYNC,
+            JOB_MISSING_CHECK,
+            JOB_PAPER_TRADING_VALUATION,
+            JOB_LATEST_STATE_COMPACTION,
+        ):
             try:
                 self._scheduler.remove_job(job_id)
             except Exception:
@@ -270,6 +285,29 @@ class UnifiedScheduler:
             chk_minute,
         )
 
+        # --- Paper trading end-of-day valuation (after the daily sync) ---
+        valuation_time = settings.PAPER_TRADING_VALUATION_TIME
+        val_hour, val_minute = map(int, valuation_time.split(":"))
+        self._scheduler.add_job(
+            self._paper_trading_valuation_job,
+            CronTrigger(hour=val_hour, minute=val_minute, day_of_week="mon-fri"),
+            id=JOB_PAPER_TRADING_VALUATION,
+            name="Paper trading end-of-day valuation",
+            replace_existing=True,
+        )
+        logger.info(
+            "Registered paper trading valuation job: %s %s:%02d (mon-fri)",
+            JOB_PAPER_TRADING_VALUATION,
+            val_hour,
+            val_minute,
+        )
+
+        # --- Latest-state compaction (merges serving tables between syncs) ---
+        register_latest_state_jobs(self._scheduler)
+
+        # --- fact_adjusted_daily backfill (bars missed by incremental refresh) ---
+        register_adjusted_price_jobs(self._scheduler)
+
     # ------------------------------------------------------------------
     # Job implementations
     # ------------------------------------------------------------------
@@ -441,6 +479,28 @@ class UnifiedScheduler:
         except Exception as exc:
             logger.error("Monthly sync job failed: %s", exc, exc_info=True)
 
+    def _paper_trading_valuation_job(self) -> None:
+        """Mark all paper trading accounts to market and snapshot them in bulk."""
+        from ..core.trade_calendar import trade_calendar_service
+
+        if not trade_calendar_service.is_trading_day(date.today()):
+            logger.info("Paper trading valuation skipped: not a trading day")
+            return
+
+        started = _time.time()
+        try:
+            from ..modules.paper_trading.service import PaperTradingService
+
+            result = PaperTradingService().run_end_of_day_valuation()
+            logger.info(
+                "Paper trading valuation done: %d accounts, %d positions in %.1fs",
+                result["accounts"],
+                result["positions"],
+                _time.time() - started,
+            )
+        except Exception as exc:
+            logger.error("Paper trading valuation failed: %s", exc, exc_info=True)
+
     def _missing_check_job(self) -> None:
         """Execute the daily missing-data check and generate a report.
 
@@ -0,0 +1,460 @@
+"""Adjusted (qfq/hfq) price series.
+
+Two pieces:
+
+- ``asof_adjust`` / ``adjust_records``: vectorized as-of application of
+  adjustment factors to a price frame (``pd.merge_asof`` per ``ts_code``),
+  used wherever raw bars and factors are already in memory.
+- ``AdjustedPriceStore``: the ``fact_adjusted_daily`` ClickHouse table with
+  raw OHLC, the as-of adjustment factor and backward-adjusted (hfq) OHLC per
+  bar. hfq prices never change once written, so the table is maintained
+  incrementally: the adj factor and daily bar plugins call ``refresh`` with
+  the dates they just loaded (whichever arrives second completes the join),
+  and a weekly ``backfill`` job fills any trade date whose row count lags the
+  raw daily table. Bars without a known factor are stored with
+  ``adj_factor = 0`` and no hfq prices. Readers only trust the store when it
+  has as many bars as the raw table for the requested range.
+
+Both derive prices from the same base factor: the latest factor within the
+requested range. qfq is ``price * factor / base`` and hfq is
+``price * factor``; bars before the first known factor use the base factor
+(ratio 1 for qfq), and a range without factors is returned unadjusted.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+ADJUSTED_TABLE = "fact_adjusted_daily"
+
+# market -> (daily table, factor table, factor column)
+_MARKET_SOURCES = {
+    "a_share": ("ods_daily", "ods_adj_factor", "adj_factor"),
+    "hk_stock": ("ods_hk_daily", "ods_hk_adjfactor", "cum_adjfactor"),
+}
+
+# market -> filter selecting its rows in the (shared) adjusted table
+_MARKET_FILTERS = {
+    "a_share": "NOT endsWith(ts_code, '.HK')",
+    "hk_stock": "endsWith(ts_code, '.HK')",
+}
+
+JOB_ADJUSTED_PRICE_BACKFILL = "adjusted_price_backfill"
+
+# Trade dates rewritten per INSERT ... SELECT during a backfill
+BACKFILL_CHUNK_DATES = 20
+
+_CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {ADJUSTED_TABLE} (
+    `ts_code` LowCardinality(String),
+    `trade_date` Date,
+    `open` Nullable(Float64),
+    `high` Nullable(Float64),
+    `low` Nullable(Float64),
+    `close` Nullable(Float64),
+    `pct_chg` Nullable(Float64),
+    `vol` Nullable(Float64),
+    `amount` Nullable(Float64),
+    `adj_factor` Float64,
+    `hfq_open` Nullable(Float64),
+    `hfq_high` Nullable(Float64),
+    `hfq_low` Nullable(Float64),
+    `hfq_close` Nullable(Float64),
+    `version` UInt32,
+    `_ingested_at` DateTime
+) ENGINE = ReplacingMergeTree(version)
+PARTITION BY toYYYYMM(trade_date)
+ORDER BY (ts_code, trade_date)
+"""
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    """Parse trade dates given as YYYYMMDD, YYYY-MM-DD or date objects."""
+    text = values.astype(str).str[:10].str.replace("-", "")
+    return pd.to_datetime(text, format="%Y%m%d")
+
+
+def asof_adjust(
+    prices: pd.DataFrame,
+    factors: pd.DataFrame,
+    adjust: str,
+    factor_column: str = "adj_factor",
+    columns: list[str] | None = None,
+    decimals: int | None = 2,
+) -> pd.DataFrame:
+    """Apply adjustment factors to a price frame with as-of semantics.
+
+    Each bar uses the factor of the latest factor date on or before it; bars
+    before the first known factor use the latest factor (ratio 1 for qfq).
+    Callers pass the factors of the requested range, so the latest factor is
+    the same base ``AdjustedPriceStore.get_adjusted`` divides by.
+
+    Args:
+        prices: Bars with ``trade_date`` (and optionally ``ts_code``).
+        factors: Factors with ``trade_date``, ``factor_column`` (and
+            optionally ``ts_code``).
+        adjust: ``qfq`` (forward, divided by the latest factor) or ``hfq``
+            (backward, multiplied by the factor). Anything else is a no-op.
+        factor_column: Factor column name in ``factors``.
+        columns: Price columns to adjust (default OHLC).
+        decimals: Round adjusted prices (``None`` keeps full precision).
+
+    Returns:
+        A copy of ``prices`` in its original row order with adjusted columns.
+    """
+    if adjust not in ("qfq", "hfq") or prices.empty or factors is None or factors.empty:
+        return prices
+
+    columns = [c for c in (columns or PRICE_COLUMNS) if c in prices.columns]
+    by = (
+        "ts_code"
+        if "ts_code" in prices.columns and "ts_code" in factors.columns
+        else None
+    )
+
+    left = prices.copy()
+    left["_row"] = range(len(left))
+    left["_date"] = _to_datetime(left["trade_date"])
+
+    right = factors[[c for c in (by, "trade_date", factor_column) if c]].copy()
+    right["_date"] = _to_datetime(right["trade_date"])
+    right["_factor"] = pd.to_numeric(right[factor_column], errors="coerce")
+    right = (
+        right.dropna(subset=["_factor"])
+        .drop(columns=["trade_date", factor_column])
+        .sort_values("_date")
+    )
+    if right.empty:
+        return prices
+
+    merged = (
+        pd.merge_asof(
+            left.sort_values("_date"), right, on="_date", by=by, direction="backward"
+        )
+        .sort_values("_row")
+        .reset_index(drop=True)
+    )
+
+    if by:
+        latest_factor = merged[by].map(right.groupby(by)["_factor"].last())
+    else:
+        latest_factor = pd.Series(right["_factor"].iloc[-1], index=merged.index)
+    factor = merged["_factor"].fillna(latest_factor)
+
+    ratio = factor / latest_factor if adjust == "qfq" else factor
+    ratio = ratio.fillna(1.0).to_numpy()
+
+    result = prices.copy()
+    for column in columns:
+        values = pd.to_numeric(result[column], errors="coerce") * ratio
+        result[column] = values.round(decimals) if decimals is not None else values
+    return result
+
+
+def adjust_records(
+    records: list[dict],
+    factors: list[dict],
+    adjust: str,
+    factor_column: str = "adj_factor",
+) -> list[dict]:
+    """``asof_adjust`` for lists of row dicts (plugin service results)."""
+    if not records or not factors or adjust not in ("qfq", "hfq"):
+        return records
+    prices = pd.DataFrame(records)
+    factor_df = pd.DataFrame(factors)
+    if factor_column not in factor_df.columns:
+        return records
+    factor_df = factor_df.drop(columns=["ts_code"], errors="ignore")
+    adjusted = asof_adjust(
+        prices.drop(columns=["ts_code"], errors="ignore"),
+        factor_df,
+        adjust,
+        factor_column=factor_column,
+    )
+    for record, values in zip(
+        records, adjusted[[c for c in PRICE_COLUMNS if c in adjusted]].to_dict("records")
+    ):
+        for column, value in values.items():
+            # Keep missing/zero prices as they were
+            if record.get(column) and pd.notna(value):
+                record[column] = float(value)
+    return records
+
+
+def _iso_dates(trade_dates: list[Any]) -> list[str]:
+    return sorted(_to_datetime(pd.Series(trade_dates)).dt.strftime("%Y-%m-%d").unique())
+
+
+class AdjustedPriceStore:
+    """Maintained hfq price table with qfq derived on read."""
+
+    def __init__(self, db=None):
+        self._db = db
+        self._table_ready = False
+
+    def _get_db(self):
+        if self._db is None:
+            from stock_datasource.models.database import db_client
+
+            self._db = db_client
+        return self._db
+
+    def ensure_table(self) -> None:
+        if not self._table_ready:
+            self._get_db().create_table(_CREATE_TABLE_SQL)
+            self._table_ready = True
+
+    def refresh(self, market: str, trade_dates: list[Any]) -> None:
+        """Recompute adjusted bars for ``trade_dates`` (as-of joined in ClickHouse).
+
+        Args:
+            market: ``a_share`` or ``hk_stock``.
+            trade_dates: Bar dates to (re)write.
+        """
+        if not trade_dates:
+            return
+        daily_table, factor_table, factor_column = _MARKET_SOURCES[market]
+        self.ensure_table()
+
+        iso_dates = _iso_dates(trade_dates)
+        dates = ", ".join(f"'{d}'" for d in iso_dates)
+        months = ", ".join(sorted({d[:7].replace("-", "") for d in iso_dates}))
+        # Factors are published for every trading day, so the partition
+        # before the first date is enough lookback for the as-of match
+        factor_start = (pd.Timestamp(iso_dates[0]).to_period("M") - 1).start_time
+        hfq_sql = ", ".join(
+            f"if(a.factor > 0, d.{c} * a.factor, NULL)" for c in PRICE_COLUMNS
+        )
+        query = f"""
+            INSERT INTO {ADJUSTED_TABLE}
+            SELECT
+                d.ts_code, d.trade_date,
+                d.open, d.high, d.low, d.close, d.pct_chg, d.vol, d.amount,
+                ifNull(a.factor, 0) AS adj_factor,
+                {hfq_sql},
+                %(version)s AS version, now() AS _ingested_at
+            FROM (
+                SELECT * FROM {daily_table} FINAL
+                WHERE toYYYYMM(trade_date) IN ({months})
+                AND trade_date IN ({dates})
+            ) d
+            ASOF LEFT JOIN (
+                SELECT ts_code, trade_date, {factor_column} AS factor
+                FROM {factor_table} FINAL
+                WHERE {factor_column} IS NOT NULL
+                AND trade_date >= '{factor_start:%Y-%m-%d}'
+                AND trade_date <= '{iso_dates[-1]}'
+            ) a
+            ON d.ts_code = a.ts_code AND d.trade_date >= a.trade_date
+        """
+        self._get_db().execute(query, {"version": int(datetime.now().timestamp())})
+        logger.info(
+            f"Refreshed {ADJUSTED_TABLE} for {market}: {len(trade_dates)} dates"
+        )
+
+    def on_data_loaded(self, market: str, data: pd.DataFrame) -> None:
+        """Incremental maintenance hook for the adj factor and daily plugins."""
+        try:
+            if data is None or data.empty or "trade_date" not in data.columns:
+                return
+            self.refresh(market, data["trade_date"].unique().tolist())
+        except Exception as e:
+            logger.warning(f"Failed to refresh adjusted prices for {market}: {e}")
+
+    def missing_dates(self, market: str, since: str | None = None) -> list[str]:
+        """Trade dates where the store has fewer bars than the raw daily table."""
+        daily_table, _, _ = _MARKET_SOURCES[market]
+        self.ensure_table()
+        date_filter = f"WHERE trade_date >= '{_iso_dates([since])[0]}'" if since else ""
+        store_filter = f"{date_filter} AND" if date_filter else "WHERE"
+        df = self._get_db().execute_query(
+            f"""
+            SELECT toString(d.trade_date) AS trade_date
+            FROM (
+                SELECT trade_date, count() AS n FROM {daily_table} FINAL
+                {date_filter}
+                GROUP BY trade_date
+            ) d
+            LEFT JOIN (
+                SELECT trade_date, count() AS n FROM {ADJUSTED_TABLE} FINAL
+                {store_filter} {_MARKET_FILTERS[market]}
+                GROUP BY trade_date
+            ) s ON d.trade_date = s.trade_date
+            WHERE s.n < d.n
+            ORDER BY trade_date
+            """
+        )
+        return [] if df is None or df.empty else df["trade_date"].tolist()
+
+    def backfill(self, market: str, since: str | None = None) -> int:
+        """Write every trade date the store is missing bars for.
+
+        Covers history that predates the store as well as bars whose factor
+        or daily rows arrived without the other. Returns the dates refreshed.
+        """
+        dates = self.missing_dates(market, since)
+        for i in range(0, len(dates), BACKFILL_CHUNK_DATES):
+            self.refresh(market, dates[i : i + BACKFILL_CHUNK_DATES])
+        if dates:
+            logger.info(f"Backfilled {ADJUSTED_TABLE} for {market}: {len(dates)} dates")
+        return len(dates)
+
+    def backfill_all(self) -> dict[str, int]:
+        """``backfill`` every market; failures are logged per market."""
+        results = {}
+        for market in _MARKET_SOURCES:
+            try:
+                results[market] = self.backfill(market)
+            except Exception as e:
+                logger.warning(f"Adjusted price backfill failed for {market}: {e}")
+        return results
+
+    def get_adjusted(
+        self,
+        ts_code: str,
+        start_date: str,
+        end_date: str,
+        adjust: str = "qfq",
+    ) -> pd.DataFrame:
+        """Adjusted bars for one code.
+
+        Returns an empty frame unless the store holds every raw bar of the
+        range, so callers fall back to adjusting raw bars instead of serving
+        a truncated series.
+        """
+        market = "hk_stock" if ts_code.upper().endswith(".HK") else "a_share"
+        daily_table, factor_table, factor_column = _MARKET_SOURCES[market]
+        if adjust == "hfq":
+            adjusted = "s.hfq_{c}"
+            fallback = "s.{c} * base.factor"
+        else:
+            adjusted = "s.hfq_{c} / base.factor"
+            fallback = "s.{c}"
+        price_sql = ", ".join(
+            f"round(if(base.factor > 0, if(s.adj_factor > 0, "
+            f"{adjusted.format(c=c)}, {fallback.format(c=c)}), s.{c}), 2) AS {c}"
+            for c in PRICE_COLUMNS
+        )
+        query = f"""
+            SELECT s.trade_date AS trade_date, {price_sql},
+                   s.vol AS vol, s.amount AS amount, s.pct_chg AS pct_chg,
+                   raw.n AS raw_bars
+            FROM (
+                SELECT * FROM {ADJUSTED_TABLE} FINAL
+                WHERE ts_code = %(code)s
+                AND trade_date BETWEEN %(start)s AND %(end)s
+            ) s
+            CROSS JOIN (
+                SELECT argMax({factor_column}, trade_date) AS factor
+                FROM {factor_table} FINAL
+                WHERE ts_code = %(code)s
+                AND trade_date BETWEEN %(start)s AND %(end)s
+                AND {factor_column} IS NOT NULL
+            ) base
+            CROSS JOIN (
+                SELECT count() AS n FROM {daily_table} FINAL
+                WHERE ts_code = %(code)s
+                AND trade_date BETWEEN %(start)s AND %(end)s
+            ) raw
+            ORDER BY trade_date
+        """
+        df = self._get_db().execute_query(
+            query,
+            {
+                "code": ts_code,
+                "start": _iso_dates([start_date])[0],
+                "end": _iso_dates([end_date])[0],
+            },
+        )
+        if df is None or df.empty:
+            return pd.DataFrame()
+        if len(df) < int(df["raw_bars"].iloc[0]):
+            logger.debug(
+                f"{ADJUSTED_TABLE} incomplete for {ts_code}: "
+                f"{len(df)}/{int(df['raw_bars'].iloc[0])} bars"
+            )
+            return pd.DataFrame()
+        return df.drop(columns=["raw_bars"])
+
+    def load_a_share_window(self, days: int) -> pd.DataFrame:
+        """hfq close for all A-shares over the last ``days`` days.
+
+        Returns ``ts_code, trade_date, close, pct_chg, adj_factor`` where
+        ``close`` is already backward-adjusted (ratios between bars match
+        forward-adjusted prices) and ``adj_factor`` is 1. Empty when the
+        store has fewer bars in the window than ``ods_daily``.
+        """
+        db = self._get_db()
+        counts = db.execute_query(
+            f"""
+            SELECT
+                (SELECT count() FROM {ADJUSTED_TABLE} FINAL
+                 WHERE trade_date >= subtractDays(today(), {int(days)})
+                 AND {_MARKET_FILTERS["a_share"]}) AS stored,
+                (SELECT count() FROM ods_daily FINAL
+                 WHERE trade_date >= subtractDays(today(), {int(days)})) AS raw
+            """
+        )
+        if counts is None or counts.empty:
+            return pd.DataFrame()
+        stored, raw = int(counts.iloc[0]["stored"]), int(counts.iloc[0]["raw"])
+        if stored == 0 or stored < raw:
+            logger.debug(f"{ADJUSTED_TABLE} window incomplete: {stored}/{raw} bars")
+            return pd.DataFrame()
+        window = (
+            f"trade_date >= subtractDays(today(), {int(days)}) "
+            f"AND {_MARKET_FILTERS['a_share']}"
+        )
+        # Bars before a code's first known factor use its latest factor
+        return db.execute_query(
+            f"""
+            SELECT s.ts_code AS ts_code, toString(s.trade_date) AS trade_date,
+                   if(s.adj_factor > 0, s.hfq_close,
+                      s.close * if(base.factor > 0, base.factor, 1)) AS close,
+                   s.pct_chg AS pct_chg, 1.0 AS adj_factor
+            FROM (SELECT * FROM {ADJUSTED_TABLE} FINAL WHERE {window}) s
+            LEFT JOIN (
+                SELECT ts_code,
+                       argMaxIf(adj_factor, trade_date, adj_factor > 0) AS factor
+                FROM {ADJUSTED_TABLE} FINAL
+                WHERE {window}
+                GROUP BY ts_code
+            ) base ON s.ts_code = base.ts_code
+            ORDER BY ts_code, trade_date
+            """
+        )
+
+
+_adjusted_price_store: AdjustedPriceStore | None = None
+
+
+def get_adjusted_price_store() -> AdjustedPriceStore:
+    """Get the process-wide adjusted price store."""
+    global _adjusted_price_store
+    if _adjusted_price_store is None:
+        _adjusted_price_store = AdjustedPriceStore()
+    return _adjusted_price_store
+
+
+def register_adjusted_price_jobs(scheduler) -> None:
+    """Register the weekly ``fact_adjusted_daily`` backfill (Sunday 03:00)."""
+    from apscheduler.triggers.cron import CronTrigger
+
+    scheduler.add_job(
+        _run_backfill,
+        CronTrigger(day_of_week="sun", hour=3, minute=0),
+        id=JOB_ADJUSTED_PRICE_BACKFILL,
+        name="Adjusted price backfill",
+        replace_existing=True,
+    )
+    logger.info("Registered adjusted price backfill job")
+
+
+def _run_backfill() -> None:
+    get_adjusted_price_store().backfill_all()
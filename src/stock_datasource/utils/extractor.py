@@ -415,7 +415,7 @@ class TuShareExtractor(BaseTuShareExtractor):
         from stock_datasource.models.database import db_client
 
         # Discover plugins if not already done
-        if not plugin_manager.plugins:
+        if not plugin_manager.list_plugins():
             plugin_manager.discover_plugins()
 
         # Parse trade_date to datetime.date for schedule checking
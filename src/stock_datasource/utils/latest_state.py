@@ -0,0 +1,371 @@
+"""Latest-state serving layer for ReplacingMergeTree tables.
+
+ReplacingMergeTree only deduplicates on merge, so reads of the latest row
+per key pay ``FINAL`` or ``argMax(..., version)`` on every query. This module
+keeps a compacted copy of the hottest tables and routes reads to it:
+
+- ``LatestStateSpec`` declares a table's dedup keys and version column.
+  Tables whose own sorting key is the dedup key (``in_place``) are compacted
+  where they are; others get a ``<table>_latest`` ReplacingMergeTree fed on
+  ingest by a materialized view.
+- ``LatestStateManager.compact`` is the background merge policy: it reads
+  ``get_partition_info`` and runs ``optimize_table`` only on partitions that
+  have more than one active part.
+- ``LatestStateManager.source`` returns the FROM clause for a read: the
+  serving table without ``FINAL`` while it is known to be fully merged,
+  ``FINAL`` otherwise. By default the merged state is re-checked on every
+  read; a ``check_interval`` window is opt-in, because inside it reads skip
+  ``FINAL`` even while other processes insert.
+
+``strict`` specs (auth tables, paper trading positions) are compacted but
+always read with ``FINAL``, which is then close to free because every
+partition is a single part. Positions are strict because every read feeds a
+read-modify-write; a superseded row would resurrect a closed position.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from stock_datasource.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_LATEST_STATE_COMPACTION = "latest_state_compaction"
+
+
+@dataclass(frozen=True)
+class LatestStateSpec:
+    """Dedup keys and version column of a latest-state table."""
+
+    table: str
+    keys: tuple[str, ...]
+    version: str
+    in_place: bool = False
+    strict: bool = False
+
+    @property
+    def serving_table(self) -> str:
+        return self.table if self.in_place else f"{self.table}_latest"
+
+    @property
+    def view(self) -> str:
+        return f"{self.table}_latest_mv"
+
+
+LATEST_STATE_SPECS: dict[str, LatestStateSpec] = {
+    spec.table: spec
+    for spec in (
+        LatestStateSpec("fact_fina_indicator", ("ts_code", "end_date"), "_ingested_at"),
+        LatestStateSpec(
+            "paper_trading_positions",
+            ("user_id", "account_id", "ts_code"),
+            "last_update",
+            in_place=True,
+            strict=True,
+        ),
+        LatestStateSpec("users", ("email", "id"), "updated_at", in_place=True, strict=True),
+        LatestStateSpec(
+            "mcp_api_keys", ("user_id", "id"), "updated_at", in_place=True, strict=True
+        ),
+    )
+}
+
+# name -> (table, legacy query, routed query); {source} is the routed FROM clause
+HOT_QUERIES: dict[str, tuple[str, str, str]] = {
+    "fina_indicator_latest": (
+        "fact_fina_indicator",
+        """SELECT ts_code, end_date,
+                  argMax(roe, _ingested_at) AS roe,
+                  argMax(revenue_yoy, _ingested_at) AS revenue_yoy,
+                  argMax(netprofit_yoy, _ingested_at) AS netprofit_yoy
+           FROM fact_fina_indicator
+           WHERE end_date >= '20200101'
+           GROUP BY ts_code, end_date""",
+        """SELECT ts_code, end_date, roe, revenue_yoy, netprofit_yoy
+           FROM {source}
+           WHERE end_date >= '20200101'""",
+    ),
+    "paper_trading_positions": (
+        "paper_trading_positions",
+        "SELECT * FROM paper_trading_positions FINAL WHERE quantity > 0",
+        "SELECT * FROM {source} WHERE quantity > 0",
+    ),
+}
+
+
+@dataclass
+class _TableState:
+    ready: bool = False
+    compacted: bool = False
+    checked_at: float = 0.0
+
+
+class LatestStateManager:
+    """Maintains serving tables and routes reads to them."""
+
+    def __init__(
+        self,
+        db=None,
+        specs: dict[str, LatestStateSpec] | None = None,
+        check_interval: float = 0.0,
+        max_partitions_per_run: int = 20,
+    ):
+        self._db = db
+        self.specs = specs if specs is not None else LATEST_STATE_SPECS
+        self.check_interval = check_interval
+        self.max_partitions_per_run = max_partitions_per_run
+        self._states: dict[str, _TableState] = {}
+        self._lock = threading.Lock()
+
+    def _get_db(self):
+        if self._db is None:
+            from stock_datasource.models.database import db_client
+
+            self._db = db_client
+        return self._db
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def ensure(self, spec: LatestStateSpec) -> bool:
+        """Create the serving table + feeding view, or resync them to the source.
+
+        The view lists the source columns explicitly, so a column added to or
+        changed on the source (``add_column`` / ``modify_column``) is applied
+        to the serving table and the view is rebuilt.
+
+        Returns True when the serving table is usable.
+        """
+        db = self._get_db()
+        if not db.table_exists(spec.table):
+            return False
+        if spec.in_place:
+            return True
+
+        columns = self._columns(spec.table)
+        if db.table_exists(spec.serving_table):
+            if self._columns(spec.serving_table) != columns or not db.table_exists(
+                spec.view
+            ):
+                self._rebuild(spec, columns)
+            return True
+
+        keys = ", ".join(spec.keys)
+        db.create_table(
+            f"CREATE TABLE IF NOT EXISTS {spec.serving_table} AS {spec.table} "
+            f"ENGINE = ReplacingMergeTree({spec.version}) ORDER BY ({keys})"
+        )
+        self._create_view(spec, columns)
+        logger.info(f"Created latest-state table {spec.serving_table} for {spec.table}")
+        return True
+
+    def _columns(self, table: str) -> dict[str, str]:
+        """``{column: type}`` of ``table`` in position order."""
+        return {
+            c["column_name"]: c["data_type"]
+            for c in self._get_db().get_table_schema(table)
+        }
+
+    def _create_view(self, spec: LatestStateSpec, columns: dict[str, str]) -> None:
+        db = self._get_db()
+        column_list = ", ".join(f"`{name}`" for name in columns)
+        db.create_table(
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS {spec.view} "
+            f"TO {spec.serving_table} AS SELECT {column_list} FROM {spec.table}"
+        )
+        # Rows inserted between the view and the backfill are written twice,
+        # which the ReplacingMergeTree collapses.
+        db.execute(
+            f"INSERT INTO {spec.serving_table} ({column_list}) "
+            f"SELECT {column_list} FROM {spec.table}"
+        )
+
+    def _rebuild(self, spec: LatestStateSpec, columns: dict[str, str]) -> None:
+        """Align the serving table with the source schema and recreate the view."""
+        db = self._get_db()
+        db.execute(f"DROP VIEW IF EXISTS {spec.view}")
+        serving = self._columns(spec.serving_table)
+        for name, data_type in columns.items():
+            if name not in serving:
+                db.add_column(spec.serving_table, f"`{name}` {data_type}")
+            elif serving[name] != data_type:
+                db.modify_column(spec.serving_table, f"`{name}`", data_type)
+        for name in serving.keys() - columns.keys():
+            db.execute(
+                f"ALTER TABLE {spec.serving_table} DROP COLUMN IF EXISTS `{name}`"
+            )
+        self._create_view(spec, columns)
+        logger.info(f"Rebuilt latest-state view {spec.view} after a schema change")
+
+    def pending_partitions(self, spec: LatestStateSpec) -> list[dict[str, Any]]:
+        """Partitions of the serving table with more than one active part."""
+        partitions = self._get_db().get_partition_info(spec.serving_table)
+        return [p for p in partitions if int(p.get("parts") or 0) > 1]
+
+    def compact(self, tables: list[str] | None = None) -> dict[str, dict[str, Any]]:
+        """Merge unmerged partitions of the serving tables.
+
+        Args:
+            tables: Source tables to compact (default: all declared).
+
+        Returns:
+            ``{table: {"ready", "optimized", "pending"}}``
+        """
+        db = self._get_db()
+        report: dict[str, dict[str, Any]] = {}
+        for name in tables or list(self.specs):
+            spec = self.specs[name]
+            try:
+                ready = self.ensure(spec)
+                optimized: list[str] = []
+                pending: list[dict[str, Any]] = []
+                if ready:
+                    pending = self.pending_partitions(spec)
+                    for part in pending[: self.max_partitions_per_run]:
+                        db.optimize_table(
+                            spec.serving_table,
+                            final=True,
+                            partition_id=str(part["partition_id"]),
+                        )
+                        optimized.append(str(part["partition"]))
+                    pending = pending[self.max_partitions_per_run :]
+                self._set_state(name, ready=ready, compacted=ready and not pending)
+                report[name] = {
+                    "ready": ready,
+                    "optimized": optimized,
+                    "pending": len(pending),
+                }
+            except Exception as e:
+                logger.warning(f"Latest-state compaction failed for {name}: {e}")
+                self._set_state(name, ready=False, compacted=False)
+                report[name] = {"ready": False, "error": str(e)}
+        return report
+
+    def mark_dirty(self, table: str) -> None:
+        """Record an in-process write; reads use FINAL until the next check."""
+        with self._lock:
+            state = self._states.get(table)
+            if state is not None:
+                state.compacted = False
+                state.checked_at = 0.0
+
+    def on_data_loaded(self, plugin_name: str, table_name: str) -> None:
+        """Plugin load listener (see ``BasePlugin.add_load_listener``)."""
+        if table_name in self.specs:
+            self.mark_dirty(table_name)
+
+    def _set_state(self, table: str, ready: bool, compacted: bool) -> _TableState:
+        with self._lock:
+            state = _TableState(ready=ready, compacted=compacted, checked_at=time.time())
+            self._states[table] = state
+            return state
+
+    # ------------------------------------------------------------------
+    # Read routing
+    # ------------------------------------------------------------------
+
+    def _state(self, spec: LatestStateSpec) -> _TableState:
+        state = self._states.get(spec.table)
+        if state is not None and time.time() - state.checked_at < self.check_interval:
+            return state
+        db = self._get_db()
+        try:
+            ready = spec.in_place or db.table_exists(spec.serving_table)
+            compacted = ready and not self.pending_partitions(spec)
+        except Exception as e:
+            logger.debug(f"Latest-state check failed for {spec.table}: {e}")
+            ready = spec.in_place
+            compacted = False
+        return self._set_state(spec.table, ready=ready, compacted=compacted)
+
+    def source(self, table: str) -> str | None:
+        """FROM clause serving the latest row per key of ``table``.
+
+        Returns None when a serving table has not been built yet; callers
+        then keep their ``argMax`` / ``FINAL`` query on the source table.
+        """
+        spec = self.specs.get(table)
+        if spec is None:
+            return f"{table} FINAL"
+        state = self._state(spec)
+        if not state.ready:
+            return f"{table} FINAL" if spec.in_place else None
+        if state.compacted and not spec.strict:
+            return spec.serving_table
+        return f"{spec.serving_table} FINAL"
+
+    # ------------------------------------------------------------------
+    # Benchmark
+    # ------------------------------------------------------------------
+
+    def benchmark(self, repeat: int = 5) -> list[dict[str, Any]]:
+        """Time ``HOT_QUERIES`` on the source table vs the routed table.
+
+        Returns one row per query with median milliseconds and row counts.
+        """
+        db = self._get_db()
+        results = []
+        for name, (table, legacy_sql, routed_sql) in HOT_QUERIES.items():
+            source = self.source(table)
+            if source is None:
+                results.append({"query": name, "skipped": "serving table not built"})
+                continue
+            row: dict[str, Any] = {"query": name, "source": source}
+            for label, sql in (("legacy", legacy_sql), ("routed", routed_sql.format(source=source))):
+                timings = []
+                rows = 0
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    rows = len(db.execute(sql))
+                    timings.append((time.perf_counter() - t0) * 1000)
+                timings.sort()
+                row[f"{label}_ms"] = round(timings[len(timings) // 2], 2)
+                row[f"{label}_rows"] = rows
+            results.append(row)
+        return results
+
+
+def register_latest_state_jobs(scheduler) -> None:
+    """Register the background compaction job with APScheduler."""
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    scheduler.add_job(
+        _run_compaction,
+        IntervalTrigger(minutes=settings.LATEST_STATE_COMPACTION_MINUTES),
+        id=JOB_LATEST_STATE_COMPACTION,
+        name="Latest-state compaction",
+        replace_existing=True,
+    )
+    logger.info("Registered latest-state compaction job")
+
+
+def _run_compaction() -> None:
+    report = get_latest_state_manager().compact()
+    optimized = {t: r["optimized"] for t, r in report.items() if r.get("optimized")}
+    if optimized:
+        logger.info(f"Latest-state compaction merged partitions: {optimized}")
+
+
+_latest_state_manager: LatestStateManager | None = None
+
+
+def get_latest_state_manager() -> LatestStateManager:
+    """Get the process-wide latest-state manager."""
+    global _latest_state_manager
+    if _latest_state_manager is None:
+        from stock_datasource.core.base_plugin import add_load_listener
+
+        _latest_state_manager = LatestStateManager(
+            check_interval=settings.LATEST_STATE_CHECK_INTERVAL
+        )
+        add_load_listener(_latest_state_manager.on_data_loaded)
+    return _latest_state_manager
+
+
+def latest_source(table: str) -> str | None:
+    """Shortcut for ``get_latest_state_manager().source(table)``."""
+    return get_latest_state_manager().source(table)
@@ -349,6 +349,11 @@ class DataLoader:
             # Force optimization
             self.db.optimize_table(table_name, final=True)
 
+            # Whole dates may be gone; the next missing-data check re-scans
+            from stock_datasource.modules.datamanage.coverage import get_coverage_engine
+
+            get_coverage_engine().invalidate(table_name)
+
             stats = {
                 "table_name": table_name,
                 "cleanup_date": datetime.now(),
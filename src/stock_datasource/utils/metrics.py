@@ -0,0 +1,476 @@
+"""Process-wide metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms are declared once at module level and
+updated in-process without I/O::
+
+    QUERIES = registry.counter("clickhouse_queries_total", "Queries run", ("method", "status"))
+    QUERIES.inc(method="execute", status="ok")
+
+The API server, ``TaskWorker`` processes and their plugin subprocesses each
+hold their own registry. To aggregate them, every process periodically
+writes an atomic JSON snapshot of its samples to ``METRICS_MULTIPROC_DIR``
+(one file per hostname and pid, as the backend and worker containers share
+the directory but not a pid namespace). ``collect()`` merges all snapshots:
+counters and histograms are summed, gauges are summed, maxed or kept per
+process depending on their ``multiprocess_mode``. Snapshots of processes
+that have exited are folded into ``archive.json`` (counters and histograms
+only) so totals never go backwards when short-lived subprocesses come and
+go. Liveness is checked by pid for this host's processes; for snapshots of
+other hosts it falls back to the file's mtime, which each process refreshes
+on every flush interval.
+"""
+
+import json
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import weakref
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from stock_datasource.config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+_GAUGE_MODES = ("sum", "max", "all")
+_ARCHIVE_FILE = "archive.json"
+# Heartbeats missed before another host's snapshot is treated as exited
+_STALE_INTERVALS = 12
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labelnames: Sequence[str]):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _labels(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def describe(self) -> dict[str, Any]:
+        return {"type": self.kind, "help": self.help, "labelnames": list(self.labelnames)}
+
+    def samples(self) -> list[list[Any]]:
+        with self._registry._lock:
+            return [[list(k), v if not isinstance(v, list) else list(v)] for k, v in self._values.items()]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._labels(labels)
+        with self._registry._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry._touch()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, registry, name, help, labelnames, multiprocess_mode: str = "sum"):
+        super().__init__(registry, name, help, labelnames)
+        if multiprocess_mode not in _GAUGE_MODES:
+            raise ValueError(f"multiprocess_mode must be one of {_GAUGE_MODES}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def describe(self) -> dict[str, Any]:
+        return {**super().describe(), "mode": self.multiprocess_mode}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._registry._lock:
+            self._values[key] = float(value)
+        self._registry._touch()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._registry._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry._touch()
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution; stored as ``[bucket counts..., +Inf, sum]``."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labelnames, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def describe(self) -> dict[str, Any]:
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._registry._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+        self._registry._touch()
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the ``with`` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+class MetricsRegistry:
+    """Registry of metrics for this process, aggregated across processes on collect."""
+
+    def __init__(self, multiproc_dir: Path | str | None = None, flush_interval: float = 5.0):
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.flush_interval = flush_interval
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._thread: threading.Thread | None = None
+        self.host = socket.gethostname()
+        self._owns_snapshot = False
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(
+                after_in_child=lambda: ref() is not None and ref()._reset_after_fork()
+            )
+
+    def _reset_after_fork(self) -> None:
+        # A forked child starts with empty samples so the parent's values,
+        # which the parent reports itself, are not counted twice.
+        self._lock = threading.RLock()
+        self._thread = None
+        self._dirty = False
+        self._owns_snapshot = False
+        for metric in self._metrics.values():
+            metric._values = {}
+
+    # ------------------------------------------------------------------
+    # Declaration
+    # ------------------------------------------------------------------
+
+    def _register(self, cls, name: str, *args, **kwargs) -> Any:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, cls):
+                    raise ValueError(f"Metric {name} already registered as {existing.kind}")
+                return existing
+            metric = cls(self, name, *args, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(
+        self, name: str, help: str, labelnames: Sequence[str] = (), multiprocess_mode: str = "sum"
+    ) -> Gauge:
+        return self._register(Gauge, name, help, labelnames, multiprocess_mode=multiprocess_mode)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict[str, Any]:
+        """Samples of this process only."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            m.name: {**m.describe(), "samples": m.samples()}
+            for m in metrics
+        }
+
+    def _touch(self) -> None:
+        self._dirty = True
+        if self.multiproc_dir is None:
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, daemon=True, name="metrics-flush"
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+            else:
+                # Heartbeat: other hosts judge liveness by the file's mtime
+                try:
+                    os.utime(self._snapshot_path())
+                except OSError:
+                    pass
+
+    @property
+    def _stale_after(self) -> float:
+        return max(60.0, self.flush_interval * _STALE_INTERVALS)
+
+    def _snapshot_path(self) -> Path:
+        return self.multiproc_dir / f"{self.host}-{os.getpid()}.json"
+
+    def flush(self) -> None:
+        """Write this process's snapshot for other processes to collect."""
+        if self.multiproc_dir is None:
+            return
+        self._dirty = False
+        try:
+            self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+            path = self._snapshot_path()
+            if not self._owns_snapshot:
+                # A file under our name was left by an earlier process that
+                # had the same pid (e.g. a restarted container); keep its totals
+                with _dir_lock(self.multiproc_dir):
+                    if path.exists():
+                        self._archive([path])
+                self._owns_snapshot = True
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(
+                    {"host": self.host, "pid": os.getpid(), "metrics": self.snapshot()}
+                )
+            )
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.debug(f"Metrics flush failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Collection
+    # ------------------------------------------------------------------
+
+    def collect(self) -> dict[str, Any]:
+        """Merged samples of all live and exited processes."""
+        if self.multiproc_dir is None:
+            return _merge([(os.getpid(), self.snapshot())])
+        self.flush()
+        with _dir_lock(self.multiproc_dir):
+            self._archive_dead_processes()
+            snapshots = []
+            for path in self.multiproc_dir.glob("*.json"):
+                data = _read_json(path)
+                if data:
+                    snapshots.append((_process_id(data, path), data.get("metrics", {})))
+        return _merge(snapshots)
+
+    def _archive_dead_processes(self) -> None:
+        now = time.time()
+        dead = []
+        for path in self.multiproc_dir.glob("*.json"):
+            if path.name == _ARCHIVE_FILE:
+                continue
+            data = _read_json(path)
+            if data is None or not isinstance(data.get("pid"), int):
+                continue
+            if data.get("host", self.host) == self.host:
+                alive = _pid_alive(data["pid"])
+            else:
+                try:
+                    alive = now - path.stat().st_mtime < self._stale_after
+                except OSError:
+                    continue
+            if not alive:
+                dead.append(path)
+        if dead:
+            self._archive(dead)
+
+    def _archive(self, dead: list[Path]) -> None:
+        """Fold the counters of exited processes' snapshots into the archive."""
+        archive_path = self.multiproc_dir / _ARCHIVE_FILE
+        archive = _read_json(archive_path) or {"pid": "archive", "metrics": {}}
+        snapshots = [("archive", archive["metrics"])]
+        for path in dead:
+            data = _read_json(path)
+            if data:
+                snapshots.append(
+                    (_process_id(data, path), _without_gauges(data.get("metrics", {})))
+                )
+        archive["metrics"] = _merge(snapshots)
+        tmp = archive_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(archive))
+        os.replace(tmp, archive_path)
+        for path in dead:
+            path.unlink(missing_ok=True)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        lines: list[str] = []
+        for name, metric in sorted(self.collect().items()):
+            kind = metric["type"]
+            names = metric["labelnames"]
+            lines.append(f"# HELP {name} {_escape_help(metric.get('help', ''))}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in metric["samples"]:
+                if kind == "histogram":
+                    buckets = [*metric["buckets"], math.inf]
+                    for bound, count in zip(buckets, value[:-1], strict=True):
+                        le = "+Inf" if math.isinf(bound) else _fmt(bound)
+                        label_str = _label_str([*names, "le"], [*labels, le])
+                        lines.append(f"{name}_bucket{label_str} {_fmt(count)}")
+                    label_str = _label_str(names, labels)
+                    lines.append(f"{name}_count{label_str} {_fmt(value[-2])}")
+                    lines.append(f"{name}_sum{label_str} {_fmt(value[-1])}")
+                else:
+                    lines.append(f"{name}{_label_str(names, labels)} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+
+def _merge(snapshots: list[tuple[Any, dict[str, Any]]]) -> dict[str, Any]:
+    merged: dict[str, Any] = {}
+    for pid, metrics in snapshots:
+        for name, metric in metrics.items():
+            target = merged.get(name)
+            mode = metric.get("mode", "sum")
+            if target is None:
+                target = merged[name] = {k: v for k, v in metric.items() if k != "samples"}
+                target["_values"] = {}
+                if metric["type"] == "gauge" and mode == "all":
+                    target["labelnames"] = [*metric["labelnames"], "pid"]
+            values = target["_values"]
+            for labels, value in metric["samples"]:
+                if metric["type"] == "gauge" and mode == "all":
+                    labels = [*labels, str(pid)]
+                key = tuple(labels)
+                if key not in values:
+                    values[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    values[key] = [a + b for a, b in zip(values[key], value, strict=True)]
+                elif metric["type"] == "gauge" and mode == "max":
+                    values[key] = max(values[key], value)
+                else:
+                    values[key] = values[key] + value
+    for metric in merged.values():
+        metric["samples"] = [[list(k), v] for k, v in sorted(metric.pop("_values").items())]
+    return merged
+
+
+def _process_id(data: dict[str, Any], path: Path) -> str:
+    if "host" in data:
+        return f"{data['host']}-{data.get('pid')}"
+    return str(data.get("pid", path.stem))
+
+
+def _without_gauges(metrics: dict[str, Any]) -> dict[str, Any]:
+    return {name: m for name, m in metrics.items() if m.get("type") != "gauge"}
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _dir_lock(directory: Path) -> Iterator[None]:
+    directory.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(directory / ".lock", "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _fmt(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _label_str(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    parts = []
+    for n, v in zip(names, values, strict=True):
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{n}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _create_registry() -> MetricsRegistry:
+    try:
+        if not settings.METRICS_MULTIPROC_ENABLED:
+            return MetricsRegistry()
+        return MetricsRegistry(
+            multiproc_dir=settings.METRICS_MULTIPROC_DIR or settings.LOGS_DIR / "metrics",
+            flush_interval=settings.METRICS_FLUSH_INTERVAL,
+        )
+    except Exception as e:
+        logger.warning(f"Metrics registry falling back to single-process mode: {e}")
+        return MetricsRegistry()
+
+
+# Process-wide registry
+registry = _create_registry()
@@ -1,7 +1,16 @@
-"""Data quality checks for stock data."""
+"""Data quality checks for stock data.
 
+Row-level consistency checks are declared as ``QualityRule`` objects and
+compiled into a single ClickHouse aggregation per rule (violation counts plus
+a few sample offenders per date), so a multi-date audit transfers one row per
+date instead of every row of every date.
+"""
+
+import ast
 import logging
-from datetime import datetime
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Any
 
 import pandas as pd
@@ -12,32 +21,197 @@ from stock_datasource.utils.extractor import extractor
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class QualityRule:
+    """A consistency check that can be pushed down to ClickHouse.
+
+    Attributes:
+        check_name: Name reported in results and ``meta_quality_check``.
+        source: FROM clause (may contain joins).
+        required_tables: Tables that must exist for the check to run.
+        violations: ``(name, issue_template, condition)`` triples; the
+            template receives ``n`` (the number of offending rows).
+        metrics: Extra ``(name, condition)`` counts reported as-is.
+        base_filter: Row filter applied before counting.
+        date_column: Trade date column used for grouping/filtering.
+        key_column: Column collected for sample offenders.
+        empty_issue: Issue reported when a date has no rows.
+        settings: Query-level SETTINGS clause.
+        skipped_reason: Reason reported when a required table is missing.
+    """
+
+    check_name: str
+    source: str
+    required_tables: tuple[str, ...]
+    violations: tuple[tuple[str, str, str], ...]
+    metrics: tuple[tuple[str, str], ...] = ()
+    base_filter: str = ""
+    date_column: str = "trade_date"
+    key_column: str = "ts_code"
+    empty_issue: str = "No data found"
+    settings: str = ""
+    skipped_reason: str = "Required tables not found"
+
+
+PRICE_CONSISTENCY_RULE = QualityRule(
+    check_name="price_consistency",
+    source="ods_daily",
+    required_tables=("ods_daily",),
+    base_filter=(
+        "open IS NOT NULL AND high IS NOT NULL "
+        "AND low IS NOT NULL AND close IS NOT NULL"
+    ),
+    violations=(
+        ("invalid_high", "High < max(Open, Close) for {n} records",
+         "high < greatest(open, close)"),
+        ("invalid_low", "Low > min(Open, Close) for {n} records",
+         "low > least(open, close)"),
+        ("negative_open", "Negative open prices for {n} records", "open < 0"),
+        ("negative_high", "Negative high prices for {n} records", "high < 0"),
+        ("negative_low", "Negative low prices for {n} records", "low < 0"),
+        ("negative_close", "Negative close prices for {n} records", "close < 0"),
+        ("extreme_change", "Price changes > 20% for {n} records",
+         "abs((close - pre_close) / pre_close * 100) > 20"),
+    ),
+    empty_issue="No price data found",
+    skipped_reason="ods_daily table not found",
+)
+
+STK_LIMIT_CONSISTENCY_RULE = QualityRule(
+    check_name="stk_limit_consistency",
+    source=(
+        "ods_daily d LEFT JOIN ods_stk_limit l "
+        "ON d.ts_code = l.ts_code AND d.trade_date = l.trade_date"
+    ),
+    required_tables=("ods_stk_limit", "ods_daily"),
+    base_filter="d.close IS NOT NULL AND d.pre_close IS NOT NULL",
+    date_column="d.trade_date",
+    key_column="d.ts_code",
+    metrics=(
+        ("records_with_limits",
+         "l.up_limit IS NOT NULL AND l.down_limit IS NOT NULL"),
+    ),
+    violations=(
+        ("above_up_limit", "Close price above up limit for {n} records",
+         "l.up_limit IS NOT NULL AND l.down_limit IS NOT NULL "
+         "AND d.close > l.up_limit"),
+        ("below_down_limit", "Close price below down limit for {n} records",
+         "l.up_limit IS NOT NULL AND l.down_limit IS NOT NULL "
+         "AND d.close < l.down_limit"),
+        ("missing_limits", "Missing limit data for {n} records",
+         "l.up_limit IS NULL OR l.down_limit IS NULL"),
+    ),
+    # Unmatched rows must come back as NULL (not 0) to be "missing limits"
+    settings="join_use_nulls = 1",
+)
+
+SUSPEND_CONSISTENCY_RULE = QualityRule(
+    check_name="suspend_consistency",
+    source=(
+        "ods_daily d LEFT JOIN ods_suspend_d s "
+        "ON d.ts_code = s.ts_code AND d.trade_date = s.trade_date"
+    ),
+    required_tables=("ods_suspend_d", "ods_daily"),
+    date_column="d.trade_date",
+    key_column="d.ts_code",
+    metrics=(("suspended_records", "s.suspend_type IS NOT NULL"),),
+    violations=(
+        ("suspended_with_trades",
+         "Suspended stocks with trading data: {n} records",
+         "s.suspend_type IS NOT NULL AND d.close IS NOT NULL"),
+        ("no_trades_not_suspended",
+         "Stocks with no trades but not suspended: {n} records",
+         "(d.close IS NULL OR d.close = 0) AND s.suspend_type IS NULL"),
+    ),
+    settings="join_use_nulls = 1",
+)
+
+QUALITY_RULES: tuple[QualityRule, ...] = (
+    PRICE_CONSISTENCY_RULE,
+    STK_LIMIT_CONSISTENCY_RULE,
+    SUSPEND_CONSISTENCY_RULE,
+)
+
+
+def _normalize_date(value: Any) -> str:
+    """Normalize a date-like value to ``YYYYMMDD``."""
+    if isinstance(value, str) and len(value) == 8 and value.isdigit():
+        return value
+    return pd.Timestamp(value).strftime("%Y%m%d")
+
+
+def _iso_date(value: Any) -> str:
+    """Format a date-like value as ``YYYY-MM-DD`` for SQL literals."""
+    return pd.Timestamp(_normalize_date(value)).strftime("%Y-%m-%d")
+
+
+def _as_list(value: Any) -> list:
+    """Decode an array column (native list/ndarray or TSV text)."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            return list(ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            return []
+    return list(value)
+
+
+def compile_quality_rule(
+    rule: QualityRule, trade_dates: list[str], sample_limit: int = 5
+) -> str:
+    """Compile a rule into one GROUP BY query over ``trade_dates``."""
+    date_list = ", ".join(f"'{_iso_date(d)}'" for d in trade_dates)
+    select = [
+        f"{rule.date_column} AS check_date",
+        "count() AS total_records",
+    ]
+    for name, condition in rule.metrics:
+        select.append(f"countIf({condition}) AS {name}")
+    for name, _, condition in rule.violations:
+        select.append(f"countIf({condition}) AS {name}")
+        select.append(
+            f"groupArrayIf({sample_limit})({rule.key_column}, {condition}) "
+            f"AS {name}__samples"
+        )
+
+    where = [f"{rule.date_column} IN ({date_list})"]
+    if rule.base_filter:
+        where.append(f"({rule.base_filter})")
+
+    query = (
+        f"SELECT {', '.join(select)} "
+        f"FROM {rule.source} "
+        f"WHERE {' AND '.join(where)} "
+        f"GROUP BY check_date ORDER BY check_date"
+    )
+    if rule.settings:
+        query += f" SETTINGS {rule.settings}"
+    return query
+
+
 class QualityChecker:
     """Performs data quality checks on stock data."""
 
+    ALIGNMENT_TABLES = ["ods_daily", "ods_adj_factor", "ods_daily_basic"]
+    # Calendar days scanned before the first checked date to find the
+    # previous 10 trading days used as the expected record count.
+    ALIGNMENT_LOOKBACK_DAYS = 45
+
     def __init__(self):
         self.db = db_client
         self.extractor = extractor
 
+    # ------------------------------------------------------------------
+    # Trade date alignment
+    # ------------------------------------------------------------------
+
     def check_trade_date_alignment(self, trade_date: str) -> dict[str, Any]:
         """Check if data row count matches trading calendar."""
         logger.info(f"Checking trade date alignment for {trade_date}")
 
-        # Convert trade_date format from YYYYMMDD to YYYY-MM-DD for trade calendar API
-        from datetime import datetime
-
         try:
-            if len(trade_date) == 8 and trade_date.isdigit():
-                # Convert from YYYYMMDD to YYYY-MM-DD
-                formatted_date = datetime.strptime(trade_date, "%Y%m%d").strftime(
-                    "%Y-%m-%d"
-                )
-                logger.warning(
-                    f"Date format auto-converted: {trade_date} → {formatted_date} (system auto-fixed)"
-                )
-            else:
-                # Assume it's already in YYYY-MM-DD format
-                formatted_date = trade_date
+            _normalize_date(trade_date)
         except ValueError as e:
             logger.error(f"Invalid trade_date format: {trade_date}, error: {e}")
             return {
@@ -47,66 +221,104 @@ class QualityChecker:
                 "reason": f"Invalid date format: {trade_date}",
             }
 
-        # Get expected trading days
-        trade_cal = self.extractor.get_trade_calendar(formatted_date, formatted_date)
-        if trade_cal.empty or trade_cal.iloc[0]["is_open"] == 0:
-            return {
-                "check_name": "trade_date_alignment",
-                "trade_date": trade_date,
-                "status": "skipped",
-                "reason": "Not a trading day",
-            }
-
-        results = {}
-
-        # Check each ODS table
-        ods_tables = ["ods_daily", "ods_adj_factor", "ods_daily_basic"]
-
-        for table in ods_tables:
+        return self.check_trade_date_alignment_for_dates([trade_date])[trade_date]
+
+    def check_trade_date_alignment_for_dates(
+        self, trade_dates: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Check row counts against the calendar for many dates at once.
+
+        Uses one trade calendar call and one ``GROUP BY trade_date`` count per
+        table; the expected count for each date is the average of the previous
+        10 trading days that have data.
+        """
+        normalized = {d: _normalize_date(d) for d in trade_dates}
+        start = min(normalized.values())
+        end = max(normalized.values())
+
+        trade_cal = self.extractor.get_trade_calendar(_iso_date(start), _iso_date(end))
+        open_days = set()
+        if not trade_cal.empty:
+            for _, row in trade_cal.iterrows():
+                if int(row["is_open"]) == 1:
+                    open_days.add(_normalize_date(row["cal_date"]))
+
+        lookback_start = (
+            pd.Timestamp(start) - timedelta(days=self.ALIGNMENT_LOOKBACK_DAYS)
+        ).strftime("%Y-%m-%d")
+
+        table_counts: dict[str, dict[str, int] | Exception] = {}
+        for table in self.ALIGNMENT_TABLES:
             if not self.db.table_exists(table):
                 continue
-
             try:
-                # Count records for the trade date
-                query = f"""
-                SELECT COUNT(*) as record_count
-                FROM {table}
-                WHERE trade_date = '{trade_date}'
-                """
-
-                result = self.db.execute_query(query)
-                actual_count = result.iloc[0]["record_count"] if not result.empty else 0
-
-                # Get expected count (approximate from previous trading days)
-                expected_count = self._get_expected_record_count(table, trade_date)
-
-                # Determine status
-                if actual_count == 0:
-                    status = "failed"
-                    issue = "No records found"
-                elif expected_count == 0:
-                    # No historical data to compare against, consider it passed
-                    status = "passed"
-                    issue = "No historical data for comparison, assuming valid"
-                elif abs(actual_count - expected_count) / expected_count > 0.1:
-                    status = "warning"
-                    issue = f"Record count deviation > 10%: expected ~{expected_count}, got {actual_count}"
-                else:
-                    status = "passed"
-                    issue = None
-
-                results[table] = {
-                    "actual_count": int(actual_count),
-                    "expected_count": expected_count,
-                    "status": status,
-                    "issue": issue,
+                df = self.db.execute_query(
+                    f"""
+                    SELECT trade_date, count() AS record_count
+                    FROM {table}
+                    WHERE trade_date >= '{lookback_start}'
+                    AND trade_date <= '{_iso_date(end)}'
+                    GROUP BY trade_date
+                    ORDER BY trade_date
+                    """
+                )
+                table_counts[table] = {
+                    _normalize_date(row["trade_date"]): int(row["record_count"])
+                    for _, row in df.iterrows()
                 }
-
             except Exception as e:
                 logger.error(f"Failed to check {table}: {e}")
-                results[table] = {"status": "error", "error": str(e)}
+                table_counts[table] = e
 
-        # Overall result
+        results = {}
+        for original, day in normalized.items():
+            if day not in open_days:
+                results[original] = {
+                    "check_name": "trade_date_alignment",
+                    "trade_date": original,
+                    "status": "skipped",
+                    "reason": "Not a trading day",
+                }
+                continue
+
+            details = {}
+            for table, counts in table_counts.items():
+                if isinstance(counts, Exception):
+                    details[table] = {"status": "error", "error": str(counts)}
+                    continue
+                details[table] = self._alignment_status(counts, day)
+            results[original] = self._alignment_result(original, details)
+        return results
+
+    @staticmethod
+    def _alignment_status(counts: dict[str, int], day: str) -> dict[str, Any]:
+        actual_count = counts.get(day, 0)
+        previous = [c for d, c in sorted(counts.items()) if d < day][-10:]
+        expected_count = int(sum(previous) / len(previous)) if previous else 0
+
+        if actual_count == 0:
+            status = "failed"
+            issue = "No records found"
+        elif expected_count == 0:
+            # No historical data to compare against, consider it passed
+            status = "passed"
+            issue = "No historical data for comparison, assuming valid"
+        elif abs(actual_count - expected_count) / expected_count > 0.1:
+            status = "warning"
+            issue = f"Record count deviation > 10%: expected ~{expected_count}, got {actual_count}"
+        else:
+            status = "passed"
+            issue = None
+
+        return {
+            "actual_count": int(actual_count),
+            "expected_count": expected_count,
+            "status": status,
+            "issue": issue,
+        }
+
+    @staticmethod
+    def _alignment_result(trade_date: str, results: dict[str, Any]) -> dict[str, Any]:
         failed_checks = [r for r in results.values() if r["status"] == "failed"]
         warning_checks = [r for r in results.values() if r["status"] == "warning"]
 
@@ -127,311 +339,187 @@ class QualityChecker:
             },
         }
 
-    def _get_expected_record_count(self, table_name: str, trade_date: str) -> int:
-        """Get expected record count based on historical data."""
-        try:
-            # Get average count from previous 10 trading days
-            query = f"""
-            SELECT AVG(record_count) as avg_count
-            FROM (
-                SELECT COUNT(*) as record_count
-                FROM {table_name}
-                WHERE trade_date < '{trade_date}'
-                GROUP BY trade_date
-                ORDER BY trade_date DESC
-                LIMIT 10
-            )
-            """
-
-            result = self.db.execute_query(query)
-            if not result.empty and result.iloc[0]["avg_count"] is not None:
-                avg_count = result.iloc[0]["avg_count"]
-                # Handle NaN values
-                if pd.isna(avg_count):
-                    logger.info(
-                        f"No historical data found for {table_name}, using 0 as expected count"
-                    )
-                    return 0
-                return int(avg_count)
-        except Exception as e:
-            logger.warning(
-                f"Failed to get expected count for {table_name}: {e}, using 0 as fallback"
-            )
-
-        return 0
+    # ------------------------------------------------------------------
+    # Push-down consistency rules
+    # ------------------------------------------------------------------
 
-    def check_price_consistency(self, trade_date: str) -> dict[str, Any]:
-        """Check price data consistency (OHLC relationships)."""
-        logger.info(f"Checking price consistency for {trade_date}")
+    def run_rule(
+        self, rule: QualityRule, trade_dates: list[str], sample_limit: int = 5
+    ) -> dict[str, dict[str, Any]]:
+        """Evaluate a rule for many dates with a single aggregation query.
 
-        if not self.db.table_exists("ods_daily"):
+        Returns results keyed by the given trade date strings, in the same
+        shape as the per-date ``check_*`` methods plus ``violation_counts``
+        and ``samples`` (up to ``sample_limit`` offending codes per violation).
+        """
+        if not all(self.db.table_exists(t) for t in rule.required_tables):
             return {
-                "check_name": "price_consistency",
-                "trade_date": trade_date,
-                "status": "skipped",
-                "reason": "ods_daily table not found",
+                d: {
+                    "check_name": rule.check_name,
+                    "trade_date": d,
+                    "status": "skipped",
+                    "reason": rule.skipped_reason,
+                }
+                for d in trade_dates
             }
 
         try:
-            query = f"""
-            SELECT 
-                ts_code,
-                open, high, low, close, pre_close
-            FROM ods_daily
-            WHERE trade_date = '{trade_date}'
-            AND open IS NOT NULL 
-            AND high IS NOT NULL 
-            AND low IS NOT NULL 
-            AND close IS NOT NULL
-            """
-
-            df = self.db.execute_query(query)
-
-            if df.empty:
-                return {
-                    "check_name": "price_consistency",
-                    "trade_date": trade_date,
-                    "status": "failed",
-                    "issue": "No price data found",
-                }
-
-            issues = []
-
-            # Check OHLC relationships
-            # High should be >= max(Open, Close)
-            invalid_high = df[df["high"] < df[["open", "close"]].max(axis=1)]
-            if len(invalid_high) > 0:
-                issues.append(
-                    f"High < max(Open, Close) for {len(invalid_high)} records"
-                )
-
-            # Low should be <= min(Open, Close)
-            invalid_low = df[df["low"] > df[["open", "close"]].min(axis=1)]
-            if len(invalid_low) > 0:
-                issues.append(f"Low > min(Open, Close) for {len(invalid_low)} records")
-
-            # Check for negative prices
-            price_cols = ["open", "high", "low", "close"]
-            for col in price_cols:
-                negative_prices = df[df[col] < 0]
-                if len(negative_prices) > 0:
-                    issues.append(
-                        f"Negative {col} prices for {len(negative_prices)} records"
-                    )
-
-            # Check for extreme price changes (> 20%)
-            df["price_change_pct"] = abs(
-                (df["close"] - df["pre_close"]) / df["pre_close"] * 100
+            df = self.db.execute_query(
+                compile_quality_rule(rule, trade_dates, sample_limit)
             )
-            extreme_changes = df[df["price_change_pct"] > 20]
-            if len(extreme_changes) > 0:
-                issues.append(f"Price changes > 20% for {len(extreme_changes)} records")
-
-            status = "failed" if issues else "passed"
-
-            return {
-                "check_name": "price_consistency",
-                "trade_date": trade_date,
-                "status": status,
-                "total_records": len(df),
-                "issues": issues,
-                "issue_count": len(issues),
-            }
-
         except Exception as e:
-            logger.error(f"Price consistency check failed: {e}")
+            logger.error(f"{rule.check_name} check failed: {e}")
             return {
-                "check_name": "price_consistency",
-                "trade_date": trade_date,
-                "status": "error",
-                "error": str(e),
-            }
-
-    def check_stk_limit_consistency(self, trade_date: str) -> dict[str, Any]:
-        """Check stock limit (up/down) consistency."""
-        logger.info(f"Checking stock limit consistency for {trade_date}")
-
-        if not self.db.table_exists("ods_stk_limit") or not self.db.table_exists(
-            "ods_daily"
-        ):
-            return {
-                "check_name": "stk_limit_consistency",
-                "trade_date": trade_date,
-                "status": "skipped",
-                "reason": "Required tables not found",
+                d: {
+                    "check_name": rule.check_name,
+                    "trade_date": d,
+                    "status": "error",
+                    "error": str(e),
+                }
+                for d in trade_dates
             }
 
-        try:
-            query = f"""
-            SELECT 
-                d.ts_code,
-                d.close,
-                d.pre_close,
-                l.up_limit,
-                l.down_limit
-            FROM ods_daily d
-            LEFT JOIN ods_stk_limit l 
-                ON d.ts_code = l.ts_code 
-                AND d.trade_date = l.trade_date
-            WHERE d.trade_date = '{trade_date}'
-            AND d.close IS NOT NULL 
-            AND d.pre_close IS NOT NULL
-            """
-
-            df = self.db.execute_query(query)
+        rows = {}
+        if df is not None and not df.empty:
+            for _, row in df.iterrows():
+                rows[_normalize_date(row["check_date"])] = row
 
-            if df.empty:
-                return {
-                    "check_name": "stk_limit_consistency",
+        results = {}
+        for trade_date in trade_dates:
+            row = rows.get(_normalize_date(trade_date))
+            if row is None or int(row["total_records"]) == 0:
+                results[trade_date] = {
+                    "check_name": rule.check_name,
                     "trade_date": trade_date,
                     "status": "failed",
-                    "issue": "No data found",
+                    "issue": rule.empty_issue,
                 }
+                continue
 
             issues = []
-
-            # Check records with limit data
-            limit_data = df.dropna(subset=["up_limit", "down_limit"])
-
-            if len(limit_data) > 0:
-                # Check if close price is within limits
-                above_up_limit = limit_data[
-                    limit_data["close"] > limit_data["up_limit"]
-                ]
-                below_down_limit = limit_data[
-                    limit_data["close"] < limit_data["down_limit"]
-                ]
-
-                if len(above_up_limit) > 0:
-                    issues.append(
-                        f"Close price above up limit for {len(above_up_limit)} records"
-                    )
-
-                if len(below_down_limit) > 0:
-                    issues.append(
-                        f"Close price below down limit for {len(below_down_limit)} records"
-                    )
-
-            # Check for missing limit data
-            missing_limits = df[df["up_limit"].isnull() | df["down_limit"].isnull()]
-            if len(missing_limits) > 0:
-                issues.append(f"Missing limit data for {len(missing_limits)} records")
-
-            status = "failed" if issues else "passed"
-
-            return {
-                "check_name": "stk_limit_consistency",
+            violation_counts = {}
+            samples = {}
+            for name, template, _ in rule.violations:
+                n = int(row[name])
+                violation_counts[name] = n
+                if n > 0:
+                    issues.append(template.format(n=n))
+                    samples[name] = [str(s) for s in _as_list(row[f"{name}__samples"])]
+
+            result = {
+                "check_name": rule.check_name,
                 "trade_date": trade_date,
-                "status": status,
-                "total_records": len(df),
-                "records_with_limits": len(limit_data),
-                "issues": issues,
-                "issue_count": len(issues),
+                "status": "failed" if issues else "passed",
+                "total_records": int(row["total_records"]),
             }
+            for name, _ in rule.metrics:
+                result[name] = int(row[name])
+            result.update(
+                {
+                    "issues": issues,
+                    "issue_count": len(issues),
+                    "violation_counts": violation_counts,
+                    "samples": samples,
+                }
+            )
+            results[trade_date] = result
+        return results
 
-        except Exception as e:
-            logger.error(f"Stock limit consistency check failed: {e}")
-            return {
-                "check_name": "stk_limit_consistency",
-                "trade_date": trade_date,
-                "status": "error",
-                "error": str(e),
-            }
+    def check_price_consistency(self, trade_date: str) -> dict[str, Any]:
+        """Check price data consistency (OHLC relationships)."""
+        logger.info(f"Checking price consistency for {trade_date}")
+        return self.run_rule(PRICE_CONSISTENCY_RULE, [trade_date])[trade_date]
+
+    def check_stk_limit_consistency(self, trade_date: str) -> dict[str, Any]:
+        """Check stock limit (up/down) consistency."""
+        logger.info(f"Checking stock limit consistency for {trade_date}")
+        return self.run_rule(STK_LIMIT_CONSISTENCY_RULE, [trade_date])[trade_date]
 
     def check_suspend_consistency(self, trade_date: str) -> dict[str, Any]:
         """Check suspension data consistency."""
         logger.info(f"Checking suspension consistency for {trade_date}")
+        return self.run_rule(SUSPEND_CONSISTENCY_RULE, [trade_date])[trade_date]
+
+    # ------------------------------------------------------------------
+    # Batch runner
+    # ------------------------------------------------------------------
+
+    def run_checks_for_dates(
+        self,
+        trade_dates: list[str],
+        persist: bool = False,
+        skip_checked: bool = False,
+    ) -> dict[str, dict[str, Any]]:
+        """Run all quality checks for many trade dates.
+
+        Every check runs once for the whole set of dates instead of once per
+        date.
+
+        Args:
+            trade_dates: Dates in ``YYYYMMDD`` or ``YYYY-MM-DD`` format.
+            persist: Write results to ``meta_quality_check`` as they are
+                produced.
+            skip_checked: Skip dates that already have results in
+                ``meta_quality_check`` (resumable audits).
+
+        Returns:
+            ``run_all_checks``-shaped results keyed by trade date.
+        """
+        trade_dates = list(dict.fromkeys(trade_dates))
+        if skip_checked:
+            checked = self._get_checked_dates(trade_dates)
+            if checked:
+                logger.info(f"Skipping {len(checked)} already checked dates")
+            trade_dates = [d for d in trade_dates if _normalize_date(d) not in checked]
+        if not trade_dates:
+            return {}
+
+        logger.info(f"Running all quality checks for {len(trade_dates)} dates")
+
+        check_runs = [
+            ("check_trade_date_alignment", self.check_trade_date_alignment_for_dates),
+        ] + [
+            (rule.check_name, lambda dates, rule=rule: self.run_rule(rule, dates))
+            for rule in QUALITY_RULES
+        ]
 
-        if not self.db.table_exists("ods_suspend_d") or not self.db.table_exists(
-            "ods_daily"
-        ):
-            return {
-                "check_name": "suspend_consistency",
-                "trade_date": trade_date,
-                "status": "skipped",
-                "reason": "Required tables not found",
-            }
-
-        try:
-            query = f"""
-            SELECT 
-                d.ts_code,
-                d.close,
-                s.suspend_type
-            FROM ods_daily d
-            LEFT JOIN ods_suspend_d s 
-                ON d.ts_code = s.ts_code 
-                AND d.trade_date = s.trade_date
-            WHERE d.trade_date = '{trade_date}'
-            """
-
-            df = self.db.execute_query(query)
-
-            if df.empty:
-                return {
-                    "check_name": "suspend_consistency",
-                    "trade_date": trade_date,
-                    "status": "failed",
-                    "issue": "No data found",
-                }
-
-            issues = []
-
-            # Check suspended stocks with trading data
-            suspended_with_trades = df[
-                (df["suspend_type"].notna()) & (df["close"].notna())
-            ]
-
-            if len(suspended_with_trades) > 0:
-                issues.append(
-                    f"Suspended stocks with trading data: {len(suspended_with_trades)} records"
-                )
-
-            # Check for stocks with zero/invalid close price but not suspended
-            no_trades_not_suspended = df[
-                (df["close"].isna() | (df["close"] == 0)) & (df["suspend_type"].isna())
-            ]
-
-            if len(no_trades_not_suspended) > 0:
-                issues.append(
-                    f"Stocks with no trades but not suspended: {len(no_trades_not_suspended)} records"
+        per_check = []
+        for check_name, run in check_runs:
+            try:
+                per_check.append(run(trade_dates))
+            except Exception as e:
+                logger.error(f"Quality check {check_name} failed: {e}")
+                per_check.append(
+                    {
+                        d: {
+                            "check_name": check_name,
+                            "trade_date": d,
+                            "status": "error",
+                            "error": str(e),
+                        }
+                        for d in trade_dates
+                    }
                 )
 
-            status = "failed" if issues else "passed"
-
-            return {
-                "check_name": "suspend_consistency",
-                "trade_date": trade_date,
-                "status": status,
-                "total_records": len(df),
-                "suspended_records": len(df[df["suspend_type"].notna()]),
-                "issues": issues,
-                "issue_count": len(issues),
-            }
-
-        except Exception as e:
-            logger.error(f"Suspension consistency check failed: {e}")
-            return {
-                "check_name": "suspend_consistency",
-                "trade_date": trade_date,
-                "status": "error",
-                "error": str(e),
-            }
+        results = {}
+        for trade_date in trade_dates:
+            results[trade_date] = self._summarize(
+                trade_date, [check[trade_date] for check in per_check]
+            )
+            if persist:
+                self.persist_results(results[trade_date])
+        return results
 
     def run_all_checks(self, trade_date: str) -> dict[str, Any]:
         """Run all quality checks for a trade date."""
         logger.info(f"Running all quality checks for {trade_date}")
+        return self.run_checks_for_dates([trade_date])[trade_date]
 
-        checks = [
-            self.check_trade_date_alignment,
-            self.check_price_consistency,
-            self.check_stk_limit_consistency,
-            self.check_suspend_consistency,
-        ]
-
+    @staticmethod
+    def _summarize(trade_date: str, checks: list[dict[str, Any]]) -> dict[str, Any]:
         results = {
             "trade_date": trade_date,
-            "checks": [],
+            "checks": checks,
             "summary": {
                 "total_checks": len(checks),
                 "passed": 0,
@@ -442,28 +530,11 @@ class QualityChecker:
             },
         }
 
-        for check_func in checks:
-            try:
-                result = check_func(trade_date)
-                results["checks"].append(result)
-
-                # Update summary
-                status = result.get("status", "error")
-                if status in results["summary"]:
-                    results["summary"][status] += 1
-                else:
-                    results["summary"]["error"] += 1
-
-            except Exception as e:
-                logger.error(f"Quality check {check_func.__name__} failed: {e}")
-                results["checks"].append(
-                    {
-                        "check_name": check_func.__name__,
-                        "trade_date": trade_date,
-                        "status": "error",
-                        "error": str(e),
-                    }
-                )
+        for result in checks:
+            status = result.get("status", "error")
+            if status in results["summary"]:
+                results["summary"][status] += 1
+            else:
                 results["summary"]["error"] += 1
 
         # Overall status
@@ -479,6 +550,86 @@ class QualityChecker:
         )
         return results
 
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _ensure_quality_check_table(self) -> None:
+        if not self.db.table_exists("meta_quality_check"):
+            self._create_quality_check_table()
+
+    def _get_checked_dates(self, trade_dates: list[str]) -> set[str]:
+        """Dates that already have rows in ``meta_quality_check``."""
+        try:
+            if not self.db.table_exists("meta_quality_check"):
+                return set()
+            date_list = ", ".join(f"'{_iso_date(d)}'" for d in trade_dates)
+            df = self.db.execute_query(
+                f"""
+                SELECT DISTINCT check_date
+                FROM meta_quality_check
+                WHERE check_date IN ({date_list})
+                """
+            )
+            return {_normalize_date(d) for d in df["check_date"]} if not df.empty else set()
+        except Exception as e:
+            logger.warning(f"Failed to load checked dates: {e}")
+            return set()
+
+    def persist_results(self, date_results: dict[str, Any]) -> None:
+        """Write one date's ``run_all_checks`` result in a single insert."""
+        check_date = pd.Timestamp(_normalize_date(date_results["trade_date"])).date()
+        created_at = datetime.now()
+        rows = []
+        for check in date_results["checks"]:
+            if check["check_name"] == "trade_date_alignment" and check.get("details"):
+                for table, detail in check["details"].items():
+                    rows.append(
+                        {
+                            "check_name": check["check_name"],
+                            "table_name": table,
+                            "expected_value": str(detail.get("expected_count", "")),
+                            "actual_value": str(detail.get("actual_count", "")),
+                            "status": detail["status"],
+                            "error_details": detail.get("issue")
+                            or detail.get("error")
+                            or "",
+                        }
+                    )
+                continue
+
+            details = "; ".join(check.get("issues", [])) or check.get(
+                "issue", check.get("reason", check.get("error", ""))
+            )
+            if check.get("samples"):
+                details += f" | samples: {check['samples']}"
+            rows.append(
+                {
+                    "check_name": check["check_name"],
+                    "table_name": check.get("table_name", "multiple"),
+                    "expected_value": "",
+                    "actual_value": str(check.get("total_records", "")),
+                    "status": check["status"],
+                    "error_details": details,
+                }
+            )
+
+        for row in rows:
+            row.update(
+                {
+                    "id": uuid.uuid4().int >> 64,
+                    "check_date": check_date,
+                    "check_result": row["status"],
+                    "created_at": created_at,
+                }
+            )
+
+        try:
+            self._ensure_quality_check_table()
+            self.db.insert_dataframe("meta_quality_check", pd.DataFrame(rows))
+        except Exception as e:
+            logger.error(f"Failed to persist quality checks for {check_date}: {e}")
+
     def log_quality_check(self, check_result: dict[str, Any]) -> None:
         """Log quality check result to metadata table."""
         try:
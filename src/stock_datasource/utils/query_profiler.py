@@ -0,0 +1,364 @@
+"""Opt-in profiler and slow-query log for ClickHouse queries.
+
+When enabled, every ``ClickHouseClient.execute`` / ``execute_query`` call is
+tagged with a ``query_id`` and the module that issued it. After the query
+finishes, the profiler reads ``read_rows``, ``read_bytes``, ``elapsed`` and
+``memory_usage`` from the driver's progress/profile info (TCP) or from the
+``X-ClickHouse-Summary`` header (HTTP). Then it:
+
+- folds the query into per-fingerprint aggregates, where the fingerprint is
+  the SQL with literals, ``IN`` lists and whitespace normalised;
+- appends queries slower than the threshold to an in-memory ring buffer and
+  to a size-rotated JSON-lines file.
+
+Nothing is sent to ClickHouse beyond the ``query_id``, so the worst offenders
+can be found without enabling server-side ``query_log``.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+from stock_datasource.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SQL_PREVIEW_CHARS = 2000
+
+# Modules skipped when looking for the code that issued a query
+_INFRA_MODULE_PREFIXES = (
+    "stock_datasource.models.database",
+    "stock_datasource.core.base_service",
+    "tenacity",
+    "contextlib",
+    "functools",
+    "concurrent.",
+    "threading",
+    "asyncio",
+)
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_ARRAY_RE = re.compile(r"\[\s*\?(?:\s*,\s*\?)*\s*\]")
+_PARAM_RE = re.compile(r"%\(\w+\)s")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Reduce a statement to its shape: literals, lists and spacing removed."""
+    text = _COMMENT_RE.sub(" ", sql)
+    text = _STRING_RE.sub("?", text)
+    text = _PARAM_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("IN (?)", text)
+    text = _ARRAY_RE.sub("[?]", text)
+    return _WS_RE.sub(" ", text).strip().rstrip(";").strip()
+
+
+def sql_fingerprint(sql: str) -> str:
+    """Stable short id of the normalised statement."""
+    return hashlib.md5(normalize_sql(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def _caller_module() -> str:
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if (
+            module
+            and frame.f_globals is not globals()
+            and not module.startswith(_INFRA_MODULE_PREFIXES)
+        ):
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+@dataclass
+class QueryRecord:
+    """Profile of one query, filled in by the client that ran it."""
+
+    query_id: str
+    client: str
+    method: str
+    caller: str
+    fingerprint: str
+    sql: str
+    started_at: str
+    elapsed_ms: float = 0.0
+    server_elapsed_ms: float | None = None
+    read_rows: int | None = None
+    read_bytes: int | None = None
+    result_rows: int | None = None
+    memory_usage: int | None = None
+    error: str | None = None
+    attempts: int = 0
+
+    def new_attempt(self) -> str:
+        """Query id for the next send of this query.
+
+        Retries and reconnects re-send the query within one profile; each send
+        gets its own id so ClickHouse does not reject it as a duplicate of an
+        attempt it may still be running, and stats match the last attempt.
+        """
+        if self.attempts:
+            self.query_id = uuid.uuid4().hex
+        self.attempts += 1
+        return self.query_id
+
+    def update_from_tcp(self, last_query: Any) -> None:
+        """Copy stats from ``clickhouse_driver.Client.last_query``."""
+        if last_query is None:
+            return
+        progress = getattr(last_query, "progress", None)
+        if progress is not None:
+            self.read_rows = getattr(progress, "rows", None)
+            self.read_bytes = getattr(progress, "bytes", None)
+            elapsed_ns = getattr(progress, "elapsed_ns", None)
+            if elapsed_ns:
+                self.server_elapsed_ms = elapsed_ns / 1e6
+        profile_info = getattr(last_query, "profile_info", None)
+        if profile_info is not None:
+            self.result_rows = getattr(profile_info, "rows", None)
+        elapsed = getattr(last_query, "elapsed", None)
+        if elapsed and self.server_elapsed_ms is None:
+            self.server_elapsed_ms = elapsed * 1000
+        events = getattr(last_query, "profile_events", None) or {}
+        if isinstance(events, dict):
+            memory = events.get("MemoryTrackerPeakUsage") or events.get("MemoryTrackerUsage")
+            if memory:
+                self.memory_usage = int(memory)
+
+    def update_from_http(self, summary_header: str | None) -> None:
+        """Copy stats from the ``X-ClickHouse-Summary`` response header."""
+        if not summary_header:
+            return
+        try:
+            summary = json.loads(summary_header)
+        except ValueError:
+            return
+
+        def _int(key: str) -> int | None:
+            value = summary.get(key)
+            return int(value) if value not in (None, "") else None
+
+        self.read_rows = _int("read_rows")
+        self.read_bytes = _int("read_bytes")
+        self.result_rows = _int("result_rows")
+        self.memory_usage = _int("peak_memory_usage") or _int("memory_usage")
+        elapsed_ns = _int("elapsed_ns")
+        if elapsed_ns:
+            self.server_elapsed_ms = elapsed_ns / 1e6
+
+
+@dataclass
+class FingerprintStats:
+    """Aggregate of all profiled queries sharing one fingerprint."""
+
+    fingerprint: str
+    normalized_sql: str
+    count: int = 0
+    errors: int = 0
+    slow_count: int = 0
+    total_elapsed_ms: float = 0.0
+    max_elapsed_ms: float = 0.0
+    total_read_rows: int = 0
+    total_read_bytes: int = 0
+    max_memory_usage: int = 0
+    callers: dict[str, int] = field(default_factory=dict)
+    last_seen: str = ""
+
+    def add(self, record: QueryRecord, slow: bool) -> None:
+        self.count += 1
+        self.errors += 1 if record.error else 0
+        self.slow_count += 1 if slow else 0
+        self.total_elapsed_ms += record.elapsed_ms
+        self.max_elapsed_ms = max(self.max_elapsed_ms, record.elapsed_ms)
+        self.total_read_rows += record.read_rows or 0
+        self.total_read_bytes += record.read_bytes or 0
+        self.max_memory_usage = max(self.max_memory_usage, record.memory_usage or 0)
+        self.callers[record.caller] = self.callers.get(record.caller, 0) + 1
+        self.last_seen = record.started_at
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["avg_elapsed_ms"] = self.total_elapsed_ms / self.count if self.count else 0.0
+        data["callers"] = dict(sorted(self.callers.items(), key=lambda kv: -kv[1])[:10])
+        return data
+
+
+_current_record: ContextVar[QueryRecord | None] = ContextVar("query_record", default=None)
+
+
+def current_query() -> QueryRecord | None:
+    """The profile record of the query currently running in this context."""
+    return _current_record.get()
+
+
+class QueryProfiler:
+    """Per-process query profiler with a slow-query ring buffer and log file."""
+
+    SORT_KEYS = ("total_elapsed_ms", "max_elapsed_ms", "count", "total_read_bytes", "total_read_rows", "slow_count")
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_threshold_ms: float = 1000.0,
+        ring_size: int = 500,
+        max_fingerprints: int = 2000,
+        log_file: Path | None = None,
+        log_max_bytes: int = 10 * 1024 * 1024,
+        log_backup_count: int = 5,
+    ):
+        self.enabled = enabled
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self._slow: deque[dict[str, Any]] = deque(maxlen=ring_size)
+        self._stats: dict[str, FingerprintStats] = {}
+        self._lock = threading.Lock()
+        self._file_logger: logging.Logger | None = None
+        if log_file is not None:
+            self._file_logger = self._build_file_logger(Path(log_file), log_max_bytes, log_backup_count)
+
+    @staticmethod
+    def _build_file_logger(path: Path, max_bytes: int, backup_count: int) -> logging.Logger | None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_logger = logging.getLogger(f"stock_datasource.slow_query.{path}")
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            if not file_logger.handlers:
+                # delay: no file is opened until the first slow query
+                handler = RotatingFileHandler(
+                    path,
+                    maxBytes=max_bytes,
+                    backupCount=backup_count,
+                    encoding="utf-8",
+                    delay=True,
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                file_logger.addHandler(handler)
+            return file_logger
+        except Exception as e:
+            logger.warning(f"Slow query log file disabled: {e}")
+            return None
+
+    def configure(self, enabled: bool | None = None, slow_threshold_ms: float | None = None) -> None:
+        if enabled is not None:
+            self.enabled = enabled
+        if slow_threshold_ms is not None:
+            self.slow_threshold_ms = slow_threshold_ms
+
+    @contextmanager
+    def profile(self, client: str, method: str, sql: str) -> Iterator[QueryRecord | None]:
+        """Profile the query run inside the block; yields ``None`` when disabled."""
+        if not self.enabled or _current_record.get() is not None:
+            yield None
+            return
+        record = QueryRecord(
+            query_id=uuid.uuid4().hex,
+            client=client,
+            method=method,
+            caller=_caller_module(),
+            fingerprint=sql_fingerprint(sql),
+            sql=sql[:_SQL_PREVIEW_CHARS],
+            started_at=datetime.now().isoformat(timespec="milliseconds"),
+        )
+        token = _current_record.set(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.error = str(e)[:500]
+            raise
+        finally:
+            record.elapsed_ms = (time.perf_counter() - start) * 1000
+            _current_record.reset(token)
+            self.record(record)
+
+    def record(self, record: QueryRecord) -> None:
+        slow = record.elapsed_ms >= self.slow_threshold_ms
+        with self._lock:
+            stats = self._stats.get(record.fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # Drop the cheapest fingerprint to stay bounded
+                    cheapest = min(self._stats.values(), key=lambda s: s.total_elapsed_ms)
+                    del self._stats[cheapest.fingerprint]
+                stats = self._stats[record.fingerprint] = FingerprintStats(
+                    fingerprint=record.fingerprint,
+                    normalized_sql=normalize_sql(record.sql),
+                )
+            stats.add(record, slow)
+            if slow:
+                self._slow.append(asdict(record))
+        if slow and self._file_logger is not None:
+            try:
+                self._file_logger.info(json.dumps(asdict(record), ensure_ascii=False, default=str))
+            except Exception:
+                pass
+
+    def slow_queries(self, limit: int = 100, fingerprint: str | None = None) -> list[dict[str, Any]]:
+        """Most recent slow queries, newest first."""
+        with self._lock:
+            items = list(self._slow)
+        if fingerprint:
+            items = [i for i in items if i["fingerprint"] == fingerprint]
+        return items[::-1][:limit]
+
+    def top_fingerprints(self, sort_by: str = "total_elapsed_ms", limit: int = 50) -> list[dict[str, Any]]:
+        """Fingerprints ordered by ``sort_by`` (descending)."""
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {self.SORT_KEYS}")
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda s: getattr(s, sort_by), reverse=True)
+            return [s.to_dict() for s in stats[:limit]]
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "slow_threshold_ms": self.slow_threshold_ms,
+                "fingerprints": len(self._stats),
+                "slow_buffered": len(self._slow),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._slow.clear()
+            self._stats.clear()
+
+
+def _create_profiler() -> QueryProfiler:
+    try:
+        return QueryProfiler(
+            enabled=settings.QUERY_PROFILER_ENABLED,
+            slow_threshold_ms=settings.QUERY_PROFILER_SLOW_MS,
+            ring_size=settings.QUERY_PROFILER_RING_SIZE,
+            log_file=settings.LOGS_DIR / "slow_queries.log",
+            log_max_bytes=settings.QUERY_PROFILER_LOG_MAX_BYTES,
+            log_backup_count=settings.QUERY_PROFILER_LOG_BACKUPS,
+        )
+    except Exception as e:
+        logger.warning(f"Query profiler disabled: {e}")
+        return QueryProfiler()
+
+
+# Process-wide profiler
+query_profiler = _create_profiler()
@@ -0,0 +1,340 @@
+"""Fingerprinted, concurrent schema bootstrap for API startup.
+
+Every startup used to run each module's ``CREATE TABLE IF NOT EXISTS`` /
+``ALTER`` DDL one after another. Each *schema module* is now reduced to a
+fingerprint (sha256 of its normalized DDL) that is recorded in
+``_schema_fingerprints`` once the module has been applied.
+
+:func:`bootstrap_schemas` reads the recorded fingerprints and the existing
+table names with a single query. A module is skipped when its fingerprint is
+unchanged and every table its DDL creates still exists, so a warm start costs
+one metadata read. The remaining modules run concurrently on a bounded
+thread pool; modules given as plain DDL statements get a dedicated client per
+worker, so they are not serialized behind the shared ``db_client`` lock.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import logging
+import os
+import re
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from stock_datasource.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_TABLE = "_schema_fingerprints"
+
+_FINGERPRINT_TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE}
+(
+    module      String,
+    fingerprint String,
+    applied_at  DateTime DEFAULT now()
+)
+ENGINE = ReplacingMergeTree(applied_at)
+ORDER BY module
+"""
+
+# Fingerprints and table names in one round trip
+_METADATA_QUERY = f"""
+SELECT 'module' AS kind, module AS name, argMax(fingerprint, applied_at) AS value
+FROM {FINGERPRINT_TABLE}
+GROUP BY module
+UNION ALL
+SELECT 'table' AS kind, name, '' AS value
+FROM system.tables
+WHERE database = currentDatabase()
+"""
+
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE\s+TABLE\s+IF\s+NOT\s+EXISTS\s+(?:`?\w+`?\.)?`?(\w+)`?", re.IGNORECASE
+)
+
+# Tables required by frontend pages, override with REQUIRED_PLUGIN_TABLES=a,b,...
+DEFAULT_REQUIRED_PLUGINS = [
+    "tushare_ths_daily",  # 同花顺行情数据
+    "tushare_ths_index",  # 同花顺指数
+    "tushare_idx_factor_pro",  # 指数因子
+    "tushare_index_basic",  # 指数基础信息
+    "tushare_etf_fund_daily",  # ETF日线数据
+    "tushare_etf_basic",  # ETF基础信息
+    "tushare_cyq_chips",  # 筹码分布数据
+    "tushare_stk_surv",  # 机构调研数据
+    "tushare_report_rc",  # 研报覆盖数据
+]
+
+
+def _normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+@dataclass
+class SchemaModule:
+    """A unit of startup DDL that is fingerprinted and applied as a whole.
+
+    Either ``statements`` are executed in order on a worker-owned client, or
+    ``apply`` is called for modules whose DDL lives inline in existing
+    ``ensure_*`` functions; ``ddl`` is then the text that is fingerprinted
+    (usually the functions' source).
+    """
+
+    name: str
+    statements: list[str] = field(default_factory=list)
+    apply: Callable[[], Any] | None = None
+    ddl: str | None = None
+
+    @classmethod
+    def from_functions(cls, name: str, *functions: Callable[[], Any]) -> "SchemaModule":
+        """Module applied by calling ``functions`` in order.
+
+        The functions must raise on failure; one that only logs would get its
+        fingerprint recorded and never be retried. ``functools.partial``
+        objects are fingerprinted by their underlying function's source.
+        """
+
+        def _apply() -> None:
+            for fn in functions:
+                fn()
+
+        source = "\n".join(
+            inspect.getsource(getattr(fn, "func", fn)) for fn in functions
+        )
+        return cls(name=name, apply=_apply, ddl=source)
+
+    @property
+    def fingerprint(self) -> str:
+        text = self.ddl if self.ddl is not None else ";\n".join(
+            _normalize_sql(s) for s in self.statements
+        )
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @property
+    def tables(self) -> set[str]:
+        """Tables this module's DDL creates."""
+        text = self.ddl if self.ddl is not None else "\n".join(self.statements)
+        return set(_CREATE_TABLE_RE.findall(text))
+
+
+@dataclass
+class BootstrapResult:
+    applied: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def _read_metadata(db) -> tuple[dict[str, str], set[str]] | None:
+    """Recorded fingerprints and existing tables, or None if unreadable."""
+    try:
+        rows = db.execute(_METADATA_QUERY)
+    except Exception as e:
+        logger.info(f"Schema fingerprints unavailable, applying all modules: {e}")
+        return None
+    fingerprints: dict[str, str] = {}
+    tables: set[str] = set()
+    for kind, name, value in rows:
+        if kind == "module":
+            fingerprints[name] = value
+        else:
+            tables.add(name)
+    return fingerprints, tables
+
+
+def _default_client_factory():
+    from stock_datasource.models.database import DualWriteClient
+
+    return DualWriteClient()
+
+
+def _run_statement(client, statement: str) -> None:
+    """Run a DDL statement on primary, and best-effort on backup."""
+    client.primary.execute(statement)
+    if getattr(client, "backup", None):
+        try:
+            client.backup.execute(statement)
+        except Exception as e:
+            logger.warning(f"Failed to apply schema statement on backup: {e}")
+
+
+def _record_fingerprints(db, modules: list[SchemaModule]) -> None:
+    from stock_datasource.models.database import _to_clickhouse_literal
+
+    now = _to_clickhouse_literal(datetime.now())
+    values = ", ".join(
+        f"({_to_clickhouse_literal(m.name)}, {_to_clickhouse_literal(m.fingerprint)}, {now})"
+        for m in modules
+    )
+    try:
+        db.execute(
+            f"INSERT INTO {FINGERPRINT_TABLE} (module, fingerprint, applied_at) VALUES {values}"
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record schema fingerprints: {e}")
+
+
+def bootstrap_schemas(
+    modules: Iterable[SchemaModule],
+    db=None,
+    max_workers: int | None = None,
+    client_factory: Callable[[], Any] | None = None,
+) -> BootstrapResult:
+    """Apply changed schema modules concurrently, skipping unchanged ones.
+
+    Args:
+        modules: Schema modules to ensure.
+        db: Client used for the metadata read/write (default: ``db_client``).
+        max_workers: Pool size (default: ``settings.SCHEMA_BOOTSTRAP_WORKERS``).
+        client_factory: Creates the per-worker client for statement modules.
+
+    Returns:
+        Which modules were applied, skipped or failed.
+    """
+    if db is None:
+        from stock_datasource.models.database import db_client as db
+    if max_workers is None:
+        max_workers = settings.SCHEMA_BOOTSTRAP_WORKERS
+    client_factory = client_factory or _default_client_factory
+
+    modules = list(modules)
+    result = BootstrapResult()
+    metadata = _read_metadata(db)
+    if metadata is None:
+        # First start (or database missing): create the metadata table first
+        try:
+            db.create_database(settings.CLICKHOUSE_DATABASE)
+            db.execute(_FINGERPRINT_TABLE_DDL)
+        except Exception as e:
+            logger.warning(f"Failed to create {FINGERPRINT_TABLE}: {e}")
+        fingerprints, existing = {}, set()
+    else:
+        fingerprints, existing = metadata
+
+    pending = []
+    for module in modules:
+        if fingerprints.get(module.name) == module.fingerprint and module.tables <= existing:
+            result.skipped.append(module.name)
+        else:
+            pending.append(module)
+
+    if pending:
+        local = threading.local()
+        clients: list[Any] = []
+        clients_lock = threading.Lock()
+
+        def _worker_client():
+            if not hasattr(local, "client"):
+                local.client = client_factory()
+                with clients_lock:
+                    clients.append(local.client)
+            return local.client
+
+        def _apply(module: SchemaModule) -> None:
+            if module.apply is not None:
+                module.apply()
+                return
+            client = _worker_client()
+            for statement in module.statements:
+                _run_statement(client, statement)
+
+        workers = max(1, min(max_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schema-bootstrap") as pool:
+            futures = {module.name: pool.submit(_apply, module) for module in pending}
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+        for module in pending:
+            error = futures[module.name].exception()
+            if error is None:
+                result.applied.append(module.name)
+            else:
+                result.failed[module.name] = str(error)
+                logger.warning(f"Schema module {module.name} failed: {error}")
+
+        succeeded = [m for m in pending if m.name in result.applied]
+        if succeeded:
+            _record_fingerprints(db, succeeded)
+
+    logger.info(
+        f"Schema bootstrap: {len(result.applied)} applied, "
+        f"{len(result.skipped)} unchanged, {len(result.failed)} failed"
+    )
+    return result
+
+
+def startup_schema_modules(plugin_manager=None) -> list[SchemaModule]:
+    """Schema modules ensured by the HTTP server on startup."""
+    from stock_datasource.models.schemas import PREDEFINED_SCHEMAS
+    from stock_datasource.modules.financial_analysis.tables import FINANCIAL_ANALYSIS_TABLES
+    from stock_datasource.modules.portfolio.init import (
+        ensure_portfolio_tables,
+        ensure_profile_id_column,
+    )
+    from stock_datasource.modules.profile.service import get_profile_service
+    from stock_datasource.utils.schema_manager import dict_to_schema, schema_manager
+
+    profile_service = get_profile_service()
+    modules = [
+        SchemaModule.from_functions(
+            "portfolio",
+            ensure_portfolio_tables,
+            partial(ensure_profile_id_column, strict=True),
+        ),
+        SchemaModule(
+            name="profile",
+            apply=partial(profile_service.ensure_table, strict=True),
+            ddl=inspect.getsource(type(profile_service).ensure_table),
+        ),
+    ]
+    modules.extend(
+        SchemaModule(name=f"financial_analysis.{table}", statements=[sql])
+        for table, sql in FINANCIAL_ANALYSIS_TABLES.items()
+    )
+
+    open_api_schema = Path(__file__).resolve().parents[1] / "modules" / "open_api" / "schema.sql"
+    try:
+        with open(open_api_schema, encoding="utf-8") as f:
+            statements = [s.strip() for s in f.read().split(";") if s.strip()]
+        modules.append(SchemaModule(name="open_api", statements=statements))
+    except OSError as e:
+        logger.warning(f"Open API schema not found: {e}")
+
+    modules.extend(
+        SchemaModule(
+            name=f"predefined.{schema.table_name}",
+            statements=[schema_manager._build_create_table_sql(schema)],
+        )
+        for schema in PREDEFINED_SCHEMAS.values()
+    )
+
+    if plugin_manager is not None:
+        required_env = os.getenv("REQUIRED_PLUGIN_TABLES", "")
+        required = [p.strip() for p in required_env.split(",") if p.strip()]
+        for plugin_name in required or DEFAULT_REQUIRED_PLUGINS:
+            plugin = plugin_manager.get_plugin(plugin_name)
+            if not plugin:
+                logger.warning(f"Required plugin not found: {plugin_name}")
+                continue
+            schema_dict = plugin.get_schema()
+            if not schema_dict or not schema_dict.get("table_name"):
+                logger.warning(f"Plugin {plugin_name} schema is empty")
+                continue
+            try:
+                sql = schema_manager._build_create_table_sql(dict_to_schema(schema_dict))
+            except Exception as e:
+                logger.warning(f"Failed to build table DDL for plugin {plugin_name}: {e}")
+                continue
+            modules.append(SchemaModule(name=f"plugin.{plugin_name}", statements=[sql]))
+
+    return modules
@@ -0,0 +1,146 @@
+"""Tests for adjusted price series and the adjusted price store."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from stock_datasource.utils.adjusted_prices import (
+    AdjustedPriceStore,
+    adjust_records,
+    asof_adjust,
+)
+
+
+def _prices() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ts_code": ["A", "A", "A", "B", "B"],
+            "trade_date": ["20240102", "20240103", "20240104", "20240102", "20240103"],
+            "close": [10.0, 10.0, 5.0, 20.0, 20.0],
+        }
+    )
+
+
+def _factors() -> pd.DataFrame:
+    # A has no factor on 20240103 (as-of uses 20240102); B splits on 20240103
+    return pd.DataFrame(
+        {
+            "ts_code": ["A", "A", "B", "B"],
+            "trade_date": ["2024-01-02", "2024-01-04", "2024-01-02", "2024-01-03"],
+            "adj_factor": [1.0, 2.0, 3.0, 6.0],
+        }
+    )
+
+
+class TestAsofAdjust:
+    def test_qfq_divides_by_latest_factor_per_code(self):
+        result = asof_adjust(_prices(), _factors(), "qfq")
+        assert result["close"].tolist() == [5.0, 5.0, 5.0, 10.0, 20.0]
+
+    def test_hfq_multiplies_by_asof_factor(self):
+        result = asof_adjust(_prices(), _factors(), "hfq")
+        assert result["close"].tolist() == [10.0, 10.0, 10.0, 60.0, 120.0]
+
+    def test_bars_before_first_factor_use_latest(self):
+        prices = pd.DataFrame({"trade_date": ["20231229", "20240102"], "close": [8.0, 10.0]})
+        factors = pd.DataFrame({"trade_date": ["20240102"], "adj_factor": [2.0]})
+        assert asof_adjust(prices, factors, "qfq")["close"].tolist() == [8.0, 10.0]
+
+    def test_none_adjust_is_noop(self):
+        prices = _prices()
+        assert asof_adjust(prices, _factors(), "none") is prices
+
+
+class TestAdjustRecords:
+    def test_records_are_adjusted_in_place(self):
+        records = [
+            {"trade_date": "20240102", "open": 10.0, "close": 10.0, "vol": 1},
+            {"trade_date": "20240104", "open": 0, "close": 5.0, "vol": 1},
+        ]
+        factors = [
+            {"trade_date": "20240102", "adj_factor": 1.0},
+            {"trade_date": "20240104", "adj_factor": 2.0},
+        ]
+        adjust_records(records, factors, "qfq")
+        assert records[0]["close"] == pytest.approx(5.0)
+        assert records[1]["close"] == pytest.approx(5.0)
+        assert records[1]["open"] == 0  # missing prices stay untouched
+        assert records[0]["vol"] == 1
+
+
+class TestAdjustedPriceStore:
+    def test_refresh_inserts_asof_joined_rows_for_loaded_dates(self):
+        db = MagicMock()
+        store = AdjustedPriceStore(db=db)
+        store.on_data_loaded(
+            "hk_stock", pd.DataFrame({"trade_date": ["20240103", "20240102", "20240103"]})
+        )
+        db.create_table.assert_called_once()
+        query = db.execute.call_args.args[0]
+        assert "INSERT INTO fact_adjusted_daily" in query
+        assert "FROM ods_hk_daily FINAL" in query
+        assert "cum_adjfactor AS factor" in query
+        # Bars before the first factor are kept (adj_factor 0, no hfq prices)
+        assert "ASOF LEFT JOIN" in query
+        assert "ifNull(a.factor, 0) AS adj_factor" in query
+        assert "IN ('2024-01-02', '2024-01-03')" in query
+        # Only the touched partitions, plus one month of factor lookback
+        assert "toYYYYMM(trade_date) IN (202401)" in query
+        assert "trade_date >= '2023-12-01'" in query
+
+    def test_refresh_errors_do_not_propagate(self):
+        db = MagicMock()
+        db.execute.side_effect = ConnectionError("down")
+        AdjustedPriceStore(db=db).on_data_loaded(
+            "a_share", pd.DataFrame({"trade_date": ["20240102"]})
+        )
+
+    def test_qfq_read_uses_latest_factor_in_range(self):
+        db = MagicMock()
+        AdjustedPriceStore(db=db).get_adjusted("000001.SZ", "20240101", "20240131")
+        query, params = db.execute_query.call_args.args
+        assert "s.hfq_close / base.factor" in query
+        # Same base as asof_adjust given the range's factors
+        assert "argMax(adj_factor, trade_date) AS factor" in query
+        assert "FROM ods_adj_factor FINAL" in query
+        # Bars before the first known factor keep their raw price (ratio 1)
+        assert "if(s.adj_factor > 0, s.hfq_close / base.factor, s.close)" in query
+        assert params == {"code": "000001.SZ", "start": "2024-01-01", "end": "2024-01-31"}
+
+    def test_truncated_store_is_not_trusted(self):
+        db = MagicMock()
+        db.execute_query.return_value = pd.DataFrame(
+            {"trade_date": ["2024-01-02", "2024-01-03"], "close": [1.0, 2.0], "raw_bars": [3, 3]}
+        )
+        df = AdjustedPriceStore(db=db).get_adjusted("000001.SZ", "20240101", "20240131")
+        assert df.empty
+
+    def test_complete_store_is_returned(self):
+        db = MagicMock()
+        db.execute_query.return_value = pd.DataFrame(
+            {"trade_date": ["2024-01-02", "2024-01-03"], "close": [1.0, 2.0], "raw_bars": [2, 2]}
+        )
+        df = AdjustedPriceStore(db=db).get_adjusted("00700.HK", "20240101", "20240131")
+        assert list(df.columns) == ["trade_date", "close"]
+        assert "FROM ods_hk_daily FINAL" in db.execute_query.call_args.args[0]
+
+    def test_window_falls_back_when_store_lags(self):
+        db = MagicMock()
+        db.execute_query.return_value = pd.DataFrame({"stored": [90], "raw": [100]})
+        assert AdjustedPriceStore(db=db).load_a_share_window(400).empty
+        assert db.execute_query.call_count == 1
+
+    def test_backfill_refreshes_missing_dates_in_chunks(self):
+        db = MagicMock()
+        dates = [f"2024-01-{d:02d}" for d in range(1, 26)]
+        db.execute_query.return_value = pd.DataFrame({"trade_date": dates})
+        store = AdjustedPriceStore(db=db)
+
+        assert store.backfill("a_share") == 25
+
+        assert "s.n < d.n" in db.execute_query.call_args.args[0]
+        inserts = [call.args[0] for call in db.execute.call_args_list]
+        assert len(inserts) == 2
+        assert "'2024-01-20'" in inserts[0] and "'2024-01-21'" not in inserts[0]
+        assert "'2024-01-25'" in inserts[1]
@@ -0,0 +1,117 @@
+"""Tests for the Akinator bitmap candidate universe."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from stock_datasource.modules.akinator import service, universe as universe_module
+from stock_datasource.modules.akinator.schemas import Predicate, QuestionDTO
+from stock_datasource.modules.akinator.universe import StockUniverse
+
+from tests.test_akinator import MOCK_MATRIX
+
+
+@pytest.fixture(autouse=True)
+def fresh_universe():
+    universe_module.invalidate_universe()
+    yield
+    universe_module.invalidate_universe()
+
+
+def _universe() -> StockUniverse:
+    return StockUniverse(MOCK_MATRIX)
+
+
+class TestStockUniverse:
+    @pytest.mark.parametrize(
+        "predicate",
+        [
+            Predicate(field="in_hs300", op="equals", value=True),
+            Predicate(field="industry", op="in_list", value=["银行", "保险"]),
+            Predicate(field="industry", op="contains", value="电"),
+            Predicate(field="concepts", op="contains", value="金融"),
+            Predicate(field="market", op="equals", value="主板"),
+            Predicate(field="total_mv", op="gte", value=5_000_000 * 10000),
+            Predicate(field="list_date", op="lt", value="2010-01-01"),
+            Predicate(field="pe_ttm", op="lt", value=10),
+        ],
+    )
+    def test_bitsets_agree_with_row_evaluation(self, predicate):
+        u = _universe()
+        expected = {c for c, s in MOCK_MATRIX.items() if service._matches(s, predicate)}
+        assert set(u.codes_for(u.mask_for(predicate))) == expected
+
+    def test_filter_and_counts(self):
+        u = _universe()
+        hs300 = Predicate(field="in_hs300", op="equals", value=True)
+        no = u.candidates().filter(hs300, "no")
+        assert len(no) == 1
+        assert no.codes() == ["688981.SH"]
+        assert u.candidates().filter(hs300, "unknown").mask == u.full
+        assert u.candidates().value_counts("concepts")["大金融"] == 2
+
+    def test_bitmap_round_trip(self):
+        u = _universe()
+        mask = u.mask_from_codes(["300750.SZ", "688981.SH"])
+        assert StockUniverse.decode(StockUniverse.encode(mask)) == mask
+        assert StockUniverse.decode(StockUniverse.encode(0)) == 0
+
+    def test_translate_between_universes(self):
+        old = _universe()
+        new = StockUniverse(dict(reversed(MOCK_MATRIX.items())))
+        mask = old.mask_from_codes(["600519.SH", "000001.SZ"])
+        assert set(new.codes_for(new.translate(mask, old))) == {"600519.SH", "000001.SZ"}
+
+    def test_universe_is_process_resident(self):
+        loader = lambda: MOCK_MATRIX  # noqa: E731
+        first = universe_module.get_stock_universe(loader)
+        assert universe_module.get_stock_universe(lambda: {}) is first
+
+
+class TestSessionBitmap:
+    @pytest.fixture
+    def cache(self):
+        store = {}
+
+        class FakeCache:
+            def get(self, key):
+                return store.get(key)
+
+            def set(self, key, value, ttl=300):
+                store[key] = value
+                return True
+
+            def delete(self, key):
+                store.pop(key, None)
+                return True
+
+        with patch.object(service, "get_cache_service", return_value=FakeCache()), \
+                patch.object(service, "get_stock_matrix", return_value=MOCK_MATRIX):
+            yield store
+
+    @pytest.mark.asyncio
+    async def test_session_stores_bitmap_and_replays_on_new_universe(self, cache):
+        question = QuestionDTO(
+            question="是沪深300成分股吗?",
+            predicate=Predicate(field="in_hs300", op="equals", value=True),
+        )
+
+        async def pick(*args, **kwargs):
+            return question, 0
+
+        with patch.object(service, "pick_next_question", side_effect=pick):
+            start = await service.start_session(user_id="u1")
+            await service.answer_session(start["session_id"], "yes", user_id="u1")
+
+        state = service._load_session(start["session_id"])
+        assert "candidate_codes" not in state
+        assert state["universe_version"] == universe_module.get_stock_universe(dict).version
+
+        # A universe built with another stock order (e.g. in a new process)
+        universe_module.invalidate_universe()
+        reordered = StockUniverse(dict(reversed(MOCK_MATRIX.items())))
+        candidates = service._session_candidates(state, reordered)
+        assert "688981.SH" not in candidates.codes()
+        assert len(candidates) == 4
@@ -748,6 +748,128 @@ class TestAPIModels:
         assert request.mode == "debate"
 
 
+# =============================================================================
+# Test Thinking Stream Store and Writer
+# =============================================================================
+
+
+class TestMessageStore:
+    """Test the indexed ring-buffer message store."""
+
+    def _message(self, index, base, **kwargs):
+        from stock_datasource.arena import ThinkingMessage
+
+        return ThinkingMessage(
+            arena_id=kwargs.pop("arena_id", "arena_1"),
+            content=f"msg {index}",
+            timestamp=base + timedelta(seconds=index),
+            **kwargs,
+        )
+
+    def test_filters_and_limit(self):
+        """Filtered queries return the newest matches in order."""
+        from stock_datasource.arena import MessageType
+        from stock_datasource.arena.stream_processor import MessageStore
+
+        store = MessageStore()
+        base = datetime(2026, 1, 1)
+        for i in range(20):
+            store.add_message(
+                self._message(
+                    i,
+                    base,
+                    round_id=f"round_{i % 2}",
+                    agent_id=f"agent_{i % 4}",
+                    message_type=MessageType.SYSTEM
+                    if i % 5 == 0
+                    else MessageType.THINKING,
+                )
+            )
+
+        msgs = store.get_messages("arena_1", round_id="round_0", limit=3)
+        assert [m.content for m in msgs] == ["msg 14", "msg 16", "msg 18"]
+
+        msgs = store.get_messages(
+            "arena_1", agent_id="agent_0", message_type=MessageType.SYSTEM
+        )
+        assert [m.content for m in msgs] == ["msg 0"]
+
+        assert store.get_messages("missing_arena") == []
+
+    def test_since_query(self):
+        """Since queries only return messages newer than the cursor."""
+        from stock_datasource.arena.stream_processor import MessageStore
+
+        store = MessageStore()
+        base = datetime(2026, 1, 1)
+        for i in range(10):
+            store.add_message(self._message(i, base))
+
+        msgs = store.get_messages("arena_1", since=base + timedelta(seconds=6))
+        assert [m.content for m in msgs] == ["msg 7", "msg 8", "msg 9"]
+        assert store.get_messages("arena_1", since=base + timedelta(hours=1)) == []
+
+    def test_ring_buffer_eviction(self):
+        """Oldest messages are evicted from storage and indexes."""
+        from stock_datasource.arena.stream_processor import MessageStore
+
+        store = MessageStore(max_messages_per_arena=5)
+        base = datetime(2026, 1, 1)
+        for i in range(12):
+            store.add_message(self._message(i, base, round_id=f"round_{i % 3}"))
+
+        msgs = store.get_messages("arena_1")
+        assert [m.content for m in msgs] == [f"msg {i}" for i in range(7, 12)]
+
+        msgs = store.get_messages("arena_1", round_id="round_1")
+        assert [m.content for m in msgs] == ["msg 7", "msg 10"]
+
+        store.clear_arena("arena_1")
+        assert store.get_messages("arena_1") == []
+
+
+class TestThinkingMessageWriter:
+    """Test batched thinking message persistence."""
+
+    def test_write_is_batched(self):
+        """Queued messages are flushed with a single INSERT."""
+        import asyncio
+        from unittest.mock import MagicMock
+
+        from stock_datasource.arena import ThinkingMessage
+        from stock_datasource.arena.persistence import ThinkingMessageWriter
+
+        client = MagicMock()
+        writer = ThinkingMessageWriter(batch_size=50, flush_interval=0.05)
+        writer._client = client
+
+        async def run():
+            for i in range(10):
+                assert await writer.write(
+                    ThinkingMessage(arena_id="arena_1", content=f"msg {i}")
+                )
+            await writer.flush()
+            await writer.close()
+
+        asyncio.run(run())
+
+        assert client.execute.call_count == 1
+        rows = client.execute.call_args[0][1]
+        assert [row[6] for row in rows] == [f"msg {i}" for i in range(10)]
+
+    def test_write_without_client(self):
+        """Write reports failure when ClickHouse is unavailable."""
+        import asyncio
+
+        from stock_datasource.arena import ThinkingMessage
+        from stock_datasource.arena.persistence import ThinkingMessageWriter
+
+        writer = ThinkingMessageWriter()
+        writer._client = False
+
+        assert asyncio.run(writer.write(ThinkingMessage())) is False
+
+
 # =============================================================================
 # Test Exceptions
 # =============================================================================
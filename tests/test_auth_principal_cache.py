@@ -0,0 +1,188 @@
+"""Tests for the authenticated-principal cache used by JWT and API key auth."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from stock_datasource.modules.auth.principal_cache import (
+    LastUsedTracker,
+    PrincipalCache,
+    get_api_key_cache,
+    get_user_cache,
+)
+
+
+class TestPrincipalCache:
+    def test_get_set_and_invalidate(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+        cache.set("u1", {"id": "u1"})
+        assert cache.get("u1") == {"id": "u1"}
+        cache.invalidate("u1")
+        assert cache.get("u1") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_expired_entries_are_dropped(self):
+        cache = PrincipalCache(ttl_seconds=10, max_entries=10)
+        with patch(
+            "stock_datasource.modules.auth.principal_cache.time.monotonic",
+            side_effect=[100.0, 105.0, 111.0],
+        ):
+            cache.set("k", 1)
+            assert cache.get("k") == 1
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate_where(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+        cache.set("h1", {"user_id": "u1"})
+        cache.set("h2", {"user_id": "u2"})
+        assert cache.invalidate_where(lambda v: v["user_id"] == "u1") == 1
+        assert cache.get("h1") is None
+        assert cache.get("h2") == {"user_id": "u2"}
+
+    def test_invalidation_reaches_other_processes(self):
+        shared = {}
+        fake_redis = MagicMock()
+        fake_redis.get.side_effect = shared.get
+        fake_redis.set.side_effect = lambda key, value, ttl: shared.__setitem__(key, value) or True
+
+        worker_a = PrincipalCache(60, 10, name="api_key", sync_interval=5)
+        worker_b = PrincipalCache(60, 10, name="api_key", sync_interval=5)
+        with patch(
+            "stock_datasource.services.cache_service.get_cache_service",
+            return_value=fake_redis,
+        ), patch(
+            "stock_datasource.modules.auth.principal_cache.time.monotonic",
+            side_effect=[100.0, 100.0, 101.0, 106.0],
+        ):
+            worker_b.set("h1", {"user_id": "u1"})
+            assert worker_b.get("h1") == {"user_id": "u1"}
+            worker_a.invalidate("h1")
+            # Within the sync interval worker B still serves its entry
+            assert worker_b.get("h1") == {"user_id": "u1"}
+            # After it, B sees the new generation and drops everything
+            assert worker_b.get("h1") is None
+
+    def test_unnamed_cache_never_touches_redis(self):
+        cache = PrincipalCache(60, 10)
+        with patch(
+            "stock_datasource.services.cache_service.get_cache_service"
+        ) as get_cache_service:
+            cache.set("k", 1)
+            cache.get("k")
+            cache.invalidate("k")
+        get_cache_service.assert_not_called()
+
+    def test_ttls_come_from_settings(self):
+        from stock_datasource.config.settings import settings
+
+        assert get_user_cache().ttl_seconds == settings.AUTH_USER_CACHE_TTL
+        assert get_api_key_cache().max_entries == settings.AUTH_API_KEY_CACHE_MAX_ENTRIES
+
+
+class TestLastUsedTracker:
+    def test_touch_coalesces_until_flush(self):
+        flushed = []
+        tracker = LastUsedTracker(flushed.append, interval=3600)
+        t1 = datetime(2026, 1, 1, 9, 30)
+        t2 = t1 + timedelta(seconds=5)
+        tracker.touch("k1", t1)
+        tracker.touch("k1", t2)
+        tracker.touch("k2", t1)
+
+        assert tracker.flush() == 2
+        assert flushed == [{"k1": t2, "k2": t1}]
+        assert tracker.flush() == 0
+
+
+class TestCachedApiKeyValidation:
+    def setup_method(self):
+        get_api_key_cache().clear()
+        get_user_cache().clear()
+
+    def teardown_method(self):
+        get_api_key_cache().clear()
+        get_user_cache().clear()
+
+    def test_validate_api_key_hits_database_once(self):
+        from stock_datasource.modules.mcp_api_key.service import McpApiKeyService
+
+        service = McpApiKeyService()
+        service.client = MagicMock()
+        service.client.query.return_value = [
+            {"id": "key-1", "user_id": "u1", "is_active": 1, "expires_at": None}
+        ]
+        service._last_used = LastUsedTracker(lambda pending: None, interval=3600)
+        get_user_cache().set("u1", {"id": "u1", "email": "a@b.c"})
+
+        with patch(
+            "stock_datasource.modules.mcp_api_key.service._ensure_tables"
+        ):
+            for _ in range(3):
+                ok, user, key_id = service.validate_api_key("sk-test")
+                assert ok
+                assert key_id == "key-1"
+                assert user["id"] == "u1"
+
+        assert service.client.query.call_count == 1
+        service.client.primary.execute.assert_not_called()
+
+    def test_expired_cached_key_is_rejected(self):
+        from stock_datasource.modules.mcp_api_key.service import McpApiKeyService
+
+        service = McpApiKeyService()
+        service.client = MagicMock()
+        service.client.query.return_value = [
+            {
+                "id": "key-1",
+                "user_id": "u1",
+                "is_active": 1,
+                "expires_at": datetime.now() - timedelta(days=1),
+            }
+        ]
+
+        with patch(
+            "stock_datasource.modules.mcp_api_key.service._ensure_tables"
+        ):
+            ok, _, _ = service.validate_api_key("sk-expired")
+        assert not ok
+
+    def test_user_change_drops_that_users_keys(self):
+        from stock_datasource.modules.auth.service import AuthService
+
+        get_api_key_cache().set("h1", {"id": "key-1", "user_id": "u1"})
+        get_api_key_cache().set("h2", {"id": "key-2", "user_id": "u2"})
+        get_user_cache().set("u1", {"id": "u1"})
+
+        AuthService.invalidate_user(MagicMock(), "u1")
+
+        assert get_user_cache().get("u1") is None
+        assert get_api_key_cache().get("h1") is None
+        assert get_api_key_cache().get("h2") == {"id": "key-2", "user_id": "u2"}
+
+    def test_flush_last_used_filters_ids_with_a_tuple(self):
+        from clickhouse_driver.util.escape import escape_params
+
+        from stock_datasource.modules.mcp_api_key.service import McpApiKeyService
+
+        service = McpApiKeyService()
+        service.client = MagicMock()
+        t1 = datetime(2024, 1, 2, 3, 4, 5)
+        service._flush_last_used({"k1": t1, "k2": t1})
+
+        query, params = service.client.primary.execute.call_args.args
+        context = MagicMock()
+        context.server_info.get_timezone.return_value = "UTC"
+        rendered = query % escape_params(params, context)
+        assert "WHERE id IN ('k1', 'k2')" in rendered
+        assert "indexOf(['k1', 'k2'], id)" in rendered
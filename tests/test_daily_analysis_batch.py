@@ -0,0 +1,189 @@
+"""Tests for the set-based daily position analysis."""
+
+import asyncio
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from stock_datasource.services.daily_analysis_service import PortfolioAnalysisService
+
+ANALYSIS_DATE = date(2026, 1, 9)
+
+
+def _positions(users):
+    rows = []
+    for user_id in users:
+        for ts_code, name in [
+            ("600519.SH", "贵州茅台"),
+            ("000858.SZ", "五粮液"),
+            ("300750.SZ", "宁德时代"),
+        ]:
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "ts_code": ts_code,
+                    "stock_name": name,
+                    "quantity": 100,
+                    "cost_price": 100.0,
+                    "current_price": 100.0,
+                    "market_value": 10000.0,
+                    "profit_loss": 0.0,
+                    "profit_rate": 0.0,
+                    "sector": "消费",
+                    "industry": "白酒",
+                    "buy_date": date(2025, 6, 1),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _fake_db(users):
+    def execute_query(sql, params=None):
+        if "user_positions" in sql:
+            return _positions(users)
+        if "technical_indicators" in sql:
+            return pd.DataFrame(
+                {
+                    "ts_code": ["600519.SH", "000858.SZ"],
+                    "indicator_date": [ANALYSIS_DATE, ANALYSIS_DATE],
+                    "ma5": [12, 8],
+                    "ma10": [11, 9],
+                    "ma20": [10, 10],
+                    "rsi": [50, 80],
+                    "macd": [0.2, -0.1],
+                    "macd_signal": [0.1, 0.1],
+                }
+            )
+        if "ods_daily_basic" in sql:
+            return pd.DataFrame(
+                {
+                    "ts_code": ["600519.SH", "000858.SZ"],
+                    "fundamental_date": [ANALYSIS_DATE, ANALYSIS_DATE],
+                    "pe_ttm": [25.0, None],
+                    "pb": [8.0, 12.0],
+                    "total_mv": [2e8, 5e7],
+                }
+            )
+        if "GROUP BY ts_code" in sql:
+            return pd.DataFrame(
+                {
+                    "ts_code": ["600519.SH"],
+                    "price_date": [ANALYSIS_DATE],
+                    "close": [125.0],
+                    "pct_chg": [1.5],
+                }
+            )
+        return pd.DataFrame()
+
+    db = MagicMock()
+    db.execute_query.side_effect = execute_query
+    return db
+
+
+def _service(db):
+    service = PortfolioAnalysisService()
+    service._db = db
+    return service
+
+
+def test_query_count_does_not_grow_with_users():
+    counts = []
+    for users in (["u1"], ["u1", "u2", "u3", "u4"]):
+        db = _fake_db(users)
+        results = asyncio.run(_service(db).analyze_all_users(ANALYSIS_DATE))
+
+        assert set(results) == set(users)
+        assert db.insert_dataframe.call_count == 1
+        counts.append(db.execute_query.call_count)
+
+    # positions, technicals, prices, fundamentals and market indices
+    assert counts == [5, 5]
+
+
+def test_market_data_loaded_for_all_codes_at_once():
+    db = _fake_db(["u1", "u2"])
+    asyncio.run(_service(db).analyze_all_users(ANALYSIS_DATE))
+
+    code_params = [
+        call.args[1]["ts_codes"]
+        for call in db.execute_query.call_args_list
+        if len(call.args) > 1 and "ts_codes" in call.args[1]
+    ]
+    assert code_params == [("000858.SZ", "300750.SZ", "600519.SH")] * 3
+
+
+def test_scores_match_scalar_rules():
+    db = _fake_db(["u1"])
+    results = asyncio.run(_service(db).analyze_all_users(ANALYSIS_DATE))
+    stocks = results["u1"]["stock_analyses"]
+
+    # Uptrend, neutral RSI, bullish MACD
+    assert stocks["600519.SH"]["technical_score"] == 85.0
+    # Downtrend, overbought RSI, bearish MACD
+    assert stocks["000858.SZ"]["technical_score"] == 20.0
+    # No indicators computed yet
+    assert stocks["300750.SZ"]["technical_score"] == 65.0
+
+    assert stocks["600519.SH"]["fundamental_score"] == 75.0
+    assert stocks["000858.SZ"]["fundamental_score"] == 45.0
+    assert stocks["300750.SZ"]["fundamental_score"] == 70.0
+
+    # Revalued at the latest close: +25% moves the position into high risk
+    assert stocks["600519.SH"]["current_price"] == 125.0
+    assert stocks["600519.SH"]["profit_rate"] == 25.0
+    assert stocks["600519.SH"]["risk_score"] == 70.0
+    assert stocks["000858.SZ"]["risk_score"] == 50.0
+
+    assert stocks["600519.SH"]["recommendation"] == "hold"
+    assert stocks["000858.SZ"]["recommendation"] == "sell"
+    assert stocks["300750.SZ"]["recommendation"] == "buy"
+    assert results["u1"]["portfolio_metrics"]["total_value"] == 32500.0
+
+
+def test_single_user_analysis_filters_positions():
+    db = _fake_db(["u1"])
+    service = _service(db)
+    service.user_id = "u1"
+
+    analysis = asyncio.run(service._generate_analysis(ANALYSIS_DATE, "daily"))
+
+    assert analysis["user_id"] == "u1"
+    assert len(analysis["stock_analyses"]) == 3
+    positions_call = db.execute_query.call_args_list[0]
+    assert positions_call.args[1] == {"user_ids": ("u1",)}
+
+
+def test_manual_analysis_writes_portfolio_analysis_for_one_user():
+    from stock_datasource.tasks.daily_portfolio_analysis_task import (
+        DailyPortfolioAnalysisTask,
+    )
+
+    db = _fake_db(["u1"])
+    task = DailyPortfolioAnalysisTask()
+    task._portfolio_analysis_service = _service(db)
+
+    result = asyncio.run(task.run_manual_analysis("u1", ANALYSIS_DATE))
+
+    assert result["status"] == "success"
+    assert result["analysis_type"] == "manual"
+    assert result["analysis_date"] == str(ANALYSIS_DATE)
+    assert db.execute_query.call_args_list[0].args[1] == {"user_ids": ("u1",)}
+    [insert] = db.insert_dataframe.call_args_list
+    assert insert.args[0] == "portfolio_analysis"
+
+
+def test_manual_analysis_without_positions_reports_error():
+    from stock_datasource.tasks.daily_portfolio_analysis_task import (
+        DailyPortfolioAnalysisTask,
+    )
+
+    db = MagicMock()
+    db.execute_query.return_value = pd.DataFrame()
+    task = DailyPortfolioAnalysisTask()
+    task._portfolio_analysis_service = _service(db)
+
+    result = asyncio.run(task.run_manual_analysis("u1", ANALYSIS_DATE))
+
+    assert result["status"] == "error"
+    db.insert_dataframe.assert_not_called()
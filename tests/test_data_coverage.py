@@ -0,0 +1,167 @@
+"""Tests for batched, incremental missing-data coverage."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from stock_datasource.modules.datamanage.coverage import CoverageEngine, TableCoverage
+
+DAYS = ["2024-01-02", "2024-01-03", "2024-01-04"]
+
+
+def _db(present: dict[str, list[str]]) -> MagicMock:
+    """Fake client answering the coverage, system.columns and UNION ALL queries."""
+    db = MagicMock(spec=["database", "create_table", "execute_query", "insert_dataframe"])
+    db.database = "stock"
+    saved = []
+
+    def execute_query(query, params=None):
+        if "count() AS n" in query:
+            return pd.DataFrame({"n": [len(saved)], "ts": [len(saved)]})
+        if "FROM sys_data_coverage" in query:
+            # FINAL: the latest row per table wins
+            latest = {row["table_name"]: row for row in saved}
+            return pd.DataFrame(list(latest.values()))
+        if "system.columns" in query:
+            return pd.DataFrame(
+                [
+                    {"table": "ods_daily", "name": "trade_date", "type": "Date"},
+                    {"table": "ods_moneyflow", "name": "trade_date", "type": "String"},
+                ]
+            )
+        rows = [
+            {"tbl": t, "d": d}
+            for t, dates in present.items()
+            if f"'{t}' AS tbl" in query
+            for d in dates
+        ]
+        return pd.DataFrame(rows, columns=["tbl", "d"])
+
+    db.execute_query.side_effect = execute_query
+    db.insert_dataframe.side_effect = lambda table, df: saved.extend(
+        df.to_dict("records")
+    )
+    return db
+
+
+def _union_queries(db: MagicMock) -> list[str]:
+    return [
+        c.args[0]
+        for c in db.execute_query.call_args_list
+        if "GROUP BY d" in c.args[0]
+    ]
+
+
+class TestTableCoverage:
+    def test_add_extends_anchor_backwards(self):
+        cov = TableCoverage("t", "trade_date")
+        cov.add([date(2024, 1, 5)])
+        cov.add([date(2024, 1, 2)])
+        assert cov.anchor == date(2024, 1, 2)
+        assert cov.has(date(2024, 1, 5)) and cov.has(date(2024, 1, 2))
+        assert not cov.has(date(2024, 1, 3))
+
+        restored = TableCoverage.decode("t", "trade_date", cov.anchor, cov.encode())
+        assert restored.bits == cov.bits
+
+
+class TestCoverageEngine:
+    def test_all_tables_checked_in_one_query(self):
+        db = _db({"ods_daily": ["2024-01-02", "2024-01-04"], "ods_moneyflow": DAYS})
+        engine = CoverageEngine(db=db)
+
+        missing = engine.missing_dates(
+            {"ods_daily": "trade_date", "ods_moneyflow": "trade_date", "ods_gone": "trade_date"},
+            DAYS,
+        )
+
+        assert missing == {
+            "ods_daily": ["2024-01-03"],
+            "ods_moneyflow": [],
+            "ods_gone": DAYS,
+        }
+        (query,) = _union_queries(db)
+        assert "UNION ALL" in query
+        # String dates are range-compared raw (both spellings), never parsed
+        assert "parseDateTime" not in query
+        assert (
+            "((trade_date >= '20240102' AND trade_date < '20240105') OR "
+            "(trade_date >= '2024-01-02' AND trade_date < '2024-01-05'))"
+        ) in query
+        assert "ods_gone" not in query
+
+    def test_known_dates_are_not_queried_again(self):
+        db = _db({"ods_daily": ["2024-01-02", "2024-01-03"]})
+        engine = CoverageEngine(db=db)
+        engine.missing_dates({"ods_daily": "trade_date"}, DAYS[:2])
+
+        # A new engine (new process) restores the persisted bitmap
+        engine = CoverageEngine(db=db)
+        missing = engine.missing_dates({"ods_daily": "trade_date"}, DAYS)
+
+        assert missing == {"ods_daily": ["2024-01-04"]}
+        query = _union_queries(db)[-1]
+        assert "toDate('2024-01-04') AND toDate(trade_date) <= toDate('2024-01-04')" in query
+
+    def test_fully_covered_tables_skip_the_scan(self):
+        db = _db({"ods_daily": DAYS})
+        engine = CoverageEngine(db=db)
+        engine.missing_dates({"ods_daily": "trade_date"}, DAYS)
+        db.execute_query.reset_mock()
+
+        assert engine.missing_dates({"ods_daily": "trade_date"}, DAYS) == {"ods_daily": []}
+        assert _union_queries(db) == []
+
+    def test_invalidate_forces_rescan(self):
+        db = _db({"ods_daily": DAYS})
+        engine = CoverageEngine(db=db)
+        engine.missing_dates({"ods_daily": "trade_date"}, DAYS)
+        engine.invalidate("ods_daily")
+        db.execute_query.reset_mock()
+
+        engine.missing_dates({"ods_daily": "trade_date"}, DAYS)
+        assert len(_union_queries(db)) == 1
+
+    def test_invalidate_from_another_engine_is_picked_up(self):
+        present = {"ods_daily": list(DAYS)}
+        db = _db(present)
+        engine = CoverageEngine(db=db)
+        engine.missing_dates({"ods_daily": "trade_date"}, DAYS)
+
+        # A TaskWorker subprocess reloads the table and invalidates it
+        present["ods_daily"].remove("2024-01-03")
+        CoverageEngine(db=db).invalidate("ods_daily")
+
+        missing = engine.missing_dates({"ods_daily": "trade_date"}, DAYS)
+        assert missing == {"ods_daily": ["2024-01-03"]}
+        # The stale bitmap was not written back over the invalidation
+        fresh = CoverageEngine(db=db)
+        assert fresh.missing_dates({"ods_daily": "trade_date"}, DAYS) == {
+            "ods_daily": ["2024-01-03"]
+        }
+
+    def test_string_dates_in_either_spelling_are_parsed(self):
+        db = _db({"ods_moneyflow": ["20240102", "2024-01-03 00:00:00", "garbage"]})
+        engine = CoverageEngine(db=db)
+
+        missing = engine.missing_dates({"ods_moneyflow": "trade_date"}, DAYS)
+
+        assert missing == {"ods_moneyflow": ["2024-01-04"]}
+
+
+class TestCoverageInvalidation:
+    def test_truncate_invalidates_coverage(self):
+        from unittest.mock import patch
+
+        from stock_datasource.core.base_plugin import BasePlugin
+
+        plugin = MagicMock()
+        with patch(
+            "stock_datasource.modules.datamanage.coverage.get_coverage_engine"
+        ) as get_engine:
+            assert BasePlugin._truncate_table(plugin, "ods_stock_basic")
+            plugin._invalidate_coverage.assert_called_once_with("ods_stock_basic")
+
+            BasePlugin._invalidate_coverage(plugin, "ods_stock_basic")
+        get_engine.return_value.invalidate.assert_called_once_with("ods_stock_basic")
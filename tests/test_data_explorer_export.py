@@ -0,0 +1,87 @@
+"""Tests for streamed SQL data explorer exports."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openpyxl import load_workbook
+
+from stock_datasource.modules.datamanage import data_explorer_service as module
+from stock_datasource.modules.datamanage.data_explorer_service import DataExplorerService
+from stock_datasource.modules.datamanage.schemas import ExportFormat
+
+
+@pytest.fixture
+def service():
+    svc = DataExplorerService()
+    validator = MagicMock()
+    validator.validate.return_value = (True, None)
+    with patch.object(svc, "_get_validator", return_value=validator):
+        yield svc
+
+
+@pytest.fixture
+def db():
+    with patch.object(module, "db_client") as client:
+        yield client
+
+
+def _export(service, fmt, **kwargs):
+    chunks, filename, media_type = service.stream_export(
+        "SELECT ts_code, close FROM ods_daily;", fmt, filename="out", **kwargs
+    )
+    return b"".join(chunks), filename, media_type
+
+
+class TestStreamExport:
+    def test_csv_is_passed_through_with_bom_and_budgets(self, service, db):
+        db.stream.return_value = iter([b"ts_code,close\n", b"000001.SZ,10.5\n"])
+
+        content, filename, media_type = _export(service, ExportFormat.CSV, max_rows=500)
+
+        assert content == b"\xef\xbb\xbfts_code,close\n000001.SZ,10.5\n"
+        assert (filename, media_type) == ("out.csv", "text/csv")
+        query = db.stream.call_args.args[0]
+        assert query == "SELECT * FROM (SELECT ts_code, close FROM ods_daily) LIMIT 500 FORMAT CSVWithNames"
+        ch_settings = db.stream.call_args.kwargs["settings"]
+        assert ch_settings["result_overflow_mode"] == "break"
+        assert ch_settings["max_result_bytes"] == module.settings.EXPLORER_EXPORT_MAX_BYTES
+
+    def test_requested_budget_is_capped_by_settings(self, service, db):
+        db.stream.return_value = iter([b"PAR1"])
+        with patch.object(module.settings, "EXPLORER_EXPORT_MAX_ROWS", 100):
+            content, filename, _ = _export(service, ExportFormat.PARQUET, max_rows=10**9)
+        assert content == b"PAR1"
+        assert filename == "out.parquet"
+        assert "LIMIT 100 FORMAT Parquet" in db.stream.call_args.args[0]
+
+    def test_xlsx_rows_are_written_to_workbook(self, service, db):
+        # A row split across chunk boundaries
+        db.stream.return_value = iter(
+            [b'["ts_code","close"]\n["000001.SZ",1', b'0.5]\n["600000.SH",8]\n']
+        )
+        content, filename, _ = _export(service, ExportFormat.XLSX)
+
+        sheet = load_workbook(io.BytesIO(content)).active
+        assert list(sheet.values) == [
+            ("ts_code", "close"),
+            ("000001.SZ", 10.5),
+            ("600000.SH", 8),
+        ]
+        assert filename == "out.xlsx"
+        assert f"LIMIT {module.XLSX_MAX_DATA_ROWS} " in db.stream.call_args.args[0]
+
+    def test_query_errors_surface_before_streaming(self, service, db):
+        def failing():
+            raise RuntimeError("Code: 60. Unknown table")
+            yield b""
+
+        db.stream.return_value = failing()
+        with pytest.raises(ValueError, match="查询执行失败"):
+            service.stream_export("SELECT 1", ExportFormat.CSV)
+
+    def test_invalid_sql_is_rejected(self, service, db):
+        service._get_validator().validate.return_value = (False, "禁止的关键字: DROP")
+        with pytest.raises(ValueError, match="DROP"):
+            service.stream_export("DROP TABLE x", ExportFormat.CSV)
+        db.stream.assert_not_called()
@@ -67,6 +67,16 @@ def _setup_minimal_deps():
     sys.modules["stock_datasource.utils.logger"].setup_logging = lambda: None
 
 
+@pytest.fixture(autouse=True)
+def _restore_settings_module():
+    """Put the real settings module back after a test installs ``_MockSettings``."""
+    name = "stock_datasource.config.settings"
+    saved = sys.modules.get(name)
+    yield
+    if saved is not None:
+        sys.modules[name] = saved
+
+
 # =============================================================================
 # T1: CacheService reconnection behavior
 # =============================================================================
@@ -0,0 +1,164 @@
+"""Tests for latest-state serving tables and read routing."""
+
+from unittest.mock import MagicMock
+
+from stock_datasource.utils.latest_state import (
+    LATEST_STATE_SPECS,
+    LatestStateManager,
+    LatestStateSpec,
+)
+
+# A non-strict in-place table, read without FINAL once compacted
+_IN_PLACE = LatestStateSpec(
+    "trade_positions", ("account_id", "ts_code"), "last_update", in_place=True
+)
+_SPECS = {**LATEST_STATE_SPECS, _IN_PLACE.table: _IN_PLACE}
+
+
+_COLUMNS = [
+    ("ts_code", "String"),
+    ("end_date", "String"),
+    ("_ingested_at", "DateTime"),
+]
+
+
+def _db(
+    parts: int = 1,
+    serving_exists: bool = True,
+    source_columns=_COLUMNS,
+    serving_columns=_COLUMNS,
+) -> MagicMock:
+    db = MagicMock()
+    db.table_exists.side_effect = lambda t: serving_exists or "_latest" not in t
+    db.get_partition_info.return_value = [
+        {"partition": "tuple()", "partition_id": "all", "parts": parts, "rows": 10}
+    ]
+    db.get_table_schema.side_effect = lambda t: [
+        {"column_name": name, "data_type": data_type}
+        for name, data_type in (
+            serving_columns if t.endswith("_latest") else source_columns
+        )
+    ]
+    return db
+
+
+class TestRouting:
+    def test_compacted_serving_table_is_read_without_final(self):
+        manager = LatestStateManager(db=_db(parts=1), specs=_SPECS)
+        assert manager.source("fact_fina_indicator") == "fact_fina_indicator_latest"
+        assert manager.source("trade_positions") == "trade_positions"
+
+    def test_unmerged_parts_fall_back_to_final(self):
+        manager = LatestStateManager(db=_db(parts=3))
+        assert manager.source("fact_fina_indicator") == "fact_fina_indicator_latest FINAL"
+
+    def test_missing_serving_table_keeps_legacy_query(self):
+        manager = LatestStateManager(db=_db(serving_exists=False), specs=_SPECS)
+        assert manager.source("fact_fina_indicator") is None
+        assert manager.source("trade_positions") == "trade_positions"
+
+    def test_strict_tables_always_use_final(self):
+        manager = LatestStateManager(db=_db(parts=1), specs=_SPECS)
+        assert manager.source("users") == "users FINAL"
+        # Read-modify-write paths (buy/sell, valuation) must never see a
+        # superseded position row, even between compactions
+        assert manager.source("paper_trading_positions") == "paper_trading_positions FINAL"
+
+    def test_merged_state_is_rechecked_on_every_read_by_default(self):
+        db = _db(parts=1)
+        manager = LatestStateManager(db=db, specs=_SPECS)
+        assert manager.source("trade_positions") == "trade_positions"
+        # Another process inserts; no in-process mark_dirty happens
+        db.get_partition_info.return_value[0]["parts"] = 2
+        assert manager.source("trade_positions") == "trade_positions FINAL"
+
+    def test_mark_dirty_forces_recheck(self):
+        db = _db(parts=1)
+        manager = LatestStateManager(db=db, specs=_SPECS, check_interval=3600)
+        assert manager.source("trade_positions") == "trade_positions"
+        db.get_partition_info.return_value[0]["parts"] = 2
+        # Cached state is still trusted...
+        assert manager.source("trade_positions") == "trade_positions"
+        # ...until an in-process write marks the table dirty
+        manager.mark_dirty("trade_positions")
+        assert manager.source("trade_positions") == "trade_positions FINAL"
+
+
+class TestCompaction:
+    def test_creates_serving_table_and_view(self):
+        db = _db(serving_exists=False)
+        specs = {"fact_fina_indicator": LATEST_STATE_SPECS["fact_fina_indicator"]}
+        LatestStateManager(db=db, specs=specs).compact()
+
+        ddl = [c.args[0] for c in db.create_table.call_args_list]
+        assert ddl[0].startswith(
+            "CREATE TABLE IF NOT EXISTS fact_fina_indicator_latest AS fact_fina_indicator"
+        )
+        assert "ReplacingMergeTree(_ingested_at) ORDER BY (ts_code, end_date)" in ddl[0]
+        columns = "`ts_code`, `end_date`, `_ingested_at`"
+        assert ddl[1].endswith(
+            f"TO fact_fina_indicator_latest "
+            f"AS SELECT {columns} FROM fact_fina_indicator"
+        )
+        db.execute.assert_called_once_with(
+            f"INSERT INTO fact_fina_indicator_latest ({columns}) "
+            f"SELECT {columns} FROM fact_fina_indicator"
+        )
+
+    def test_unchanged_schema_keeps_view(self):
+        db = _db()
+        specs = {"fact_fina_indicator": LATEST_STATE_SPECS["fact_fina_indicator"]}
+        LatestStateManager(db=db, specs=specs).compact()
+
+        db.create_table.assert_not_called()
+        db.execute.assert_not_called()
+
+    def test_schema_change_rebuilds_view(self):
+        db = _db(
+            source_columns=[*_COLUMNS[:2], ("roe", "Float64"), _COLUMNS[2]],
+            serving_columns=[
+                ("ts_code", "String"),
+                ("end_date", "Date"),
+                ("_ingested_at", "DateTime"),
+            ],
+        )
+        specs = {"fact_fina_indicator": LATEST_STATE_SPECS["fact_fina_indicator"]}
+        report = LatestStateManager(db=db, specs=specs).compact()
+
+        assert report["fact_fina_indicator"]["ready"] is True
+        executed = [c.args[0] for c in db.execute.call_args_list]
+        assert executed[0] == "DROP VIEW IF EXISTS fact_fina_indicator_latest_mv"
+        db.add_column.assert_called_once_with(
+            "fact_fina_indicator_latest", "`roe` Float64"
+        )
+        db.modify_column.assert_called_once_with(
+            "fact_fina_indicator_latest", "`end_date`", "String"
+        )
+        columns = "`ts_code`, `end_date`, `roe`, `_ingested_at`"
+        ddl = db.create_table.call_args_list[0].args[0]
+        assert ddl.startswith(
+            "CREATE MATERIALIZED VIEW IF NOT EXISTS fact_fina_indicator_latest_mv"
+        )
+        assert f"SELECT {columns} FROM fact_fina_indicator" in ddl
+        assert executed[-1] == (
+            f"INSERT INTO fact_fina_indicator_latest ({columns}) "
+            f"SELECT {columns} FROM fact_fina_indicator"
+        )
+
+    def test_optimizes_only_partitions_with_several_parts(self):
+        db = _db()
+        db.get_partition_info.return_value = [
+            {"partition": "202401", "partition_id": "202401", "parts": 1},
+            {"partition": "202402", "partition_id": "202402", "parts": 4},
+        ]
+        manager = LatestStateManager(
+            db=db, specs={_IN_PLACE.table: _IN_PLACE}, check_interval=3600
+        )
+
+        report = manager.compact()
+
+        db.optimize_table.assert_called_once_with(
+            "trade_positions", final=True, partition_id="202402"
+        )
+        assert report["trade_positions"]["optimized"] == ["202402"]
+        assert manager.source("trade_positions") == "trade_positions"
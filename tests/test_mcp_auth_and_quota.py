@@ -358,3 +358,17 @@ class TestMcpEndpoints:
         data = resp.json()
         assert "error" in data
         assert data["error"]["code"] == -32601
+
+    # --- Shutdown ---
+
+    def test_shutdown_flushes_telemetry_sink(self):
+        from fastapi.testclient import TestClient
+
+        sink = MagicMock()
+        with patch(
+            "stock_datasource.services.telemetry_sink.get_telemetry_sink",
+            return_value=sink,
+        ):
+            with TestClient(self.app):
+                sink.close.assert_not_called()
+        sink.close.assert_called_once()
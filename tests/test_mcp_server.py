@@ -1,9 +1,17 @@
 """Tests for MCP server."""
 
+import asyncio
+import inspect
+import json
+import threading
 from unittest.mock import patch
 
+import pandas as pd
+
 from stock_datasource.services.mcp_server import (
     _discover_services,
+    _encode_tool_result,
+    _make_tool_handler,
     create_mcp_server,
 )
 
@@ -97,3 +105,70 @@ class TestMCPServerIntegration:
 
             # Should return empty list, not raise exception
             assert services == []
+
+
+class TestToolResultEncoding:
+    """Test compact, column-oriented encoding of tool results."""
+
+    def test_dataframe_is_columnar_and_capped(self):
+        df = pd.DataFrame({"ts_code": ["a", "b", "c"], "close": [1.0, float("nan"), 3.0]})
+
+        data = json.loads(_encode_tool_result(df, max_rows=2))
+
+        assert data["row_count"] == 2
+        assert data["total_rows"] == 3
+        assert data["truncated"] is True
+        assert data["columns"] == {"ts_code": ["a", "b"], "close": [1.0, None]}
+
+    def test_record_list_is_columnar(self):
+        rows = [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+
+        data = json.loads(_encode_tool_result(rows, max_rows=10))
+
+        assert data["truncated"] is False
+        assert data["columns"] == {"a": [1, 2], "b": ["x", "y"]}
+
+    def test_plain_dict_is_compact(self):
+        text = _encode_tool_result({"status": "ok", "n": 1}, max_rows=10)
+
+        assert "\n" not in text and ": " not in text
+        assert json.loads(text) == {"status": "ok", "n": 1}
+
+    def test_scalar_falls_back_to_str(self):
+        assert _encode_tool_result(42, max_rows=10) == "42"
+
+
+class TestToolHandler:
+    """Test async tool handlers built from service methods."""
+
+    def test_handler_signature_mirrors_method(self):
+        def get_daily(code, start_date=None):
+            return []
+
+        handler = _make_tool_handler("get_daily", get_daily)
+        params = inspect.signature(handler).parameters
+
+        assert list(params) == ["code", "start_date"]
+        assert params["start_date"].default is None
+        assert inspect.iscoroutinefunction(handler)
+
+    def test_handler_runs_service_call_off_the_event_loop(self):
+        calls = []
+
+        def get_daily(code):
+            calls.append(threading.current_thread().name)
+            return [{"code": code}]
+
+        handler = _make_tool_handler("get_daily", get_daily)
+        data = json.loads(asyncio.run(handler(code="000001.SZ")))
+
+        assert data["columns"] == {"code": ["000001.SZ"]}
+        assert calls[0].startswith("mcp-tool")
+
+    def test_handler_reports_errors(self):
+        def get_daily(code):
+            raise RuntimeError("boom")
+
+        handler = _make_tool_handler("get_daily", get_daily)
+
+        assert asyncio.run(handler(code="x")) == "Error calling get_daily: boom"
@@ -0,0 +1,188 @@
+"""Tests for the process-wide metrics registry."""
+
+import json
+import os
+import time
+
+import pytest
+
+from stock_datasource.utils.metrics import MetricsRegistry
+
+
+class TestSingleProcess:
+    def test_counter_and_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ("status",))
+        counter.inc(status="ok")
+        counter.inc(2, status="ok")
+
+        text = registry.render()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{status="ok"} 3' in text
+
+    def test_counter_rejects_negative_and_bad_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ("status",))
+
+        with pytest.raises(ValueError):
+            counter.inc(-1, status="ok")
+        with pytest.raises(ValueError):
+            counter.inc(plugin="x")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        hist.observe(0.05)
+        hist.observe(0.5)
+        hist.observe(5)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+
+    def test_register_is_idempotent(self):
+        registry = MetricsRegistry()
+        assert registry.counter("a_total", "A") is registry.counter("a_total", "A")
+        with pytest.raises(ValueError):
+            registry.gauge("a_total", "A")
+
+
+class TestMultiProcess:
+    def _write_snapshot(self, directory, pid, metrics):
+        (directory / f"{pid}.json").write_text(json.dumps({"pid": pid, "metrics": metrics}))
+
+    def test_collect_merges_process_snapshots(self, tmp_path):
+        registry = MetricsRegistry(tmp_path)
+        registry.counter("jobs_total", "Jobs", ("status",)).inc(status="ok")
+        registry.gauge("depth", "Depth", multiprocess_mode="max").set(2)
+        other = MetricsRegistry(tmp_path)
+        other.counter("jobs_total", "Jobs", ("status",)).inc(4, status="ok")
+        other.gauge("depth", "Depth", multiprocess_mode="max").set(7)
+        snapshot = other.snapshot()
+        # Pretend the second registry lives in the parent process (alive)
+        self._write_snapshot(tmp_path, os.getppid(), snapshot)
+
+        merged = registry.collect()
+
+        assert merged["jobs_total"]["samples"] == [[["ok"], 5.0]]
+        assert merged["depth"]["samples"] == [[[], 7.0]]
+
+    def test_dead_process_counters_are_archived(self, tmp_path):
+        registry = MetricsRegistry(tmp_path)
+        registry.counter("jobs_total", "Jobs").inc()
+        dead = MetricsRegistry()
+        dead.counter("jobs_total", "Jobs").inc(10)
+        dead.gauge("depth", "Depth").set(3)
+        self._write_snapshot(tmp_path, 999999999, dead.snapshot())
+
+        merged = registry.collect()
+
+        assert merged["jobs_total"]["samples"] == [[[], 11.0]]
+        assert "depth" not in merged
+        assert not (tmp_path / "999999999.json").exists()
+        assert (tmp_path / "archive.json").exists()
+        # Archived totals survive later collections
+        assert registry.collect()["jobs_total"]["samples"] == [[[], 11.0]]
+
+    def test_other_hosts_are_archived_by_heartbeat_not_pid(self, tmp_path):
+        registry = MetricsRegistry(tmp_path)
+        worker = MetricsRegistry()
+        worker.counter("jobs_total", "Jobs").inc(5)
+        # Same pid as a process that is dead here, but on the worker container
+        fresh = tmp_path / "worker-999999999.json"
+        fresh.write_text(
+            json.dumps({"host": "worker", "pid": 999999999, "metrics": worker.snapshot()})
+        )
+        stale = tmp_path / "old-worker-7.json"
+        stale.write_text(
+            json.dumps({"host": "old-worker", "pid": 7, "metrics": worker.snapshot()})
+        )
+        old = time.time() - registry._stale_after - 1
+        os.utime(stale, (old, old))
+
+        merged = registry.collect()
+
+        assert merged["jobs_total"]["samples"] == [[[], 10.0]]
+        assert fresh.exists()
+        assert not stale.exists()
+
+    def test_snapshot_left_under_reused_pid_is_archived(self, tmp_path):
+        previous = MetricsRegistry()
+        previous.counter("jobs_total", "Jobs").inc(3)
+        registry = MetricsRegistry(tmp_path)
+        path = tmp_path / f"{registry.host}-{os.getpid()}.json"
+        path.write_text(
+            json.dumps(
+                {"host": registry.host, "pid": os.getpid(), "metrics": previous.snapshot()}
+            )
+        )
+        registry.counter("jobs_total", "Jobs").inc()
+
+        assert registry.collect()["jobs_total"]["samples"] == [[[], 4.0]]
+        assert json.loads(path.read_text())["metrics"]["jobs_total"]["samples"] == [
+            [[], 1.0]
+        ]
+
+
+def _llm_requests(**labels):
+    from stock_datasource.utils.metrics import registry
+
+    samples = registry.snapshot()["llm_requests_total"]["samples"]
+    key = [labels["source"], labels["model"], labels["status"]]
+    return next((value for k, value in samples if k == key), 0.0)
+
+
+class TestLLMMetrics:
+    def test_client_calls_are_counted(self):
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from stock_datasource.llm.client import OpenAIClient
+
+        client = OpenAIClient(api_key="test")
+        client.model = "metrics-test-model"
+        client._langfuse = False
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="hi"))],
+            usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3, total_tokens=10),
+        )
+        create = AsyncMock(side_effect=[response, RuntimeError("down")])
+        client._client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        labels = {"source": "generate", "model": "metrics-test-model"}
+        before_ok = _llm_requests(**labels, status="ok")
+        before_error = _llm_requests(**labels, status="error")
+
+        assert asyncio.run(client.generate("hello")) == "hi"
+        asyncio.run(client.generate("hello"))
+
+        assert _llm_requests(**labels, status="ok") == before_ok + 1
+        assert _llm_requests(**labels, status="error") == before_error + 1
+
+    def test_langchain_callback_records_calls(self):
+        from uuid import uuid4
+
+        from langchain_core.outputs import LLMResult
+
+        from stock_datasource.llm.metrics import LLMMetricsCallback
+
+        callback = LLMMetricsCallback("callback-test-model")
+        labels = {"source": "agent", "model": "callback-test-model"}
+        before = _llm_requests(**labels, status="ok")
+
+        run_id = uuid4()
+        callback.on_chat_model_start({}, [[]], run_id=run_id)
+        callback.on_llm_end(
+            LLMResult(generations=[], llm_output={"token_usage": {"prompt_tokens": 5}}),
+            run_id=run_id,
+        )
+        # An end without a start (e.g. a retried run) is ignored
+        callback.on_llm_end(LLMResult(generations=[]), run_id=uuid4())
+
+        assert _llm_requests(**labels, status="ok") == before + 1
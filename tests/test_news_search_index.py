@@ -0,0 +1,87 @@
+"""Tests for the on-disk news full-text index."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from stock_datasource.modules.news.search_index import NewsSearchIndex, tokenize
+
+
+def _item(news_id, title, content="", publish_time="2025-01-14T09:30:00"):
+    return {
+        "id": news_id,
+        "title": title,
+        "content": content,
+        "publish_time": publish_time,
+        "source": "sina",
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = NewsSearchIndex(tmp_path / "search_index.db")
+    idx.add(
+        [
+            _item("n1", "贵州茅台发布年报", "营收同比增长", "2025-01-10T10:00:00"),
+            _item("n2", "白酒板块走强", "茅台、五粮液领涨", "2025-01-14T10:00:00"),
+            _item("n3", "央行降准 0.5 个百分点", "释放长期资金", "2025-01-15T10:00:00"),
+            _item("n4", "NVIDIA earnings beat", "AI demand strong", "2025-01-16T10:00:00"),
+        ],
+        source="sina",
+        file="/data/news/sina/2025-01-14.json",
+    )
+    return idx
+
+
+def test_tokenize_bigrams_and_ascii():
+    assert tokenize("茅台AI 2025年") == ["茅台", "台", "ai", "2025", "年"]
+
+
+def test_search_matches_bigrams_and_ranks_title_first(index):
+    assert [i["id"] for i in index.search("茅台")] == ["n1", "n2"]
+    assert [i["id"] for i in index.search("茅台 年报")] == ["n1"]
+    assert index.search("茅台年报") == []
+    assert index.search("茅台降准") == []
+
+
+def test_single_char_and_ascii_prefix(index):
+    assert {i["id"] for i in index.search("茅")} == {"n1", "n2"}
+    assert [i["id"] for i in index.search("nvid")] == ["n4"]
+    assert [i["id"] for i in index.search("Earnings")] == ["n4"]
+
+
+def test_time_bounds_and_source(index):
+    hits = index.search("茅台", start_time=datetime(2025, 1, 12))
+    assert [i["id"] for i in hits] == ["n2"]
+    assert index.search("茅台", end_time=datetime(2025, 1, 11))[0]["id"] == "n1"
+    assert index.search("茅台", source="tushare") == []
+
+
+def test_reindex_and_remove_file(index):
+    index.add([_item("n2", "白酒板块回调", "五粮液领跌")], source="sina")
+    assert [i["id"] for i in index.search("茅台")] == ["n1"]
+    assert index.search("回调")[0]["title"] == "白酒板块回调"
+
+    assert index.remove_file("/data/news/sina/2025-01-14.json") == 4
+    assert index.search("五粮液") == []
+    assert index.stats()["docs"] == 0
+
+
+def test_storage_builds_index_from_existing_files(tmp_path):
+    from stock_datasource.modules.news.storage import NewsFileStorage
+
+    with patch.object(NewsFileStorage, "_instance", None):
+        storage = NewsFileStorage(str(tmp_path))
+    (tmp_path / "sina").mkdir()
+    storage.save_news_file(
+        tmp_path / "sina" / "2025-01-14.json", [_item("n1", "贵州茅台发布年报")]
+    )
+    storage._search_index = None
+    (tmp_path / "cache" / "search_index.db").unlink()
+
+    assert [i["id"] for i in storage.search_news("茅台")] == ["n1"]
+    assert storage.get_search_index().is_built()
+
+    storage.save_news([_item("n2", "茅台批价回升")], "sina")
+    assert {i["id"] for i in storage.search_news("茅台")} == {"n1", "n2"}
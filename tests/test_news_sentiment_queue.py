@@ -0,0 +1,152 @@
+"""Tests for the deduplicated news sentiment job queue."""
+
+import asyncio
+import threading
+
+from stock_datasource.modules.news.schemas import NewsItem, NewsSentiment
+from stock_datasource.modules.news.sentiment_queue import (
+    SentimentCache,
+    SentimentJobQueue,
+    sentiment_key,
+)
+
+
+def _news(news_id, title, source="sina"):
+    return NewsItem(id=news_id, title=title, source=source)
+
+
+def _score(items, score):
+    return [
+        NewsSentiment(news_id=i.id, title=i.title, sentiment="positive", score=score)
+        for i in items
+    ]
+
+
+def _fallback(items):
+    return [
+        NewsSentiment(news_id=i.id, title=i.title, sentiment="neutral", score=0.0)
+        for i in items
+    ]
+
+
+class FakeAnalyzer:
+    def __init__(self, fail=False):
+        self.batches: list[list[str]] = []
+        self.active = 0
+        self.peak = 0
+        self.fail = fail
+
+    async def __call__(self, items, stock_context=None):
+        self.batches.append([i.title for i in items])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        if self.fail:
+            raise RuntimeError("LLM down")
+        return _score(items, 0.8)
+
+
+def _queue(analyzer, cache=None, **kwargs):
+    kwargs.setdefault("flush_delay", 0.05)
+    return SentimentJobQueue(analyzer, _fallback, cache=cache, **kwargs)
+
+
+def test_key_ignores_source_whitespace_and_punctuation():
+    assert sentiment_key(_news("a", "茅台：业绩 超预期！")) == sentiment_key(
+        _news("b", "茅台业绩超预期", source="tushare")
+    )
+
+
+def test_key_depends_on_stock_context():
+    item = _news("a", "白酒板块大涨")
+    assert sentiment_key(item, "600519.SH 贵州茅台") != sentiment_key(item, "000858.SZ 五粮液")
+    assert sentiment_key(item, "600519.SH 贵州茅台") != sentiment_key(item)
+    assert sentiment_key(item, "  ") == sentiment_key(item)
+
+
+def test_same_title_under_different_contexts_is_scored_separately(tmp_path):
+    cache = SentimentCache(tmp_path / "sentiment_cache.db")
+    analyzer = FakeAnalyzer()
+    queue = _queue(analyzer, cache)
+
+    async def _run():
+        return await asyncio.gather(
+            queue.analyze([_news("a", "白酒板块大涨")], "600519.SH 贵州茅台"),
+            queue.analyze([_news("b", "白酒板块大涨")], "000858.SZ 五粮液"),
+        )
+
+    asyncio.run(_run())
+    assert analyzer.batches == [["白酒板块大涨"], ["白酒板块大涨"]]
+    assert queue.stats()["deduplicated"] == 0
+
+    # Each context hits its own cached result
+    asyncio.run(queue.analyze([_news("c", "白酒板块大涨")], "000858.SZ 五粮液"))
+    assert len(analyzer.batches) == 2
+    assert queue.stats()["cache_hits"] == 1
+
+
+def test_concurrent_duplicates_share_one_batched_call():
+    analyzer = FakeAnalyzer()
+    queue = _queue(analyzer)
+
+    async def _run():
+        return await asyncio.gather(
+            queue.analyze([_news("a1", "央行降准"), _news("a2", "茅台提价")]),
+            queue.analyze([_news("b1", "央行 降准", source="cls")]),
+        )
+
+    first, second = asyncio.run(_run())
+
+    assert analyzer.batches == [["央行降准", "茅台提价"]]
+    assert second[0].news_id == "b1"
+    assert second[0].score == 0.8
+    assert queue.stats()["deduplicated"] == 1
+
+
+def test_results_persist_across_queues(tmp_path):
+    cache = SentimentCache(tmp_path / "sentiment_cache.db")
+    asyncio.run(_queue(FakeAnalyzer(), cache).analyze([_news("a", "茅台提价")]))
+
+    analyzer = FakeAnalyzer()
+    result = asyncio.run(_queue(analyzer, cache).analyze([_news("b", "茅台提价")]))
+
+    assert analyzer.batches == []
+    assert result[0].sentiment == "positive"
+
+
+def test_batches_are_capped_and_inflight_limited():
+    analyzer = FakeAnalyzer()
+    queue = _queue(analyzer, batch_size=2, max_inflight=2)
+    items = [_news(str(i), f"新闻{i}") for i in range(5)]
+
+    results = asyncio.run(queue.analyze(items))
+
+    assert [len(b) for b in analyzer.batches] == [2, 2, 1]
+    assert analyzer.peak == 2
+    assert [r.news_id for r in results] == [str(i) for i in range(5)]
+
+
+def test_llm_failure_falls_back_without_caching(tmp_path):
+    cache = SentimentCache(tmp_path / "sentiment_cache.db")
+    queue = _queue(FakeAnalyzer(fail=True), cache)
+
+    result = asyncio.run(queue.analyze([_news("a", "茅台提价")]))
+
+    assert result[0].sentiment == "neutral"
+    assert cache.get_many([sentiment_key(_news("a", "茅台提价"))]) == {}
+
+
+def test_submit_calls_on_done_with_all_results():
+    queue = _queue(FakeAnalyzer())
+    done = threading.Event()
+    received = {}
+
+    def _on_done(items, sentiments):
+        received.update({i.id: s.score for i, s in zip(items, sentiments)})
+        done.set()
+
+    queue.submit([_news("a", "茅台提价"), _news("b", "白酒回调")], on_done=_on_done)
+
+    assert done.wait(2)
+    assert received == {"a": 0.8, "b": 0.8}
@@ -0,0 +1,262 @@
+"""Tests for Open API limit/projection push-down into service query methods."""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from stock_datasource.core.base_service import (
+    BaseService,
+    QueryShape,
+    query_method,
+    query_shape,
+    streams_natively,
+    supports_pushdown,
+)
+from stock_datasource.modules.open_api import router as open_api_router
+from stock_datasource.modules.open_api.dependencies import require_api_key
+from stock_datasource.modules.open_api.router import _ndjson_chunks, _window_result
+
+
+class _RecordingDb:
+    def __init__(self):
+        self.queries = []
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        return pd.DataFrame({"ts_code": ["000001.SZ"], "close": [10.0]})
+
+
+class _DemoService(BaseService):
+    def __init__(self):
+        super().__init__("demo")
+        self.db = _RecordingDb()
+
+    @query_method(description="plain", pushdown="raw")
+    def get_daily(self, code: str) -> list:
+        df = self.db.execute_query(f"SELECT * FROM ods_daily WHERE ts_code = '{code}'")
+        return df.to_dict("records")
+
+    @query_method(description="reduces rows")
+    def get_latest(self, code: str) -> list:
+        df = self.db.execute_query("SELECT * FROM ods_daily")
+        return df.sort_values("close").head(1).to_dict("records")
+
+    @query_method(description="not opted in")
+    def get_daily_implicit(self, code: str) -> list:
+        return self.db.execute_query("SELECT * FROM ods_daily").to_dict("records")
+
+    @query_method(description="converted rows", pushdown="mapped")
+    def get_daily_converted(self, code: str) -> list:
+        df = self.db.execute_query("SELECT * FROM ods_daily")
+        if df.empty:
+            return []
+        records = df.to_dict("records")
+        return [_clean(record) for record in records]
+
+    @query_method(description="parameterized", pushdown="raw")
+    def get_by_market(self, market: str, since: date | None = None) -> list:
+        df = self.db.execute_query(
+            "SELECT * FROM ods_hk_basic WHERE market = %(market)s",
+            {"market": market, "since": since},
+        )
+        return df.to_dict("records")
+
+
+def _clean(record):
+    return record
+
+
+class TestQueryShape:
+    def test_apply_wraps_select(self):
+        shape = QueryShape(limit=101, offset=200, columns=["ts_code", "close"])
+        sql = shape.apply("SELECT * FROM t ORDER BY trade_date;")
+        assert sql.startswith("SELECT `ts_code`, `close` FROM (")
+        assert sql.endswith(") LIMIT 101 OFFSET 200")
+
+    def test_apply_ignores_non_select(self):
+        assert QueryShape(limit=5).apply("SHOW TABLES") == "SHOW TABLES"
+
+    def test_rejects_invalid_column(self):
+        try:
+            QueryShape(columns=["close; DROP TABLE t"])
+        except ValueError:
+            return
+        raise AssertionError("expected ValueError")
+
+
+class TestPushdown:
+    def test_supports_pushdown_detection(self):
+        svc = _DemoService()
+        assert supports_pushdown(svc.get_daily)
+        assert not supports_pushdown(svc.get_latest)
+
+    def test_pushdown_is_opt_in(self):
+        assert not supports_pushdown(_DemoService().get_daily_implicit)
+
+    def test_rejects_unknown_pushdown_mode(self):
+        with pytest.raises(ValueError):
+            query_method(pushdown=True)
+
+    def test_converted_rows_are_not_streamed_natively(self):
+        svc = _DemoService()
+        assert supports_pushdown(svc.get_daily_converted)
+        assert not streams_natively(svc.get_daily_converted)
+        assert streams_natively(svc.get_daily)
+
+    def test_plugin_reshaping_methods_are_not_pushed_down(self):
+        from stock_datasource.plugins.tushare_etf_basic.service import (
+            TuShareETFBasicService,
+        )
+        from stock_datasource.plugins.tushare_hk_basic.service import (
+            TuShareHKBasicService,
+        )
+        from stock_datasource.plugins.tushare_stock_basic.service import (
+            TuShareStockBasicService,
+        )
+
+        assert not supports_pushdown(TuShareStockBasicService.get_all_stock_names)
+        assert not supports_pushdown(TuShareHKBasicService.get_statistics)
+        assert not supports_pushdown(TuShareETFBasicService.get_etf_codes)
+        assert supports_pushdown(TuShareStockBasicService.get_all_stock_basic_df)
+
+    def test_shape_applied_to_first_query(self):
+        svc = _DemoService()
+        shape = QueryShape(limit=11, columns=["close"])
+        with query_shape(shape):
+            svc.get_daily("000001.SZ")
+        assert shape.applied
+        assert svc.db.queries[-1].endswith("LIMIT 11")
+        # Outside the block the raw client is used again
+        svc.get_daily("000001.SZ")
+        assert "LIMIT" not in svc.db.queries[-1]
+
+    def test_capture_mode_skips_execution(self):
+        svc = _DemoService()
+        shape = QueryShape(limit=10, capture=True)
+        with query_shape(shape):
+            assert svc.get_daily("000001.SZ") == []
+        assert svc.db.queries == []
+        assert "LIMIT 10" in shape.captured_sql
+
+    def test_capture_inlines_params(self):
+        svc = _DemoService()
+        shape = QueryShape(limit=10, capture=True)
+        with query_shape(shape):
+            svc.get_by_market("Main Board's")
+        assert svc.db.queries == []
+        assert "market = 'Main Board\\'s'" in shape.captured_sql
+        assert "%(" not in shape.captured_sql
+
+    def test_capture_executes_when_params_need_the_server(self):
+        svc = _DemoService()
+        shape = QueryShape(limit=10, capture=True)
+        with query_shape(shape):
+            rows = svc.get_by_market("Main", since=datetime(2026, 1, 1, 9, 30))
+        assert shape.captured_sql is None
+        assert rows == [{"ts_code": "000001.SZ", "close": 10.0}]
+        assert svc.db.queries[-1].endswith("LIMIT 10")
+
+
+class TestFallbackWindow:
+    def test_window_list_result(self):
+        rows = [{"a": i, "b": i * 2} for i in range(5)]
+        assert _window_result(rows, 3, ["b"]) == [{"b": 6}, {"b": 8}]
+
+    def test_window_dataframe_result(self):
+        df = pd.DataFrame({"a": range(5), "b": range(5)})
+        out = _window_result(df, 2, ["a"])
+        assert list(out.columns) == ["a"]
+        assert len(out) == 3
+
+    def test_window_rejects_unknown_columns(self):
+        df = pd.DataFrame({"a": range(5)})
+        with pytest.raises(ValueError, match="missing"):
+            _window_result(df, 0, ["a", "missing"])
+        with pytest.raises(ValueError, match="missing"):
+            _window_result([{"a": 1}], 0, ["missing"])
+
+    def test_ndjson_chunks(self):
+        body = b"".join(_ndjson_chunks([{"a": 1}, {"a": 2}]))
+        assert body == b'{"a": 1}\n{"a": 2}\n'
+
+
+class _UnknownIdentifierError(Exception):
+    pass
+
+
+def _client(service, method_name):
+    app = FastAPI()
+    app.include_router(open_api_router.router, prefix="/api/open")
+    app.dependency_overrides[require_api_key] = lambda: ({"id": "u1"}, "key1")
+    open_api_svc = MagicMock()
+    open_api_svc.get_policy.return_value = {"is_enabled": True, "max_records": 100}
+    method_info = {"method": getattr(service, method_name)}
+
+    async def allow(**_kwargs):
+        return True, ""
+
+    patches = [
+        patch.object(
+            open_api_router,
+            "_get_plugin_method",
+            return_value=(service, method_info),
+        ),
+        patch.object(open_api_router, "get_open_api_service", return_value=open_api_svc),
+        patch.object(open_api_router.rate_limiter, "acheck", side_effect=allow),
+    ]
+    for p in patches:
+        p.start()
+    return TestClient(app), patches
+
+
+class TestRouter:
+    def teardown_method(self):
+        for p in getattr(self, "_patches", []):
+            p.stop()
+
+    def test_streams_parameterized_method_natively(self):
+        from stock_datasource.plugins.tushare_hk_basic.service import (
+            TuShareHKBasicService,
+        )
+
+        service = TuShareHKBasicService()
+        service.db = MagicMock()
+        client, self._patches = _client(service, "get_by_market")
+        stream = MagicMock(return_value=iter([b'{"ts_code":"00700.HK"}\n']))
+        with patch("stock_datasource.models.database.db_client.stream", stream):
+            resp = client.post(
+                "/api/open/v1/tushare_hk_basic/get_by_market?format=ndjson&limit=5",
+                json={"market": "主板"},
+            )
+
+        assert resp.status_code == 200
+        assert resp.content == b'{"ts_code":"00700.HK"}\n'
+        service.db.execute_query.assert_not_called()
+        sql = stream.call_args.args[0]
+        assert "market = '主板'" in sql
+        assert "%(" not in sql
+        assert "LIMIT 5" in sql
+
+    def test_unknown_field_is_400_without_pushdown(self):
+        svc = _DemoService()
+        client, self._patches = _client(svc, "get_latest")
+        resp = client.post("/api/open/v1/demo/get_latest?fields=nope", json={"code": "x"})
+        assert resp.status_code == 400
+        assert "nope" in resp.json()["detail"]
+
+    def test_unknown_field_is_400_with_pushdown(self):
+        svc = _DemoService()
+        svc.db.execute_query = MagicMock(
+            side_effect=_UnknownIdentifierError(
+                "Code: 47. DB::Exception: Unknown expression identifier `nope` "
+                "in scope SELECT `nope` FROM (...). (UNKNOWN_IDENTIFIER)"
+            )
+        )
+        client, self._patches = _client(svc, "get_daily")
+        resp = client.post("/api/open/v1/demo/get_daily?fields=nope", json={"code": "x"})
+        assert resp.status_code == 400
+        assert "nope" in resp.json()["detail"]
@@ -0,0 +1,213 @@
+"""Tests for the Open API gateway sliding-window-counter rate limiter."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import fakeredis
+
+from stock_datasource.modules.open_api.dependencies import (
+    _RedisRateLimiter,
+    _SlidingWindowRateLimiter,
+)
+
+_TIME = "stock_datasource.modules.open_api.dependencies.time.time"
+
+
+class _CountingRedis(fakeredis.FakeRedis):
+    """fakeredis (Lua via lupa) that counts limiter script invocations."""
+
+    script_calls = 0
+
+    def register_script(self, source):
+        script = super().register_script(source)
+
+        def run(keys, args):
+            self.script_calls += 1
+            return script(keys=keys, args=args)
+
+        return run
+
+
+class _BrokenRedis:
+    def register_script(self, _source):
+        def run(keys, args):
+            raise ConnectionError("redis down")
+
+        return run
+
+
+class TestLocalLimiter:
+    def test_per_minute_limit(self):
+        limiter = _SlidingWindowRateLimiter()
+        with patch(_TIME, return_value=120.0):
+            results = [limiter.check("k", "p", 3, 100)[0] for _ in range(5)]
+        assert results == [True, True, True, False, False]
+
+    def test_window_slides(self):
+        limiter = _SlidingWindowRateLimiter()
+        with patch(_TIME, return_value=120.0):
+            for _ in range(3):
+                assert limiter.check("k", "p", 3, 100)[0]
+        # Half-way through the next minute half of the previous bucket counts
+        with patch(_TIME, return_value=210.0):
+            assert limiter.check("k", "p", 3, 100)[0]
+            allowed, msg = limiter.check("k", "p", 3, 100)
+        assert not allowed
+        assert "/min" in msg
+        # Two minutes later the old bucket no longer counts at all
+        with patch(_TIME, return_value=400.0):
+            assert limiter.check("k", "p", 3, 100)[0]
+
+    def test_day_limit(self):
+        limiter = _SlidingWindowRateLimiter()
+        allowed = []
+        for i in range(4):
+            with patch(_TIME, return_value=86400.0 + i * 120):
+                allowed.append(limiter.check("k", "p", 100, 3))
+        assert [a for a, _ in allowed] == [True, True, True, False]
+        assert "/day" in allowed[-1][1]
+
+    def test_keys_are_independent(self):
+        limiter = _SlidingWindowRateLimiter()
+        with patch(_TIME, return_value=120.0):
+            assert limiter.check("k1", "p", 1, 100)[0]
+            assert not limiter.check("k1", "p", 1, 100)[0]
+            assert limiter.check("k2", "p", 1, 100)[0]
+
+    def test_concurrent_checks_do_not_overshoot(self):
+        limiter = _SlidingWindowRateLimiter()
+        estimate = limiter._estimate
+
+        def slow_estimate(*args):
+            # Widen the gap between the window check and the increment
+            result = estimate(*args)
+            time.sleep(0.01)
+            return result
+
+        limiter._estimate = slow_estimate
+        results = []
+        start = threading.Barrier(8)
+
+        def worker():
+            start.wait()
+            results.append(limiter.check("k", "p", 3, 100)[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 3
+
+
+class TestRedisLimiter:
+    def test_shared_counters_across_processes(self):
+        redis = _CountingRedis()
+        worker_a = _RedisRateLimiter(fast_path_fraction=0, redis_getter=lambda: redis)
+        worker_b = _RedisRateLimiter(fast_path_fraction=0, redis_getter=lambda: redis)
+        with patch(_TIME, return_value=120.0):
+            results = [
+                (worker_a if i % 2 else worker_b).check("k", "p", 4, 100)[0]
+                for i in range(6)
+            ]
+        assert results == [True, True, True, True, False, False]
+
+    def test_fast_path_skips_redis_and_reports_pending(self):
+        redis = _CountingRedis()
+        limiter = _RedisRateLimiter(
+            fast_path_fraction=0.1, sync_interval=10, redis_getter=lambda: redis
+        )
+        with patch(_TIME, return_value=120.0):
+            for _ in range(6):
+                assert limiter.check("k", "p", 1000, 100000)[0]
+        # First call syncs; the rest fit in the local budget (10% of headroom)
+        assert redis.script_calls == 1
+
+        # fakeredis expires keys on the patched clock, so read under it too
+        with patch(_TIME, return_value=200.0):
+            assert limiter.check("k", "p", 1000, 100000)[0]
+            # Sync interval elapsed: pending hits are flushed with this request
+            assert redis.script_calls == 2
+            assert int(redis.get("stock:open_api_rl:k:p:day:0")) == 7
+            # The minute rolled over: earlier hits land in the previous bucket
+            assert int(redis.get("stock:open_api_rl:k:p:min:2")) == 6
+            assert int(redis.get("stock:open_api_rl:k:p:min:3")) == 1
+
+    def test_falls_back_to_local_without_redis(self):
+        limiter = _RedisRateLimiter(redis_getter=lambda: None)
+        with patch(_TIME, return_value=120.0):
+            results = [limiter.check("k", "p", 2, 100)[0] for _ in range(3)]
+        assert results == [True, True, False]
+
+    def test_script_weights_previous_bucket(self):
+        redis = _CountingRedis()
+        limiter = _RedisRateLimiter(fast_path_fraction=0, redis_getter=lambda: redis)
+        with patch(_TIME, return_value=120.0):
+            for _ in range(4):
+                assert limiter.check("k", "p", 4, 100)[0]
+        # A quarter into the next minute 3/4 of the previous 4 hits still count
+        with patch(_TIME, return_value=195.0):
+            assert limiter.check("k", "p", 4, 100)[0]
+            assert not limiter.check("k", "p", 4, 100)[0]
+        # Three quarters in only one of them does
+        with patch(_TIME, return_value=225.0):
+            assert limiter.check("k", "p", 4, 100)[0]
+            assert limiter.check("k", "p", 4, 100)[0]
+            allowed, msg = limiter.check("k", "p", 4, 100)
+            assert redis.ttl("stock:open_api_rl:k:p:min:3") == 120
+        assert not allowed
+        assert "/min" in msg
+
+    def test_day_limit_reported_by_script(self):
+        redis = _CountingRedis()
+        limiter = _RedisRateLimiter(fast_path_fraction=0, redis_getter=lambda: redis)
+        results = []
+        for i in range(3):
+            with patch(_TIME, return_value=86400.0 + i * 120):
+                results.append(limiter.check("k", "p", 100, 2))
+        assert [a for a, _ in results] == [True, True, False]
+        assert "/day" in results[-1][1]
+
+    def test_pending_hits_survive_redis_outage(self):
+        redis = _CountingRedis()
+        backend = {"client": redis}
+        limiter = _RedisRateLimiter(
+            fast_path_fraction=0.1, sync_interval=10, redis_getter=lambda: backend["client"]
+        )
+        with patch(_TIME, return_value=120.0):
+            for _ in range(4):
+                assert limiter.check("k", "p", 1000, 100000)[0]
+        backend["client"] = _BrokenRedis()
+        with patch(_TIME, return_value=140.0):
+            assert limiter.check("k", "p", 1000, 100000)[0]
+        backend["client"] = redis
+        with patch(_TIME, return_value=150.0):
+            assert limiter.check("k", "p", 1000, 100000)[0]
+            # 1 synced + 3 fast-path hits + this request; the local fallback
+            # hit is the only one Redis never sees
+            assert int(redis.get("stock:open_api_rl:k:p:min:2")) == 5
+
+    def test_acheck_matches_check(self):
+        redis = _CountingRedis()
+        limiter = _RedisRateLimiter(fast_path_fraction=0, redis_getter=lambda: redis)
+
+        async def run():
+            return [(await limiter.acheck("k", "p", 2, 100))[0] for _ in range(3)]
+
+        with patch(_TIME, return_value=120.0):
+            assert asyncio.run(run()) == [True, True, False]
+
+    def test_stale_state_is_cleaned_up_during_checks(self):
+        redis = _CountingRedis()
+        with patch(_TIME, return_value=120.0):
+            limiter = _RedisRateLimiter(
+                sync_interval=1, cleanup_interval=300, redis_getter=lambda: redis
+            )
+            for i in range(5):
+                limiter.check(f"k{i}", "p", 1000, 100000)
+        assert len(limiter._fast) == 5
+        with patch(_TIME, return_value=500.0):
+            limiter.check("k0", "p", 1000, 100000)
+        assert set(limiter._fast) == {"k0:p"}
@@ -0,0 +1,133 @@
+"""Tests for the bulk end-of-day paper trading valuation."""
+
+import asyncio
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from stock_datasource.modules.paper_trading import service as service_module
+from stock_datasource.services.price_resolver import LatestPriceResolver
+
+ACCOUNTS = pd.DataFrame(
+    {
+        "user_id": ["u1", "u2"],
+        "account_id": ["a1", "a2"],
+        "initial_capital": [100000.0, 50000.0],
+        "current_cash": [80000.0, 50000.0],
+    }
+)
+
+POSITIONS = pd.DataFrame(
+    {
+        "user_id": ["u1", "u1"],
+        "account_id": ["a1", "a1"],
+        "ts_code": ["600000.SH", "000001.SZ"],
+        "quantity": [1000, 500],
+        "avg_cost": [10.0, 12.0],
+        "current_price": [10.0, 12.0],
+        "first_buy_date": [date(2024, 1, 2)] * 2,
+    }
+)
+
+# 000001.SZ has no daily row: keeps its last price and is not rewritten
+PRICES = pd.DataFrame(
+    {
+        "src": ["ods_daily"],
+        "ts_code": ["600000.SH"],
+        "close": [11.0],
+        "trade_date": ["2024-01-05"],
+        "pre_close": [10.5],
+    }
+)
+
+HISTORY = pd.DataFrame(
+    {
+        "user_id": ["u1", "u2"],
+        "account_id": ["a1", "a2"],
+        "prev_value": [95000.0, 0.0],
+        "prev_count": [3, 0],
+        "regime": ["bull", ""],
+        "position_level": [0.8, 0.0],
+    }
+)
+
+
+@pytest.fixture
+def db():
+    client = MagicMock()
+
+    def execute_query(sql, params=None):
+        if "FROM paper_trading_accounts" in sql:
+            return ACCOUNTS.copy()
+        if "WHERE quantity > 0" in sql:
+            return POSITIONS.copy()
+        if "paper_trading_daily_snapshots" in sql:
+            return HISTORY.copy()
+        return pd.DataFrame()
+
+    client.execute_query.side_effect = execute_query
+    price_db = MagicMock()
+    price_db.execute_query.return_value = PRICES.copy()
+    resolver = LatestPriceResolver(db=price_db, cache_ttl=0)
+    with patch.object(service_module, "db_client", client), patch(
+        "stock_datasource.services.price_resolver.get_price_resolver",
+        return_value=resolver,
+    ), patch.object(
+        service_module, "latest_source", return_value="paper_trading_positions"
+    ), patch.object(service_module, "get_latest_state_manager"):
+        yield client
+
+
+def _inserts(db, table):
+    return [c.args[1] for c in db.insert_dataframe.call_args_list if c.args[0] == table]
+
+
+def test_bulk_valuation_writes_one_insert_per_table(db):
+    svc = service_module.PaperTradingService()
+    result = svc.run_end_of_day_valuation(snapshot_date=date(2024, 1, 5))
+
+    assert result == {"accounts": 2, "positions": 1}
+    (positions,) = _inserts(db, "paper_trading_positions")
+    assert positions["ts_code"].tolist() == ["600000.SH"]
+    assert positions["unrealized_pnl"].tolist() == [1000.0]
+
+    (snap,) = _inserts(db, "paper_trading_daily_snapshots")
+    u1, u2 = snap.to_dict("records")
+    assert u1["positions_value"] == 11000.0 + 6000.0
+    assert u1["total_value"] == 97000.0
+    assert u1["daily_pnl"] == 2000.0
+    assert u1["total_return"] == pytest.approx(-0.03)
+    assert u1["position_count"] == 2
+    assert u1["regime"] == "bull"  # today's regime is kept
+    assert u2["total_value"] == 50000.0
+    assert u2["daily_pnl"] == 0.0  # no earlier snapshot
+
+
+def test_single_account_snapshot_filters_queries(db):
+    svc = service_module.PaperTradingService()
+    asyncio.run(svc.take_daily_snapshot("u1", "a1"))
+
+    queries = [c.args[0] for c in db.execute_query.call_args_list]
+    assert all("(user_id, account_id) IN (('u1', 'a1'))" in q for q in queries)
+    assert "status = 'active'" not in queries[0]
+
+
+def test_positions_are_read_with_final(db):
+    service_module.PaperTradingService().run_end_of_day_valuation(
+        snapshot_date=date(2024, 1, 5)
+    )
+
+    (query,) = [
+        c.args[0] for c in db.execute_query.call_args_list if "quantity > 0" in c.args[0]
+    ]
+    assert "FROM paper_trading_positions FINAL" in query
+
+
+def test_empty_account_selection_runs_no_queries(db):
+    result = service_module.PaperTradingService().run_end_of_day_valuation(accounts=[])
+
+    assert result == {"accounts": 0, "positions": 0}
+    db.execute_query.assert_not_called()
+    assert service_module.PaperTradingService._account_filter([]) == " AND 0"
@@ -0,0 +1,162 @@
+"""Tests for manifest-driven lazy plugin discovery."""
+
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from stock_datasource.core import plugin_manifest
+from stock_datasource.core.base_plugin import PluginCategory
+from stock_datasource.core.plugin_manager import PluginManager
+
+PLUGIN_PY = '''
+from stock_datasource.core.base_plugin import BasePlugin, PluginCategory
+
+IMPORTED = True
+
+
+class DemoPlugin(BasePlugin):
+    def __init__(self, **kwargs):
+        self._plugin_config = {{"plugin_name": "{name}"}}
+        super().__init__(**kwargs)
+
+    @property
+    def name(self) -> str:
+        return {name_expr}
+
+    def get_category(self) -> PluginCategory:
+        return PluginCategory.INDEX
+
+    def get_dependencies(self) -> list[str]:
+        return ["demo_basic"]
+
+    def extract_data(self, **kwargs):
+        return [kwargs]
+
+    def load_data(self, data):
+        return {{"status": "success"}}
+'''
+
+
+def _write_plugin(root, module, name, name_expr=None):
+    plugin_dir = root / "demo_plugins" / module
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "__init__.py").write_text("from .plugin import DemoPlugin\n")
+    (plugin_dir / "plugin.py").write_text(
+        PLUGIN_PY.format(name=name, name_expr=name_expr or repr(name))
+    )
+    (plugin_dir / "config.json").write_text(
+        json.dumps({"enabled": True, "schedule": {"frequency": "weekly"}})
+    )
+    (plugin_dir / "schema.json").write_text(json.dumps({"table_name": f"ods_{name}"}))
+    return plugin_dir
+
+
+@pytest.fixture
+def plugin_root(tmp_path):
+    (tmp_path / "demo_plugins").mkdir()
+    (tmp_path / "demo_plugins" / "__init__.py").write_text("")
+    sys.path.insert(0, str(tmp_path))
+    yield tmp_path
+    sys.path.remove(str(tmp_path))
+    for module in [m for m in sys.modules if m.startswith("demo_plugins")]:
+        del sys.modules[module]
+
+
+def test_discovery_reads_manifest_without_importing(plugin_root):
+    _write_plugin(plugin_root, "demo_daily", "demo_daily")
+    manager = PluginManager(manifest_path=plugin_root / "manifest.json")
+
+    manager.discover_plugins("demo_plugins")
+
+    assert manager.list_plugins() == ["demo_daily"]
+    assert "demo_plugins.demo_daily" not in sys.modules
+    plugin = manager.get_plugin("demo_daily")
+    assert plugin.get_category() == PluginCategory.INDEX
+    assert plugin.get_dependencies() == ["demo_basic"]
+    assert plugin.get_schema() == {"table_name": "ods_demo_daily"}
+    assert plugin.get_schedule()["day_of_week"] == "saturday"
+    assert manager.get_dependency_graph() == {"demo_daily": ["demo_basic"]}
+    assert "demo_plugins.demo_daily" not in sys.modules
+
+    assert plugin.extract_data(trade_date="20250114") == [{"trade_date": "20250114"}]
+    assert sys.modules["demo_plugins.demo_daily"].plugin.IMPORTED
+    assert manager.get_plugin("demo_daily") is plugin.load()
+
+
+def test_cached_manifest_is_reused_until_mtime_changes(plugin_root):
+    plugin_dir = _write_plugin(plugin_root, "demo_daily", "demo_daily")
+    manifest_path = plugin_root / "manifest.json"
+    PluginManager(manifest_path=manifest_path).discover_plugins("demo_plugins")
+    assert manifest_path.exists()
+
+    with patch.object(
+        plugin_manifest, "scan_plugin_dir", wraps=plugin_manifest.scan_plugin_dir
+    ) as scan:
+        PluginManager(manifest_path=manifest_path).discover_plugins("demo_plugins")
+        assert scan.call_count == 0
+
+        config_file = plugin_dir / "config.json"
+        config_file.write_text(json.dumps({"enabled": False}))
+        mtime = os.stat(config_file).st_mtime + 5
+        os.utime(config_file, (mtime, mtime))
+
+        manager = PluginManager(manifest_path=manifest_path)
+        manager.discover_plugins("demo_plugins")
+        assert scan.call_count == 1
+    assert manager.get_plugin("demo_daily").is_enabled() is False
+
+
+def test_config_resolved_names_and_unresolvable_plugins(plugin_root):
+    _write_plugin(
+        plugin_root,
+        "demo_weekly",
+        "demo_weekly",
+        name_expr='self._plugin_config.get("plugin_name", "demo_weekly")',
+    )
+    _write_plugin(
+        plugin_root, "demo_dynamic", "demo_dynamic", name_expr='"demo_" + "dynamic"'
+    )
+    manager = PluginManager(manifest_path=plugin_root / "manifest.json")
+
+    manager.discover_plugins("demo_plugins")
+
+    assert sorted(manager.list_plugins()) == ["demo_dynamic", "demo_weekly"]
+    # The dynamic name can only be known by importing the package
+    assert "demo_plugins.demo_dynamic" in sys.modules
+    assert "demo_plugins.demo_weekly" not in sys.modules
+
+
+def test_rate_limit_from_config_does_not_import(plugin_root):
+    plugin_dir = _write_plugin(plugin_root, "demo_daily", "demo_daily")
+    (plugin_dir / "config.json").write_text(json.dumps({"rate_limit": 120}))
+    manager = PluginManager(manifest_path=plugin_root / "manifest.json")
+    manager.discover_plugins("demo_plugins")
+
+    assert manager.get_plugin("demo_daily").get_rate_limit() == 120
+    assert "demo_plugins.demo_daily" not in sys.modules
+
+
+def test_service_import_skips_plugin_extractor():
+    # Importing the service module runs the package __init__ first; the
+    # extractor (and its Tushare client) must stay unimported until needed.
+    # A fresh interpreter keeps other tests' imports out of the picture.
+    script = """
+import sys
+import stock_datasource.plugins.tushare_daily.service
+assert "stock_datasource.plugins.tushare_daily.extractor" not in sys.modules
+assert "stock_datasource.plugins.tushare_daily.plugin" not in sys.modules
+from stock_datasource.plugins.tushare_daily import TuShareDailyPlugin
+assert TuShareDailyPlugin.__module__.endswith("tushare_daily.plugin")
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,122 @@
+"""Tests for the batched latest-price resolver."""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from stock_datasource.services import price_resolver as resolver_module
+from stock_datasource.services.price_resolver import (
+    LatestPriceResolver,
+    candidate_tables,
+)
+
+DAILY = pd.DataFrame(
+    [
+        # 510300.SH is an ETF: its own table wins over a stray ods_daily row
+        ("ods_etf_fund_daily", "510300.SH", 3.9, "2024-01-05", 3.8),
+        ("ods_daily", "510300.SH", 1.0, "2024-01-05", 1.0),
+        ("ods_daily", "600000.SH", 11.0, "2024-01-05", 10.5),
+        ("ods_hk_daily", "00700.HK", 300.0, "2024-01-05", 295.0),
+        ("ods_daily", "000001.SZ", 9.0, "2024-01-04", 8.8),
+    ],
+    columns=["src", "ts_code", "close", "trade_date", "pre_close"],
+)
+
+
+def _resolver(bars=None, cache_ttl=0):
+    db = MagicMock()
+    db.execute_query.return_value = DAILY.copy()
+    store = MagicMock()
+    store.available = True
+    store.get_latest_many.return_value = bars or {}
+    return LatestPriceResolver(db=db, cache_store=store, cache_ttl=cache_ttl), db, store
+
+
+def test_candidate_tables_follow_market_precedence():
+    assert candidate_tables("510300.SH") == ["ods_etf_fund_daily", "ods_daily"]
+    assert candidate_tables("000001.SH") == [
+        "ods_index_daily",
+        "ods_daily",
+        "ods_etf_fund_daily",
+    ]
+    assert candidate_tables("00700.HK")[0] == "ods_hk_daily"
+
+
+def test_daily_prices_come_from_one_query():
+    resolver, db, _ = _resolver()
+    prices = resolver.resolve(
+        ["600000.SH", "510300.SH", "00700.HK", "999999.SH"], include_realtime=False
+    )
+
+    (query,) = [c.args[0] for c in db.execute_query.call_args_list]
+    assert query.count("LIMIT 1 BY ts_code") == query.count("UNION ALL") + 1
+    assert set(prices) == {"600000.SH", "510300.SH", "00700.HK"}
+    assert prices["510300.SH"]["close"] == 3.9
+    assert prices["600000.SH"] == {
+        "close": 11.0,
+        "trade_time": "2024-01-05 15:00:00",
+        "prev_close": 10.5,
+        "source": "daily",
+    }
+    assert prices["00700.HK"]["trade_time"] == "2024-01-05 16:00:00"
+
+
+def test_realtime_quotes_take_daily_close_as_prev_close():
+    bars = {
+        "600000.SH": {"close": 11.5, "trade_time": "2024-01-08 10:31:00"},
+        "000001.SZ": {"close": 9.3, "trade_time": "2024-01-08 14:30:00"},
+    }
+    resolver, _, store = _resolver(bars)
+    on_demand = MagicMock(return_value={"510300.SH": {"close": 4.0, "trade_time": "t"}})
+
+    with patch.object(resolver_module, "is_market_closed", return_value=False):
+        prices = resolver.resolve(["600000.SH", "000001.SZ", "510300.SH"], on_demand=on_demand)
+
+    store.get_latest_many.assert_called_once()
+    on_demand.assert_called_once_with(["510300.SH"])
+    assert prices["600000.SH"]["close"] == 11.5
+    assert prices["600000.SH"]["prev_close"] == 11.0
+    assert prices["510300.SH"]["source"] == "on_demand"
+    assert prices["510300.SH"]["prev_close"] == 3.9
+
+
+def test_stale_minute_bars_fall_back_to_daily_after_close():
+    bars = {"000001.SZ": {"close": 9.3, "trade_time": "2024-01-08 14:30:00"}}
+    resolver, _, _ = _resolver(bars)
+
+    with patch.object(resolver_module, "is_market_closed", return_value=True):
+        prices = resolver.resolve(["000001.SZ"])
+
+    assert prices["000001.SZ"]["source"] == "daily"
+    assert prices["000001.SZ"]["close"] == 9.0
+
+
+def test_cache_serves_repeated_reads_and_returns_copies():
+    resolver, db, _ = _resolver(cache_ttl=60)
+    first = resolver.resolve(["600000.SH"], include_realtime=False)
+    first["600000.SH"]["prev_close"] = None
+    second = resolver.resolve(["600000.SH"], include_realtime=False)
+
+    assert db.execute_query.call_count == 1
+    assert second["600000.SH"]["prev_close"] == 10.5
+
+    resolver.invalidate(["600000.SH"])
+    resolver.resolve(["600000.SH"], include_realtime=False)
+    assert db.execute_query.call_count == 2
+
+
+def test_missing_table_falls_back_to_per_table_queries():
+    resolver, db, _ = _resolver()
+    db.execute_query.side_effect = [
+        Exception("Table ods_index_daily doesn't exist"),
+        Exception("Table ods_index_daily doesn't exist"),
+        pd.DataFrame(
+            [("ods_daily", "000001.SH", 7.0, "2024-01-05", 6.9)],
+            columns=DAILY.columns,
+        ),
+        pd.DataFrame(),
+    ]
+    prices = resolver.resolve(["000001.SH"], include_realtime=False)
+
+    assert db.execute_query.call_count == 4
+    assert prices["000001.SH"]["close"] == 7.0
@@ -0,0 +1,150 @@
+"""Tests for push-down quality checks."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from stock_datasource.utils.quality_checks import (
+    PRICE_CONSISTENCY_RULE,
+    STK_LIMIT_CONSISTENCY_RULE,
+    QualityChecker,
+    compile_quality_rule,
+)
+
+
+def _checker(db=None, extractor=None) -> QualityChecker:
+    checker = QualityChecker.__new__(QualityChecker)
+    checker.db = db or MagicMock()
+    checker.extractor = extractor or MagicMock()
+    return checker
+
+
+class TestCompileQualityRule:
+    def test_single_aggregation_over_all_dates(self):
+        query = compile_quality_rule(PRICE_CONSISTENCY_RULE, ["20240102", "2024-01-03"])
+        assert "trade_date IN ('2024-01-02', '2024-01-03')" in query
+        assert "GROUP BY check_date" in query
+        assert "countIf(high < greatest(open, close)) AS invalid_high" in query
+        assert "groupArrayIf(5)(ts_code, high < greatest(open, close))" in query
+
+    def test_join_rules_use_nulls(self):
+        query = compile_quality_rule(STK_LIMIT_CONSISTENCY_RULE, ["20240102"])
+        assert "LEFT JOIN ods_stk_limit" in query
+        assert query.endswith("SETTINGS join_use_nulls = 1")
+
+
+class TestRunRule:
+    def test_counts_and_samples_per_date(self):
+        db = MagicMock()
+        db.table_exists.return_value = True
+        row = {
+            "check_date": "2024-01-02",
+            "total_records": 5000,
+            "invalid_high": 2,
+            "invalid_high__samples": "['000001.SZ','600000.SH']",
+        }
+        for name, _, _ in PRICE_CONSISTENCY_RULE.violations[1:]:
+            row[name] = 0
+            row[f"{name}__samples"] = "[]"
+        db.execute_query.return_value = pd.DataFrame([row])
+
+        results = _checker(db).run_rule(
+            PRICE_CONSISTENCY_RULE, ["20240102", "20240103"]
+        )
+
+        assert db.execute_query.call_count == 1
+        day1 = results["20240102"]
+        assert day1["status"] == "failed"
+        assert day1["total_records"] == 5000
+        assert day1["issues"] == ["High < max(Open, Close) for 2 records"]
+        assert day1["samples"] == {"invalid_high": ["000001.SZ", "600000.SH"]}
+        # No rows at all for the second date
+        assert results["20240103"]["issue"] == "No price data found"
+
+    def test_missing_tables_skip(self):
+        db = MagicMock()
+        db.table_exists.return_value = False
+        result = _checker(db).check_stk_limit_consistency("20240102")
+        assert result["status"] == "skipped"
+        db.execute_query.assert_not_called()
+
+
+class TestRunChecksForDates:
+    def test_alignment_uses_previous_trading_days(self):
+        db = MagicMock()
+        db.table_exists.side_effect = lambda table: table == "ods_daily"
+        db.execute_query.return_value = pd.DataFrame(
+            {
+                "trade_date": ["2024-01-02", "2024-01-03", "2024-01-04"],
+                "record_count": [5000, 5000, 4000],
+            }
+        )
+        extractor = MagicMock()
+        extractor.get_trade_calendar.return_value = pd.DataFrame(
+            {"cal_date": ["20240103", "20240104"], "is_open": [1, 1]}
+        )
+
+        results = _checker(db, extractor).check_trade_date_alignment_for_dates(
+            ["20240103", "20240104"]
+        )
+
+        extractor.get_trade_calendar.assert_called_once_with("2024-01-03", "2024-01-04")
+        assert results["20240103"]["status"] == "passed"
+        detail = results["20240104"]["details"]["ods_daily"]
+        assert detail["expected_count"] == 5000
+        assert detail["status"] == "warning"
+
+    def test_persist_and_skip_checked(self):
+        checker = _checker()
+        checker._get_checked_dates = MagicMock(return_value={"20240102"})
+        checker.check_trade_date_alignment_for_dates = MagicMock(
+            side_effect=lambda dates: {
+                d: {"check_name": "trade_date_alignment", "trade_date": d, "status": "skipped"}
+                for d in dates
+            }
+        )
+        checker.run_rule = MagicMock(
+            side_effect=lambda rule, dates: {
+                d: {"check_name": rule.check_name, "trade_date": d, "status": "passed"}
+                for d in dates
+            }
+        )
+        checker.persist_results = MagicMock()
+
+        results = checker.run_checks_for_dates(
+            ["20240102", "20240103"], persist=True, skip_checked=True
+        )
+
+        assert list(results) == ["20240103"]
+        assert results["20240103"]["overall_status"] == "passed"
+        assert results["20240103"]["summary"]["total_checks"] == 4
+        # One query per check for all dates, not per date
+        assert checker.run_rule.call_count == 3
+        checker.persist_results.assert_called_once_with(results["20240103"])
+
+
+class TestBackfillQualityChecks:
+    def test_relaxed_results_are_not_persisted(self):
+        from stock_datasource.services.ingestion import IngestionService
+
+        checker = _checker()
+        checker.check_trade_date_alignment_for_dates = MagicMock(
+            side_effect=lambda dates: {
+                d: {"check_name": "trade_date_alignment", "trade_date": d, "status": "failed"}
+                for d in dates
+            }
+        )
+        checker.run_rule = MagicMock(
+            side_effect=lambda rule, dates: {
+                d: {"check_name": rule.check_name, "trade_date": d, "status": "passed"}
+                for d in dates
+            }
+        )
+        checker.persist_results = MagicMock()
+        service = IngestionService()
+        service.quality_checker = checker
+
+        results = service._run_backfill_quality_checks_for_dates(["20240103"])
+
+        assert results["20240103"]["overall_status"] == "warning"
+        checker.persist_results.assert_not_called()
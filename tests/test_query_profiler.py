@@ -0,0 +1,130 @@
+"""Tests for the ClickHouse query profiler and slow-query log."""
+
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stock_datasource.utils.query_profiler import (
+    QueryProfiler,
+    current_query,
+    normalize_sql,
+    sql_fingerprint,
+)
+
+
+class TestFingerprint:
+    def test_literals_and_lists_are_normalised(self):
+        a = "SELECT * FROM ods_daily WHERE ts_code IN ('000001.SZ', '600000.SH') AND trade_date >= '20240101' LIMIT 10"
+        b = "select  * FROM ods_daily WHERE ts_code IN ('300750.SZ') AND trade_date >= '20230101'   LIMIT 500;"
+
+        assert normalize_sql(a) == "SELECT * FROM ods_daily WHERE ts_code IN (?) AND trade_date >= ? LIMIT ?"
+        assert sql_fingerprint(a) == sql_fingerprint(b.replace("select", "SELECT"))
+
+    def test_bound_params_and_comments(self):
+        sql = "-- screener\nSELECT close FROM t WHERE d = %(d)s /* hint */"
+        assert normalize_sql(sql) == "SELECT close FROM t WHERE d = ?"
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert normalize_sql("SELECT ma5, ma20 FROM t") == "SELECT ma5, ma20 FROM t"
+
+
+class TestProfiler:
+    def test_disabled_profiler_yields_none(self):
+        profiler = QueryProfiler(enabled=False)
+        with profiler.profile("primary", "execute", "SELECT 1") as record:
+            assert record is None
+        assert profiler.status()["fingerprints"] == 0
+
+    def test_profile_sets_context_and_aggregates(self):
+        profiler = QueryProfiler(enabled=True, slow_threshold_ms=0)
+        for code in ("a", "b"):
+            with profiler.profile("primary", "execute_query", f"SELECT * FROM t WHERE c = '{code}'") as record:
+                assert current_query() is record
+                record.update_from_http(json.dumps({"read_rows": "100", "read_bytes": "2048", "elapsed_ns": "5000000"}))
+        assert current_query() is None
+
+        [stats] = profiler.top_fingerprints()
+        assert stats["count"] == 2
+        assert stats["total_read_rows"] == 200
+        assert stats["total_read_bytes"] == 4096
+        assert stats["callers"] == {f"{__name__}:test_profile_sets_context_and_aggregates": 2}
+        slow = profiler.slow_queries()
+        assert len(slow) == 2 and slow[0]["sql"].endswith("'b'")
+
+    def test_only_slow_queries_are_logged(self, tmp_path):
+        log_file = tmp_path / "slow.log"
+        profiler = QueryProfiler(enabled=True, slow_threshold_ms=10_000, log_file=log_file)
+        with profiler.profile("primary", "execute", "SELECT 1"):
+            pass
+        assert profiler.slow_queries() == []
+        assert not log_file.exists()
+
+        profiler.configure(slow_threshold_ms=0)
+        with profiler.profile("primary", "execute", "SELECT 2"):
+            pass
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["sql"] == "SELECT 2"
+
+    def test_errors_are_recorded_and_reraised(self):
+        profiler = QueryProfiler(enabled=True, slow_threshold_ms=0)
+        with pytest.raises(RuntimeError):
+            with profiler.profile("primary", "execute", "SELECT broken"):
+                raise RuntimeError("Code: 47")
+        assert profiler.slow_queries()[0]["error"] == "Code: 47"
+        assert profiler.top_fingerprints()[0]["errors"] == 1
+
+    def test_tcp_stats(self):
+        profiler = QueryProfiler(enabled=True)
+        last_query = SimpleNamespace(
+            progress=SimpleNamespace(rows=10, bytes=80, elapsed_ns=None),
+            profile_info=SimpleNamespace(rows=3),
+            elapsed=0.25,
+        )
+        with profiler.profile("primary", "execute", "SELECT 1") as record:
+            record.update_from_tcp(last_query)
+        assert (record.read_rows, record.read_bytes, record.result_rows) == (10, 80, 3)
+        assert record.server_elapsed_ms == 250
+
+    def test_invalid_sort_key(self):
+        with pytest.raises(ValueError):
+            QueryProfiler().top_fingerprints(sort_by="sql")
+
+
+class TestClientAttempts:
+    def _client(self):
+        from stock_datasource.models.database import ClickHouseClient
+
+        client = ClickHouseClient.__new__(ClickHouseClient)
+        client.name = "primary"
+        client.client = MagicMock(last_query=None)
+        client._http_client = None
+        client._use_http = False
+        client._lock = threading.Lock()
+        client._ensure_connected = lambda: None
+        client._should_reconnect = lambda e: False
+        return client
+
+    def test_each_retry_gets_its_own_query_id(self):
+        from stock_datasource.models import database
+        from stock_datasource.models.database import ClickHouseClient
+
+        profiler = QueryProfiler(enabled=True)
+        client = self._client()
+        client.client.execute.side_effect = [RuntimeError("Code: 210"), [(1,)]]
+        retrying = ClickHouseClient.execute.__wrapped__.retry
+        instruments = database._instruments()._replace(profiler=profiler)
+
+        with (
+            patch.object(database, "_instruments", lambda: instruments),
+            patch.object(retrying, "sleep", lambda seconds: None),
+        ):
+            assert client.execute("SELECT 1") == [(1,)]
+
+        ids = [c.kwargs["query_id"] for c in client.client.execute.call_args_list]
+        assert len(ids) == 2 and ids[0] != ids[1]
+        [stats] = profiler.top_fingerprints()
+        assert stats["count"] == 1
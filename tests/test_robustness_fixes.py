@@ -22,6 +22,16 @@ if str(_src_dir) not in sys.path:
     sys.path.insert(0, str(_src_dir))
 
 
+@pytest.fixture(autouse=True)
+def _restore_settings_module():
+    """Put the real settings module back after a test installs ``_MockSettings``."""
+    name = "stock_datasource.config.settings"
+    saved = sys.modules.get(name)
+    yield
+    if saved is not None:
+        sys.modules[name] = saved
+
+
 # =============================================================================
 # C1-C5: _to_clickhouse_literal prevents SQL injection
 # =============================================================================
@@ -0,0 +1,143 @@
+"""Tests for the fingerprinted startup schema bootstrap."""
+
+import threading
+import time
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+from stock_datasource.utils.schema_bootstrap import (
+    FINGERPRINT_TABLE,
+    SchemaModule,
+    bootstrap_schemas,
+)
+
+ORDERS_DDL = "CREATE TABLE IF NOT EXISTS orders (id String) ENGINE = MergeTree() ORDER BY id"
+TRADES_DDL = "CREATE TABLE IF NOT EXISTS trades (id String) ENGINE = MergeTree() ORDER BY id"
+
+
+def _db(fingerprints=None, tables=(), fail_read=False):
+    db = MagicMock()
+    rows = [("module", name, fp) for name, fp in (fingerprints or {}).items()]
+    rows += [("table", name, "") for name in tables]
+
+    def _execute(sql, params=None):
+        if "UNION ALL" in sql:
+            if fail_read:
+                raise RuntimeError("UNKNOWN_TABLE")
+            return rows
+        return []
+
+    db.execute.side_effect = _execute
+    return db
+
+
+def _inserts(db):
+    return [
+        c.args[0] for c in db.execute.call_args_list if c.args[0].startswith("INSERT INTO")
+    ]
+
+
+def test_fingerprint_ignores_whitespace_and_extracts_tables():
+    compact = SchemaModule("orders", statements=[ORDERS_DDL])
+    spaced = SchemaModule("orders", statements=[ORDERS_DDL.replace(" (", "\n    (")])
+
+    assert compact.fingerprint == spaced.fingerprint
+    assert compact.tables == {"orders"}
+    assert SchemaModule("orders", statements=[TRADES_DDL]).fingerprint != compact.fingerprint
+
+
+def test_unchanged_modules_cost_a_single_metadata_read():
+    orders = SchemaModule("orders", statements=[ORDERS_DDL])
+    trades = SchemaModule("trades", statements=[TRADES_DDL])
+    db = _db({"orders": orders.fingerprint, "trades": trades.fingerprint}, {"orders", "trades"})
+    factory = MagicMock()
+
+    result = bootstrap_schemas([orders, trades], db=db, max_workers=2, client_factory=factory)
+
+    assert result.skipped == ["orders", "trades"]
+    assert db.execute.call_count == 1
+    factory.assert_not_called()
+
+
+def test_changed_or_missing_modules_are_reapplied_and_recorded():
+    orders = SchemaModule("orders", statements=[ORDERS_DDL])
+    trades = SchemaModule("trades", statements=[TRADES_DDL])
+    # orders' table was dropped, trades' DDL changed
+    db = _db({"orders": orders.fingerprint, "trades": "stale"}, {"trades"})
+    client = MagicMock(backup=None)
+
+    result = bootstrap_schemas(
+        [orders, trades], db=db, max_workers=2, client_factory=lambda: client
+    )
+
+    assert sorted(result.applied) == ["orders", "trades"]
+    executed = {c.args[0] for c in client.primary.execute.call_args_list}
+    assert executed == {ORDERS_DDL, TRADES_DDL}
+    [insert] = _inserts(db)
+    assert insert.startswith(f"INSERT INTO {FINGERPRINT_TABLE}")
+    assert trades.fingerprint in insert
+
+
+def test_first_start_creates_metadata_table_and_skips_failed_fingerprints():
+    ok = SchemaModule("ok", apply=MagicMock(), ddl="CREATE TABLE IF NOT EXISTS ok (x UInt8)")
+    broken = SchemaModule("broken", apply=MagicMock(side_effect=RuntimeError("boom")), ddl="x")
+    db = _db(fail_read=True)
+
+    result = bootstrap_schemas([ok, broken], db=db, max_workers=2, client_factory=MagicMock())
+
+    db.create_database.assert_called_once()
+    assert any(FINGERPRINT_TABLE in c.args[0] and "CREATE TABLE" in c.args[0]
+               for c in db.execute.call_args_list)
+    assert result.applied == ["ok"]
+    assert result.failed == {"broken": "boom"}
+    [insert] = _inserts(db)
+    assert "'ok'" in insert and "'broken'" not in insert
+
+
+def test_modules_run_concurrently_up_to_the_worker_limit():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _slow():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    modules = [SchemaModule(f"m{i}", apply=_slow, ddl=str(i)) for i in range(6)]
+
+    bootstrap_schemas(modules, db=_db(), max_workers=3, client_factory=MagicMock())
+
+    assert peak == 3
+
+
+def test_startup_wrappers_raise_so_failures_are_not_recorded():
+    from stock_datasource.modules.portfolio import init as portfolio_init
+    from stock_datasource.modules.profile.service import ProfileService
+
+    profile_service = ProfileService()
+    profile_service._db = MagicMock()
+    profile_service._db.execute.side_effect = RuntimeError("profile ddl")
+    failing_client = MagicMock()
+    failing_client.execute.side_effect = RuntimeError("alter failed")
+    modules = [
+        SchemaModule.from_functions(
+            "portfolio", partial(portfolio_init.ensure_profile_id_column, strict=True)
+        ),
+        SchemaModule(
+            name="profile", apply=partial(profile_service.ensure_table, strict=True), ddl="x"
+        ),
+    ]
+    db = _db()
+
+    with patch.object(portfolio_init, "db_client", failing_client):
+        result = bootstrap_schemas(modules, db=db, max_workers=2, client_factory=MagicMock())
+
+    assert result.failed == {"portfolio": "alter failed", "profile": "profile ddl"}
+    assert _inserts(db) == []
+    # Callers outside the bootstrap keep the lenient behaviour
+    profile_service.ensure_table()
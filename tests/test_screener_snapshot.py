@@ -0,0 +1,138 @@
+"""Tests for the per-date screener market snapshot."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_datasource.modules.screener import snapshot as snapshot_module
+from stock_datasource.modules.screener.schemas import ScreenerCondition
+from stock_datasource.modules.screener.snapshot import (
+    MarketSnapshotCache,
+    build_market_snapshot,
+)
+
+DAILY = pd.DataFrame(
+    {
+        "ts_code": ["600519.SH", "000858.SZ", "000001.SZ"],
+        "trade_date": ["2025-01-14"] * 3,
+        "close": ["1800.0", "150.0", "10.0"],
+        "pct_chg": [2.5, 1.8, -0.5],
+    }
+)
+DAILY_BASIC = pd.DataFrame(
+    {
+        "ts_code": ["600519.SH", "000858.SZ", "000001.SZ"],
+        "trade_date": ["20250114"] * 3,
+        "close": [1800.0, 150.0, 10.0],
+        "pe_ttm": [35.0, 28.0, -5.0],
+        "pb": [12.0, 5.0, 0.6],
+    }
+)
+STOCK_BASIC = pd.DataFrame(
+    {
+        "ts_code": ["600519.SH", "000858.SZ"],
+        "name": ["贵州茅台", "五粮液"],
+        "industry": ["白酒", "白酒"],
+    }
+)
+
+
+def test_build_merges_coerces_and_ranks():
+    snap = build_market_snapshot("20250114", DAILY, DAILY_BASIC, STOCK_BASIC)
+
+    assert snap.trade_date == "2025-01-14"
+    frame = snap.frame.set_index("ts_code")
+    assert frame["close"].dtype == np.float64
+    assert frame.loc["000001.SZ", "stock_name"] == "000001.SZ"
+    assert frame.loc["000001.SZ", "industry"] is None
+    # Negative PE is outside the distribution and has no percentile
+    assert snap.distributions["pe_ttm"].tolist() == [28.0, 35.0]
+    assert frame.loc["600519.SH", "pe_ttm_percentile"] == 50.0
+    assert np.isnan(frame.loc["000001.SZ", "pe_ttm_percentile"])
+    assert snap.percentile("pb", 6.0) == pytest.approx(200 / 3)
+    assert snap.row("000858.SZ")["stock_name"] == "五粮液"
+
+
+def test_cache_builds_once_and_invalidates_on_load():
+    cache = MarketSnapshotCache(ttl=60)
+    builder = MagicMock(
+        side_effect=lambda d: build_market_snapshot(d, DAILY, DAILY_BASIC, STOCK_BASIC)
+    )
+
+    first = cache.get("20250114", builder)
+    assert cache.get("2025-01-14", builder) is first
+    assert builder.call_count == 1
+
+    cache.on_data_loaded("tushare_finace_indicator", "fact_fina_indicator")
+    cache.get("2025-01-14", builder)
+    assert builder.call_count == 1
+
+    cache.on_data_loaded("tushare_daily_basic", "ods_daily_basic")
+    cache.get("2025-01-14", builder)
+    assert builder.call_count == 2
+
+
+def test_cache_expires_and_evicts():
+    cache = MarketSnapshotCache(ttl=0, max_dates=1)
+    builder = MagicMock(
+        side_effect=lambda d: build_market_snapshot(d, DAILY, DAILY_BASIC, STOCK_BASIC)
+    )
+    cache.get("2025-01-14", builder)
+    cache.get("2025-01-14", builder)
+    assert builder.call_count == 2
+
+    cache.ttl = 60
+    cache.get("2025-01-15", builder)
+    assert list(cache._snapshots) == ["2025-01-15"]
+
+
+def test_screener_filters_cached_snapshot():
+    from stock_datasource.modules.screener.service import ScreenerService
+
+    service = object.__new__(ScreenerService)
+    service.daily_service = MagicMock()
+    service.daily_service.get_all_daily_by_date.return_value = DAILY
+    service.daily_service.get_latest_trade_date.return_value = "2025-01-14"
+    service.daily_basic_service = MagicMock()
+    service.daily_basic_service.get_all_daily_basic_by_date.return_value = DAILY_BASIC
+    service.stock_basic_service = MagicMock()
+    service.stock_basic_service.get_all_stock_basic_df.return_value = STOCK_BASIC
+
+    with patch.object(snapshot_module, "_snapshot_cache", MarketSnapshotCache(ttl=60)):
+        for _ in range(2):
+            items, total = service.filter_by_conditions(
+                [
+                    ScreenerCondition(field="pe", operator="<", value=40),
+                    ScreenerCondition(field="industry", operator="eq", value="白酒"),
+                ],
+                sort_by="pe",
+                sort_order="asc",
+            )
+
+    assert total == 2
+    assert [i.ts_code for i in items] == ["000858.SZ", "600519.SH"]
+    assert service.daily_service.get_all_daily_by_date.call_count == 1
+    assert service.daily_service.get_latest_trade_date.call_count == 1
+
+
+def test_batch_profiles_share_snapshot_and_bulk_history():
+    from stock_datasource.modules.screener.profile import ProfileService
+
+    service = object.__new__(ProfileService)
+    service.db = MagicMock()
+    service.db.execute_query.return_value = pd.DataFrame(
+        {"ts_code": ["600519.SH"], "trade_date": ["2025-01-14"], "close": [1800.0]}
+    )
+    service.stock_basic_service = MagicMock()
+    snap = build_market_snapshot("2025-01-14", DAILY, DAILY_BASIC, STOCK_BASIC)
+
+    with patch.object(ProfileService, "get_snapshot", return_value=snap):
+        profiles = service.batch_calculate_profiles(["600519.SH", "000858.SZ"])
+
+    assert [p.stock_name for p in profiles] == ["贵州茅台", "五粮液"]
+    assert all(p.trade_date == "2025-01-14" for p in profiles)
+    # One daily and one daily_basic query for the whole batch
+    assert service.db.execute_query.call_count == 2
+    service.stock_basic_service.get_stock_basic.assert_not_called()
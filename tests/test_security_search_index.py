@@ -0,0 +1,161 @@
+"""Tests for the in-process security search index."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from stock_datasource.modules.market.search_index import (
+    SecuritySearchIndex,
+    build_entry,
+)
+
+_ROWS = {
+    "ods_stock_basic": pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ", "600000.SH", "000002.SZ"],
+            "symbol": ["000001", "600000", "000002"],
+            "name": ["平安银行", "浦发银行", "万科A"],
+        }
+    ),
+    "ods_etf_basic": pd.DataFrame(
+        {
+            "ts_code": ["510300.SH"],
+            "name": ["沪深300ETF"],
+            "extname": ["300ETF"],
+            "cname": ["华泰柏瑞沪深300交易型开放式指数证券投资基金"],
+        }
+    ),
+    "ods_hk_basic": pd.DataFrame(
+        {"ts_code": ["00700.HK"], "name": ["腾讯控股"], "cn_spell": ["TXKG"]}
+    ),
+    "dim_index_basic": pd.DataFrame(
+        {"ts_code": ["000300.SH"], "name": ["沪深300"], "fullname": ["沪深300指数"]}
+    ),
+}
+
+
+def _db() -> MagicMock:
+    db = MagicMock()
+
+    def execute_query(query, params=None):
+        if "count()" in query:
+            return pd.DataFrame({"n": [1], "ts": ["2026-01-01 00:00:00"]})
+        table = query.split("FROM ")[-1].strip()
+        return _ROWS[table]
+
+    db.execute_query.side_effect = execute_query
+    return db
+
+
+def _index() -> SecuritySearchIndex:
+    index = SecuritySearchIndex(db=_db(), refresh_interval=3600)
+    index.refresh()
+    return index
+
+
+class TestSecuritySearchIndex:
+    def test_not_ready_returns_none(self):
+        index = SecuritySearchIndex(db=MagicMock(), refresh_interval=3600)
+        index._maybe_refresh = lambda: None
+        assert index.search("平安") is None
+        assert not index.ready
+
+    def test_exact_code_ranks_first(self):
+        results = _index().search("000001")
+        assert results[0] == {"code": "000001.SZ", "name": "平安银行", "market": "a_share"}
+
+    def test_prefix_and_substring_matches(self):
+        index = _index()
+        assert [r["code"] for r in index.search("银行")] == ["000001.SZ", "600000.SH"]
+        codes = [r["code"] for r in index.search("300")]
+        # ETF / index code prefixes before name substrings
+        assert set(codes) == {"510300.SH", "000300.SH"}
+
+    def test_hk_pinyin_alias(self):
+        assert _index().search("txkg")[0]["code"] == "00700.HK"
+
+    def test_a_share_pinyin_initials(self):
+        assert _index().search("payh")[0]["code"] == "000001.SZ"
+
+    def test_market_limits(self):
+        results = _index().search("0", market_limits={"a_share": 1})
+        assert len(results) == 1
+        assert results[0]["market"] == "a_share"
+
+    def test_resolve(self):
+        index = _index()
+        assert index.resolve("000001")["code"] == "000001.SZ"
+        assert index.resolve("510300")["market"] == "etf"
+        assert index.resolve("700")["code"] == "00700.HK"
+        assert index.resolve("00700.hk")["name"] == "腾讯控股"
+        assert index.resolve("999999") is None
+
+    def test_refresh_reloads_only_changed_tables(self):
+        index = _index()
+        assert index.refresh() == []
+        index._stale.add("ods_hk_basic")
+        assert index.refresh() == ["ods_hk_basic"]
+
+    def test_load_entries_swaps_table(self):
+        index = _index()
+        index.load_entries(
+            "ods_hk_basic",
+            [build_entry("hk_stock", {"ts_code": "09988.HK", "name": "阿里巴巴-SW"})],
+        )
+        assert index.resolve("00700.HK") is None
+        assert index.search("阿里")[0]["code"] == "09988.HK"
+
+    def test_unreachable_database_keeps_index_not_ready(self):
+        db = MagicMock()
+        db.execute_query.side_effect = ConnectionError("clickhouse down")
+        index = SecuritySearchIndex(db=db, refresh_interval=3600)
+        index._maybe_refresh = lambda: None
+
+        assert index.refresh() == []
+        assert not index.ready
+        assert index.search("平安") is None
+
+    def test_failed_reload_keeps_previous_snapshot(self):
+        index = _index()
+        index._get_db().execute_query.side_effect = ConnectionError("clickhouse down")
+        index._stale.add("ods_stock_basic")
+
+        assert index.refresh() == []
+        assert index.resolve("000001")["code"] == "000001.SZ"
+
+    def test_empty_reload_keeps_previous_entries(self):
+        index = _index()
+        index._get_db().execute_query.side_effect = lambda q, p=None: (
+            pd.DataFrame({"n": [2], "ts": ["2026-01-02 00:00:00"]})
+            if "count()" in q
+            else pd.DataFrame(columns=["ts_code", "symbol", "name"])
+        )
+        index._stale.add("ods_stock_basic")
+
+        assert index.refresh() == []
+        assert index.resolve("000001")["code"] == "000001.SZ"
+
+
+class TestResolveStockCode:
+    def test_code_missing_from_ready_index_falls_back_to_database(self):
+        from stock_datasource.modules.market.service import MarketService
+
+        service = MarketService()
+        service._db = MagicMock()
+        service._db.execute_query.return_value = pd.DataFrame(
+            {"ts_code": ["001999.SZ"], "name": ["新上市"]}
+        )
+        index = _index()
+        with patch(
+            "stock_datasource.modules.market.service.get_security_search_index",
+            return_value=index,
+        ):
+            assert asyncio.run(service.resolve_stock_code("000001"))["code"] == (
+                "000001.SZ"
+            )
+            service._db.execute_query.assert_not_called()
+
+            result = asyncio.run(service.resolve_stock_code("001999.SZ"))
+
+        assert result == {"code": "001999.SZ", "name": "新上市", "market": "a_share"}
@@ -0,0 +1,108 @@
+"""Tests for the batched multi-stock signal aggregation path."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from stock_datasource.modules.signal_aggregator.schemas import (
+    CapitalFlowSignalInput,
+    NewsSignalInput,
+    TechSignalInput,
+)
+from stock_datasource.modules.signal_aggregator.scoring import SignalScoringService
+from stock_datasource.modules.signal_aggregator.service import SignalAggregator
+
+CODES = ["600519.SH", "000858.SZ", "300750.SZ"]
+
+
+def _fake_db():
+    def execute_query(sql, params=None):
+        if "dim_stock_basic" in sql:
+            return pd.DataFrame({"ts_code": CODES, "name": ["茅台", "五粮液", "宁德时代"]})
+        if "ods_top_inst" in sql:
+            return pd.DataFrame(
+                {"ts_code": ["600519.SH"], "total_net": [3e8], "hhi": [0.5]}
+            )
+        if "ods_top_list" in sql:
+            return pd.DataFrame({"ts_code": ["600519.SH", "000858.SZ"], "seat_count": [2, 7]})
+        if "ods_hsgt_top10" in sql:
+            return pd.DataFrame({"ts_code": ["000858.SZ"], "total_vol": [-2e8]})
+        return pd.DataFrame()
+
+    db = MagicMock()
+    db.execute_query.side_effect = execute_query
+    return db
+
+
+def _aggregator(db):
+    aggregator = SignalAggregator()
+    aggregator._db = db
+    return aggregator
+
+
+def _tech_result():
+    signal = SimpleNamespace(
+        ts_code="300750.SZ", signal_type="buy", confidence=0.8,
+        target_position=0.5, reason="MA cross", ma25=10.0, ma120=9.0,
+    )
+    weaker = SimpleNamespace(**{**signal.__dict__, "confidence": 0.2})
+    return SimpleNamespace(signals=[weaker, signal])
+
+
+def test_batch_uses_grouped_queries_and_one_insert():
+    db = _fake_db()
+    aggregator = _aggregator(db)
+    generator = MagicMock()
+    generator.generate_signals = MagicMock(side_effect=lambda codes: asyncio.sleep(0, _tech_result()))
+
+    async def no_news(self, ts_code):
+        return NewsSignalInput(ts_code=ts_code)
+
+    with patch(
+        "stock_datasource.modules.quant.signal_generator.get_signal_generator",
+        return_value=generator,
+    ), patch.object(SignalAggregator, "_collect_news_signal", no_news):
+        response = asyncio.run(aggregator.aggregate_for_stocks(CODES + ["600519.SH"]))
+
+    # names + three capital families, regardless of the number of codes
+    assert db.execute_query.call_count == 4
+    generator.generate_signals.assert_called_once_with(CODES)
+    db.insert_dataframe.assert_called_once()
+    table, df = db.insert_dataframe.call_args.args
+    assert table == "obs_stock_signal_snapshot"
+    assert sorted(df["ts_code"]) == sorted(CODES)
+
+    by_code = {s.ts_code: s for s in response.stocks}
+    assert response.total_count == 3
+    assert by_code["600519.SH"].capital_detail["seat_hhi"] == 0.5
+    assert by_code["000858.SZ"].capital_detail["hot_money_count"] == 7
+    assert by_code["300750.SZ"].tech_detail["confidence"] == 0.8
+    assert by_code["600519.SH"].stock_name == "茅台"
+
+
+def test_capital_batch_scoring_matches_scalar():
+    scoring = SignalScoringService()
+    signals = [
+        CapitalFlowSignalInput(ts_code="a"),
+        CapitalFlowSignalInput(ts_code="b", net_institutional_flow=5e8, hot_money_count=3, seat_hhi=0.4),
+        CapitalFlowSignalInput(ts_code="c", net_institutional_flow=-2e9, northbound_net_flow=-3e8),
+        CapitalFlowSignalInput(ts_code="d", northbound_net_flow=1e7, sector_flow_rank=4),
+    ]
+
+    batch = scoring.score_capital_batch(signals)
+
+    for signal, result in zip(signals, batch, strict=True):
+        assert result == scoring.score_capital(signal)
+
+
+def test_composite_batch_matches_scalar():
+    scoring = SignalScoringService()
+    news = [scoring.score_news(NewsSignalInput(ts_code="a", positive_count=3, average_score=0.5))]
+    capital = scoring.score_capital_batch([CapitalFlowSignalInput(ts_code="a", hot_money_count=2)])
+    tech = [scoring.score_tech(TechSignalInput(ts_code="a", signal_type="sell", confidence=0.6))]
+
+    assert scoring.compute_composite_batch(news, capital, tech) == [
+        scoring.compute_composite(news[0], capital[0], tech[0])
+    ]
@@ -0,0 +1,105 @@
+"""Tests for the batched telemetry sink."""
+
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from stock_datasource.services.telemetry_sink import TelemetrySink
+
+
+def _row(i: int) -> dict:
+    return {"id": f"row-{i}", "record_count": i, "created_at": datetime(2026, 1, 2, 9, 30)}
+
+
+class TestTelemetrySink:
+    def test_rows_are_batched_per_table(self):
+        client = MagicMock()
+        sink = TelemetrySink(batch_size=100, flush_interval=3600, client=client)
+        for i in range(5):
+            sink.emit("api_usage_log", _row(i))
+        sink.emit("token_usage_log", _row(99))
+
+        assert sink.flush() == 6
+        assert client.insert_dataframe.call_count == 2
+        tables = {c.args[0]: c.args[1] for c in client.insert_dataframe.call_args_list}
+        assert len(tables["api_usage_log"]) == 5
+        assert len(tables["token_usage_log"]) == 1
+        assert sink.stats()["flushed"] == 6
+
+    def test_ensure_fn_runs_once(self):
+        client = MagicMock()
+        ensure = MagicMock()
+        sink = TelemetrySink(batch_size=100, flush_interval=3600, client=client)
+        sink.register_table("api_usage_log", ensure_fn=ensure)
+        sink.emit("api_usage_log", _row(1))
+        sink.flush()
+        sink.emit("api_usage_log", _row(2))
+        sink.flush()
+        ensure.assert_called_once()
+
+    def test_failed_ensure_fn_is_retried(self):
+        client = MagicMock()
+        ensure = MagicMock(side_effect=[False, True])
+        sink = TelemetrySink(batch_size=100, flush_interval=3600, client=client)
+        sink.register_table("api_usage_log", ensure_fn=ensure)
+        for i in range(3):
+            sink.emit("api_usage_log", _row(i))
+            sink.flush()
+        assert ensure.call_count == 2
+
+    def test_stats_does_not_wait_for_flush(self):
+        inserting = threading.Event()
+        release = threading.Event()
+        client = MagicMock()
+        client.insert_dataframe.side_effect = lambda *a: (
+            inserting.set(),
+            release.wait(5),
+        )
+        sink = TelemetrySink(batch_size=100, flush_interval=3600, client=client)
+        sink.emit("api_usage_log", _row(1))
+        flusher = threading.Thread(target=sink.flush)
+        flusher.start()
+        try:
+            assert inserting.wait(5)
+            stats = {}
+            reader = threading.Thread(target=lambda: stats.update(sink.stats()))
+            reader.start()
+            reader.join(1)
+            assert not reader.is_alive()
+            assert stats["emitted"] == 1
+        finally:
+            release.set()
+            flusher.join()
+
+    def test_full_queue_drops_rows(self):
+        sink = TelemetrySink(
+            batch_size=100, flush_interval=3600, max_queue_size=2, client=MagicMock()
+        )
+        sink._ensure_thread = lambda: None  # keep rows in the queue
+        results = [sink.emit("api_usage_log", _row(i)) for i in range(4)]
+        assert results == [True, True, False, False]
+        stats = sink.stats()
+        assert stats["queue_depth"] == 2
+        assert stats["dropped"] == 2
+
+    def test_spill_and_replay(self, tmp_path):
+        client = MagicMock()
+        client.insert_dataframe.side_effect = ConnectionError("clickhouse down")
+        sink = TelemetrySink(
+            batch_size=100, flush_interval=3600, spill_dir=tmp_path, client=client
+        )
+        for i in range(3):
+            sink.emit("api_usage_log", _row(i))
+        assert sink.flush() == 0
+        assert (tmp_path / "api_usage_log.jsonl").exists()
+        assert sink.stats()["spilled"] == 3
+
+        client.insert_dataframe.side_effect = None
+        sink.emit("api_usage_log", _row(3))
+        assert sink.flush() == 1
+
+        replayed_df = client.insert_dataframe.call_args_list[-1].args[1]
+        assert list(replayed_df["id"]) == ["row-0", "row-1", "row-2"]
+        assert isinstance(replayed_df["created_at"].iloc[0], datetime)
+        assert not (tmp_path / "api_usage_log.jsonl").exists()
+        assert sink.stats()["replayed"] == 3
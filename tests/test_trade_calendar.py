@@ -0,0 +1,86 @@
+"""Tests for the array-backed trade calendar."""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from stock_datasource.core.trade_calendar import MARKET_CN, TradeCalendarService
+
+# Thu 2024-01-04 .. Wed 2024-01-10; weekend closed, Mon 01-08 a holiday
+OPEN = {
+    "2024-01-04": 1,
+    "2024-01-05": 1,
+    "2024-01-06": 0,
+    "2024-01-07": 0,
+    "2024-01-08": 0,
+    "2024-01-09": 1,
+    "2024-01-10": 1,
+}
+
+
+@pytest.fixture
+def calendar():
+    svc = object.__new__(TradeCalendarService)
+    svc.logger = TradeCalendarService().logger
+    svc._compiled = {}
+    svc._calendar_df = pd.DataFrame(
+        {"cal_date": pd.to_datetime(list(OPEN)), "is_open": list(OPEN.values())}
+    ).sort_values("cal_date", ascending=False)
+    svc._compile(MARKET_CN)
+    return svc
+
+
+class TestScalar:
+    def test_between_and_count(self, calendar):
+        assert calendar.get_trading_days_between("20240105", "2024-01-09") == [
+            "2024-01-05",
+            "2024-01-09",
+        ]
+        assert calendar.count_trading_days_between("2024-01-06", date(2024, 1, 10)) == 2
+        assert calendar.count_trading_days_between("2024-01-10", "2024-01-04") == 0
+
+    @pytest.mark.parametrize(
+        "day, offset, expected",
+        [
+            ("2024-01-08", 0, "2024-01-05"),
+            ("2024-01-09", 0, "2024-01-09"),
+            ("2024-01-05", 1, "2024-01-09"),
+            ("2024-01-07", 2, "2024-01-10"),
+            ("2024-01-09", -1, "2024-01-05"),
+            ("2024-01-07", -2, "2024-01-04"),
+            ("2024-01-10", 1, None),
+            ("2024-01-04", -1, None),
+        ],
+    )
+    def test_offset(self, calendar, day, offset, expected):
+        assert calendar.get_trading_day_offset(day, offset) == expected
+
+    def test_recent_days_descending(self, calendar):
+        assert calendar.get_trading_days(3, end_date="2024-01-08") == [
+            "2024-01-05",
+            "2024-01-04",
+        ]
+        assert calendar.is_trading_day("20240109")
+        assert not calendar.is_trading_day("2024-01-08")
+
+    def test_invalid_date_returns_none(self, calendar):
+        assert calendar.get_trading_day_offset("2024/01/05", 1) is None
+
+
+class TestBatch:
+    def test_batch_matches_scalar(self, calendar):
+        days = list(OPEN) + ["2023-12-31", "2024-02-01"]
+        for offset in (-2, -1, 0, 1, 3):
+            assert calendar.get_trading_day_offsets(days, offset) == [
+                calendar.get_trading_day_offset(d, offset) for d in days
+            ]
+        assert calendar.is_trading_days(days).tolist() == [
+            calendar.is_trading_day(d) for d in days
+        ]
+
+    def test_batch_counts(self, calendar):
+        counts = calendar.count_trading_days_between_batch(
+            ["2024-01-04", "2024-01-06"], ["2024-01-10", "2024-01-08"]
+        )
+        assert counts.tolist() == [4, 0]